@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+백테스트 배치 평가: 가중치 K개를 run_batch 한 번 vs 포트폴리오별 run 반복
+
+프리셋 티커 유니버스(없으면 이력 긴 티커)에서 무작위 가중치(디리클레) K개를 만들어
+src/backtest.py 의 행렬 경로와 1개씩 도는 경로를 비교한다 (결과 일치도 확인).
+
+실행 방법:
+    python benchmarks/bench_backtest.py                  # K=10,000, 10년, 월 적립 없음
+    python benchmarks/bench_backtest.py -k 50000 --period 5 --dca monthly
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'src'))
+
+from backtest import ReturnPanel, run, run_batch
+from build_backtest_presets import BENCH, PRESETS, preset_weights
+
+LOOP_SAMPLE = 200   # 반복 경로는 이만큼만 돌려 K개로 환산
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='백테스트 배치(행렬) vs 반복 평가 시간 비교')
+    parser.add_argument('-k', type=int, default=10_000, help='가중치 벡터 수')
+    parser.add_argument('--period', type=int, default=10)
+    parser.add_argument('--dca', default='none', choices=('none', 'monthly', 'quarterly', 'semiannual', 'annually'))
+    parser.add_argument('--rebalance', default='monthly',
+                        choices=('monthly', 'quarterly', 'semiannual', 'annually', 'none'))
+    parser.add_argument('--output', default=str(ROOT / 'output'))
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    out = Path(args.output)
+    t0 = time.perf_counter()
+    panel = ReturnPanel.load(out / 'backtest_data.json', out / 'bt-monthly')
+    load_s = time.perf_counter() - t0
+    tickers = [t for t in preset_weights(PRESETS)[0] if t in panel.annual]
+    if len(tickers) < 5:
+        tickers = sorted(panel.annual, key=lambda t: panel.annual[t][0])[:13]
+    bench = BENCH if BENCH in panel.annual else None
+
+    rng = np.random.default_rng(args.seed)
+    W = rng.dirichlet(np.ones(len(tickers)), size=args.k)
+    W[rng.random(W.shape) < 0.3] = 0     # 일부 티커 미보유 → 시작 연도·월간 폴백 조합이 섞이게
+    W[W.sum(axis=1) == 0, 0] = 1
+    W /= W.sum(axis=1, keepdims=True)
+    opts = dict(init_val=10000.0, bench=bench, dca_freq=args.dca,
+                dca_amount=500.0 if args.dca != 'none' else 0.0, rebalance=args.rebalance)
+
+    t0 = time.perf_counter()
+    batch = run_batch(panel, tickers, W, args.period, **opts)
+    batch_s = time.perf_counter() - t0
+
+    n = min(LOOP_SAMPLE, args.k)
+    t0 = time.perf_counter()
+    singles = [run(panel, [(t, w) for t, w in zip(tickers, W[k]) if w], args.period, **opts) for k in range(n)]
+    loop_s = (time.perf_counter() - t0) / n * args.k
+
+    worst = max(abs(s['stats']['cagr'] - batch.stats['cagr'][k]) for k, s in enumerate(singles))
+    groups = len(np.unique(batch.start_year))
+    print(f'  유니버스: {len(tickers)}개 티커 ({", ".join(tickers)}), 벤치마크 {bench}, '
+          f'{args.period}년 · DCA {args.dca} · 리밸런싱 {args.rebalance}')
+    print(f'  데이터 로드: {load_s * 1000:.0f}ms ({len(panel.annual):,} 티커, ~{panel.data_end_year})\n')
+    print(f'  {"K":>8} {"batch":>10} {"loop(환산)":>12} {"배율":>7}  시작 연도 그룹')
+    print(f'  {args.k:>8,} {batch_s:>9.3f}s {loop_s:>11.2f}s {loop_s / batch_s:>6.0f}x  {groups}')
+    print(f'\n  batch vs loop CAGR 최대 차이 ({n}개): {worst:.2e} %p')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+etf_data allData 행 지향(현행) vs 열 지향(columnar-v1) 비교
+
+크기: 원본 · gzip -9 (brotli 모듈이 있으면 brotli 11도)
+파싱: Python json.loads, 그리고 node 가 있으면 브라우저와 같은 V8 JSON.parse
+      + etf-columnar.js 로 전 섹터 복원 / 한 섹터만 복원
+
+실행 방법:
+    python benchmarks/bench_columnar.py                          # output/etf_data.json
+    python benchmarks/bench_columnar.py --input path/to/etf_data.json --repeat 50
+"""
+
+import argparse
+import gzip
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'src'))
+
+from columnar import encode_all_data, decode_all_data
+
+DECODER_JS = ROOT / 'output' / 'etf-columnar.js'
+
+NODE_BENCH = r'''
+const fs = require('fs');
+const C = require(process.argv[1]);
+const repeat = +process.argv[4];
+function best(fn) {
+  let t = Infinity;
+  for (let i = 0; i < repeat; i++) { const t0 = process.hrtime.bigint(); fn(); t = Math.min(t, Number(process.hrtime.bigint() - t0) / 1e6); }
+  return t;
+}
+const row = fs.readFileSync(process.argv[2], 'utf8');
+const col = fs.readFileSync(process.argv[3], 'utf8');
+const sid = Object.keys(JSON.parse(row).allData)[0];
+console.log(JSON.stringify({
+  row_parse: best(() => JSON.parse(row)),
+  col_parse: best(() => JSON.parse(col)),
+  col_parse_decode_all: best(() => C.wrap(JSON.parse(col).allData).toAllData()),
+  col_parse_decode_one: best(() => C.wrap(JSON.parse(col).allData).sector(sid)),
+}));
+'''
+
+
+def dumps(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def sizes(data):
+    out = {'raw': len(data), 'gzip': len(gzip.compress(data, 9))}
+    try:
+        import brotli
+        out['brotli'] = len(brotli.compress(data, quality=11))
+    except ImportError:
+        pass
+    return out
+
+
+def best_of(repeat, func):
+    t = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        t = min(t, time.perf_counter() - t0)
+    return t * 1000
+
+
+def node_times(row_bytes, col_bytes, repeat):
+    """V8 JSON.parse·디코드 시간 (ms, node 없으면 None)"""
+    node = shutil.which('node')
+    if not node:
+        return None
+    with tempfile.TemporaryDirectory() as tmp:
+        row_path, col_path = Path(tmp) / 'row.json', Path(tmp) / 'col.json'
+        row_path.write_bytes(row_bytes)
+        col_path.write_bytes(col_bytes)
+        out = subprocess.run([node, '-e', NODE_BENCH, str(DECODER_JS), str(row_path), str(col_path), str(repeat)],
+                             capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='etf_data 행 지향 vs 열 지향 크기·파싱 비교')
+    parser.add_argument('--input', default=str(ROOT / 'output' / 'etf_data.json'))
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    with open(args.input, encoding='utf-8') as f:
+        raw = json.load(f)
+    all_data = raw['allData']
+    doc = encode_all_data(all_data)
+    assert decode_all_data(doc) == all_data, '왕복 불일치'
+
+    row_bytes = dumps({'as_of': raw.get('as_of', ''), 'allData': all_data})
+    col_bytes = dumps({'as_of': raw.get('as_of', ''), 'allData': doc})
+    n = sum(len(v) for v in all_data.values())
+    print(f'  입력: {args.input} ({n:,} ETF, {len(all_data)} 섹터, allData 만 비교)\n')
+
+    rs, cs = sizes(row_bytes), sizes(col_bytes)
+    print(f'  {"크기":<10} {"row":>10} {"columnar":>10} {"비율":>7}')
+    for k in rs:
+        print(f'  {k:<10} {rs[k] / 1024:9.1f}K {cs[k] / 1024:9.1f}K {cs[k] / rs[k]:6.2f}x')
+
+    print(f'\n  {"파싱 (ms)":<26} {"row":>8} {"columnar":>9}')
+    py_row = best_of(args.repeat, lambda: json.loads(row_bytes))
+    py_col = best_of(args.repeat, lambda: json.loads(col_bytes))
+    py_dec = best_of(args.repeat, lambda: decode_all_data(json.loads(col_bytes)['allData']))
+    print(f'  {"python json.loads":<26} {py_row:8.2f} {py_col:9.2f}')
+    print(f'  {"python + 전체 복원":<26} {"":>8} {py_dec:9.2f}')
+    node = node_times(row_bytes, col_bytes, args.repeat)
+    if node is None:
+        print('  (node 없음 — V8 측정 생략)')
+    else:
+        print(f'  {"node JSON.parse":<26} {node["row_parse"]:8.2f} {node["col_parse"]:9.2f}')
+        print(f'  {"node + 전체 복원":<26} {"":>8} {node["col_parse_decode_all"]:9.2f}')
+        print(f'  {"node + 한 섹터 복원":<26} {"":>8} {node["col_parse_decode_one"]:9.2f}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
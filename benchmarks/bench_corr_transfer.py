@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+상관 페이지 전송량: corr_returns.json 전체 vs 인덱스 + 티커별 바이트 범위 (corr-bin-v1)
+
+JSON 은 전체를 한 번 받고(gzip), 바이너리는 인덱스(gzip) + 선택 티커의 Range 응답(무압축)만 받는다.
+HTTP 헤더 오버헤드는 제외.
+
+실행 방법:
+    python benchmarks/bench_corr_transfer.py                       # SPY QQQ TLT GLD VNQ (없으면 이력 긴 5개)
+    python benchmarks/bench_corr_transfer.py --tickers SPY EFA AGG
+"""
+
+import argparse
+import gzip
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import build_corr_data
+
+DEFAULT_TICKERS = ('SPY', 'QQQ', 'TLT', 'GLD', 'VNQ')
+
+
+def gz(data):
+    return len(gzip.compress(data, 9))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='corr_returns JSON vs 바이너리 Range 전송량 비교')
+    parser.add_argument('--tickers', nargs='+')
+    parser.add_argument('--output', default=str(ROOT / 'output'))
+    args = parser.parse_args(argv)
+
+    out = Path(args.output)
+    json_bytes = (out / 'corr_returns.json').read_bytes()
+    index_bytes = (out / 'corr_returns_index.json').read_bytes()
+    index = json.loads(index_bytes)
+    entries = index['tickers']
+
+    tickers = args.tickers or [t for t in DEFAULT_TICKERS if t in entries]
+    if len(tickers) < len(DEFAULT_TICKERS) and not args.tickers:
+        longest = sorted(entries, key=lambda t: -entries[t][2])
+        tickers += [t for t in longest if t not in tickers][:len(DEFAULT_TICKERS) - len(tickers)]
+    missing = [t for t in tickers if t not in entries]
+    if missing:
+        parser.error(f'인덱스에 없는 티커: {missing}')
+
+    t0 = time.perf_counter()
+    got = build_corr_data.read_binary(tickers, index, out / 'corr_returns.bin')
+    read_ms = (time.perf_counter() - t0) * 1000
+    ref = json.loads(json_bytes)['returns']
+    assert all(got[t] == ref[t] for t in tickers), 'JSON 과 값 불일치'
+
+    ranges = sum(entries[t][2] for t in tickers) * build_corr_data.BIN_DTYPE.itemsize
+    json_gz, index_gz = gz(json_bytes), gz(index_bytes)
+    binary = index_gz + ranges
+    print(f'  쿼리: {", ".join(tickers)} ({len(tickers)}개, {len(entries):,} 티커 중)\n')
+    print(f'  {"":<28} {"raw":>10} {"전송(gzip)":>12}')
+    print(f'  {"corr_returns.json 전체":<28} {len(json_bytes) / 1024:9.1f}K {json_gz / 1024:11.1f}K')
+    print(f'  {"corr_returns_index.json":<28} {len(index_bytes) / 1024:9.1f}K {index_gz / 1024:11.1f}K')
+    print(f'  {"Range 응답 합계":<28} {ranges / 1024:9.1f}K {ranges / 1024:11.1f}K')
+    print(f'  {"바이너리 합계":<28} {"":>10} {binary / 1024:11.1f}K  ({json_gz / binary:.0f}x 감소)')
+    print(f'  {"(인덱스 캐시 후 추가 티커)":<28} {"":>10} {ranges / len(tickers) / 1024:11.2f}K / 티커')
+    print(f'\n  python read_binary: {read_ms:.2f}ms')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+가격 이력 LTTB: 티커 전체 벡터화 (src/downsample.lttb_indices) vs 티커별 파이썬 루프
+
+합성 일별 종가(로그 랜덤워크, 티커마다 상장일이 다름)를 build_etf_pages 와 같은 점 예산으로 줄이는
+시간을 비교하고, 루프로 돈 티커들의 선택 점이 같은지 확인한다.
+루프는 --loop-tickers 개만 돌리고 전체 티커 수로 환산.
+
+실행 방법:
+    python benchmarks/bench_downsample.py                       # 1,650 티커 × 20년 일별
+    python benchmarks/bench_downsample.py --tickers 5000 --budget 120
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'src'))
+
+from downsample import HISTORY_WEEKLY_POINTS
+from downsample import lttb_indices
+
+
+def synthetic_prices(days, tickers, seed):
+    rng = np.random.default_rng(seed)
+    values = 100 * np.exp(np.cumsum(rng.normal(0, 0.012, (days, tickers)), axis=0))
+    start = rng.integers(0, days - 300, tickers)
+    start[: tickers // 3] = 0
+    values[np.arange(days)[:, None] < start] = np.nan
+    return values
+
+
+def lttb_loop(y, budget):
+    """한 티커 LTTB (정의 그대로) → 선택 행 번호"""
+    n = len(y)
+    if n <= budget:
+        return list(range(n))
+    every = (n - 2) / (budget - 2)
+    a, out = 0, [0]
+    for i in range(budget - 2):
+        lo, hi = int(i * every) + 1, int((i + 1) * every) + 1
+        nxt = min(int((i + 2) * every) + 1, n)
+        avg_x, avg_y = (hi + nxt - 1) / 2, y[hi:nxt].mean()
+        best, a_next = -1.0, lo
+        for j in range(lo, hi):
+            area = abs((a - avg_x) * (y[j] - y[a]) - (a - j) * (avg_y - y[a]))
+            if area > best:
+                best, a_next = area, j
+        a = a_next
+        out.append(a)
+    return out + [n - 1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='LTTB 벡터화 vs 루프')
+    parser.add_argument('--tickers', type=int, default=1650)
+    parser.add_argument('--days', type=int, default=5040)
+    parser.add_argument('--budget', type=int, default=HISTORY_WEEKLY_POINTS)
+    parser.add_argument('--loop-tickers', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    values = synthetic_prices(args.days, args.tickers, args.seed)
+    t0 = time.perf_counter()
+    picks = lttb_indices(values, args.budget)
+    vec = time.perf_counter() - t0
+
+    sample = range(min(args.loop_tickers, args.tickers))
+    t0 = time.perf_counter()
+    same = True
+    for j in sample:
+        first = int(np.argmax(~np.isnan(values[:, j])))
+        got = [first + i for i in lttb_loop(values[first:, j], args.budget)]
+        same &= got == picks[j][picks[j] >= 0].tolist()
+    loop = (time.perf_counter() - t0) * args.tickers / len(sample)
+
+    print(f'  {args.tickers:,} 티커 × {args.days:,}일 → {args.budget}점')
+    print(f'  벡터화 {vec:8.2f}s')
+    print(f'  루프   {loop:8.2f}s  ({len(sample)}티커 측정 후 환산, {loop / vec:.0f}x)  일치 {"✓" if same else "✗"}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
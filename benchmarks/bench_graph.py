@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+그래프 엣지 추출: 행 블록 상삼각 스캔 vs 이전 방식 (float32 사본 + 전체 triu_indices)
+
+합성 상관행렬(섹터 팩터 모형, 120개월)에서 r >= STORE_MIN_R 쌍을 뽑는 시간과
+추출 중 추가 할당 최대치(tracemalloc — numpy 배열 포함)를 노드 수별로 비교하고 결과 일치를 확인한다.
+입력 행렬(N×N float64) 자체는 두 방식 모두 이미 메모리에 있으므로 제외.
+--layout: 임계값별 사전 배치(compute_layouts) 시간 · 추가 메모리도 측정 (노드 수² 에 비례하므로 큰 N 은 오래 걸림).
+--bytes: 첫 화면(r >= DEFAULT_VIEW_R) 엣지 전송량 — 이전 graph_data.json links 전체 vs 필요한 구간 파일 (raw · gzip).
+
+실행 방법:
+    python benchmarks/bench_graph.py                    # 1,650 · 10,000 노드
+    python benchmarks/bench_graph.py --sizes 1650,5000 --block 512
+    python benchmarks/bench_graph.py --sizes 1650,3000 --layout
+    python benchmarks/bench_graph.py --sizes 1650 --bytes
+"""
+
+import argparse
+import gzip
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from build_graph import (DEFAULT_VIEW_R, EDGE_BLOCK_ROWS, LAYOUT_LEVELS, STORE_MIN_R, compute_layouts,
+                         extract_edges, write_edge_bands)
+
+
+def synthetic_corr(n, seed, months=120, sectors=24, return_sectors=False):
+    """섹터 팩터 + 시장 팩터 모형 월간 수익률의 상관행렬 (N×N float64) — return_sectors 면 (행렬, 섹터 번호)"""
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0, 1, (months, 1))
+    factors = rng.normal(0, 1, (months, sectors))
+    sector = rng.integers(0, sectors, n)
+    beta = rng.uniform(0.2, 1.0, n)
+    load = rng.uniform(0.3, 1.5, n)
+    x = market * beta + factors[:, sector] * load + rng.normal(0, 0.6, (months, n))
+    corr = np.corrcoef(x, rowvar=False)
+    return (corr, sector) if return_sectors else corr
+
+
+def extract_edges_legacy(values, min_r):
+    """이전 build_graph.py 방식"""
+    arr = values.astype(np.float32)
+    np.fill_diagonal(arr, np.nan)
+    ri, ci = np.triu_indices(len(arr), k=1)
+    rv = arr[ri, ci]
+    mask = (rv >= min_r) & ~np.isnan(rv)
+    return ri[mask], ci[mask], rv[mask]
+
+
+def edge_bytes(ri, ci, rv):
+    """(이전 links JSON, 첫 화면 구간 파일 합, 전체 구간 파일 합) 각각 (raw, gzip) 바이트"""
+    def sizes(data):
+        return len(data), len(gzip.compress(data, compresslevel=9, mtime=0))
+
+    links = [{'s': f'T{i:04d}', 't': f'T{j:04d}', 'r': round(float(r), 3)}
+             for i, j, r in zip(ri.tolist(), ci.tolist(), rv.tolist())]
+    legacy = sizes(json.dumps(links, separators=(',', ':')).encode())
+    with tempfile.TemporaryDirectory() as tmp:
+        bands = write_edge_bands(ri, ci, rv, int(max(ri.max(), ci.max())) + 1, out_dir=tmp)
+        per_band = [(b['min'], sizes(Path(tmp, b['file']).read_bytes())) for b in bands]
+    default = tuple(sum(sz[k] for lo, sz in per_band if lo >= DEFAULT_VIEW_R) for k in (0, 1))
+    total = tuple(sum(sz[k] for _, sz in per_band) for k in (0, 1))
+    return legacy, default, total
+
+
+def measure(func, *args):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    out = func(*args)
+    seconds = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return out, seconds, peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='그래프 엣지 추출 시간·메모리 비교')
+    parser.add_argument('--sizes', type=lambda v: [int(s) for s in v.split(',') if s], default=[1650, 10_000])
+    parser.add_argument('--block', type=int, default=EDGE_BLOCK_ROWS)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--layout', action='store_true', help='사전 배치(compute_layouts) 시간도 측정')
+    parser.add_argument('--bytes', action='store_true', help='첫 화면 엣지 전송량 비교')
+    args = parser.parse_args(argv)
+
+    print(f'  r >= {STORE_MIN_R}, 블록 {args.block}행\n')
+    print(f'  {"nodes":>7} {"edges":>11}  {"legacy":>9} {"peak":>9}  {"blocked":>9} {"peak":>9}  {"일치":>4}')
+    for n in args.sizes:
+        corr = synthetic_corr(n, args.seed)
+        old, old_s, old_peak = measure(extract_edges_legacy, corr, STORE_MIN_R)
+        new, new_s, new_peak = measure(extract_edges, corr, STORE_MIN_R, args.block)
+        same = all(np.array_equal(a, b) for a, b in zip(old[:2], new[:2]))
+        print(f'  {n:>7,} {len(new[0]):>11,}  {old_s:>8.2f}s {old_peak / 2**20:>7,.0f}MB  '
+              f'{new_s:>8.2f}s {new_peak / 2**20:>7,.1f}MB  {"✓" if same else "✗":>4}')
+        del corr, old, new
+
+    if args.layout:
+        print(f'\n  사전 배치: 임계값 {", ".join(f"{v:.2f}" for v in LAYOUT_LEVELS)}\n')
+        print(f'  {"nodes":>7} {"edges":>11}  {"layout":>9} {"peak":>9}')
+        for n in args.sizes:
+            corr, sector = synthetic_corr(n, args.seed, return_sectors=True)
+            ri, ci, rv = extract_edges(corr, STORE_MIN_R, args.block)
+            del corr
+            _, seconds, peak = measure(compute_layouts, sector, ri, ci, rv)
+            print(f'  {n:>7,} {len(ri):>11,}  {seconds:>8.2f}s {peak / 2**20:>7,.1f}MB')
+
+    if args.bytes:
+        print(f'\n  엣지 전송량 (KB, raw / gzip) — 첫 화면 r >= {DEFAULT_VIEW_R}\n')
+        print(f'  {"nodes":>7} {"edges":>11}  {"links JSON":>15}  {"첫 화면 구간":>15}  {"전체 구간":>15}')
+        for n in args.sizes:
+            ri, ci, rv = extract_edges(synthetic_corr(n, args.seed), STORE_MIN_R, args.block)
+            legacy, default, total = edge_bytes(ri, ci, rv)
+            print(f'  {n:>7,} {len(ri):>11,}  ' + '  '.join(
+                f'{raw / 1024:>7,.0f} /{gz / 1024:>6,.0f}' for raw, gz in (legacy, default, total)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
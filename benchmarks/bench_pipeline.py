@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+CORRYU ETF 파이프라인 벤치마크 (합성 유니버스)
+
+실제 parquet·네트워크 없이 src/synthetic.py 가 만든 결정적 가격·메타로
+compute_all 의 계산 함수와 build_* 작성기를 티커 수별로 측정한다.
+
+실행 방법:
+    python benchmarks/bench_pipeline.py                          # 1k · 5k · 20k
+    python benchmarks/bench_pipeline.py --sizes 1000 --days 1260
+    python benchmarks/bench_pipeline.py --check                  # baseline.json 대비 회귀 검사
+    python benchmarks/bench_pipeline.py --sizes 1000 --update-baseline
+
+결과: benchmarks/results/bench_<시각>.json (+ latest.json)
+회귀 기준: 측정값 > 기준값 × (1 + --tolerance) 이고 차이가 --min-delta 초 이상이면 실패 (exit 1)
+기준값은 측정한 머신에 종속 — baseline.json 의 machine 항목과 다른 환경이면 경고만 출력.
+
+N×N 상관계수 행렬이 메모리에 안 들어가는 크기는 상관행렬이 필요한 단계를 'skipped' 로 기록
+(가격만 쓰는 compute_perf_stats · build_backtest_data · build_backtest_monthly · build_return_index · build_corr_data 는 그대로 측정).
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'src'))
+sys.path.insert(0, str(ROOT / 'scripts'))
+sys.path.insert(0, str(ROOT))
+
+from synthetic import make_universe
+from data_loader import (
+    compute_perf_stats, compute_corr_monthly, compute_corr_daily, get_all_tickers,
+)
+from classify import (
+    classify_all, get_sector_members, fill_anchor_correlations, fill_super_anchor_correlations,
+)
+from legacy import assess_all_legacy
+from ticker_index import TickerIndex
+import compute_all
+import build_etf_pages
+import build_backtest_data
+import build_backtest_monthly
+import build_return_index
+import build_corr_data
+import render_html
+
+BENCH_DIR     = ROOT / 'benchmarks'
+RESULTS_DIR   = BENCH_DIR / 'results'
+BASELINE_PATH = BENCH_DIR / 'baseline.json'
+
+DEFAULT_SIZES = (1000, 5000, 20000)
+
+
+def machine_info():
+    return {
+        'platform': platform.platform(),
+        'python':   platform.python_version(),
+        'cpus':     os.cpu_count(),
+        'numpy':    np.__version__,
+        'pandas':   pd.__version__,
+    }
+
+
+def available_memory():
+    """사용 가능 물리 메모리 (bytes, 알 수 없으면 무제한 취급)"""
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (ValueError, OSError, AttributeError):
+        return float('inf')
+
+
+def corr_fits(n):
+    """N×N float64 상관행렬 + pandas 내부 버퍼(약 3배)가 메모리에 들어가는가"""
+    return n * n * 8 * 3 < available_memory()
+
+
+class Timer:
+    """함수별 최소 소요 시간 기록 (출력은 억제)"""
+
+    def __init__(self, repeat):
+        self.repeat = repeat
+        self.times = {}
+
+    def __call__(self, name, func, *args, **kwargs):
+        best = float('inf')
+        value = None
+        for _ in range(self.repeat):
+            with contextlib.redirect_stdout(io.StringIO()):
+                t0 = time.perf_counter()
+                value = func(*args, **kwargs)
+                best = min(best, time.perf_counter() - t0)
+        self.times[name] = round(best, 4)
+        print(f'    {name:<26} {best:9.3f}s')
+        return value
+
+    def skip(self, names, reason):
+        for name in names:
+            self.times[name] = 'skipped'
+            print(f'    {name:<26}   skipped ({reason})')
+
+
+# 상관행렬이 필요한 단계 (N×N 이 메모리에 안 들어가면 함께 건너뜀)
+CORR_STAGES = ('compute_corr_monthly', 'compute_corr_daily', 'classify_all', 'assess_all_legacy',
+               'build_all_etf_data', 'write_json', 'build_etf_pages', 'render_html')
+
+
+@contextlib.contextmanager
+def redirect_outputs():
+    """build_* 작성기의 출력 경로를 임시 디렉토리로 돌림 (output/ 은 건드리지 않음)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp)
+        with mock.patch.object(compute_all, 'ETF_DATA_PATH', str(out / 'etf_data.json')), \
+             mock.patch.object(compute_all, 'ETF_COLUMNAR_PATH', str(out / 'etf_data_columnar.json')), \
+             mock.patch.object(compute_all, 'ETF_SHARD_DIR', str(out / 'etf-shards')), \
+             mock.patch.object(compute_all, 'CLASSIFICATION_PATH', str(out / 'classification.json')), \
+             mock.patch.object(compute_all, 'OUTPUT_DIR', tmp), \
+             mock.patch.object(build_etf_pages, 'ETF_DIR', str(out / 'etf-data')), \
+             mock.patch.object(build_etf_pages, 'HOLDINGS_PATH', str(out / 'holdings.json')), \
+             mock.patch.object(build_backtest_data, 'OUT_PATH', out / 'backtest_data.json'), \
+             mock.patch.object(build_backtest_monthly, 'OUT_DIR', out / 'bt-monthly'), \
+             mock.patch.object(build_return_index, 'OUT_DIR', out), \
+             mock.patch.object(build_corr_data, 'OUT_PATH', out / 'corr_returns.json'), \
+             mock.patch.object(build_corr_data, 'BIN_PATH', out / 'corr_returns.bin'), \
+             mock.patch.object(build_corr_data, 'INDEX_PATH', out / 'corr_returns_index.json'), \
+             mock.patch.object(render_html, 'OUTPUT_DIR', tmp):
+            yield out
+
+
+def bench_size(n, days, seed, repeat):
+    """티커 n개 유니버스에서 단계별 시간 측정 → {name: 초 | 'skipped'}"""
+    print(f'\n  [{n:,} tickers × {days:,} days]')
+    timer = Timer(repeat)
+    u = timer('generate', make_universe, n, days, seed)
+    df = u.df_price
+    index = TickerIndex.from_price(df)
+
+    perf = timer('compute_perf_stats', compute_perf_stats, df)
+    with redirect_outputs():
+        timer('build_backtest_data', build_backtest_data.build_backtest_data, df)
+        timer('build_backtest_monthly', build_backtest_monthly.build_backtest_monthly, df)
+        timer('build_return_index', build_return_index.build_return_index, df)
+        timer('build_corr_data', build_corr_data.build_corr_data, df)
+    if not corr_fits(df.shape[1]):
+        timer.skip(CORR_STAGES, 'N×N 상관행렬 메모리 부족')
+        return timer.times
+
+    corr_m = timer('compute_corr_monthly', compute_corr_monthly, df)
+    corr_d = timer('compute_corr_daily', compute_corr_daily, df)
+    classification = timer('classify_all', classify_all, get_all_tickers(corr_d), u.scraped,
+                           corr_m, corr_d, ticker_index=index)
+    members = get_sector_members(classification)
+    with contextlib.redirect_stdout(io.StringIO()):
+        fill_anchor_correlations(classification, members, corr_m, corr_d)
+        fill_super_anchor_correlations(classification, corr_m, corr_d)
+
+    legacy = timer('assess_all_legacy', assess_all_legacy, members, classification,
+                   corr_m, corr_d, u.scraped, perf, df, ticker_index=index)
+    all_data = timer('build_all_etf_data', compute_all.build_all_etf_data,
+                     members, classification, legacy, df, perf, u.scraped, corr_m, corr_d,
+                     u.expense_ratios, u.dividend_yields, ticker_index=index)
+    ranks = timer('compute_metric_ranks', compute_all.compute_metric_ranks, all_data)
+    metrics = {
+        'as_of':        df.index[-1].strftime('%Y-%m-%d'),
+        'all_etf_data': all_data,
+        'sector_meta':  compute_all.build_sector_meta(members, all_data, ranks),
+        'ranks':        ranks,
+    }
+    with redirect_outputs():
+        timer('write_json', compute_all.stage_write_json, metrics, classification, legacy)
+        timer('build_etf_pages', build_etf_pages.build_etf_pages, all_data, metrics['as_of'])
+        timer('render_html', render_html.render, metrics['sector_meta'])
+    return timer.times
+
+
+# ── 회귀 검사 ────────────────────────────────────────────────────────
+
+def check_regressions(result, baseline, tolerance, min_delta):
+    """baseline 대비 느려진 항목 목록 [(size, name, base, now)]"""
+    if baseline.get('machine') != result['machine']:
+        print('  [WARN] 기준값과 다른 머신 — 비교는 참고용')
+
+    regressions = []
+    print(f'\n  {"size":>6} {"function":<26} {"baseline":>9} {"now":>9} {"ratio":>7}')
+    for size, base_times in baseline.get('sizes', {}).items():
+        now_times = result['sizes'].get(size, {})
+        for name, base in base_times.items():
+            now = now_times.get(name)
+            if not isinstance(base, float) or not isinstance(now, float):
+                continue
+            ratio = now / base if base > 0 else float('inf')
+            bad = now > base * (1 + tolerance) and now - base >= min_delta
+            flag = '  ← 회귀' if bad else ''
+            print(f'  {size:>6} {name:<26} {base:8.3f}s {now:8.3f}s {ratio:6.2f}x{flag}')
+            if bad:
+                regressions.append((size, name, base, now))
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='CORRYU 파이프라인 합성 유니버스 벤치마크')
+    parser.add_argument('--sizes', type=lambda v: [int(s) for s in v.split(',') if s],
+                        default=list(DEFAULT_SIZES), help='티커 수 (쉼표 구분, 기본 1000,5000,20000)')
+    parser.add_argument('--days', type=int, default=2520, help='거래일 수 (기본 2520 ≈ 10년)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=1, help='반복 측정 횟수 (최솟값 기록)')
+    parser.add_argument('--check', action='store_true', help='baseline.json 대비 회귀 검사')
+    parser.add_argument('--update-baseline', action='store_true', help='이번 결과를 baseline.json 으로 저장')
+    parser.add_argument('--tolerance', type=float, default=0.30, help='허용 감속 비율 (기본 0.30 = 30%%)')
+    parser.add_argument('--min-delta', type=float, default=0.05, help='무시할 절대 차이 (초)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    print('=' * 55)
+    print('CORRYU 파이프라인 벤치마크 (합성 유니버스)')
+    print('=' * 55)
+
+    result = {
+        'created_at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'machine':    machine_info(),
+        'params':     {'days': args.days, 'seed': args.seed, 'repeat': args.repeat},
+        'sizes':      {},
+    }
+    for n in args.sizes:
+        result['sizes'][str(n)] = bench_size(n, args.days, args.seed, args.repeat)
+
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    for path in (RESULTS_DIR / f'bench_{stamp}.json', RESULTS_DIR / 'latest.json'):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+    print(f'\n  결과: {RESULTS_DIR / f"bench_{stamp}.json"}')
+
+    if args.update_baseline:
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+            f.write('\n')
+        print(f'  기준값 갱신: {BASELINE_PATH}')
+
+    if args.check:
+        if not BASELINE_PATH.exists():
+            print(f'  [FAIL] 기준값 없음: {BASELINE_PATH} (--update-baseline 으로 생성)')
+            return 1
+        with open(BASELINE_PATH, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('params') != result['params']:
+            print(f'  [FAIL] 측정 조건이 기준값과 다름: {baseline.get("params")} ≠ {result["params"]}')
+            return 1
+        regressions = check_regressions(result, baseline, args.tolerance, args.min_delta)
+        if regressions:
+            print(f'\n  [FAIL] 성능 회귀 {len(regressions)}건')
+            return 1
+        print('\n  [OK] 회귀 없음')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+자동완성: 검색 인덱스 (search_index.json · search-index.js) vs etf_data.json 전체 선형 탐색 (acFilter 폴백)
+
+크기: 자동완성이 받아야 하는 파일 — search_index.json vs etf_data.json (원본 · gzip -9)
+조회: node 가 있으면 V8 에서 키 입력 한 번당 시간 (티커 접두어 1~3글자 · 이름 단어 검색어 섞어서)
+      인덱스는 파싱 + fromDoc 준비 시간도 따로
+
+실행 방법:
+    python benchmarks/bench_search.py                            # output/etf_data.json
+    python benchmarks/bench_search.py --input path/to/etf_data.json --repeat 20
+"""
+
+import argparse
+import gzip
+import json
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'src'))
+
+from search_index import SearchIndex, name_tokens
+
+SEARCH_JS = ROOT / 'output' / 'search-index.js'
+
+NODE_BENCH = r'''
+const fs = require('fs');
+const S = require(process.argv[1]);
+const etfData = fs.readFileSync(process.argv[2], 'utf8');
+const indexText = fs.readFileSync(process.argv[3], 'utf8');
+const queries = JSON.parse(fs.readFileSync(process.argv[4], 'utf8'));
+const repeat = +process.argv[5];
+// autocomplete.js acFilter 폴백과 같은 선형 탐색
+function scan(query, allData, max) {
+  var q = query.toUpperCase(), starts = [], contains = [], names = [], seen = {};
+  var entries = Object.values(allData);
+  for (var i = 0; i < entries.length; i++) {
+    var e = entries[i];
+    if (!e || !e.ticker || seen[e.ticker]) continue;
+    seen[e.ticker] = 1;
+    var t = e.ticker, n = e.name || '';
+    if (t.indexOf(q) === 0) starts.push({ ticker: t, name: n });
+    else if (t.indexOf(q) >= 0) contains.push({ ticker: t, name: n });
+    else if (n.toUpperCase().indexOf(q) >= 0) names.push({ ticker: t, name: n });
+  }
+  starts.sort(function (a, b) { return a.ticker.length - b.ticker.length; });
+  return starts.concat(contains).concat(names).slice(0, max);
+}
+function best(fn) {
+  let t = Infinity;
+  for (let i = 0; i < repeat; i++) { const t0 = process.hrtime.bigint(); fn(); t = Math.min(t, Number(process.hrtime.bigint() - t0) / 1e6); }
+  return t;
+}
+const raw = JSON.parse(etfData);
+const flat = {};
+Object.values(raw.allData).forEach(l => l.forEach(e => { flat[e.ticker] = e; }));
+const idx = S.fromDoc(JSON.parse(indexText));
+console.log(JSON.stringify({
+  etf_parse: best(() => JSON.parse(etfData)),
+  index_parse: best(() => S.fromDoc(JSON.parse(indexText))),
+  scan: best(() => queries.forEach(q => scan(q, flat, 8))) / queries.length,
+  index: best(() => queries.forEach(q => idx.query(q, 8))) / queries.length,
+}));
+'''
+
+
+def dumps(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def sizes(data):
+    return {'raw': len(data), 'gzip': len(gzip.compress(data, 9))}
+
+
+def sample_queries(index, n, seed):
+    """티커 앞 1~3글자 + 이름 단어 앞 3글자~전체 (키 입력 중간 상태)"""
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        ticker, name = rng.choice(index.etfs)
+        words = name_tokens(name)
+        if words and rng.random() < 0.5:
+            w = rng.choice(words)
+            out.append(w[:rng.randint(min(3, len(w)), len(w))].lower())
+        else:
+            out.append(ticker[:rng.randint(1, min(3, len(ticker)))])
+    return out
+
+
+def node_times(etf_bytes, index_bytes, queries, repeat):
+    """V8 파싱 · 키 입력당 조회 시간 (ms, node 없으면 None)"""
+    node = shutil.which('node')
+    if not node:
+        return None
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [Path(tmp) / n for n in ('etf.json', 'index.json', 'queries.json')]
+        for p, data in zip(paths, (etf_bytes, index_bytes, dumps(queries))):
+            p.write_bytes(data)
+        out = subprocess.run([node, '-e', NODE_BENCH, str(SEARCH_JS), *map(str, paths), str(repeat)],
+                             capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='자동완성 검색 인덱스 vs 선형 탐색')
+    parser.add_argument('--input', default=str(ROOT / 'output' / 'etf_data.json'))
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with open(args.input, encoding='utf-8') as f:
+        raw = json.load(f)
+    records = [e for etfs in raw['allData'].values() for e in etfs]
+    index = SearchIndex.build(records)
+    etf_bytes = dumps(raw)
+    index_bytes = dumps(index.to_doc(raw.get('as_of', '')))
+    print(f'  입력: {args.input} ({len(index.etfs):,} 티커, 이름 n-gram {len(index.grams):,}개)\n')
+
+    es, xs = sizes(etf_bytes), sizes(index_bytes)
+    print(f'  {"크기":<10} {"etf_data":>10} {"index":>10} {"비율":>7}')
+    for k in es:
+        print(f'  {k:<10} {es[k] / 1024:9.1f}K {xs[k] / 1024:9.1f}K {xs[k] / es[k]:6.2f}x')
+
+    queries = sample_queries(index, args.queries, args.seed)
+    node = node_times(etf_bytes, index_bytes, queries, args.repeat)
+    if node is None:
+        print('\n  (node 없음 — V8 측정 생략)')
+        return 0
+    print(f'\n  {"node (ms)":<26} {"etf_data":>9} {"index":>9}')
+    print(f'  {"파싱 (+ fromDoc)":<26} {node["etf_parse"]:9.2f} {node["index_parse"]:9.2f}')
+    print(f'  {"키 입력당 조회":<26} {node["scan"]:9.4f} {node["index"]:9.4f}'
+          f'  ({node["scan"] / node["index"]:.0f}x, 검색어 {len(queries)}개)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,215 @@
+"""build_assets.py — JSON 산출물 사전 압축 + 내용 해시 파일명
+
+output/{name}.json → output/assets/{name}.{hash}.json (+ .gz, .br)
+
+- 해시 파일명은 내용이 바뀌면 이름도 바뀌므로 1년 immutable 캐시 가능 (vercel.json headers)
+- .gz(gzip -9) · .br(brotli 11)을 미리 만들어 요청마다 압축하지 않음
+  (brotli 모듈이 없으면 .br 생략)
+- 배포 빌드(vercel.json buildCommand, --rewrite-pages)에서만 output/*.html · output/*.js 의 '/{name}.json' 참조를
+  해시 경로로 치환 (다시 실행해도 같은 결과) — 버려지는 배포 체크아웃이라 원본 페이지는 저장소에서 바뀌지 않음
+  compute_all 은 치환하지 않음 (index.html 은 render_html.generate_html(assets=...) 가 생성 시점에 같은 치환 적용)
+- output/assets/ 는 커밋하지 않음 — 커밋된 원본 산출물로 배포 빌드가 같은 해시 이름을 다시 만듦
+- 직전 세대(내용이 달랐던 마지막 빌드)의 해시 사본은 한 세대 더 유지 (manifest.prev.json) — 이전 HTML 을 들고 있는
+  브라우저·CDN 이 404 를 받지 않게. 그보다 오래됐거나 모르는 해시는 404 — 현재 내용을 옛 해시 이름으로 돌려주면
+  immutable 캐시에 잘못된 내용이 1년간 고정되므로 폴백 rewrite 는 두지 않음
+- 원래 이름의 파일은 그대로 둠 (build_etf_pages · --daily-fast · 외부 소비자 호환)
+- 바이너리(corr_returns.bin · return_index_monthly.bin)는 해시 이름만 — Range 요청으로 부분 전송하므로 사전 압축하지 않음
+
+압축은 파일별로 스레드 풀에서 병렬 실행 (zlib·brotli 는 GIL 을 놓음).
+
+Usage:
+    python3 build_assets.py                    # 해시 사본 · 압축본 · 매니페스트만
+    python3 build_assets.py --rewrite-pages    # + 페이지 참조 치환 (배포 빌드)
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ROOT = Path(__file__).parent
+sys.path.insert(0, str(ROOT / 'src'))
+from serialize import write_json
+
+OUTPUT_DIR = ROOT / 'output'
+ASSETS_DIR = OUTPUT_DIR / 'assets'
+MANIFEST_PATH = ASSETS_DIR / 'manifest.json'
+PREVIOUS_PATH = ASSETS_DIR / 'manifest.prev.json'   # 직전 세대 (정리 시 함께 유지)
+VERCEL_JSON = ROOT / 'vercel.json'
+
+ARTIFACTS = (
+    'etf_data.json', 'etf_data_columnar.json', 'backtest_data.json',
+    'classification.json', 'corr_returns.json', 'graph_data.json',
+    'corr_returns_index.json', 'corr_returns.bin',
+    'return_index_monthly.json', 'return_index_monthly.bin', 'search_index.json', 'screener_ranks.json',
+)
+COMPRESSIBLE = ('.json',)
+URL_PREFIX = '/assets/'
+HASH_LEN = 10
+IMMUTABLE_HEADER = {
+    'source': '/assets/(.*)',
+    'headers': [{'key': 'Cache-Control', 'value': 'public, max-age=31536000, immutable'}],
+}
+
+
+def hashed_name(name, data):
+    stem, ext = os.path.splitext(name)
+    return f'{stem}.{hashlib.sha256(data).hexdigest()[:HASH_LEN]}{ext}'
+
+
+def _write(path, data):
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def compress(path):
+    """path 와 그 .gz · .br 작성 → {variant: bytes} (이미 있으면 건너뜀 — 해시 이름이라 내용 동일)"""
+    sizes = {'raw': path.stat().st_size}
+    if path.suffix not in COMPRESSIBLE:
+        return sizes
+    data = None
+    for suffix, func in (('', None),
+                         ('.gz', lambda d: gzip.compress(d, compresslevel=9, mtime=0)),
+                         ('.br', (lambda d: brotli.compress(d, quality=11)) if brotli else None)):
+        if suffix and func is None:
+            continue
+        out = path.with_name(path.name + suffix)
+        if not out.exists():
+            if data is None:
+                data = path.read_bytes()
+            _write(out, data if func is None else func(data))
+        sizes[suffix or 'raw'] = out.stat().st_size
+    return sizes
+
+
+def ref_pattern(name):
+    """'/{stem}.json', '{stem}.json', '/assets/{stem}.{hash}.json' 를 모두 잡는 따옴표 포함 패턴"""
+    stem, ext = os.path.splitext(name)
+    return re.compile(r'''(['"`])/?(?:assets/)?%s(?:\.[0-9a-f]{%d})?%s(?=['"`?#])'''
+                      % (re.escape(stem), HASH_LEN, re.escape(ext)))
+
+
+def rewrite_refs(text, assets):
+    """text 안의 산출물 참조를 assets {'/{name}': '/assets/{hashed}'} 경로로 치환"""
+    for src, dst in assets.items():
+        text = ref_pattern(src.lstrip('/')).sub(lambda m: m.group(1) + dst, text)
+    return text
+
+
+def rewrite_pages(assets, skip=()):
+    """output/*.html · *.js 참조 치환 → 바뀐 파일 이름 목록"""
+    changed = []
+    for path in sorted(list(OUTPUT_DIR.glob('*.html')) + list(OUTPUT_DIR.glob('*.js'))):
+        if path.name in skip:
+            continue
+        text = path.read_text(encoding='utf-8')
+        new = rewrite_refs(text, assets)
+        if new != text:
+            path.write_text(new, encoding='utf-8')
+            changed.append(path.name)
+    return changed
+
+
+def ensure_cache_headers():
+    """vercel.json 에 /assets/ immutable 헤더가 없으면 추가 → 변경 여부"""
+    if not VERCEL_JSON.exists():
+        return False
+    config = json.loads(VERCEL_JSON.read_text(encoding='utf-8'))
+    headers = config.setdefault('headers', [])
+    if IMMUTABLE_HEADER in headers:
+        return False
+    headers[:] = [h for h in headers if h.get('source') != IMMUTABLE_HEADER['source']] + [IMMUTABLE_HEADER]
+    VERCEL_JSON.write_text(json.dumps(config, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+    return True
+
+
+def _load_mapping(path):
+    try:
+        mapping = json.loads(path.read_text(encoding='utf-8'))
+        return mapping if isinstance(mapping, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def build_assets(rewrite=False):
+    """해시 사본·압축본·매니페스트 작성 → {'/{name}': '/assets/{hashed}'} (render_html 에 전달)
+
+    rewrite: output/*.html · *.js 참조 치환 (배포 빌드에서만)
+    """
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] 사전 압축·해시 파일명 생성 시작")
+    os.makedirs(ASSETS_DIR, exist_ok=True)
+
+    assets, targets = {}, []
+    for name in ARTIFACTS:
+        src = OUTPUT_DIR / name
+        if not src.exists():
+            continue
+        data = src.read_bytes()
+        dst = ASSETS_DIR / hashed_name(name, data)
+        if not dst.exists():
+            _write(dst, data)
+        assets[f'/{name}'] = URL_PREFIX + dst.name
+        targets.append(dst)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(len(targets), os.cpu_count() or 1))) as pool:
+        sizes = dict(zip(targets, pool.map(compress, targets)))
+
+    # 직전 세대 = 이번과 내용이 달랐던 마지막 매니페스트 (같은 내용 재빌드로 밀려나지 않게)
+    current = _load_mapping(MANIFEST_PATH)
+    previous = current if current and current != assets else _load_mapping(PREVIOUS_PATH)
+    previous = {k: v for k, v in previous.items() if v not in assets.values()}
+
+    # 이번 빌드 · 직전 세대 어디에도 없는 해시 사본 삭제
+    names = {url[len(URL_PREFIX):] for url in list(assets.values()) + list(previous.values())}
+    keep = {n + suffix for n in names for suffix in ('', '.gz', '.br')}
+    keep |= {MANIFEST_PATH.name, PREVIOUS_PATH.name}
+    for path in ASSETS_DIR.iterdir():
+        if path.name not in keep:
+            path.unlink()
+
+    write_json(MANIFEST_PATH, assets, indent=True, quiet=True)
+    if previous:
+        write_json(PREVIOUS_PATH, previous, indent=True, quiet=True)
+    elif PREVIOUS_PATH.exists():
+        PREVIOUS_PATH.unlink()
+    for t in targets:
+        s = sizes[t]
+        gz = f" → gz {s['.gz'] / 1024:,.0f}KB" if '.gz' in s else ' (압축 안 함)'
+        br = f" · br {s['.br'] / 1024:,.0f}KB" if '.br' in s else ''
+        print(f"  {t.name:<40} {s['raw'] / 1024:8,.0f}KB{gz}{br}")
+    if brotli is None:
+        print('  brotli 모듈 없음 — .br 생략 (pip install brotli)')
+
+    if rewrite:
+        pages = rewrite_pages(assets)
+        if pages:
+            print(f"  참조 치환: {', '.join(pages)}")
+        if ensure_cache_headers():
+            print(f'  vercel.json: {IMMUTABLE_HEADER["source"]} immutable 헤더 추가')
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] 완료: {len(assets)}개 → output/assets/"
+          f"{f' (직전 세대 {len(previous)}개 유지)' if previous else ''}")
+    return assets
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='JSON 산출물 사전 압축 + 내용 해시 파일명')
+    parser.add_argument('--rewrite-pages', action='store_true',
+                        help='output/*.html · *.js 참조를 해시 경로로 치환 (배포 빌드 전용 — 원본 페이지를 고쳐 씀)')
+    args = parser.parse_args(argv)
+    return build_assets(rewrite=args.rewrite_pages)
+
+
+if __name__ == '__main__':
+    assets = main()
+    sys.exit(0 if assets else 1)
@@ -2,59 +2,113 @@
 """
 백테스트용 연도별 실제 수익률 데이터 생성
 raw/prices_close.parquet → output/backtest_data.json
+(compute_all 에서는 연말 리샘플을 메모리로 넘겨받아 parquet 재로드 생략)
 
-출력 형식:
-  { "SPY": {"2005": 0.0490, "2006": 0.1561, ...}, ... }
+출력 형식 (backtest-v2):
+  {
+    "format": "backtest-v2",
+    "last_year": 2025,
+    "returns": {"SPY": [2005, [0.049, 0.1561, ...]], ...}   // [첫 연도, 연속 수익률 (계산 불가 null)]
+  }
+  이전 형식 { "SPY": {"2005": 0.0490, ...}, ... } 은 티커마다 연도 키를 반복해 크기가 2배 이상.
+  backtest.js 는 두 형식 모두 읽음.
 
 - 연말 마지막 거래일 종가 기준 연도별 수익률
 - 상장 첫 해(수익률 계산 불가한 연도)는 제외
+- 종가가 없는 연도(중간 결측 · 상장폐지 이후)는 직전 연말 종가를 이어 씀 → 수익률 0, 다음 해는 마지막 종가 대비
+  (이전 pct_change() 기본 fill_method='pad' 와 같음 — pandas 버전과 무관하게 명시)
 - 마지막 연도: 데이터에 존재하는 가장 최근 완전한 연도 (당해 연도 미포함)
+- 수익률·반올림·구간 자르기는 전 티커 행렬 단위 (src/packed.py)
+
+--binary: 같은 구간을 float32 로 이어 붙인 backtest_data.bin + backtest_data_index.json
+         {"last_year", "decimals", "tickers": {"SPY": [byte_offset, first_year, length]}} 도 기록
+
+Usage:
+    python3 build_backtest_data.py [--binary]
 """
-import json
-import pandas as pd
+import argparse
+import sys
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
+
 ROOT = Path(__file__).parent
+sys.path.insert(0, str(ROOT / 'src'))
+from packed import iter_slices, pack_slices, trim_bounds
+from serialize import to_list, write_atomic, write_json
+
+PRICES_PARQUET = ROOT / 'raw' / 'prices_close.parquet'
+OUT_PATH = ROOT / 'output' / 'backtest_data.json'
+BIN_PATH = ROOT / 'output' / 'backtest_data.bin'
+INDEX_PATH = ROOT / 'output' / 'backtest_data_index.json'
 
+FORMAT = 'backtest-v2'
+BIN_FORMAT = 'backtest-bin-v1'
+BIN_DTYPE = np.dtype('<f4')
+DECIMALS = 6
 
-def build_backtest_data():
-    df = pd.read_parquet(ROOT / 'raw' / 'prices_close.parquet')
-    df.index = pd.to_datetime(df.index)
+
+def annual_returns(df_price=None, yearly=None):
+    """연말 종가 → (연도 배열, 연간 수익률 행렬 (반올림), 티커 Index) — 당해 연도 제외"""
+    if yearly is None:
+        if df_price is None:
+            df_price = pd.read_parquet(PRICES_PARQUET)
+        df = df_price.copy(deep=False)
+        df.index = pd.to_datetime(df.index)
+        # 연말 마지막 거래일 종가
+        yearly = df.resample('YE').last()
 
     # 현재 연도는 미완성 → 직전 연도까지만 포함
     current_year = pd.Timestamp.now().year
-    df = df[df.index.year < current_year]
-
-    # 연말 마지막 거래일 종가
-    yearly = df.resample('YE').last()
-
-    # 연도별 수익률 (전년도 말 → 당해 연도 말)
-    annual_ret = yearly.pct_change()
-
-    result = {}
-    for ticker in annual_ret.columns:
-        series = annual_ret[ticker].dropna()
-        if series.empty:
-            continue
-        returns = {
-            str(dt.year): round(float(ret), 6)
-            for dt, ret in series.items()
-            if pd.notna(ret)
-        }
-        if returns:
-            result[ticker] = returns
-
-    out_path = ROOT / 'output' / 'backtest_data.json'
-    with open(out_path, 'w') as f:
-        json.dump(result, f, separators=(',', ':'))
-
-    size_kb = out_path.stat().st_size // 1024
-    print(f'✅ backtest_data.json: {len(result)}개 티커, {size_kb}KB → {out_path}')
-    return len(result)
-
-
-def main():
-    return build_backtest_data()
+    yearly = yearly[yearly.index.year < current_year]
+
+    # 연도별 수익률 (전년도 말 → 당해 연도 말) — 행렬 한 번에
+    prices = yearly.ffill().to_numpy(dtype=float)
+    values = np.full_like(prices, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values[1:] = prices[1:] / prices[:-1] - 1
+    values[~np.isfinite(values)] = np.nan
+    return np.asarray(yearly.index.year), np.round(values, DECIMALS), yearly.columns
+
+
+def build_backtest_data(df_price=None, yearly=None, binary=False):
+    """df_price: 일별 종가 (없으면 parquet 로드), yearly: 연말 종가 리샘플 (있으면 재사용)"""
+    years, values, tickers = annual_returns(df_price, yearly)
+    first, last, has_any = trim_bounds(values)
+
+    returns = {tickers[j]: [int(years[start]), to_list(vals)]
+               for j, start, vals in iter_slices(values, first, last, has_any)}
+    last_year = int(years[last[has_any]].max()) if has_any.any() else None
+    write_json(OUT_PATH, {'format': FORMAT, 'last_year': last_year, 'returns': returns})
+    if binary:
+        write_binary(years, values, tickers, first, last, has_any, last_year)
+
+    size_kb = OUT_PATH.stat().st_size // 1024
+    print(f'✅ backtest_data.json: {len(returns)}개 티커, {size_kb}KB → {OUT_PATH}')
+    return len(returns)
+
+
+def write_binary(years, values, tickers, first, last, has_any, last_year):
+    """JSON 과 같은 구간을 float32 로 이어 붙여 .bin + 인덱스 기록"""
+    flat, cols, offsets, lengths = pack_slices(values, first, last, has_any, BIN_DTYPE)
+    write_atomic(BIN_PATH, flat.tobytes())
+    write_json(INDEX_PATH, {
+        'format': BIN_FORMAT,
+        'dtype': 'float32',
+        'decimals': DECIMALS,
+        'last_year': last_year,
+        'bytes': int(flat.nbytes),
+        'tickers': {tickers[j]: [int(o) * BIN_DTYPE.itemsize, int(years[first[j]]), int(n)]
+                    for j, o, n in zip(cols, offsets, lengths)},
+    })
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='백테스트용 연도별 수익률 JSON 생성')
+    parser.add_argument('--binary', action='store_true', help='float32 .bin + 인덱스도 기록')
+    args = parser.parse_args(argv)
+    return build_backtest_data(binary=args.binary)
 
 
 if __name__ == '__main__':
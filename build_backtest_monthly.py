@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""build_backtest_monthly.py — 백테스트용 월간 총수익률 (티커별 int16 청크)
+
+raw/prices_close.parquet → output/bt-monthly/{TICKER}.bin + _manifest.json
+
+수정종가(배당·분할 반영) 월말 리샘플 = build_corr_data 와 같은 월간 수익률.
+backtest.js 는 포트폴리오에 담긴 티커의 파일만 받아 월 단위로 시뮬레이션합니다
+(연간 수익률의 12등분 근사 대신 실제 월 수익률 · 월 리밸런싱 · 월 적립).
+
+파일 포맷 (bt-monthly-v1, little-endian):
+  int32   start   첫 달 = 연 * 12 + (월 - 1)
+  float32 scale   수익률 = int16 값 × scale  (티커별: 최대 |수익률| / 32767)
+  int32   length  달 수
+  int16 × length  스케일된 월 수익률, 결측은 -32768
+→ 20년 이력 ≈ 0.5KB, 10개 티커 ≈ 5KB (인덱스 없이 티커 이름으로 바로 요청)
+
+- 진행 중인 달은 제외 (마지막 거래일이 월말 영업일이 아니면) — 파일은 월 1회만 바뀜
+- 수익률·양자화·구간 자르기는 전 티커 행렬 단위 한 번 (src/packed.py 의 청크 포맷), 파일 기록만 티커별
+- 내용 해시가 바뀐 파일만 다시 씀 (serialize.write_changed — etf-data 와 같은 매니페스트)
+
+Usage:
+    python3 build_backtest_monthly.py
+"""
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).parent
+sys.path.insert(0, str(ROOT / 'src'))
+from packed import encode_chunk, pack_slices, quantize, trim_bounds
+from serialize import load_manifest, write_changed, write_json, MANIFEST_NAME
+
+PRICES_PARQUET = ROOT / 'raw' / 'prices_close.parquet'
+OUT_DIR = ROOT / 'output' / 'bt-monthly'
+URL_PREFIX = '/bt-monthly/'
+
+FORMAT = 'bt-monthly-v1'
+EXT = '.bin'
+
+
+def month_index(ts):
+    return ts.year * 12 + ts.month - 1
+
+
+def monthly_returns(df_price=None, monthly=None):
+    """월말 종가 → (첫 행의 month_index, 월간 수익률 행렬, 티커 Index) — 진행 중인 달 제외"""
+    df = df_price if df_price is not None else pd.read_parquet(PRICES_PARQUET)
+    if monthly is None:
+        monthly = df.resample('ME').last()
+    last_day = df.index[-1]
+    if last_day != last_day + pd.offsets.BMonthEnd(0):
+        monthly = monthly[monthly.index < last_day.to_period('M').to_timestamp()]
+
+    prices = monthly.to_numpy(dtype=float)
+    values = np.full_like(prices, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values[1:] = prices[1:] / prices[:-1] - 1
+    values[~np.isfinite(values)] = np.nan
+    return month_index(monthly.index[0]), values, monthly.columns
+
+
+def encode(df_price=None, monthly=None):
+    """→ ({ticker: 파일 바이트}, 마지막 달 'YYYY-MM')"""
+    base, values, tickers = monthly_returns(df_price, monthly)
+    first, last, has_any = trim_bounds(values)
+    q, scale = quantize(values)
+    flat, cols, offsets, lengths = pack_slices(q, first, last, has_any, '<i2')
+    files = {
+        tickers[j]: encode_chunk(base + int(first[j]), float(scale[j]), flat[o:o + n])
+        for j, o, n in zip(cols, offsets, lengths)
+    }
+    last_month = base + len(values) - 1
+    return files, f'{last_month // 12:04d}-{last_month % 12 + 1:02d}'
+
+
+def build_backtest_monthly(df_price=None, monthly=None):
+    """df_price: 일별 종가 (없으면 parquet 로드), monthly: 월말 종가 리샘플 (있으면 재사용)"""
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] 월간 백테스트 데이터 생성 시작")
+    files, last_month = encode(df_price, monthly)
+
+    os.makedirs(OUT_DIR, exist_ok=True)
+    hashes, changed, removed = write_changed(files, str(OUT_DIR), load_manifest(str(OUT_DIR)), ext=EXT)
+    write_json(OUT_DIR / MANIFEST_NAME, {
+        'format': FORMAT,
+        'last_month': last_month,
+        'files': hashes,
+        'changed': [f'{URL_PREFIX}{t}{EXT}' for t in changed],
+        'removed': [f'{URL_PREFIX}{t}{EXT}' for t in removed],
+    }, quiet=True)
+
+    total = sum(map(len, files.values()))
+    per_ticker = total / max(len(files), 1)
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] 완료: {len(files)}개 티커 (~{last_month}) "
+          f"{total / 1024:,.0f}KB, 티커당 {per_ticker:,.0f}B · {len(changed)}개 변경"
+          f"{f', {len(removed)}개 삭제' if removed else ''} → output/bt-monthly/")
+    return len(files)
+
+
+def main():
+    return build_backtest_monthly()
+
+
+if __name__ == '__main__':
+    n = main()
+    sys.exit(0 if n > 0 else 1)
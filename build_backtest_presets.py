@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""build_backtest_presets.py — 백테스트 프리셋 결과 사전 계산
+
+output/backtest_data.json + output/bt-monthly/ → output/backtest_presets.json
+
+backtest.html 의 프리셋(PRESETS_DEF)을 기간별(3·5·7·10년)로 src/backtest.py 엔진에 한 번에 돌려
+backtest-engine.js simulate 와 같은 모양의 결과(stats · annualData · 시작 연도)를 기록합니다.
+페이지 첫 화면·비교표가 데이터 전체를 받지 않고 바로 쓸 수 있는 값이며,
+엔진 두 벌(Python · JS)의 회귀 기준점 역할도 합니다.
+
+출력 형식 (backtest-presets-v1):
+  {
+    "format": "backtest-presets-v1",
+    "data_end_year": 2025, "init_val": 10000, "bench": "SPY",
+    "presets": {"6040": {"holdings": [["SPY", 60], ["BND", 40]],
+                         "results": {"5": {"effectiveStartYear": ..., "stats": {...}, "annualData": [...]}}}}
+  }
+
+Usage:
+    python3 build_backtest_presets.py
+"""
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).parent
+sys.path.insert(0, str(ROOT / 'src'))
+from backtest import ReturnPanel, run_batch
+from serialize import write_json
+
+BACKTEST_DATA_PATH = ROOT / 'output' / 'backtest_data.json'
+MONTHLY_DIR = ROOT / 'output' / 'bt-monthly'
+OUT_PATH = ROOT / 'output' / 'backtest_presets.json'
+
+FORMAT = 'backtest-presets-v1'
+PERIODS = (3, 5, 7, 10)
+INIT_VAL = 10000
+BENCH = 'SPY'
+
+# output/backtest.js PRESETS_DEF 와 같게 유지 (tests 가 비교)
+PRESETS = {
+    '6040': [('SPY', 60), ('BND', 40)],
+    'allweather': [('SPY', 30), ('TLT', 40), ('GLD', 15), ('IEI', 7.5), ('DBC', 7.5)],
+    'golden': [('SPY', 20), ('IWM', 20), ('TLT', 20), ('SHY', 20), ('GLD', 20)],
+    'tech': [('QQQ', 50), ('SOXX', 25), ('VGT', 25)],
+    'global': [('VTI', 40), ('VEA', 20), ('VWO', 10), ('BND', 20), ('GLD', 10)],
+}
+
+
+def preset_weights(presets):
+    """프리셋 → (티커 열, 가중치 행렬 (프리셋 × 티커, 행 합 1), 보유 순서 행렬 (run_batch order))"""
+    tickers = sorted({t for holdings in presets.values() for t, _ in holdings})
+    col = {t: j for j, t in enumerate(tickers)}
+    W = np.zeros((len(presets), len(tickers)))
+    order = np.zeros_like(W)
+    for i, holdings in enumerate(presets.values()):
+        for pos, (t, w) in enumerate(holdings):
+            W[i, col[t]] = w / 100
+            order[i, col[t]] = pos
+    return tickers, W, order
+
+
+def build_backtest_presets(panel=None):
+    """panel: ReturnPanel (없으면 output/ 의 backtest_data.json · bt-monthly 로드)"""
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] 백테스트 프리셋 계산 시작")
+    tickers, W, order = preset_weights(PRESETS)
+    if panel is None:
+        panel = ReturnPanel.load(BACKTEST_DATA_PATH, MONTHLY_DIR, tickers + [BENCH])
+
+    results = {key: {} for key in PRESETS}
+    for period in PERIODS:
+        batch = run_batch(panel, tickers, W, period, INIT_VAL, BENCH, order=order)
+        for k, key in enumerate(PRESETS):
+            res = batch.to_js(k, BENCH)
+            results[key][str(period)] = {name: res[name] for name in
+                                         ('effectiveStartYear', 'effectivePeriod', 'constrainingTicker',
+                                          'stats', 'annualData')}
+
+    write_json(OUT_PATH, {
+        'format': FORMAT,
+        'data_end_year': panel.data_end_year,
+        'init_val': INIT_VAL,
+        'bench': BENCH,
+        'presets': {key: {'holdings': [[t, w] for t, w in holdings], 'results': results[key]}
+                    for key, holdings in PRESETS.items()},
+    }, quiet=True)
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] 완료: 프리셋 {len(PRESETS)}개 × 기간 {len(PERIODS)}개 "
+          f"(~{panel.data_end_year}) → {OUT_PATH.relative_to(ROOT)}")
+    return len(PRESETS)
+
+
+def main():
+    return build_backtest_presets()
+
+
+if __name__ == '__main__':
+    n = main()
+    sys.exit(0 if n > 0 else 1)
@@ -1,6 +1,7 @@
 """build_corr_data.py — 전체 이력 월간 수익률 데이터 생성
 
-raw/prices_close.parquet → output/corr_returns.json
+raw/prices_close.parquet → output/corr_returns.json (호환 포맷)
+                         → output/corr_returns.bin + corr_returns_index.json (바이너리)
 
 포맷: {
   "dates": ["1993-01-31", ...],          // 전체 월 인덱스
@@ -12,31 +13,49 @@ raw/prices_close.parquet → output/corr_returns.json
 
 Vercel gzip 자동 압축 덕분에 실전 전송 크기 ~550KB.
 
+바이너리 포맷 (corr-bin-v1): 같은 슬라이스를 float32 little-endian 으로 이어 붙인 .bin
+(중간 결측은 NaN) + 인덱스 {"dates", "decimals", "tickers": {"SPY": [byte_offset, start_idx, length]}}.
+상관 페이지(output/corr-returns.js)는 인덱스만 받은 뒤 선택한 티커의 바이트 범위만
+Range 요청으로 가져온다 (5개 티커 ≈ 인덱스 + 5KB).
+compute_all 에서는 가격·월말 리샘플을 메모리로 넘겨받아 parquet 재로드를 생략합니다.
+반올림은 행렬 전체를 한 번에(np.round), 기록은 티커 단위 스트리밍(src/serialize.py).
+
 Usage:
     python3 build_corr_data.py
 """
-import json
-import os
 import sys
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 ROOT = Path(__file__).parent
+sys.path.insert(0, str(ROOT / 'src'))
+from packed import iter_slices, pack_slices, trim_bounds
+from serialize import load as load_json, to_list, write_atomic, write_json, write_json_stream
+
 PRICES_PARQUET = ROOT / 'raw' / 'prices_close.parquet'
 OUT_PATH = ROOT / 'output' / 'corr_returns.json'
+BIN_PATH = ROOT / 'output' / 'corr_returns.bin'
+INDEX_PATH = ROOT / 'output' / 'corr_returns_index.json'
+
+BIN_FORMAT = 'corr-bin-v1'
+BIN_DTYPE = np.dtype('<f4')
+DECIMALS = 5
 
 MIN_MONTHS = 12  # 최소 12개월 이상 데이터 있는 티커만
 
 
-def build_corr_data():
+def build_corr_data(df_price=None, monthly=None):
+    """df_price: 일별 종가 (없으면 parquet 로드), monthly: 월말 종가 리샘플 (있으면 재사용)"""
     print(f"[{datetime.now().strftime('%H:%M:%S')}] corr_returns.json 생성 시작")
 
-    df = pd.read_parquet(PRICES_PARQUET)
+    df = df_price if df_price is not None else pd.read_parquet(PRICES_PARQUET)
 
     # 월말 종가 → 월간 수익률 (전체 이력)
-    monthly = df.resample('ME').last()
+    if monthly is None:
+        monthly = df.resample('ME').last()
     monthly_ret = monthly.pct_change(fill_method=None)
 
     # 유효 티커 (최소 12개월)
@@ -46,33 +65,61 @@ def build_corr_data():
     dates = ret.index.strftime('%Y-%m-%d').tolist()
 
     # compact 포맷: [start_idx, [r0, r1, ...]] — leading/trailing null 제거
-    tickers_data = {}
-    for col in ret.columns:
-        s = ret[col]
-        non_null = s.notna()
-        if not non_null.any():
-            continue
-        first = non_null.idxmax()
-        last = non_null[::-1].idxmax()
-        slice_ = s.loc[first:last]
-        start_idx = int(ret.index.get_loc(first))
-        vals = [round(v, 5) if pd.notna(v) else None for v in slice_]
-        tickers_data[col] = [start_idx, vals]
-
-    out = {
-        'as_of': df.index[-1].strftime('%Y-%m-%d'),
-        'dates': dates,
-        'returns': tickers_data,
-    }
+    values = np.round(ret.to_numpy(dtype=float), DECIMALS)
+    first, last, has_any = trim_bounds(values)
+
+    def items():
+        for j, start, vals in iter_slices(values, first, last, has_any):
+            yield ret.columns[j], [start, to_list(vals)]
 
-    os.makedirs(OUT_PATH.parent, exist_ok=True)
-    with open(OUT_PATH, 'w', encoding='utf-8') as f:
-        json.dump(out, f, separators=(',', ':'))
+    head = {'as_of': df.index[-1].strftime('%Y-%m-%d'), 'dates': dates}
+    write_json_stream(OUT_PATH, head, 'returns', items())
+    write_binary(head, ret.columns, values, first, last, has_any)
+    n_tickers = int(has_any.sum())
 
     size_kb = OUT_PATH.stat().st_size / 1024
+    bin_kb = (BIN_PATH.stat().st_size + INDEX_PATH.stat().st_size) / 1024
     date_range = f"{dates[0]} ~ {dates[-1]}"
-    print(f"[{datetime.now().strftime('%H:%M:%S')}] 완료: {len(tickers_data)}개 티커 × {len(dates)}개월 ({date_range}) → {size_kb:.0f} KB")
-    return len(tickers_data)
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] 완료: {n_tickers}개 티커 × {len(dates)}개월 ({date_range}) "
+          f"→ {size_kb:.0f} KB (바이너리+인덱스 {bin_kb:.0f} KB)")
+    return n_tickers
+
+
+def write_binary(head, tickers, values, first, last, has_any):
+    """JSON 과 같은 [first, last] 슬라이스를 float32 로 이어 붙여 .bin + 인덱스 기록"""
+    flat, cols, offsets, lengths = pack_slices(values, first, last, has_any, BIN_DTYPE)
+    offsets = offsets * BIN_DTYPE.itemsize
+
+    write_atomic(BIN_PATH, flat.tobytes())
+    index = {
+        **head,
+        'format': BIN_FORMAT,
+        'dtype': 'float32',
+        'decimals': DECIMALS,
+        'bytes': int(flat.nbytes),
+        'tickers': {tickers[j]: [int(o), int(first[j]), int(n)]
+                    for j, o, n in zip(cols, offsets, lengths)},
+    }
+    write_json(INDEX_PATH, index)
+
+
+def read_binary(tickers, index=None, bin_path=None):
+    """바이너리 포맷에서 티커별 [start_idx, [r...]] (JSON 포맷과 같은 값, 결측 None) — 검증·벤치마크용
+
+    프론트엔드처럼 티커 구간만 seek 해서 읽음
+    """
+    index = index if index is not None else load_json(INDEX_PATH)
+    out = {}
+    with open(bin_path or BIN_PATH, 'rb') as f:
+        for t in tickers:
+            entry = index['tickers'].get(t)
+            if entry is None:
+                continue
+            offset, start, length = entry
+            f.seek(offset)
+            vals = np.frombuffer(f.read(length * BIN_DTYPE.itemsize), dtype=BIN_DTYPE)
+            out[t] = [start, to_list(np.round(vals.astype(float), index['decimals']))]
+    return out
 
 
 def main():
@@ -2,49 +2,88 @@
 
 output/etf_data.json 에서 각 티커의 데이터를 추출해
 output/etf-data/{TICKER}.json 파일을 생성합니다.
+compute_all 파이프라인에서는 방금 계산한 allData를 메모리로 넘겨받아 JSON 재파싱을 생략합니다.
 
 etf-detail.html 이 625KB 전체 JSON 대신 ~400B짜리 개별 파일을 먼저 로드하게 됩니다.
 경로를 /etf-data/ 로 분리해 vercel.json 의 /etf/:ticker rewrite 충돌을 방지합니다.
 
+가격 이력 (history): compute_all 의 etf_pages 스테이지가 일별 종가(df_price)를 넘길 때만 넣음
+  전체 주간 (주 마지막 거래일) + 최근 1년 일별을 각각 LTTB 로 고정 점 수까지 줄임 (downsample.price_histories)
+  {"w": {"t": [1970-01-01 부터 일수, ...], "c": [종가, ...]}, "d": {...}} — 주간은 일별 구간 이전까지
+  compare.html 비교 차트 · etf-detail.html 차트 폴백이 /api/yf 대신 사용 (history 가 없는 파일이면 /api/yf)
+이 파일은 Vercel buildCommand 라서 표준 라이브러리만으로 동작 — numpy · pandas 는 df_price 가 있을 때만 불러오고
+CLI 는 parquet 을 읽지 않음. 대신 daily_update 가 history 를 넣은 티커 파일을 커밋하고, 가격 없이 돌 때(배포 빌드 ·
+월간 holdings)는 기존 파일의 history 를 그대로 이어감 (문서가 바뀌어 다시 쓰는 파일은 디스크의 history 를 옮겨 붙임)
+
+변경분만 기록: 직렬화한 바이트의 해시를 직전 빌드의 매니페스트(etf-data/_manifest.json)와 비교해
+달라진 파일(+ 디스크에 없는 파일)만 임시 파일 → rename 으로 원자적으로 교체합니다 (스레드 풀).
+매니페스트의 changed / removed 목록(직전 세대 대비 내용이 바뀐 경로)으로 배포 시 해당 경로만 캐시 무효화할 수 있습니다.
+- 기준일(as_of · holdings_as_of)은 티커 파일이 아닌 etf-data/_index.json 하나에만 → 지표가 그대로인 티커는 매일 바뀌지 않음
+- files · changed 는 history 를 뺀 문서 기준 (배포 빌드와 같은 값), history 해시는 따로 (history) — 이력만 바뀐 파일은
+  다시 쓰되 changed 에는 넣지 않음
+- 매니페스트 · 티커 파일은 저장소에 커밋(daily_update 워크플로) — 새 체크아웃(Vercel 빌드)에서도 직전 세대와 비교
+- 같은 세대 재빌드(해시 전부 동일)는 매니페스트를 그대로 둠 — CI 가 커밋한 changed 목록이 배포 빌드에서 지워지지 않음
+
 Usage:
     python3 build_etf_pages.py
 """
-import json
 import os
 import sys
 from datetime import datetime
 
-
 ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+from serialize import (content_hash, dumps, load as load_json, load_manifest, timed_dumps, write_atomic,
+                       write_changed, BACKEND, MANIFEST_NAME)
+
 ETF_DATA_PATH    = os.path.join(ROOT, 'output', 'etf_data.json')
 HOLDINGS_PATH    = os.path.join(ROOT, 'data_scraped', 'holdings.json')
 ETF_DIR          = os.path.join(ROOT, 'output', 'etf-data')
+INDEX_KEY        = '_index'           # etf-data/_index.json — 기준일 (티커 파일 공통 값)
+URL_PREFIX       = '/etf-data/'
 
 
-def build_etf_pages():
+def load_history(etf_dir, ticker):
+    """기존 티커 파일의 history (없거나 읽을 수 없으면 None)"""
+    try:
+        return load_json(os.path.join(etf_dir, f'{ticker}.json')).get('history')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def build_etf_pages(all_data=None, as_of=None, df_price=None):
+    """all_data: {sid: [etf, ...]} (없으면 etf_data.json 에서 로드), as_of: 기준일,
+    df_price: 일별 종가 (compute_all 만 넘김 — 없으면 가격 이력 생략)"""
     print(f"[{datetime.now().strftime('%H:%M:%S')}] ETF 개별 JSON 생성 시작")
 
-    with open(ETF_DATA_PATH, encoding='utf-8') as f:
-        raw = json.load(f)
+    if all_data is None:
+        raw = load_json(ETF_DATA_PATH)
+        all_data = raw.get('allData', raw)
+        as_of = raw.get('as_of', '')
 
     # 구성종목 데이터 로드 (월 1회 수집, 없으면 빈 dict)
     holdings_data = {}
     holdings_as_of = ''
     if os.path.exists(HOLDINGS_PATH):
         try:
-            with open(HOLDINGS_PATH, encoding='utf-8') as f:
-                h = json.load(f)
+            h = load_json(HOLDINGS_PATH)
             holdings_data   = h.get('data', {})
             holdings_as_of  = h.get('as_of', '')
             print(f"  holdings: {sum(1 for v in holdings_data.values() if v)}개 ETF 보유 (기준일: {holdings_as_of})")
         except Exception as e:
             print(f"  holdings 로드 실패: {e}")
 
-    all_data = raw.get('allData', raw)
-    as_of = raw.get('as_of', '')
+    # 가격 이력 (주간 + 최근 1년 일별, LTTB) — numpy · pandas 는 여기서만
+    histories = {}
+    if df_price is not None and len(df_price):
+        from downsample import price_histories, HISTORY_DAILY_DAYS, HISTORY_DAILY_POINTS, HISTORY_WEEKLY_POINTS
+        histories = price_histories(df_price)
+        print(f"  가격 이력: {len(histories)}개 티커 (주간 ≤{HISTORY_WEEKLY_POINTS} + "
+              f"최근 {HISTORY_DAILY_DAYS}일 ≤{HISTORY_DAILY_POINTS}점)")
+
     os.makedirs(ETF_DIR, exist_ok=True)
 
-    count = 0
+    docs = []
     for sid, etfs in all_data.items():
         if not isinstance(etfs, list):
             continue
@@ -52,17 +91,55 @@ def build_etf_pages():
             ticker = etf.get('ticker', '').upper().strip()
             if not ticker:
                 continue
-            out = {
-                'ticker': ticker, 'sid': sid, 'etf': etf, 'as_of': as_of,
-                'holdings': holdings_data.get(ticker) or [],
-                'holdings_as_of': holdings_as_of,
-            }
-            path = os.path.join(ETF_DIR, f'{ticker}.json')
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(out, f, ensure_ascii=False, separators=(',', ':'))
-            count += 1
-
-    print(f"[{datetime.now().strftime('%H:%M:%S')}] 완료: {count}개 ETF JSON 생성 → output/etf-data/")
+            docs.append((ticker, {'ticker': ticker, 'sid': sid, 'etf': etf,
+                                  'holdings': holdings_data.get(ticker) or []}))
+    files, encode_sec = timed_dumps(docs)
+    count = len(files)
+    files[INDEX_KEY] = dumps({'as_of': as_of or '', 'holdings_as_of': holdings_as_of})
+    hashes = {t: content_hash(data) for t, data in files.items()}
+
+    previous = load_manifest(ETF_DIR)
+    prev_history = previous.get('history', {})
+    kept = {}
+    if df_price is None:
+        # 가격 없이 돌 때: 커밋된 파일의 history 유지 — 다시 쓸 파일(문서 변경)만 디스크에서 읽어 옮겨 붙임
+        prev_files = previous.get('files', {})
+        for t, h in prev_history.items():
+            if t in files and os.path.exists(os.path.join(ETF_DIR, f'{t}.json')):
+                if prev_files.get(t) != hashes[t]:
+                    histories[t] = load_history(ETF_DIR, t)
+                else:
+                    kept[t] = h
+        histories = {t: h for t, h in histories.items() if h is not None}
+
+    # history 는 문서 끝 키로 이어 붙임 — 해시는 따로 (files 해시는 history 없는 배포 빌드와 같게)
+    history_bytes, history_sec = timed_dumps((t, h) for t, h in histories.items() if t in files)
+    for t, data in history_bytes.items():
+        files[t] = files[t][:-1] + b',"history":' + data + b'}'
+    history_hashes = {**kept, **{t: content_hash(data) for t, data in history_bytes.items()}}
+    print(f"  직렬화: {count}개 {sum(map(len, files.values())) / 1024:,.0f}KB · "
+          f"encode {(encode_sec + history_sec) * 1000:,.1f}ms ({BACKEND})")
+
+    rewrite = {t for t in files if prev_history.get(t) != history_hashes.get(t)}   # 이력만 바뀐 파일
+    hashes, changed, removed = write_changed(files, ETF_DIR, previous, hashes=hashes, rewrite=rewrite)
+    if previous.get('files') == hashes:
+        # 같은 세대 재빌드 — 직전 매니페스트의 changed / removed 가 여전히 이번 세대의 변경분
+        changed = [u[len(URL_PREFIX):-len('.json')] for u in previous.get('changed', [])]
+        removed = [u[len(URL_PREFIX):-len('.json')] for u in previous.get('removed', [])]
+    manifest = {
+        'as_of':   as_of or '',
+        'files':   hashes,
+        'changed': [f'{URL_PREFIX}{t}.json' for t in changed],
+        'removed': [f'{URL_PREFIX}{t}.json' for t in removed],
+    }
+    if history_hashes:
+        manifest['history'] = history_hashes
+    if manifest != previous:
+        write_atomic(os.path.join(ETF_DIR, MANIFEST_NAME), dumps(manifest))
+
+    n_changed = sum(t != INDEX_KEY for t in changed)
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] 완료: {count}개 ETF JSON 중 {n_changed}개 변경"
+          f"{f', {len(removed)}개 삭제' if removed else ''} → output/etf-data/ (매니페스트 {MANIFEST_NAME})")
     return count
 
 
@@ -1,25 +1,58 @@
 """
 그래프 뷰용 데이터 생성 (build_graph.py)
-  - correlation_matrix_monthly.csv → output/graph_data.json
-  - r >= STORE_MIN_R 인 쌍만 엣지로 저장
+  - 월간 상관계수 행렬 → output/graph_data.json (노드 · 섹터 · 사전 배치) + graph_edges_{하한}.bin (엣지)
+  - r >= STORE_MIN_R 인 쌍만 엣지로 저장 — EDGE_BANDS 구간별 파일로 나눠 graph.js 가 슬라이더에 필요한 구간만 받음
   - 브라우저(graph.html)에서 슬라이더로 동적 필터링
 
+compute_all 의 graph 스테이지가 메모리의 월간 상관행렬(corr_monthly)·분류·레거시 결과로 호출.
+단독 실행 시 상관행렬은 파이프라인 캐시(.cache/pipeline/)의 마지막 corr_monthly 산출물,
+메타는 output/etf_data.json · classification.json 에서 읽음.
+
+노드 좌표는 LAYOUT_LEVELS 임계값마다 미리 계산해 layouts 로 저장 (graph.js 는 시뮬레이션 없이 바로 렌더):
+  그 임계값 이상 엣지만 남긴 그래프에 Fruchterman-Reingold 힘 배치 (numpy 벡터화, 반발력은 행 블록 단위)
+  - 시작 배치는 섹터별 원 위 (시드 고정 → 같은 입력이면 같은 좌표)
+  - 높은 임계값 → 낮은 임계값 순서로 이전 좌표에서 이어서 계산 (슬라이더를 움직여도 군집 위치 유지)
+
+엣지 파일 (graph-edges-v1, little-endian): 구간 [하한, 상한) 의 엣지 count 개를 열 단위로
+  source 노드 번호 × count, target 노드 번호 × count (nodes 순서, uint16 — 노드 65,536개 이상이면 uint32),
+  r × count (uint16, 소수 셋째 자리 ×1000) — graph_data.json meta.edge_bands 에 파일 · 개수 · 내용 해시.
+
+엣지 추출은 행 블록 단위 상삼각 스캔 — 행렬 사본(float32 변환)이나 전체 triu_indices(쌍 N²/2개 × int64 2개)
+없이 블록(EDGE_BLOCK_ROWS × N bool)만 추가로 씀 (10k 노드에서 ~1.9GB → 수 MB).
+
 사용법:
   python build_graph.py
-  (사전에 python build_monthly_corr.py 가 실행되어 있어야 함)
+  (사전에 python scripts/compute_all.py 가 한 번 실행되어 있어야 함 — corr_monthly 캐시)
 """
-import json
+import hashlib
 import os
 import sys
+import time
+from datetime import datetime
+
 import numpy as np
-import pandas as pd
 
 ROOT = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, os.path.join(ROOT, 'src'))
-from config import SECTOR_DEFS, SUPER_SECTOR_DEFS, CORR_MONTHLY_CSV
+from config import SECTOR_DEFS, SUPER_SECTOR_DEFS
+from pipeline import Pipeline
+from serialize import load as load_json, write_atomic, write_json
 
 # ── 설정 ──────────────────────────────────────────────
 STORE_MIN_R   = 0.70   # JSON 저장 최소 r (슬라이더 하한)
+DEFAULT_VIEW_R = 0.90  # graph.js DEFAULT_R (첫 화면에 받는 구간 — 로그용)
+EDGE_BLOCK_ROWS = 256  # 상삼각 스캔 행 블록 (블록당 추가 메모리 = 행 × N bool)
+EDGE_BANDS = (0.95, 0.90, 0.85, 0.80, 0.75, 0.70)  # 엣지 파일 구간 하한 (위 구간의 하한이 상한, 맨 위는 1.0 포함)
+EDGE_FORMAT = 'graph-edges-v1'
+EDGE_R_SCALE = 1000    # r → uint16 (graph.js 표시·필터와 같은 소수 셋째 자리)
+EDGE_HASH_LEN = 10     # 파일 내용 해시 (graph.js 가 ?v= 로 붙여 캐시 무효화)
+LAYOUT_LEVELS = (0.95, 0.90, 0.80, 0.70)  # 좌표를 미리 계산할 임계값 (graph.js 는 슬라이더에 가장 가까운 값)
+LAYOUT_ITERATIONS = (150, 60)  # 첫 임계값 / 이어서 계산하는 임계값 반복 수
+LAYOUT_BLOCK_ROWS = 256  # 반발력 행 블록 (블록당 추가 메모리 = 행 × N × 2 float32)
+LAYOUT_GRAVITY = 1.0   # 중심 인력 (고립 노드가 멀리 흩어지지 않게)
+LAYOUT_COLLIDE = 0.4   # 이 거리(× k) 안으로 겹친 노드는 밀어냄 (graph.js forceCollide 역할)
+LAYOUT_LINK_PX = 30    # 이상 거리 k → 화면 px
+LAYOUT_SEED = 0
 ETF_DATA_JSON    = os.path.join(ROOT, 'output', 'etf_data.json')
 CLASSIF_JSON     = os.path.join(ROOT, 'output', 'classification.json')
 OUT_JSON         = os.path.join(ROOT, 'output', 'graph_data.json')
@@ -52,40 +85,197 @@ SECTOR_COLORS = {
 }
 
 
-def main():
-    # 1. 상관행렬 로드
-    if not os.path.exists(CORR_MONTHLY_CSV):
-        print(f"❌ 파일 없음: {CORR_MONTHLY_CSV}")
-        print("   먼저 python build_monthly_corr.py 를 실행하세요.")
-        sys.exit(1)
-
-    print("📊 상관행렬 로드 중...")
-    corr = pd.read_csv(CORR_MONTHLY_CSV, index_col=0)
-    tickers = list(corr.columns)
-    n = len(tickers)
-    print(f"   {n}×{n} 행렬  ({n*(n-1)//2:,}쌍)")
+def extract_edges(values, min_r=STORE_MIN_R, block=EDGE_BLOCK_ROWS):
+    """N×N 상관행렬 상삼각(i < j)에서 r >= min_r 인 쌍 → (행, 열, r float32), 행 우선 순서
 
-    # 2. ETF 메타데이터
-    print("   ETF 메타데이터 로드 중...")
-    with open(ETF_DATA_JSON, encoding='utf-8') as f:
-        db = json.load(f)
+    행 블록마다 오른쪽 부분(values[i0:i1, i0+1:])만 뷰로 보고 비교 → NaN 은 자동 제외.
+    """
+    n = len(values)
+    rows, cols, rs = [], [], []
+    for i0 in range(0, max(n - 1, 0), block):
+        i1 = min(i0 + block, n - 1)
+        slab = values[i0:i1, i0 + 1:]
+        mask = slab >= min_r
+        # 블록 안 행 i 의 열 c 는 j = i0 + 1 + c → j > i ⇔ c >= i - i0
+        mask &= np.arange(slab.shape[1]) >= np.arange(i1 - i0)[:, None]
+        r, c = np.nonzero(mask)
+        rs.append(slab[r, c].astype(np.float32))
+        rows.append(r + i0)
+        cols.append(c + i0 + 1)
+    if not rs:
+        return np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0, np.float32)
+    return np.concatenate(rows), np.concatenate(cols), np.concatenate(rs)
+
+
+def band_path(lo, out_dir=None):
+    return os.path.join(out_dir or os.path.dirname(OUT_JSON), f'graph_edges_{round(lo * 100):03d}.bin')
+
+
+STORED_BANDS = tuple(lo for lo in EDGE_BANDS if lo >= STORE_MIN_R)
+OUT_EDGES = tuple(band_path(lo) for lo in STORED_BANDS)   # 파이프라인 스테이지 출력 선언용
+
+
+def remove_stale_bands(bands, out_dir=None):
+    """meta.edge_bands 에 없는 graph_edges_*.bin 삭제 (구간 설정이 바뀌었을 때 남는 파일) → 삭제한 파일명"""
+    out_dir = out_dir or os.path.dirname(OUT_JSON)
+    listed = {b['file'] for b in bands}
+    stale = sorted(name for name in os.listdir(out_dir)
+                   if name.startswith('graph_edges_') and name.endswith('.bin') and name not in listed)
+    for name in stale:
+        os.remove(os.path.join(out_dir, name))
+    return stale
+
+
+def write_edge_bands(ri, ci, rv, n_nodes, bands=EDGE_BANDS, out_dir=None):
+    """엣지 → 구간별 .bin 기록 → meta.edge_bands [{min, max, file, count, bytes, v}] (높은 구간부터)"""
+    idx_dtype = np.dtype('<u2') if n_nodes <= 0xFFFF else np.dtype('<u4')
+    r_int = np.rint(np.asarray(rv, dtype=np.float64) * EDGE_R_SCALE).astype(np.int64)
+    out, hi = [], None
+    for lo in sorted(bands, reverse=True):
+        keep = r_int >= round(lo * EDGE_R_SCALE)
+        if hi is not None:
+            keep &= r_int < round(hi * EDGE_R_SCALE)
+        data = b''.join([ri[keep].astype(idx_dtype).tobytes(), ci[keep].astype(idx_dtype).tobytes(),
+                         r_int[keep].astype('<u2').tobytes()])
+        path = band_path(lo, out_dir)
+        write_atomic(path, data)
+        out.append({'min': lo, 'max': hi, 'file': os.path.basename(path), 'count': int(keep.sum()),
+                    'bytes': len(data), 'v': hashlib.sha256(data).hexdigest()[:EDGE_HASH_LEN]})
+        hi = lo
+    return out
+
+
+def read_edges(doc, min_r=None, out_dir=None):
+    """graph_data.json 내용 + 구간 파일 → (source 번호, target 번호, r) — min_r 이상 구간만 읽음 (검증·소비자용)"""
+    meta = doc['meta']
+    idx_dtype = np.dtype('<u2') if meta['edge_index_bytes'] == 2 else np.dtype('<u4')
+    parts = []
+    for band in meta['edge_bands']:
+        if min_r is not None and band['max'] is not None and band['max'] <= min_r:
+            continue
+        n = band['count']
+        with open(os.path.join(out_dir or os.path.dirname(OUT_JSON), band['file']), 'rb') as f:
+            data = f.read()
+        s = np.frombuffer(data, idx_dtype, n)
+        t = np.frombuffer(data, idx_dtype, n, n * idx_dtype.itemsize)
+        r = np.frombuffer(data, '<u2', n, 2 * n * idx_dtype.itemsize) / EDGE_R_SCALE
+        parts.append((s, t, r))
+    if not parts:
+        return np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0)
+    s, t, r = (np.concatenate(col) for col in zip(*parts))
+    keep = r >= min_r if min_r is not None else slice(None)
+    return s[keep].astype(np.int64), t[keep].astype(np.int64), r[keep]
+
+
+def initial_positions(sector_ids, seed=LAYOUT_SEED):
+    """섹터를 원 위에 고르게, 노드는 섹터 중심 주변 (단위 정사각형 좌표)"""
+    _, codes = np.unique(np.asarray(sector_ids), return_inverse=True)
+    angle = 2 * np.pi * codes / max(codes.max() + 1, 1) if len(codes) else codes
+    rng = np.random.default_rng(seed)
+    pos = 0.5 + 0.35 * np.column_stack([np.cos(angle), np.sin(angle)])
+    return (pos + rng.normal(0, 0.05, pos.shape)).astype(np.float32)
+
+
+def force_layout(pos, rows, cols, r, iterations, block=LAYOUT_BLOCK_ROWS):
+    """Fruchterman-Reingold (단위 정사각형, 이상 거리 k = 1/√N) — 엣지 인력은 r 이 클수록 강하게
+
+    반발력·충돌은 행 블록 × 전체 노드 쌍으로 계산해 N×N 배열을 만들지 않음. → 새 좌표 (float32)
+    """
+    pos = np.array(pos, dtype=np.float32)
+    n = len(pos)
+    if n == 0:
+        return pos
+    k2 = np.float32(1.0 / n)
+    k = np.sqrt(k2)
+    min_sep = np.float32(LAYOUT_COLLIDE) * k
+    w = ((np.asarray(r, dtype=np.float32) - 0.65) / 0.35) / k
+    temp, cool = 0.1, 0.1 / (iterations + 1)
+    disp = np.empty_like(pos)
+    for _ in range(iterations):
+        # 반발력 k²/d + 겹침 max(min_sep - d, 0) (방향 d/|d|) — 쌍별 계수 c_ij 로
+        # Σ_j (p_i - p_j)·c_ij = p_i·Σ_j c_ij - (C @ p)_i, 자기 자신은 계수 0
+        for i0 in range(0, n, block):
+            blk = pos[i0:i0 + block]
+            d2 = np.square(blk[:, :1] - pos[:, 0]) + np.square(blk[:, 1:] - pos[:, 1])
+            d2 += 1e-9
+            overlap = np.divide(min_sep, np.sqrt(d2))
+            overlap -= 1
+            coef = np.divide(k2, d2, out=d2)
+            coef += np.maximum(overlap, 0, out=overlap)
+            coef[np.arange(len(blk)), np.arange(i0, i0 + len(blk))] = 0
+            disp[i0:i0 + block] = blk * coef.sum(axis=1)[:, None] - coef @ pos
+        # 인력 d²/k (엣지 양 끝에 반대 방향)
+        delta = pos[rows] - pos[cols]
+        f = delta * (np.sqrt(np.einsum('ij,ij->i', delta, delta)) * w)[:, None]
+        for ax in (0, 1):
+            pull = np.bincount(cols, f[:, ax], n) - np.bincount(rows, f[:, ax], n)
+            disp[:, ax] += pull.astype(np.float32)
+        disp -= LAYOUT_GRAVITY * (pos - 0.5)
+        # 온도만큼만 이동 (선형 냉각)
+        length = np.sqrt(np.einsum('ij,ij->i', disp, disp))
+        pos += disp * (np.minimum(length, temp) / np.maximum(length, 1e-9))[:, None]
+        temp -= cool
+    return pos
+
+
+def compute_layouts(sector_ids, ri, ci, rv, levels=LAYOUT_LEVELS, iterations=LAYOUT_ITERATIONS):
+    """임계값별 노드 좌표 → {'0.95': [x0, y0, x1, y1, ...] (정수 px)} — 높은 임계값부터 이어서 계산"""
+    pos = initial_positions(sector_ids)
+    levels = sorted(levels, reverse=True)
+    if not len(pos):
+        return {f'{level:.2f}': [] for level in levels}
+    k = np.sqrt(1.0 / len(pos))
+    layouts = {}
+    for i, level in enumerate(levels):
+        keep = rv >= level
+        pos = force_layout(pos, ri[keep], ci[keep], rv[keep], iterations[0] if i == 0 else iterations[1])
+        px = np.rint((pos - pos.mean(axis=0)) / k * LAYOUT_LINK_PX).astype(np.int64)
+        layouts[f'{level:.2f}'] = px.ravel().tolist()
+    return layouts
+
+
+def node_meta(all_data):
+    """allData {섹터: [etf...]} → {ticker: {n, s, a}}"""
     meta = {}
-    for sid, etfs in db['allData'].items():
+    for sid, etfs in all_data.items():
         for e in etfs:
             meta[e['ticker']] = {
                 'n': e['name'],
                 's': sid,
                 'a': round(e.get('aum', 0) / 1e9, 2),
             }
+    return meta
+
+
+def build_graph(corr=None, all_data=None, legacy=None):
+    """corr: 월간 상관계수 DataFrame, all_data: etf_data allData, legacy: {ticker: {is_legacy, reasons}}
 
-    # 레거시 티커 로드
-    legacy_tickers = set()
-    if os.path.exists(CLASSIF_JSON):
-        with open(CLASSIF_JSON, encoding='utf-8') as f:
-            classif = json.load(f)
-        legacy_tickers = {tk for tk, info in classif.items() if info.get('is_legacy')}
-        short_history_tickers = {tk for tk, info in classif.items() if 'SHORT_HISTORY' in info.get('legacy_reasons', [])}
-        print(f"   레거시 티커: {len(legacy_tickers)}개 (그 중 짧은 연혁: {len(short_history_tickers)}개)")
+    인자가 없으면 파이프라인 캐시 · output/ JSON 에서 로드. → 엣지 수
+    """
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] 그래프 데이터 생성 시작")
+    # 1. 상관행렬
+    if corr is None:
+        corr = Pipeline([]).cached('corr_monthly')
+        if corr is None:
+            print("❌ 월간 상관행렬 캐시 없음 — 먼저 python scripts/compute_all.py 를 실행하세요.")
+            return None
+    tickers = [str(t) for t in corr.columns]
+    n = len(tickers)
+    print(f"   {n}×{n} 행렬  ({n*(n-1)//2:,}쌍)")
+
+    # 2. ETF 메타데이터
+    if all_data is None:
+        all_data = load_json(ETF_DATA_JSON)['allData']
+    meta = node_meta(all_data)
+
+    # 레거시 티커
+    if legacy is None:
+        classif = load_json(CLASSIF_JSON) if os.path.exists(CLASSIF_JSON) else {}
+        legacy = {tk: {'is_legacy': info.get('is_legacy', False), 'reasons': info.get('legacy_reasons', [])}
+                  for tk, info in classif.items()}
+    legacy_tickers = {tk for tk, info in legacy.items() if info.get('is_legacy')}
+    short_history_tickers = {tk for tk, info in legacy.items() if 'SHORT_HISTORY' in info.get('reasons', [])}
+    print(f"   레거시 티커: {len(legacy_tickers)}개 (그 중 짧은 연혁: {len(short_history_tickers)}개)")
 
     # 앵커 티커 집합 (섹터 앵커 + 슈퍼섹터 앵커 포함)
     anchor_tickers = {v['anchor'] for v in SECTOR_DEFS.values() if v.get('anchor')}
@@ -109,22 +299,18 @@ def main():
             node['anchor'] = 1
         nodes.append(node)
 
-    # 4. 엣지 계산 (numpy 벡터화, 상삼각만)
-    print(f"   엣지 계산 중 (r ≥ {STORE_MIN_R})...")
-    arr = corr.values.astype(np.float32)
-    np.fill_diagonal(arr, np.nan)
-    ri, ci = np.triu_indices(n, k=1)
-    rv = arr[ri, ci]
-    mask = (rv >= STORE_MIN_R) & ~np.isnan(rv)
-    ri, ci, rv = ri[mask], ci[mask], rv[mask]
-
-    links = [
-        {'s': tickers[int(i)], 't': tickers[int(j)], 'r': round(float(r), 3)}
-        for i, j, r in zip(ri, ci, rv)
-    ]
-    print(f"   엣지 수: {len(links):,}개")
-
-    # 5. 섹터 메타 (이름 + 색상 + 슈퍼섹터 소속)
+    # 4. 엣지 (행 블록 상삼각 스캔) → r 구간별 파일
+    ri, ci, rv = extract_edges(corr.to_numpy(), STORE_MIN_R)
+    bands = write_edge_bands(ri, ci, rv, n, STORED_BANDS)
+    print(f"   엣지 수 (r ≥ {STORE_MIN_R}): {len(ri):,}개 → 구간 파일 "
+          + ', '.join(f"≥{b['min']:.2f} {b['count']:,}" for b in bands))
+
+    # 5. 임계값별 사전 배치
+    t0 = time.perf_counter()
+    layouts = compute_layouts([node['s'] for node in nodes], ri, ci, rv)
+    print(f"   배치: 임계값 {', '.join(layouts)} ({time.perf_counter() - t0:.1f}s)")
+
+    # 6. 섹터 메타 (이름 + 색상 + 슈퍼섹터 소속)
     sectors = {
         sid: {
             'name':    sdef['name'],
@@ -148,28 +334,38 @@ def main():
         for ssid, ss in SUPER_SECTOR_DEFS.items()
     }
 
-    # 6. 저장
+    # 7. 저장
     out = {
         'nodes':         nodes,
-        'links':         links,
         'sectors':       sectors,
         'super_sectors': super_sectors,
+        'layouts':       layouts,   # 임계값 → nodes 순서의 [x, y, ...]
         'meta': {
-            'n_nodes':        len(nodes),
-            'n_links_stored': len(links),
-            'store_min_r':    STORE_MIN_R,
+            'n_nodes':          len(nodes),
+            'n_links_stored':   len(ri),
+            'store_min_r':      STORE_MIN_R,
+            'layout_levels':    [float(k) for k in layouts],
+            'edge_format':      EDGE_FORMAT,
+            'edge_index_bytes': 2 if n <= 0xFFFF else 4,
+            'edge_bands':       bands,
         },
     }
-    os.makedirs(os.path.dirname(OUT_JSON), exist_ok=True)
-    with open(OUT_JSON, 'w', encoding='utf-8') as f:
-        json.dump(out, f, ensure_ascii=False, separators=(',', ':'))
+    write_json(OUT_JSON, out)
+    stale = remove_stale_bands(bands)
+    if stale:
+        print(f"   이전 구간 파일 삭제: {', '.join(stale)}")
+
+    json_kb = os.path.getsize(OUT_JSON) / 1024
+    default_kb = json_kb + sum(b['bytes'] for b in bands if b['min'] >= DEFAULT_VIEW_R) / 1024
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] 완료: 노드 {len(nodes):,}개 | 엣지 {len(ri):,}개 | "
+          f"{json_kb:,.0f}KB + 엣지 {sum(b['bytes'] for b in bands) / 1024:,.0f}KB "
+          f"(기본 r ≥ {DEFAULT_VIEW_R} 화면 {default_kb:,.0f}KB) → {OUT_JSON}")
+    return len(ri)
 
-    size_mb = os.path.getsize(OUT_JSON) / 1024 ** 2
-    print(f"✅ 저장 완료: {OUT_JSON}")
-    print(f"   노드 {len(nodes):,}개 | 엣지 {len(links):,}개 | {size_mb:.1f} MB")
-    print()
-    print("💡 이후 git add output/graph_data.json && git commit 후 배포하세요.")
+
+def main():
+    return build_graph()
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(0 if main() is not None else 1)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""build_return_index.py — 티커별 누적 로그수익률 인덱스 (prefix sum)
+
+raw/prices_close.parquet → output/return_index_monthly.bin + return_index_monthly.json
+                           (--weekly: return_index_weekly.bin + .json 도)
+
+L[k] = ln(기간 k 말 종가 / 첫 종가). 임의 구간 수익률 = exp(L[b] - L[a]) - 1 이라
+backtest · compare · 상세 페이지가 수익률 시계열을 다시 훑지 않고 두 번 조회로 계산합니다.
+계산은 src/return_index.py (data_loader.compute_return_index 와 같은 값).
+
+파일 포맷 (retidx-v1):
+  .bin   티커별 [첫 기간 ~ 마지막 기간] 구간의 float32 (little-endian) 를 이어 붙임
+  .json  {"format", "freq": "M"|"W", "as_of", "end_key", "dtype", "decimals", "bytes",
+          "tickers": {"SPY": [byte_offset, start_key, length]}}
+  키: 월 = 연*12+월-1, 주 = 1970-01-02(금) 부터의 주 번호 — 마지막 키는 진행 중 기간 (최신 종가)
+  → corr-returns.js 와 같은 Range 로더로 티커 구간만 받음 (output/return-index.js)
+
+Usage:
+    python3 build_return_index.py [--weekly]
+"""
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).parent
+sys.path.insert(0, str(ROOT / 'src'))
+from packed import pack_slices, trim_bounds
+from return_index import ReturnIndex
+from serialize import load as load_json, write_atomic, write_json
+
+PRICES_PARQUET = ROOT / 'raw' / 'prices_close.parquet'
+OUT_DIR = ROOT / 'output'
+NAMES = {'M': 'return_index_monthly', 'W': 'return_index_weekly'}
+
+FORMAT = 'retidx-v1'
+BIN_DTYPE = np.dtype('<f4')
+DECIMALS = 6    # float32 유효숫자 안 (로그값 |L| < 10 → 오차 ~1e-6)
+
+
+def paths(freq, out_dir=None):
+    base = Path(out_dir or OUT_DIR) / NAMES[freq]
+    return base.with_suffix('.bin'), base.with_suffix('.json')
+
+
+def write_index(index, as_of, out_dir=None):
+    """ReturnIndex → .bin + .json → 기록 바이트 수"""
+    bin_path, index_path = paths(index.freq, out_dir)
+    values = index.to_float32()
+    first, last, has_any = trim_bounds(values)
+    flat, cols, offsets, lengths = pack_slices(values, first, last, has_any, BIN_DTYPE)
+    write_atomic(bin_path, flat.tobytes())
+    write_json(index_path, {
+        'format': FORMAT,
+        'freq': index.freq,
+        'as_of': as_of,
+        'end_key': index.end_key,
+        'dtype': 'float32',
+        'decimals': DECIMALS,
+        'bytes': int(flat.nbytes),
+        'tickers': {index.tickers[j]: [int(o) * BIN_DTYPE.itemsize, index.start_key + int(first[j]), int(n)]
+                    for j, o, n in zip(cols, offsets, lengths)},
+    }, quiet=True)
+    return int(flat.nbytes)
+
+
+def read_index(freq='M', tickers=None, out_dir=None):
+    """기록된 파일 → ReturnIndex (tickers 만, 없으면 전체) — 검증·소비자용"""
+    bin_path, index_path = paths(freq, out_dir)
+    doc = load_json(index_path)
+    entries = doc['tickers']
+    names = [t for t in (tickers or entries) if t in entries]
+    start = min((entries[t][1] for t in names), default=doc['end_key'])
+    matrix = np.full((doc['end_key'] - start + 1, len(names)), np.nan)
+    with open(bin_path, 'rb') as f:
+        for j, t in enumerate(names):
+            offset, key, length = entries[t]
+            f.seek(offset)
+            vals = np.frombuffer(f.read(length * BIN_DTYPE.itemsize), dtype=BIN_DTYPE)
+            matrix[key - start:key - start + length, j] = vals
+    return ReturnIndex(matrix, start, names, freq)
+
+
+def build_return_index(df_price=None, monthly=None, weekly=False):
+    """df_price: 일별 종가 (없으면 parquet 로드), monthly: 월말 종가 리샘플 (있으면 재사용)"""
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] 누적 수익률 인덱스 생성 시작")
+    df = df_price if df_price is not None else pd.read_parquet(PRICES_PARQUET)
+    as_of = df.index[-1].strftime('%Y-%m-%d')
+    built = [ReturnIndex.from_prices(df, 'M', monthly)]
+    if weekly:
+        built.append(ReturnIndex.from_prices(df, 'W'))
+    for index in built:
+        size = write_index(index, as_of)
+        print(f"  {NAMES[index.freq]}: {len(index.tickers):,} 티커 × {len(index.log_index):,} 기간 "
+              f"→ {size / 1024:,.0f}KB (float32)")
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] 완료 (~{as_of}) → output/")
+    return len(built[0].tickers)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='티커별 누적 로그수익률 인덱스 생성')
+    parser.add_argument('--weekly', action='store_true', help='주간 인덱스도 기록')
+    args = parser.parse_args(argv)
+    return build_return_index(weekly=args.weekly)
+
+
+if __name__ == '__main__':
+    n = main()
+    sys.exit(0 if n > 0 else 1)
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""build_search_index.py — 자동완성 검색 인덱스
+
+output/etf_data.json (allData) → output/search_index.json
+
+autocomplete.js 가 etf_data.json 전체를 받아 키 입력마다 모든 레코드를 훑는 대신
+이 인덱스(~1,650 티커 · 이름)만 먼저 받아 조회합니다. 규칙 · 포맷은 src/search_index.py.
+
+출력 형식 (search-v1):
+  {
+    "format": "search-v1", "as_of": "2026-10-16",
+    "etfs": [["VOO", "Vanguard S&P 500 ETF"], ...],      ← ID = 위치, AUM 순위 순
+    "by_ticker": [ID, ...],                                ← 티커 사전순 (접두어 = 이진 탐색 구간)
+    "grams": {"VA": [0, 3, 12], "VAN": [...], ...}         ← 이름 단어 앞 2~6글자 → ID 차이값
+  }
+
+Usage:
+    python3 build_search_index.py
+"""
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).parent
+sys.path.insert(0, str(ROOT / 'src'))
+from search_index import SearchIndex
+from serialize import load as load_json, write_json
+
+ETF_DATA_PATH = ROOT / 'output' / 'etf_data.json'
+OUT_PATH = ROOT / 'output' / 'search_index.json'
+
+
+def build_search_index(all_data=None, as_of=None):
+    """all_data: {sid: [etf, ...]} (없으면 etf_data.json 에서 로드) → 인덱스 티커 수"""
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] 검색 인덱스 생성 시작")
+    if all_data is None:
+        raw = load_json(ETF_DATA_PATH)
+        all_data = raw.get('allData', raw)
+        as_of = raw.get('as_of', '')
+    records = [e for etfs in all_data.values() if isinstance(etfs, list) for e in etfs]
+    index = SearchIndex.build(records)
+    write_json(OUT_PATH, index.to_doc(as_of or ''), quiet=True)
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] 완료: {len(index.etfs):,} 티커 · 이름 n-gram {len(index.grams):,}개 "
+          f"→ {os.path.getsize(OUT_PATH) / 1024:,.0f}KB → {OUT_PATH}")
+    return len(index.etfs)
+
+
+def main():
+    return build_search_index()
+
+
+if __name__ == '__main__':
+    n = main()
+    sys.exit(0 if n > 0 else 1)
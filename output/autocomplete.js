@@ -3,6 +3,10 @@
 // 사용법: TickerAC.init(inputEl, getItems, onSelect)
 //   getItems(query)  → [{ticker, name}, ...]
 //   onSelect(ticker, name, inputEl)
+// search-index.js 가 먼저 로드돼 있으면 입력창 첫 포커스 · 첫 조회 때 search_index.json 을 받아
+// acFilter 가 인덱스 결과(이름 단어 검색 · AUM 순)를 먼저 쓰고, max 개가 안 되면 allData 선형 탐색으로 채움
+// (티커 중간 일치 — QQQ → TQQQ · SQQQ). 인덱스는 검색 품질용 — 페이지는 ETF 객체가 필요해서
+// etf_data.json 을 그대로 받으므로 시작 시점에는 받지 않음 (받기 전 · 실패 시에는 선형 탐색만)
 // ─────────────────────────────────────────────────────────────────────────────
 (function () {
   // ── 스타일 주입 ───────────────────────────────────────────
@@ -39,13 +43,39 @@
     if (_active && !_active.contains(e.target)) closeAll();
   }, { passive: true });
 
+  // ── 검색 인덱스 (build_search_index.py) ───────────────────
+  var _index = null;
+  var _indexRequested = false;
+  function loadIndex() {
+    if (_indexRequested || !window.CorryuSearch) return;
+    _indexRequested = true;
+    CorryuSearch.load('/search_index.json')
+      .then(function (idx) { _index = idx; })
+      .catch(function () {});
+  }
+
   // ── 티커 필터 헬퍼 ────────────────────────────────────────
-  // 1순위: 티커가 쿼리로 시작 (길이순 정렬)
-  // 2순위: 티커에 쿼리 포함
-  // 3순위: 이름에 쿼리 포함
+  // allData: {ticker: etf} — 결과는 이 안의 티커만
+  // 인덱스: 티커 접두어 (같은 티커 먼저, AUM 순) → 이름 단어 접두어 (AUM 순)
+  // 선형 탐색 (인덱스 결과 뒤에 채움, 중복 제외):
+  //   1순위: 티커가 쿼리로 시작 (길이순 정렬)
+  //   2순위: 티커에 쿼리 포함
+  //   3순위: 이름에 쿼리 포함
   window.acFilter = function (query, allData, max) {
     max = max || 8;
     if (!query) return [];
+    loadIndex();
+    var hits = _index
+      ? _index.query(query, max).filter(function (h) { return allData[h.ticker]; })
+      : [];
+    if (hits.length >= max) return hits;
+    var picked = {};
+    hits.forEach(function (h) { picked[h.ticker] = 1; });
+    return hits.concat(scan(query, allData).filter(function (h) { return !picked[h.ticker]; }))
+      .slice(0, max);
+  };
+
+  function scan(query, allData) {
     var q = query.toUpperCase();
     var starts = [], contains = [], names = [];
     var seen = {};
@@ -61,8 +91,8 @@
       else if (n.toUpperCase().indexOf(q) >= 0) names.push({ ticker: t, name: n });
     }
     starts.sort(function (a, b) { return a.ticker.length - b.ticker.length; });
-    return starts.concat(contains).concat(names).slice(0, max);
-  };
+    return starts.concat(contains).concat(names);
+  }
 
   // ── 핵심 init 함수 ────────────────────────────────────────
   window.TickerAC = {
@@ -157,6 +187,8 @@
         activeIdx = idx;
       }
 
+      input.addEventListener('focus', loadIndex);
+
       input.addEventListener('input', function () {
         var q = currentQuery();
         if (q.length < 1) { hide(); return; }
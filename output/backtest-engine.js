@@ -0,0 +1,159 @@
+/**
+ * CORRYU — 백테스트 시뮬레이션 엔진 (backtest-engine.js)
+ * ──────────────────────────────────────────────────────────
+ * DOM·fetch 없이 입력 → 결과만 계산하는 순수 함수. backtest.js 의 runBacktest 가 호출하고,
+ * src/backtest.py (배치·프리셋 사전 계산)가 같은 규칙을 벡터화해 따릅니다 — 규칙을 바꾸면 둘 다.
+ *
+ *   CorryuBacktest.simulate(
+ *     { holdings: [{ticker, weight}], period, initVal, benchTicker, dcaFreq, dcaAmount },
+ *     { dataEndYear, annual(ticker, year), firstYear(ticker), monthly(ticker, m) });
+ *
+ *   annual   연간 수익률 (없으면 0)      firstYear  첫 데이터 연도 (모르면 null)
+ *   monthly  월 m(연*12+월-1) 수익률 (없으면 null)
+ */
+(function (global) {
+  'use strict';
+
+  var DCA_EVERY = { monthly: 1, quarterly: 3, semiannual: 6, annually: 12 };
+  var RFR = 0.04;
+
+  // 월 m 포트폴리오 수익률 (월 리밸런싱) — 한 티커라도 그 달 데이터가 없으면 null
+  function monthlyPortReturn(holdings, m, monthly) {
+    var r = 0;
+    for (var i = 0; i < holdings.length; i++) {
+      var v = monthly(holdings[i].ticker, m);
+      if (v === null) return null;
+      r += holdings[i].weight * v;
+    }
+    return r;
+  }
+
+  function simulate(opts, data) {
+    var holdings = opts.holdings, initVal = opts.initVal, benchTicker = opts.benchTicker;
+    var hasBench = benchTicker !== 'none';
+    var dcaAmount = opts.dcaFreq !== 'none' ? opts.dcaAmount : 0;
+    var hasDCA = opts.dcaFreq !== 'none' && dcaAmount > 0;
+
+    var currYear = data.dataEndYear + 1; // 마지막 완성 연도 다음 = 시뮬레이션 상한
+    var userStartYear = currYear - opts.period;
+
+    // constrained startYear: 선택된 모든 ETF의 실제 첫 데이터 연도 기준
+    var allTickers = holdings.map(function (h) { return h.ticker; });
+    if (hasBench) allTickers.push(benchTicker);
+
+    var constrainingTicker = null;
+    var maxFirstYear = userStartYear;
+    allTickers.forEach(function (t) {
+      var fy = data.firstYear(t);
+      if (fy !== null && fy > maxFirstYear) {
+        maxFirstYear = fy;
+        constrainingTicker = t;
+      }
+    });
+    var effectiveStartYear = maxFirstYear;
+    var effectivePeriod = currYear - effectiveStartYear;
+
+    // 연도별 실수익률 사전 빌드
+    var pre = {}; // "TICKER:YEAR" → annual return
+    allTickers.forEach(function (t) {
+      for (var y = effectiveStartYear; y < currYear; y++) pre[t + ':' + y] = data.annual(t, y);
+    });
+
+    // DCA 적립 간격 (월 단위)
+    var dcaEvery = DCA_EVERY[opts.dcaFreq] || Infinity;
+
+    // ── 월별 시뮬레이션 ─────────────────────────────────────
+    var portVal       = initVal;
+    var benchVal      = initVal;
+    var totalInvested = initVal;
+
+    var portSeries     = [{ year: effectiveStartYear, val: initVal }];
+    var benchSeries    = hasBench ? [{ year: effectiveStartYear, val: initVal }] : [];
+    var investedSeries = [{ year: effectiveStartYear, val: initVal }];
+    var monthlyVals    = [initVal]; // MDD 계산용
+    var annualData     = [];
+
+    var portYearStart  = initVal;
+    var benchYearStart = initVal;
+
+    for (var m = 0; m < effectivePeriod * 12; m++) {
+      var year      = effectiveStartYear + Math.floor(m / 12);
+      var monthOfYr = m % 12;
+
+      // 실제 월 수익률 우선, 그 달 데이터가 없으면 연간 수익률 → 월 수익률 근사
+      var mKey        = year * 12 + monthOfYr;
+      var portAnnual  = holdings.reduce(function (s, h) { return s + h.weight * (pre[h.ticker + ':' + year] || 0); }, 0);
+      var benchAnnual = hasBench ? (pre[benchTicker + ':' + year] || 0) : 0;
+      var portMo  = monthlyPortReturn(holdings, mKey, data.monthly);
+      if (portMo === null) portMo = Math.pow(1 + portAnnual, 1 / 12) - 1;
+      var benchMo = hasBench ? data.monthly(benchTicker, mKey) : null;
+      if (benchMo === null) benchMo = Math.pow(1 + benchAnnual, 1 / 12) - 1;
+
+      portVal  *= (1 + portMo);
+      benchVal *= (1 + benchMo);
+
+      // 적립식 입금 (m=0은 초기 납입이므로 스킵)
+      if (hasDCA && m > 0 && m % dcaEvery === 0) {
+        portVal       += dcaAmount;
+        totalInvested += dcaAmount;
+      }
+
+      monthlyVals.push(portVal);
+
+      // 연말 데이터 기록
+      if (monthOfYr === 11) {
+        annualData.push({
+          year: year,
+          portRet:  portVal  / portYearStart  - 1,
+          benchRet: hasBench ? benchVal / benchYearStart - 1 : 0,
+        });
+        portSeries.push({ year: year + 1, val: portVal });
+        investedSeries.push({ year: year + 1, val: totalInvested });
+        if (hasBench) benchSeries.push({ year: year + 1, val: benchVal });
+        portYearStart  = portVal;
+        benchYearStart = benchVal;
+      }
+    }
+
+    // ── 통계 ────────────────────────────────────────────────
+    var portReturns = annualData.map(function (d) { return d.portRet; });
+    var n    = portReturns.length;
+    var mean = portReturns.reduce(function (s, r) { return s + r; }, 0) / n;
+    var vol  = Math.sqrt(portReturns.reduce(function (s, r) { return s + Math.pow(r - mean, 2); }, 0) / Math.max(n - 1, 1)) * 100;
+
+    // MDD (월별 기준)
+    var peak = monthlyVals[0], mdd = 0;
+    monthlyVals.forEach(function (v) {
+      peak = Math.max(peak, v);
+      mdd  = Math.min(mdd, (v - peak) / peak);
+    });
+
+    // 수익률
+    var totalGain = portVal - totalInvested;
+    var totalRet  = (portVal / totalInvested - 1) * 100;
+    // DCA 없을 때는 initVal 기준 CAGR, DCA 있을 때는 최종/납입 기준 단순연환산
+    var cagr = hasDCA
+      ? (Math.pow(Math.max(portVal / totalInvested, 1e-6), 1 / n) - 1) * 100
+      : (Math.pow(portVal / initVal, 1 / n) - 1) * 100;
+
+    var sharpe = vol > 0 ? (cagr / 100 - RFR) / (vol / 100) : 0;
+    var downR  = portReturns.filter(function (r) { return r < 0; });
+    var downD  = Math.sqrt(downR.reduce(function (s, r) { return s + r * r; }, 0) / Math.max(n, 1));
+    var sortino = downD > 0 ? (cagr / 100 - RFR) / downD : 5;
+
+    var benchCAGR = hasBench ? (Math.pow(benchVal / initVal, 1 / n) - 1) * 100 : null;
+    var alpha = benchCAGR != null ? cagr - benchCAGR : null;
+
+    return {
+      effectiveStartYear: effectiveStartYear, effectivePeriod: effectivePeriod, constrainingTicker: constrainingTicker,
+      portSeries: portSeries, benchSeries: benchSeries, investedSeries: investedSeries, annualData: annualData,
+      hasDCA: hasDCA, dcaAmount: dcaAmount,
+      stats: { cagr: cagr, vol: vol, mdd: mdd * 100, sharpe: sharpe, sortino: sortino, totalRet: totalRet, alpha: alpha,
+               initVal: initVal, totalInvested: totalInvested, portVal: portVal, totalGain: totalGain },
+    };
+  }
+
+  var api = { simulate: simulate, DCA_EVERY: DCA_EVERY, RFR: RFR };
+  if (typeof module !== 'undefined' && module.exports) module.exports = api;
+  else global.CorryuBacktest = api;
+})(typeof window !== 'undefined' ? window : this);
@@ -14,7 +14,8 @@ const PRESETS_DEF = {
 // 상태
 // ─────────────────────────────────────────────────────────────────────────────
 let allData = {};
-let btData  = {};          // 실제 연도별 수익률 {TICKER: {YEAR: return}}
+let btData  = {};          // 실제 연도별 수익률 {TICKER: [firstYear, [r, ...]]}
+const btMonthly = CorryuMonthly.open('/bt-monthly/');  // 실제 월간 수익률 (포트폴리오 티커만 로드)
 let DATA_END_YEAR = 2025;  // backtest_data.json 마지막 연도 (로드 후 갱신)
 let period  = 5;
 let lastResult = null;
@@ -107,11 +108,26 @@ function loadPreset(key) {
 // ─────────────────────────────────────────────────────────────────────────────
 // 실데이터 수익률 조회 (backtest_data.json 기반)
 // ─────────────────────────────────────────────────────────────────────────────
+// backtest-v2 {returns: {T: [firstYear, [r...]]}} 또는 이전 형식 {T: {YEAR: r}} → {T: [firstYear, [r...]]}
+function normalizeBacktestData(json) {
+  if (json.format === 'backtest-v2') return json.returns;
+  const out = {};
+  for (const [ticker, rec] of Object.entries(json)) {
+    const years = Object.keys(rec).map(Number).filter(y => rec[String(y)] !== null);
+    if (!years.length) continue;
+    const first = Math.min(...years), last = Math.max(...years);
+    const vals = [];
+    for (let y = first; y <= last; y++) vals.push(rec[String(y)] ?? null);
+    out[ticker] = [first, vals];
+  }
+  return out;
+}
+
 function getActualReturn(ticker, year) {
   const rec = btData[ticker];
   if (rec) {
-    const v = rec[String(year)];
-    if (v !== undefined) return v;
+    const v = rec[1][year - rec[0]];
+    if (v !== undefined && v !== null) return v;
   }
   // 데이터 없는 연도 → 0으로 처리 (effectiveStartYear 이후만 계산하므로 극히 드문 케이스)
   return 0;
@@ -119,10 +135,7 @@ function getActualReturn(ticker, year) {
 
 function getETFFirstYear(ticker) {
   const rec = btData[ticker];
-  if (rec) {
-    const years = Object.keys(rec).map(Number).filter(y => rec[String(y)] !== null && rec[String(y)] !== undefined);
-    if (years.length > 0) return Math.min(...years);
-  }
+  if (rec) return rec[0];   // 구간 첫 값은 항상 유효 (생성 시 앞뒤 결측 제거)
   const etf = allData[ticker];
   if (etf && etf.inception_date && etf.inception_date !== '1900-01-01') {
     return new Date(etf.inception_date).getFullYear() + 1;
@@ -158,131 +171,24 @@ function runBacktest() {
   }
   const dcaFreq   = document.getElementById('dca-freq').value;
   const dcaAmount = dcaFreq !== 'none' ? (parseFloat(document.getElementById('dca-amt').value) || 0) : 0;
-  const hasDCA    = dcaFreq !== 'none' && dcaAmount > 0;
-
-  const currYear  = DATA_END_YEAR + 1; // 마지막 완성 연도 다음 = 시뮬레이션 상한
-  const userStartYear = currYear - period;
 
-  // constrained startYear: 선택된 모든 ETF의 실제 첫 데이터 연도 기준
   const allTickers = [...holdings.map(h => h.etf.ticker)];
   if (benchTicker !== 'none') allTickers.push(benchTicker);
 
-  let constrainingTicker = null;
-  let maxFirstYear = userStartYear;
-  for (const t of allTickers) {
-    const fy = getETFFirstYear(t);
-    if (fy !== null && fy > maxFirstYear) {
-      maxFirstYear = fy;
-      constrainingTicker = t;
-    }
-  }
-  const effectiveStartYear = maxFirstYear;
-  const effectivePeriod = currYear - effectiveStartYear;
-
-  // 연도별 실수익률 사전 빌드
-  const pre = {}; // "TICKER:YEAR" → annual return
-  for (const h of holdings) {
-    for (let y = effectiveStartYear; y < currYear; y++)
-      pre[h.etf.ticker + ':' + y] = getActualReturn(h.etf.ticker, y);
-  }
-  if (benchTicker !== 'none') {
-    for (let y = effectiveStartYear; y < currYear; y++)
-      pre[benchTicker + ':' + y] = getActualReturn(benchTicker, y);
-  }
-
-  // DCA 적립 간격 (월 단위)
-  const dcaEvery = { monthly: 1, quarterly: 3, semiannual: 6, annually: 12 }[dcaFreq] ?? Infinity;
-
-  // ── 월별 시뮬레이션 ─────────────────────────────────────
-  let portVal       = initVal;
-  let benchVal      = initVal;
-  let totalInvested = initVal;
+  // 월간 실수익률 파일을 먼저 받은 뒤 다시 실행 (없는 티커는 연간 데이터로 폴백)
+  if (!btMonthly.loaded(allTickers)) { btMonthly.ensure(allTickers).then(runBacktest); return; }
 
-  const portSeries     = [{ year: effectiveStartYear, val: initVal }];
-  const benchSeries    = benchTicker !== 'none' ? [{ year: effectiveStartYear, val: initVal }] : [];
-  const investedSeries = [{ year: effectiveStartYear, val: initVal }];
-  const monthlyVals    = [initVal]; // MDD 계산용
-  const annualData     = [];
-
-  let portYearStart  = initVal;
-  let benchYearStart = initVal;
-
-  for (let m = 0; m < effectivePeriod * 12; m++) {
-    const year      = effectiveStartYear + Math.floor(m / 12);
-    const monthOfYr = m % 12;
-
-    // 연간 수익률 → 월 수익률
-    const portAnnual  = holdings.reduce((s, h) => s + h.weight * (pre[h.etf.ticker + ':' + year] || 0), 0);
-    const benchAnnual = benchTicker !== 'none' ? (pre[benchTicker + ':' + year] || 0) : 0;
-    const portMo  = Math.pow(1 + portAnnual,  1 / 12) - 1;
-    const benchMo = Math.pow(1 + benchAnnual, 1 / 12) - 1;
-
-    portVal  *= (1 + portMo);
-    benchVal *= (1 + benchMo);
-
-    // 적립식 입금 (m=0은 초기 납입이므로 스킵)
-    if (hasDCA && m > 0 && m % dcaEvery === 0) {
-      portVal       += dcaAmount;
-      totalInvested += dcaAmount;
-    }
-
-    monthlyVals.push(portVal);
-
-    // 연말 데이터 기록
-    if (monthOfYr === 11) {
-      annualData.push({
-        year,
-        portRet:  portVal  / portYearStart  - 1,
-        benchRet: benchTicker !== 'none' ? benchVal / benchYearStart - 1 : 0,
-      });
-      portSeries.push({ year: year + 1, val: portVal });
-      investedSeries.push({ year: year + 1, val: totalInvested });
-      if (benchTicker !== 'none') benchSeries.push({ year: year + 1, val: benchVal });
-      portYearStart  = portVal;
-      benchYearStart = benchVal;
-    }
-  }
-
-  // ── 통계 ────────────────────────────────────────────────
-  const portReturns = annualData.map(d => d.portRet);
-  const n    = portReturns.length;
-  const mean = portReturns.reduce((s, r) => s + r, 0) / n;
-  const vol  = Math.sqrt(portReturns.reduce((s, r) => s + (r - mean) ** 2, 0) / Math.max(n - 1, 1)) * 100;
-
-  // MDD (월별 기준)
-  let peak = monthlyVals[0], mdd = 0;
-  for (const v of monthlyVals) {
-    peak = Math.max(peak, v);
-    mdd  = Math.min(mdd, (v - peak) / peak);
-  }
+  // 시뮬레이션·통계는 backtest-engine.js (src/backtest.py 와 같은 규칙)
+  const result = CorryuBacktest.simulate(
+    { holdings: holdings.map(h => ({ ticker: h.etf.ticker, weight: h.weight })),
+      period, initVal, benchTicker, dcaFreq, dcaAmount },
+    { dataEndYear: DATA_END_YEAR, annual: getActualReturn, firstYear: getETFFirstYear,
+      monthly: (t, m) => btMonthly.ret(t, m) });
 
-  // 수익률
-  const totalGain = portVal - totalInvested;
-  const totalRet  = (portVal / totalInvested - 1) * 100;
-  // DCA 없을 때는 initVal 기준 CAGR, DCA 있을 때는 최종/납입 기준 단순연환산
-  const cagr = hasDCA
-    ? (Math.pow(Math.max(portVal / totalInvested, 1e-6), 1 / n) - 1) * 100
-    : (Math.pow(portVal / initVal, 1 / n) - 1) * 100;
-
-  const rfr = 0.04;
-  const sharpe = vol > 0 ? (cagr / 100 - rfr) / (vol / 100) : 0;
-  const downR  = portReturns.filter(r => r < 0);
-  const downD  = Math.sqrt(downR.reduce((s, r) => s + r ** 2, 0) / Math.max(n, 1));
-  const sortino = downD > 0 ? (cagr / 100 - rfr) / downD : 5;
-
-  const benchCAGR = benchTicker !== 'none'
-    ? (Math.pow(benchVal / initVal, 1 / n) - 1) * 100 : null;
-  const alpha = benchCAGR != null ? cagr - benchCAGR : null;
-
-  lastResult = {
-    holdings, period, effectiveStartYear, effectivePeriod, constrainingTicker,
-    portSeries, benchSeries, investedSeries, annualData, benchTicker,
-    hasDCA, dcaAmount, dcaFreq,
-    stats: { cagr, vol, mdd: mdd * 100, sharpe, sortino, totalRet, alpha, initVal, totalInvested, portVal, totalGain },
-  };
+  lastResult = { ...result, holdings, period, benchTicker, dcaFreq };
 
   showResults(lastResult);
-  renderConstraintNote(constrainingTicker, effectiveStartYear, DATA_END_YEAR);
+  renderConstraintNote(result.constrainingTicker, result.effectiveStartYear, DATA_END_YEAR);
 }
 
 // ─────────────────────────────────────────────────────────────────────────────
@@ -603,10 +509,10 @@ Promise.all([
     for (const etf of etfs) allData[etf.ticker] = { ...etf, _sid: sid };
   }
   // 실수익률 데이터 로드
-  btData = btJson;
+  btData = normalizeBacktestData(btJson);
   // 마지막 완성 연도 계산 (SPY 기준, 없으면 기본값 유지)
   if (btData['SPY']) {
-    DATA_END_YEAR = Math.max(...Object.keys(btData['SPY']).map(Number));
+    DATA_END_YEAR = btData['SPY'][0] + btData['SPY'][1].length - 1;
   }
   lb.style.width = '100%';
   setTimeout(() => { lb.style.width = '0'; lb.style.transition = 'none'; }, 400);
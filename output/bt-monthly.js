@@ -0,0 +1,64 @@
+/**
+ * CORRYU — 월간 총수익률 로더 (bt-monthly.js)
+ * ──────────────────────────────────────────────────────────
+ * /bt-monthly/{TICKER}.bin (bt-monthly-v1) 을 포트폴리오 티커만 받아 디코딩합니다.
+ * 생성기: build_backtest_monthly.py
+ *   헤더 int32 start(연*12+월-1) · float32 scale · int32 length, 본문 int16 × length (결측 -32768)
+ *
+ *   const src = CorryuMonthly.open('/bt-monthly/');
+ *   src.ensure(['SPY', 'BND']).then(() => src.ret('SPY', 2020 * 12 + 2));  // 2020-03 수익률 (없으면 null)
+ */
+(function (global) {
+  'use strict';
+
+  var FORMAT = 'bt-monthly-v1';
+  var HEADER = 12;
+  var MISSING = -32768;
+
+  // 파일 버퍼 → {start, values: Float64Array (결측 NaN)}
+  function decode(buf) {
+    var view = new DataView(buf);
+    var start = view.getInt32(0, true), scale = view.getFloat32(4, true), length = view.getInt32(8, true);
+    var values = new Float64Array(length);
+    for (var i = 0; i < length; i++) {
+      var q = view.getInt16(HEADER + i * 2, true);
+      values[i] = q === MISSING ? NaN : q * scale;
+    }
+    return { start: start, values: values };
+  }
+
+  function open(baseUrl) {
+    var series = {}, pending = {};
+
+    function load(ticker) {
+      if (series.hasOwnProperty(ticker)) return Promise.resolve();
+      if (!pending[ticker]) {
+        pending[ticker] = fetch(baseUrl + encodeURIComponent(ticker) + '.bin')
+          .then(function (r) {
+            if (!r.ok) throw new Error(ticker + ': HTTP ' + r.status);
+            return r.arrayBuffer();
+          })
+          .then(function (buf) { series[ticker] = decode(buf); })
+          .catch(function () { series[ticker] = null; })   // 없는 티커 → 연간 데이터로 폴백
+          .then(function () { delete pending[ticker]; });
+      }
+      return pending[ticker];
+    }
+
+    return {
+      loaded: function (tickers) { return tickers.every(function (t) { return series.hasOwnProperty(t); }); },
+      ensure: function (tickers) { return Promise.all(tickers.map(load)); },
+      // 월 m (연*12+월-1) 수익률, 데이터 없으면 null
+      ret: function (ticker, m) {
+        var s = series[ticker];
+        if (!s) return null;
+        var v = s.values[m - s.start];
+        return v === undefined || v !== v ? null : v;
+      },
+    };
+  }
+
+  var api = { FORMAT: FORMAT, open: open, decode: decode };
+  if (typeof module !== 'undefined' && module.exports) module.exports = api;
+  else global.CorryuMonthly = api;
+})(typeof window !== 'undefined' ? window : this);
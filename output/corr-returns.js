@@ -0,0 +1,106 @@
+/**
+ * CORRYU — 월간 수익률 지연 로더 (corr-returns.js)
+ * ──────────────────────────────────────────────────────────
+ * corr_returns_index.json(corr-bin-v1) 만 먼저 받고, 티커별 수익률은
+ * corr_returns.bin 에서 필요한 바이트 범위만 Range 요청으로 가져옵니다.
+ * 생성기: build_corr_data.py (float32 little-endian, 결측 NaN)
+ *
+ *   CorryuCorrReturns.open(인덱스 경로, 바이너리 경로)
+ *     .catch(() => CorryuCorrReturns.openJson(호환 JSON 경로))   // 인덱스 없으면 기존 포맷
+ *     .then(src => src.ensure(['SPY', 'TLT']).then(() => src.entry('SPY')));  // [start_idx, [r...]]
+ *
+ * 서버가 Range 를 무시하고 200 전체를 주면 그 버퍼를 보관해 이후 티커는 추가 요청 없이 읽습니다.
+ * 같은 레이아웃의 다른 산출물은 format 을 넘겨 재사용 (return-index.js — retidx-v1).
+ */
+(function (global) {
+  'use strict';
+
+  var FORMAT = 'corr-bin-v1';
+  var ITEM = 4;  // float32
+
+  // buf[byteOffset...] 의 float32 length개 → 값 배열 (NaN → null, JSON 과 같은 자릿수로 반올림)
+  function decodeRange(buf, byteOffset, length, decimals) {
+    var view = new DataView(buf, byteOffset, length * ITEM);
+    var scale = Math.pow(10, decimals), out = new Array(length);
+    for (var i = 0; i < length; i++) {
+      var v = view.getFloat32(i * ITEM, true);
+      out[i] = v !== v ? null : Math.round(v * scale) / scale;
+    }
+    return out;
+  }
+
+  function fetchJson(url) {
+    return fetch(url).then(function (r) {
+      if (!r.ok) throw new Error(url + ': HTTP ' + r.status);
+      return r.json();
+    });
+  }
+
+  function open(indexUrl, binUrl, format) {
+    return fetchJson(indexUrl).then(function (idx) {
+      if (idx.format !== (format || FORMAT)) throw new Error('unknown format: ' + idx.format);
+      var entries = {}, pending = {}, whole = null, fetched = 0;
+      var rangeOk = null;  // 첫 응답 전에는 서버의 Range 지원 여부를 모름
+
+      function load(ticker) {
+        var e = idx.tickers[ticker];
+        if (!e || entries.hasOwnProperty(ticker)) return Promise.resolve();
+        if (pending[ticker]) return pending[ticker];
+        var offset = e[0], start = e[1], length = e[2];
+        var p = whole
+          ? Promise.resolve({ buf: whole, base: offset })
+          : fetch(binUrl, { headers: { Range: 'bytes=' + offset + '-' + (offset + length * ITEM - 1) } })
+              .then(function (r) {
+                if (!r.ok) throw new Error(binUrl + ': HTTP ' + r.status);
+                return r.arrayBuffer().then(function (buf) {
+                  fetched += buf.byteLength;
+                  rangeOk = r.status === 206;
+                  if (rangeOk) return { buf: buf, base: 0 };
+                  whole = buf;                       // Range 미지원 서버 — 전체 보관
+                  return { buf: buf, base: offset };
+                });
+              });
+        pending[ticker] = p.then(function (res) {
+          entries[ticker] = [start, decodeRange(res.buf, res.base, length, idx.decimals)];
+        }).catch(function () { entries[ticker] = null; })  // 실패한 티커는 추정값 폴백
+          .then(function () { delete pending[ticker]; });
+        return pending[ticker];
+      }
+
+      return {
+        index: idx,
+        dates: idx.dates,
+        asOf: idx.as_of,
+        has: function (ticker) { return idx.tickers.hasOwnProperty(ticker); },
+        loaded: function (ticker) { return !idx.tickers.hasOwnProperty(ticker) || entries.hasOwnProperty(ticker); },
+        // 지원 여부를 모르면 한 티커로 먼저 확인 — 미지원 서버에서 전체 파일을 여러 번 받지 않도록
+        ensure: function (tickers) {
+          tickers = tickers.filter(function (t) { return idx.tickers.hasOwnProperty(t); });
+          if (rangeOk !== null || tickers.length < 2) return Promise.all(tickers.map(load));
+          return load(tickers[0]).then(function () { return Promise.all(tickers.slice(1).map(load)); });
+        },
+        entry: function (ticker) { return entries[ticker] || null; },
+        bytesFetched: function () { return fetched; },
+      };
+    });
+  }
+
+  // 호환 포맷 corr_returns.json 을 같은 인터페이스로 (전체 1회 다운로드)
+  function openJson(url) {
+    return fetchJson(url).then(function (d) {
+      return {
+        dates: d.dates,
+        asOf: d.as_of,
+        has: function (ticker) { return d.returns.hasOwnProperty(ticker); },
+        loaded: function () { return true; },
+        ensure: function () { return Promise.resolve(); },
+        entry: function (ticker) { return d.returns[ticker] || null; },
+        bytesFetched: function () { return 0; },
+      };
+    });
+  }
+
+  var api = { FORMAT: FORMAT, open: open, openJson: openJson, decodeRange: decodeRange };
+  if (typeof module !== 'undefined' && module.exports) module.exports = api;
+  else global.CorryuCorrReturns = api;
+})(typeof window !== 'undefined' ? window : this);
@@ -0,0 +1,70 @@
+/**
+ * CORRYU — 열 지향 allData 디코더 (etf-columnar.js)
+ * ──────────────────────────────────────────────────────────
+ * etf_data_columnar.json 의 allData(columnar-v1)를 섹터 단위로 지연 복원합니다.
+ * 인코더: src/columnar.py (같은 규칙)
+ *
+ *   fetch(열 지향 JSON 경로).then(r => r.json()).then(d => {
+ *     const cols = CorryuColumnar.wrap(d.allData);
+ *     cols.sector('S01');        // 처음 접근할 때만 행 객체 생성 (이후 캐시)
+ *     cols.toAllData();          // 전 섹터 → 기존 allData 와 같은 모양
+ *   });
+ */
+(function (global) {
+  'use strict';
+
+  var FORMAT = 'columnar-v1';
+  var DICT_FIELDS = { legacy_reasons: true, legacy_detail: true };
+
+  function decodeSector(doc, sid) {
+    var sec = doc.sectors[sid];
+    if (!sec) return [];
+    var words = doc.dict, fields = doc.fields, cols = sec.cols, n = sec.n;
+    var bools = {};
+    for (var b = 0; b < doc.bools.length; b++) bools[doc.bools[b]] = true;
+
+    var rows = new Array(n);
+    for (var i = 0; i < n; i++) rows[i] = {};
+    for (var k = 0; k < fields.length; k++) {
+      var f = fields[k], col = cols[f];
+      if (DICT_FIELDS[f]) {
+        for (var r = 0; r < n; r++) {
+          var codes = col[r], strs = new Array(codes.length);
+          for (var c = 0; c < codes.length; c++) strs[c] = words[codes[c]];
+          rows[r][f] = strs;
+        }
+      } else if (bools[f]) {
+        for (var r2 = 0; r2 < n; r2++) rows[r2][f] = col[r2] === 1;
+      } else {
+        for (var r3 = 0; r3 < n; r3++) rows[r3][f] = col[r3];
+      }
+    }
+    return rows;
+  }
+
+  function wrap(doc) {
+    if (!doc || doc.format !== FORMAT) throw new Error('unknown allData format: ' + (doc && doc.format));
+    var cache = {};
+    return {
+      sectorIds: function () { return Object.keys(doc.sectors); },
+      count: function (sid) { return doc.sectors[sid] ? doc.sectors[sid].n : 0; },
+      // 한 필드만 필요하면 행 복원 없이 열 그대로 (정렬·필터용)
+      column: function (sid, field) { return doc.sectors[sid] ? doc.sectors[sid].cols[field] : []; },
+      sector: function (sid) {
+        if (!cache.hasOwnProperty(sid)) cache[sid] = decodeSector(doc, sid);
+        return cache[sid];
+      },
+      toAllData: function () {
+        var out = {};
+        for (var sid in doc.sectors) {
+          if (doc.sectors.hasOwnProperty(sid)) out[sid] = this.sector(sid);
+        }
+        return out;
+      },
+    };
+  }
+
+  var api = { FORMAT: FORMAT, wrap: wrap, decodeSector: decodeSector };
+  if (typeof module !== 'undefined' && module.exports) module.exports = api;
+  else global.CorryuColumnar = api;
+})(typeof window !== 'undefined' ? window : this);
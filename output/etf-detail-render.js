@@ -63,6 +63,23 @@ async function loadPriceHistory(ticker) {
   return all.length >= 20 ? all : null;
 }
 
+// ── 사전 계산 이력 (/etf-data/{T}.json history: 주간 + 최근 1년 일별, LTTB) ──
+// Supabase 를 못 쓸 때 차트 폴백 — 종가만 있으므로 open/high/low 도 종가, volume 없음
+function embeddedHistory(h) {
+  if (!h) return null;
+  const rows = [];
+  ['w', 'd'].forEach(k => {
+    const seg = h[k];
+    if (!seg) return;
+    seg.t.forEach((t, i) => {
+      const c = seg.c[i];
+      rows.push({ date: new Date(t * 864e5).toISOString().split('T')[0],
+                  open: c, high: c, low: c, close: c, adj_close: c, volume: null });
+    });
+  });
+  return rows.length >= 20 ? rows : null;
+}
+
 // ── 기간별 수익률 계산 ────────────────────────────────────────────────────────
 function calcPeriodReturn(history, calDays) {
   const now = history[history.length - 1].close;
@@ -3,7 +3,7 @@
 // 의존성 (로드 순서):
 //   1. etf-detail-data.js    — SUPP, SECTOR_NAMES, inferIssuer
 //   2. etf-detail-charts.js  — 공유 상태 변수, 차트 함수
-//   3. etf-detail-render.js  — 포맷 헬퍼, renderPage, loadPriceHistory
+//   3. etf-detail-render.js  — 포맷 헬퍼, renderPage, loadPriceHistory, embeddedHistory
 //   4. etf-detail.js         — 이 파일 (진입점)
 //   5. etf-detail-comments.js — 댓글 + 좋아요 IIFE
 // ─────────────────────────────────────────────────────────────────────────────
@@ -52,7 +52,7 @@ I18n.init();
 let _i18nReady = false;
 document.addEventListener('i18n:ready', () => { _i18nReady = true; });
 
-function _applyEtfData(found, foundSid) {
+function _applyEtfData(found, foundSid, history) {
   // localStorage 오버라이드 반영 (읽기 전용)
   const ov = JSON.parse(localStorage.getItem('corryu_user_overrides') || '{}');
   if (ov[TICKER]) {
@@ -60,7 +60,7 @@ function _applyEtfData(found, foundSid) {
     if (ov[TICKER].is_legacy) found._user_override = true;
   }
   renderPage(found, foundSid);
-  loadPriceHistory(found.ticker).then(hist => {
+  loadPriceHistory(found.ticker).then(hist => hist || embeddedHistory(history)).then(hist => {
     if (hist) {
       priceHistory = hist;
       initPriceChart(document.getElementById('chart-container'), hist, currentChartType);
@@ -99,7 +99,7 @@ function _showLoadError() {
 // ※ /etf-data/ 경로 사용 — /etf/:ticker rewrite 충돌 방지
 fetch('/etf-data/' + TICKER + '.json')
   .then(r => { if (!r.ok) throw new Error('no per-ticker file'); return r.json(); })
-  .then(d => { _applyEtfData(d.etf, d.sid); })
+  .then(d => { _applyEtfData(d.etf, d.sid, d.history); })
   .catch(() =>
     fetch('/etf_data.json')
       .then(r => { if (!r.ok) throw new Error('fetch failed'); return r.json(); })
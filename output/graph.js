@@ -25,6 +25,11 @@ let hideLegacy       = false;
 let focusSector      = null;   // 레전드 클릭으로 선택된 섹터 ID (or 'SS_<id>')
 let superSectorMode  = false;  // 슈퍼섹터 통합 색상 토글
 let superSectorMeta  = {};     // graph_data.json 에서 로드
+let layouts          = null;   // 임계값별 사전 계산 좌표 {'0.90': [x0, y0, ...]} (없으면 브라우저 시뮬레이션)
+let layoutKey        = null;   // 현재 노드 좌표가 어느 임계값 배치인지
+let edgeBands        = [];     // graph_data.json meta.edge_bands — r 구간별 엣지 파일 (받은 구간만 allLinks 에)
+let edgeIndexBytes   = 2;      // 엣지 파일 노드 번호 크기 (uint16 / uint32)
+let pendingR         = DEFAULT_R;  // 슬라이더 최신 값 (구간 파일 도착 전에 또 움직이면 이전 값은 버림)
 
 // ── 색상 조절 헬퍼 ──────────────────────────────
 function darkenColor(hex, percent) {
@@ -206,27 +211,78 @@ function showLayoutOverlay(show, msg) {
   if (msg) document.getElementById('layout-msg').textContent = msg;
 }
 
+// ── r 구간별 엣지 파일 (graph-edges-v1) ────────────────
+// [source 번호 × n][target 번호 × n][r×1000 uint16 × n] — 번호는 nodes 순서
+function fetchBand(band) {
+  if (!band.promise) {
+    band.promise = fetch(band.file + '?v=' + band.v)
+      .then(res => {
+        if (!res.ok) throw new Error(`HTTP ${res.status}`);
+        return res.arrayBuffer();
+      })
+      .then(buf => {
+        const n = band.count;
+        const Idx = edgeIndexBytes === 4 ? Uint32Array : Uint16Array;
+        const src = new Idx(buf, 0, n);
+        const tgt = new Idx(buf, n * Idx.BYTES_PER_ELEMENT, n);
+        const r = new Uint16Array(buf, 2 * n * Idx.BYTES_PER_ELEMENT, n);
+        for (let i = 0; i < n; i++) {
+          allLinks.push({ s: allNodes[src[i]].id, t: allNodes[tgt[i]].id, r: r[i] / 1000 });
+        }
+      })
+      .catch(err => { band.promise = null; throw err; });  // 다음 슬라이더 이동 때 재시도
+  }
+  return band.promise;
+}
+
+// minR 이상 엣지가 들어 있는 구간을 모두 받음 (이미 받은 구간은 그대로)
+function ensureEdges(minR) {
+  return Promise.all(edgeBands.filter(b => b.max === null || b.max > minR).map(fetchBand));
+}
+
+// ── 사전 계산 좌표 적용 (build_graph.py layouts) ──────
+// 슬라이더에 가장 가까운 임계값 배치로 전체 노드 좌표를 바꿈 → 사용했으면 true
+function applyLayout(minR) {
+  if (!layouts) return false;
+  let key = null;
+  Object.keys(layouts).forEach(k => {
+    if (key === null || Math.abs(parseFloat(k) - minR) < Math.abs(parseFloat(key) - minR)) key = k;
+  });
+  if (key !== layoutKey) {
+    const xy = layouts[key];
+    allNodes.forEach((n, i) => {
+      n.x = xy[2 * i]; n.y = xy[2 * i + 1];
+      n.vx = 0; n.vy = 0;
+    });
+    layoutKey = key;
+  }
+  return true;
+}
+
 // ── 필터 적용 (슬라이더 변경 시) ───────────────────────
 function applyFilter(minR) {
   currentR = minR;
+  const precomputed = applyLayout(minR);
 
   // 신규 등장 노드 좌표 초기화 (레거시 토글 시 undefined → (0,0) 폭발 방지)
-  const currentlyVisibleIds = new Set(
-    (Graph && Graph.graphData ? Graph.graphData().nodes : []).map(n => n.id)
-  );
-  let cx = 0, cy = 0, cnt = 0;
-  allNodes.forEach(n => {
-    if (currentlyVisibleIds.has(n.id) && n.x !== undefined) {
-      cx += n.x; cy += n.y; cnt++;
-    }
-  });
-  if (cnt > 0) { cx /= cnt; cy /= cnt; }
-  allNodes.forEach(n => {
-    if (!currentlyVisibleIds.has(n.id) && n.x === undefined) {
-      n.x = cx + (Math.random() - 0.5) * 100;
-      n.y = cy + (Math.random() - 0.5) * 100;
-    }
-  });
+  if (!precomputed) {
+    const currentlyVisibleIds = new Set(
+      (Graph && Graph.graphData ? Graph.graphData().nodes : []).map(n => n.id)
+    );
+    let cx = 0, cy = 0, cnt = 0;
+    allNodes.forEach(n => {
+      if (currentlyVisibleIds.has(n.id) && n.x !== undefined) {
+        cx += n.x; cy += n.y; cnt++;
+      }
+    });
+    if (cnt > 0) { cx /= cnt; cy /= cnt; }
+    allNodes.forEach(n => {
+      if (!currentlyVisibleIds.has(n.id) && n.x === undefined) {
+        n.x = cx + (Math.random() - 0.5) * 100;
+        n.y = cy + (Math.random() - 0.5) * 100;
+      }
+    });
+  }
 
   const visibleNodes = allNodes
     .filter(n => !hideLegacy || !n.l)
@@ -234,6 +290,7 @@ function applyFilter(minR) {
     .filter(n => !hiddenSectors.has(n.s));
   const visibleIds   = new Set(visibleNodes.map(n => n.id));
   const filtered     = allLinks.filter(l => l.r >= minR && visibleIds.has(l.s) && visibleIds.has(l.t));
+  Graph.cooldownTicks(precomputed ? 0 : Infinity);  // 사전 좌표면 시뮬레이션 없이 그대로 렌더
   Graph.graphData({ nodes: visibleNodes, links: filtered });
 
   // ── 노드/엣지 수에 비례하는 동적 물리 파라미터 ──
@@ -273,6 +330,11 @@ function applyFilter(minR) {
   Graph.d3Force('y', d3.forceY().strength(0.015));
 
   // ── 하이브리드 렌더링 모드 ──────────────────────────────
+  if (precomputed) {
+    showLayoutOverlay(false);
+    updateStats(allNodes.length, filtered.length, false);
+    return;
+  }
   if (minR < STATIC_THRESHOLD) {
     // 정적 모드: 빠른 감쇠로 즉시 수렴, 오버레이 표시
     const warmTicks = Math.round(50 + (1 - minR) * 500); // r=0.89→55틱, r=0.70→200틱
@@ -304,10 +366,13 @@ fetch('graph_data.json')
     progFill.style.width = '85%';
 
     allNodes        = data.nodes;
-    allLinks        = data.links;
+    allLinks        = data.links || [];  // 구간 파일 이전 형식이면 전체 엣지가 여기에
     sectorMeta      = data.sectors;
     superSectorMeta = data.super_sectors || {};
     storeMinR       = data.meta.store_min_r;
+    layouts         = data.layouts || null;
+    edgeBands       = data.meta.edge_bands || [];
+    edgeIndexBytes  = data.meta.edge_index_bytes || 2;
 
     // 오버라이드 적용 함수 (localStorage + 서버)
     function applyOverrides(ov) {
@@ -533,8 +598,11 @@ fetch('graph_data.json')
     progFill.style.width = '100%';
     setTimeout(() => { progFill.style.width = '0%'; }, 600);
 
-    // 기본 임계값으로 데이터 적용
-    applyFilter(DEFAULT_R);
+    // 기본 임계값 구간만 받아서 적용
+    return ensureEdges(DEFAULT_R).then(() => {
+      applyFilter(DEFAULT_R);
+      if (layouts) setTimeout(() => Graph.zoomToFit(400, 40), 50);
+    });
   })
   .catch(err => {
     console.error(err);
@@ -555,7 +623,10 @@ document.getElementById('graph-container').addEventListener('mousemove', e => {
 document.getElementById('r-slider').addEventListener('input', e => {
   const v = parseInt(e.target.value) / 100;
   document.getElementById('r-val').textContent = v.toFixed(2);
-  applyFilter(v);
+  pendingR = v;
+  ensureEdges(v)
+    .then(() => { if (pendingR === v) applyFilter(v); })
+    .catch(err => console.error(err));
 });
 
 document.getElementById('node-size-slider').addEventListener('input', e => {
@@ -0,0 +1,62 @@
+/**
+ * CORRYU — 누적 로그수익률 인덱스 (return-index.js)
+ * ──────────────────────────────────────────────────────────
+ * return_index_monthly.json(retidx-v1) 을 받고, 티커 구간만 .bin 에서 Range 로 가져와
+ * 임의 구간 수익률을 조회 두 번 + exp 로 계산합니다 (로더는 corr-returns.js 재사용).
+ * 생성기: build_return_index.py — L[k] = ln(기간 k 말 종가 / 첫 종가), 월 키 = 연*12+월-1
+ * 마지막 키(endKey)는 진행 중인 달 = 최신 종가.
+ *
+ *   CorryuReturnIndex.open('/return_index_monthly.json', '/return_index_monthly.bin')
+ *     .then(idx => idx.ensure(['SPY']).then(() => {
+ *       idx.periodReturn('SPY', 2019 * 12 + 11, 2020 * 12 + 11);  // 2019-12 말 → 2020-12 말 (없으면 null)
+ *       idx.trailing('SPY', 36, true);                             // 최근 36개월 연환산
+ *     }));
+ */
+(function (global) {
+  'use strict';
+
+  var FORMAT = 'retidx-v1';
+  var PER_YEAR = { M: 12, W: 52 };
+
+  function monthKey(date) { return date.getFullYear() * 12 + date.getMonth(); }
+
+  function open(indexUrl, binUrl) {
+    var loader = global.CorryuCorrReturns || require('./corr-returns.js');
+    return loader.open(indexUrl, binUrl, FORMAT).then(function (src) {
+      var idx = src.index;
+
+      function at(ticker, key) {
+        var e = src.entry(ticker);
+        if (!e) return null;
+        var v = e[1][key - e[0]];
+        return v === undefined ? null : v;
+      }
+
+      function periodReturn(ticker, a, b) {
+        var la = at(ticker, a), lb = at(ticker, b);
+        return la === null || lb === null ? null : Math.exp(lb - la) - 1;
+      }
+
+      return {
+        freq: idx.freq,
+        endKey: idx.end_key,
+        asOf: idx.as_of,
+        has: src.has,
+        ensure: src.ensure,
+        bytesFetched: src.bytesFetched,
+        periodReturn: periodReturn,
+        // 최근 periods 기간 수익률 — annualize 면 1년 초과 구간만 연환산
+        trailing: function (ticker, periods, annualize) {
+          var r = periodReturn(ticker, idx.end_key - periods, idx.end_key);
+          var perYear = PER_YEAR[idx.freq];
+          if (r === null || !annualize || periods <= perYear) return r;
+          return Math.pow(1 + r, perYear / periods) - 1;
+        },
+      };
+    });
+  }
+
+  var api = { FORMAT: FORMAT, open: open, monthKey: monthKey };
+  if (typeof module !== 'undefined' && module.exports) module.exports = api;
+  else global.CorryuReturnIndex = api;
+})(typeof window !== 'undefined' ? window : this);
@@ -0,0 +1,109 @@
+/**
+ * CORRYU — 자동완성 검색 인덱스 (search-index.js)
+ * ──────────────────────────────────────────────────────────
+ * search_index.json(search-v1) 하나로 티커 접두어 · 펀드명 단어 접두어 조회.
+ * 생성기: build_search_index.py — 규칙은 src/search_index.py SearchIndex.query 와 같음
+ *   ID = AUM 순위 순 etfs 위치 / by_ticker = 티커 사전순 ID / grams = 이름 단어 앞 2~6글자 → ID 차이값
+ *
+ *   CorryuSearch.load('/search_index.json').then(idx => idx.query('nasdaq', 8));  // [{ticker, name}]
+ */
+(function (global) {
+  'use strict';
+
+  var FORMAT = 'search-v1';
+  var GRAM_MIN = 2, GRAM_MAX = 6;
+  var STOPWORDS = { ETF: 1, FUND: 1, THE: 1, OF: 1, AND: 1, INDEX: 1, TRUST: 1 };
+
+  // 대문자 · 악센트 제거 · 영숫자 외 구분자 → 단어 목록
+  function normalize(text) {
+    return String(text || '').normalize('NFKD').replace(/[^\x00-\x7F]/g, '').toUpperCase()
+      .split(/[^0-9A-Z]+/).filter(Boolean);
+  }
+
+  function nameTokens(name) {
+    return normalize(name).filter(function (w) { return !STOPWORDS[w]; });
+  }
+
+  function fromDoc(doc) {
+    if (!doc || doc.format !== FORMAT) throw new Error('unknown search index format: ' + (doc && doc.format));
+    var etfs = doc.etfs, byTicker = doc.by_ticker;
+    var sorted = byTicker.map(function (i) { return etfs[i][0]; });
+    var grams = {};
+    Object.keys(doc.grams).forEach(function (g) {
+      var gaps = doc.grams[g], ids = new Array(gaps.length), acc = 0;
+      for (var k = 0; k < gaps.length; k++) { acc += gaps[k]; ids[k] = acc; }
+      grams[g] = ids;
+    });
+    var tokens = {};
+
+    function lowerBound(key) {
+      var lo = 0, hi = sorted.length;
+      while (lo < hi) {
+        var mid = (lo + hi) >> 1;
+        if (sorted[mid] < key) lo = mid + 1; else hi = mid;
+      }
+      return lo;
+    }
+
+    // prefix 로 시작하는 티커 ID 전부 (AUM 순)
+    function tickerPrefix(prefix) {
+      var out = [];
+      for (var k = lowerBound(prefix); k < sorted.length && sorted[k].lastIndexOf(prefix, 0) === 0; k++) {
+        out.push(byTicker[k]);
+      }
+      return out.sort(function (a, b) { return a - b; });
+    }
+
+    // 검색어의 모든 단어가 이름 단어의 접두어인 ID (AUM 순)
+    function nameMatch(query) {
+      var words = normalize(query).filter(function (w) { return w.length >= GRAM_MIN && !STOPWORDS[w]; });
+      if (!words.length) return [];
+      var lists = words.map(function (w) { return grams[w.slice(0, GRAM_MAX)] || []; })
+        .sort(function (a, b) { return a.length - b.length; });
+      var ids = lists[0];
+      for (var k = 1; k < lists.length; k++) {
+        var keep = new Set(lists[k]);
+        ids = ids.filter(function (i) { return keep.has(i); });
+      }
+      var longWords = words.filter(function (w) { return w.length > GRAM_MAX; });
+      if (longWords.length) {
+        ids = ids.filter(function (i) {
+          var toks = tokens[i] || (tokens[i] = nameTokens(etfs[i][1]));
+          return longWords.every(function (w) {
+            return toks.some(function (t) { return t.lastIndexOf(w, 0) === 0; });
+          });
+        });
+      }
+      return ids;
+    }
+
+    // 1순위 티커 접두어 (같은 티커 먼저) → 2순위 이름 단어 접두어, 최대 limit 개
+    function query(q, limit) {
+      limit = limit || 8;
+      var key = String(q || '').trim().toUpperCase();
+      if (!key) return [];
+      var hits = tickerPrefix(key);
+      for (var k = 1; k < hits.length; k++) {
+        if (etfs[hits[k]][0] === key) { hits.unshift(hits.splice(k, 1)[0]); break; }
+      }
+      if (hits.length < limit) {
+        var taken = new Set(hits);
+        nameMatch(q).forEach(function (i) { if (!taken.has(i)) hits.push(i); });
+      }
+      return hits.slice(0, limit).map(function (i) { return { ticker: etfs[i][0], name: etfs[i][1] }; });
+    }
+
+    return { asOf: doc.as_of, size: etfs.length, query: query, tickerPrefix: tickerPrefix, nameMatch: nameMatch };
+  }
+
+  function load(url) {
+    return fetch(url).then(function (r) {
+      if (!r.ok) throw new Error('HTTP ' + r.status);
+      return r.json();
+    }).then(fromDoc);
+  }
+
+  var api = { FORMAT: FORMAT, normalize: normalize, fromDoc: fromDoc, load: load };
+  if (typeof module !== 'undefined' && module.exports) module.exports = api;
+  else global.CorryuSearch = api;
+})(typeof window !== 'undefined' ? window : this);
@@ -1,6 +1,7 @@
 """render_html.py — HTML 대시보드 렌더러 (모듈형)
 
 output/etf_data.json 을 읽어 output/index.html 을 생성합니다.
+compute_all 은 render(sector_meta) 를 직접 호출해 별도 인터프리터·JSON 재파싱을 생략합니다.
 pandas 불필요 · 단독 실행 가능 · Vercel 빌드 커맨드 진입점
 """
 import json
@@ -13,6 +14,8 @@ ROOT = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, os.path.join(ROOT, 'src'))
 
 from config import SECTOR_DEFS, SUPER_SECTOR_DEFS, ASSET_CLASSES, MY_PORTFOLIO, OUTPUT_DIR, ADMIN_EMAILS
+from build_assets import rewrite_refs, MANIFEST_PATH as ASSETS_MANIFEST
+from serialize import load as load_json
 
 
 def get_head():
@@ -171,8 +174,11 @@ def get_body(total_etfs, total_legacy, total_active, total_sectors, today):
 </body>"""
 
 
-def generate_html(sector_meta):
-    """HTML 대시보드 생성 (데이터는 etf_data.json 에서 fetch, pandas 불필요)"""
+def generate_html(sector_meta, assets=None):
+    """HTML 대시보드 생성 (데이터는 etf_data.json 에서 fetch, pandas 불필요)
+
+    assets: build_assets 의 {'/etf_data.json': '/assets/etf_data.<hash>.json', ...} — 있으면 참조 치환
+    """
     today = datetime.now().strftime('%Y-%m-%d')
     total_etfs    = sum(m['count']  for m in sector_meta.values())
     total_active  = sum(m['active'] for m in sector_meta.values())
@@ -222,20 +228,12 @@ window.CORRYU_CONFIG = {{
 <script src="/nav.js"></script>
 </html>"""
 
-    return html
+    return rewrite_refs(html, assets) if assets else html
 
 
-def main():
-    etf_data_path = os.path.join(OUTPUT_DIR, 'etf_data.json')
-    if not os.path.exists(etf_data_path):
-        print(f"ERROR: {etf_data_path} 없음. scripts/compute_all.py 를 먼저 실행하세요.")
-        sys.exit(1)
-
-    with open(etf_data_path, 'r', encoding='utf-8') as f:
-        etf_data = json.load(f)
-
-    sector_meta = etf_data['sectorMeta']
-    html = generate_html(sector_meta)
+def render(sector_meta, assets=None):
+    """sector_meta로 output/index.html 작성 (compute_all 에서 인프로세스 호출)"""
+    html = generate_html(sector_meta, assets)
 
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     out_path = os.path.join(OUTPUT_DIR, 'index.html')
@@ -247,6 +245,22 @@ def main():
     legacy = sum(m['legacy'] for m in sector_meta.values())
     print(f"HTML 생성 완료: {out_path}")
     print(f"  전체 {total:,}개 | Active {active:,}개 | Legacy {legacy:,}개")
+    return out_path
+
+
+def main():
+    etf_data_path = os.path.join(OUTPUT_DIR, 'etf_data.json')
+    if not os.path.exists(etf_data_path):
+        print(f"ERROR: {etf_data_path} 없음. scripts/compute_all.py 를 먼저 실행하세요.")
+        sys.exit(1)
+
+    etf_data = load_json(etf_data_path)
+
+    # 직전 build_assets 결과가 있으면 같은 해시 경로로 참조
+    assets = None
+    if ASSETS_MANIFEST.exists():
+        assets = load_json(ASSETS_MANIFEST)
+    render(etf_data['sectorMeta'], assets)
 
 
 if __name__ == '__main__':
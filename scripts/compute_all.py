@@ -5,48 +5,90 @@ CORRYU ETF 전체 지표 재계산 파이프라인
 원본(raw/*.parquet) → 분류 → 레거시 → 지표 → etf_data.json → HTML
 
 실행 방법:
-    python scripts/compute_all.py
-
-config.py 규칙을 바꾸었을 때도 이 스크립트 하나로 반영 완료.
-Supabase 불필요, 약 5~15분 소요.
+    python scripts/compute_all.py                    # 입력이 바뀐 스테이지만 재실행
+    python scripts/compute_all.py --force            # 전체 재계산 (무변경 감지도 무시)
+    python scripts/compute_all.py --from classify    # classify 이후 전부 재실행
+    python scripts/compute_all.py --only corr_data   # corr_data(+필요한 상위)만
+    python scripts/compute_all.py --jobs 4           # 독립 스테이지 병렬 실행
+    python scripts/compute_all.py --profile          # 스테이지별 cProfile 덤프 (.cache/profile/)
+    python scripts/compute_all.py --daily-fast       # 일간: 가격 민감 지표·AUM만 갱신 (월초 자동 전체)
+
+각 스테이지(load → resample/perf/corr_monthly/corr_daily → classify → legacy → metrics
+→ write_json/etf_pages/graph, resample → backtest_data/backtest_monthly/corr_data/return_index → backtest_presets
+→ assets → render)는 입력 해시가 같으면 .cache/pipeline/ 의 산출물을 재사용하고 건너뛴다.
+끝에 스테이지별 hit/miss 표 출력.
+--jobs N 이면 perf·corr_monthly·corr_daily, 그리고 etf_pages·graph·backtest_data·backtest_monthly·backtest_presets·
+corr_data·return_index·render를 프로세스 풀에서 동시에 돌리고, 가격 행렬은 피클 대신 메모리맵(.npy)으로 워커와 공유한다.
+스테이지별 wall·CPU·최대 RSS 증가분·출력 바이트는 .cache/run_stats/run_stats.json 에 기록되고
+.cache/run_stats/history.jsonl 에 최근 실행분이 누적된다 (추세 비교용, 배포 디렉터리 밖).
+
+입력 파일(가격·메타 parquet, config.py, holdings.json, 코드) 지문과 출력 해시가 직전 전체 실행과
+같으면(휴장일, fetch_daily 가 새 행 0개) DAG 자체를 건너뛰고 1초 안에 종료한다.
+GitHub Actions 에서는 스텝 출력 changed=true|false 를 남겨 커밋 단계를 건너뛸 수 있게 한다.
+
+config.py 규칙을 바꾸었을 때도 이 스크립트 하나로 반영 완료 (config.py가 캐시 키에 포함됨).
+Supabase 불필요, 전체 재계산 시 약 5~15분 소요.
 """
 
-import json
+import argparse
 import os
-import subprocess
 import sys
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 # src/ 모듈 경로 추가
 ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(ROOT / 'src'))
 
-from config import SECTOR_DEFS, SUPER_SECTOR_DEFS, MY_PORTFOLIO, OUTPUT_DIR
+from config import SECTOR_DEFS, SUPER_SECTOR_DEFS, MY_PORTFOLIO, OUTPUT_DIR, CACHE_DIR, ETF_DATA_MONOLITH
 from data_loader import (
+    PRICES_PARQUET, META_PARQUET,
     load_price_data, load_scraped_info, load_meta_df,
     compute_perf_stats, compute_corr_monthly, compute_corr_daily,
+    compute_monthly_close, compute_yearly_close,
     load_expense_ratios, load_dividend_yields, get_all_tickers,
 )
 from classify import (
-    classify_all, get_sector_members,
+    classify_all, get_sector_members, get_sector_masks,
     fill_anchor_correlations, fill_super_anchor_correlations,
 )
 from verify import verify_mece, spot_check
 from legacy import assess_all_legacy
-from metrics import compute_etf_metrics, compute_sector_stats
+from metrics import (
+    compute_etf_metrics, compute_sector_stats, compute_price_metrics, price_metric_records,
+    meta_metric_fields, compute_metric_ranks,
+)
+from ticker_index import TickerIndex
+from columnar import encode_all_data
+from serialize import (content_hash, dumps, load as load_json, write_atomic, write_json, BACKEND,
+                       TIMINGS as SERIALIZE_TIMINGS)
+from pipeline import Pipeline, Stage, StageResult
+from instrument import Meter, measure, output_bytes, write_run_stats, RUN_STATS_PATH
+
+sys.path.insert(0, str(ROOT))
+from build_etf_pages import build_etf_pages, ETF_DIR, HOLDINGS_PATH
+from build_backtest_data import build_backtest_data, OUT_PATH as BACKTEST_OUT_PATH
+from build_backtest_monthly import build_backtest_monthly, OUT_DIR as BT_MONTHLY_DIR
+from build_backtest_presets import build_backtest_presets, OUT_PATH as BT_PRESETS_PATH
+from build_return_index import build_return_index, paths as return_index_paths
+from build_search_index import build_search_index, OUT_PATH as SEARCH_INDEX_PATH
+from build_corr_data import build_corr_data, OUT_PATH as CORR_OUT_PATH, BIN_PATH as CORR_BIN_PATH, INDEX_PATH as CORR_INDEX_PATH
+from build_graph import build_graph, OUT_EDGES as GRAPH_EDGE_PATHS, OUT_JSON as GRAPH_PATH
+from build_assets import build_assets, ASSETS_DIR, ARTIFACTS
+from render_html import render as render_index_html
 
 
 # ════════════════════════════════════════════════════════════════════
 # 빌드 헬퍼
 # ════════════════════════════════════════════════════════════════════
 
-def build_sector_meta(sector_members, all_etf_data):
+def build_sector_meta(sector_members, all_etf_data, ranks=None):
     meta = {}
     for sid, sdef in SECTOR_DEFS.items():
         etfs = all_etf_data.get(sid, [])
-        stats = compute_sector_stats(etfs)
+        stats = compute_sector_stats(etfs, ranks)
         meta[sid] = {
             'name':         sdef['name'],
             'name_en':      sdef['name_en'],
@@ -64,19 +106,29 @@ def build_all_etf_data(
     df_price, perf_stats, scraped,
     df_corr_monthly, df_corr_daily,
     expense_ratios, dividend_yields,
+    ticker_index=None,
 ):
+    index = ticker_index if ticker_index is not None else TickerIndex(
+        t for ts in sector_members.values() for t in ts
+    )
+    sector_masks = get_sector_masks(classification, index)
+    mine_mask = index.mask_of(MY_PORTFOLIO)
+    price_metrics = price_metric_records(compute_price_metrics(df_price))   # 가격 민감 지표 전 종목 일괄
+
     all_data = {}
     for sid in sorted(SECTOR_DEFS.keys()):
-        tickers = sector_members.get(sid, set())
+        mask = sector_masks.get(sid)
+        ids = np.flatnonzero(mask) if mask is not None else np.empty(0, dtype=np.intp)
         etf_list = []
-        for ticker in tickers:
+        for tid, ticker in zip(ids.tolist(), index.tickers_of(ids)):
             info = compute_etf_metrics(
                 ticker, df_price, perf_stats, scraped, classification,
                 df_corr_monthly, df_corr_daily, legacy_results,
                 expense_ratios=expense_ratios,
                 dividend_yields=dividend_yields,
+                price_metrics=price_metrics.get(ticker),
             )
-            info['mine'] = 1 if ticker in MY_PORTFOLIO else 0
+            info['mine'] = int(mine_mask[tid])
             etf_list.append(info)
         etf_list.sort(key=lambda x: (-x['mine'], x['rank']))
         all_data[sid] = etf_list
@@ -84,95 +136,172 @@ def build_all_etf_data(
 
 
 # ════════════════════════════════════════════════════════════════════
-# 메인
+# 스테이지
 # ════════════════════════════════════════════════════════════════════
+# 각 스테이지는 상위 스테이지 산출물을 같은 이름의 키워드 인자로 받는다.
 
-def main():
-    print('=' * 55)
-    print('CORRYU ETF 전체 재계산')
-    print('=' * 55)
-
-    # ── 1. 원본 데이터 로드 ──────────────────────────────────────
-    print('\n[1/7] 원본 데이터 로드...')
+def stage_load():
+    print('\n[load] 원본 데이터 로드...')
     df_price = load_price_data()
     scraped  = load_scraped_info()
     print(f'  가격: {df_price.shape[1]} ETF × {df_price.shape[0]} 거래일')
     print(f'  메타: {len(scraped)} ETF')
-
-    # ── 2. 성과 지표 (CAGR · Vol · Sortino) ─────────────────────
-    print('\n[2/7] 성과 지표 계산 (CAGR · Vol · Sortino)...')
-    perf_stats = compute_perf_stats(df_price)
+    expense_ratios  = load_expense_ratios()
+    dividend_yields = load_dividend_yields()
+    print(f'  수수료: {len(expense_ratios)}개  |  배당: {len(dividend_yields)}개')
+    return {
+        'df_price':        df_price,
+        'scraped':         scraped,
+        'ticker_index':    TickerIndex.from_price(df_price),  # 이후 모든 단계 공용 티커 ID
+        'expense_ratios':  expense_ratios,
+        'dividend_yields': dividend_yields,
+    }
+
+
+def stage_perf(load):
+    print('\n[perf] 성과 지표 계산 (CAGR · Vol · Sortino)...')
+    perf_stats = compute_perf_stats(load['df_price'])
     valid = sum(1 for v in perf_stats.values() if v['CAGR'] != 0)
     print(f'  계산 완료: {valid}/{len(perf_stats)} ETF (데이터 충분)')
+    return perf_stats
 
-    # ── 3. 상관계수 ──────────────────────────────────────────────
-    print('\n[3/7] 상관계수 계산...')
-    print('  월간 상관계수...')
-    df_corr_monthly = compute_corr_monthly(df_price)
+
+def stage_resample(load):
+    print('\n[resample] 월말·연말 종가 리샘플...')
+    return {
+        'monthly': compute_monthly_close(load['df_price']),
+        'yearly':  compute_yearly_close(load['df_price']),
+    }
+
+
+def stage_corr_monthly(load, resample):
+    print('\n[corr_monthly] 월간 상관계수...')
+    df_corr_monthly = compute_corr_monthly(load['df_price'], resample['monthly'])
     print(f'    → {df_corr_monthly.shape[0]} × {df_corr_monthly.shape[1]}')
-    print('  일간 상관계수...')
-    df_corr_daily = compute_corr_daily(df_price)
+    return df_corr_monthly
+
+
+def stage_corr_daily(load):
+    print('\n[corr_daily] 일간 상관계수...')
+    df_corr_daily = compute_corr_daily(load['df_price'])
     print(f'    → {df_corr_daily.shape[0]} × {df_corr_daily.shape[1]}')
+    return df_corr_daily
+
 
-    # ── 4. 분류 ─────────────────────────────────────────────────
-    print('\n[4/7] ETF 분류...')
-    all_tickers = get_all_tickers(df_corr_daily)
+def stage_classify(load, corr_monthly, corr_daily):
+    print('\n[classify] ETF 분류...')
+    all_tickers = get_all_tickers(corr_daily)
     print(f'  전체 ETF 유니버스: {len(all_tickers)}개')
 
-    classification = classify_all(all_tickers, scraped, df_corr_monthly, df_corr_daily)
+    classification = classify_all(all_tickers, load['scraped'], corr_monthly, corr_daily,
+                                  ticker_index=load['ticker_index'])
     sector_members = get_sector_members(classification)
-    fill_anchor_correlations(classification, sector_members, df_corr_monthly, df_corr_daily)
-    fill_super_anchor_correlations(classification, df_corr_monthly, df_corr_daily)
+    fill_anchor_correlations(classification, sector_members, corr_monthly, corr_daily)
+    fill_super_anchor_correlations(classification, corr_monthly, corr_daily)
 
     verify_mece(classification, all_tickers)
-    spot_check(classification, scraped)
-
-    # ── 5. 레거시 판별 ───────────────────────────────────────────
-    print('\n[5/7] 레거시 판별...')
-    legacy_results = assess_all_legacy(
-        sector_members, classification,
-        df_corr_monthly, df_corr_daily,
-        scraped, perf_stats, df_price,
+    spot_check(classification, load['scraped'])
+    # set은 피클 바이트가 해시 시드마다 달라 콘텐츠 해시가 흔들림 → 분류 dict만 산출물로
+    return classification
+
+
+def stage_legacy(load, perf, corr_monthly, corr_daily, classify):
+    print('\n[legacy] 레거시 판별...')
+    return assess_all_legacy(
+        get_sector_members(classify), classify,
+        corr_monthly, corr_daily,
+        load['scraped'], perf, load['df_price'],
+        ticker_index=load['ticker_index'],
     )
 
-    # ── 6. ETF 데이터 JSON 생성 ──────────────────────────────────
-    print('\n[6/7] etf_data.json 생성...')
-    expense_ratios  = load_expense_ratios()
-    dividend_yields = load_dividend_yields()
-    print(f'  수수료: {len(expense_ratios)}개  |  배당: {len(dividend_yields)}개')
 
+def stage_metrics(load, perf, corr_monthly, corr_daily, classify, legacy):
+    print('\n[metrics] ETF 지표 계산...')
+    sector_members = get_sector_members(classify)
     all_etf_data = build_all_etf_data(
-        sector_members, classification, legacy_results,
-        df_price, perf_stats, scraped,
-        df_corr_monthly, df_corr_daily,
-        expense_ratios, dividend_yields,
+        sector_members, classify, legacy,
+        load['df_price'], perf, load['scraped'],
+        corr_monthly, corr_daily,
+        load['expense_ratios'], load['dividend_yields'],
+        ticker_index=load['ticker_index'],
     )
-    sector_meta = build_sector_meta(sector_members, all_etf_data)
-
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-
-    as_of = df_price.index[-1].strftime('%Y-%m-%d')
-
-    etf_data_path = os.path.join(OUTPUT_DIR, 'etf_data.json')
-    with open(etf_data_path, 'w', encoding='utf-8') as f:
-        json.dump({
-            'as_of':      as_of,
-            'sectorMeta': sector_meta,
-            'allData':    all_etf_data,
-            'superSectorDefs': {
-                k: {
-                    'name': v['name'], 'name_en': v['name_en'],
-                    'anchor': v['anchor'], 'icon': v['icon'],
-                    'color': v['color'], 'sub_sectors': v['sub_sectors'],
-                }
-                for k, v in SUPER_SECTOR_DEFS.items()
-            },
-        }, f, ensure_ascii=False, separators=(',', ':'))
-    print(f'  저장: {etf_data_path}')
-
-    cls_path = os.path.join(OUTPUT_DIR, 'classification.json')
+    ranks = compute_metric_ranks(all_etf_data)   # 스크리너 백분위·정렬 순서 + 섹터 사분위
+    return {
+        'as_of':        load['df_price'].index[-1].strftime('%Y-%m-%d'),
+        'all_etf_data': all_etf_data,
+        'sector_meta':  build_sector_meta(sector_members, all_etf_data, ranks),
+        'ranks':        ranks,
+    }
+
+
+def super_sector_defs_export():
+    return {
+        k: {
+            'name': v['name'], 'name_en': v['name_en'],
+            'anchor': v['anchor'], 'icon': v['icon'],
+            'color': v['color'], 'sub_sectors': v['sub_sectors'],
+        }
+        for k, v in SUPER_SECTOR_DEFS.items()
+    }
+
+
+def write_etf_shards(as_of, sector_meta, all_etf_data):
+    """섹터별 샤드 output/etf-shards/{SID}.json + 매니페스트 (as_of·sectorMeta·superSectorDefs·샤드 해시)
+
+    페이지는 매니페스트(수 KB)만 받아 첫 화면을 그리고, 보는 섹터의 샤드만 ?v=<hash> 로 가져온다.
+    해시가 같은 샤드는 다시 쓰지 않음.
+    """
+    os.makedirs(ETF_SHARD_DIR, exist_ok=True)
+    shards = {}
+    for sid, etfs in all_etf_data.items():
+        data = dumps(etfs)
+        h = content_hash(data)
+        path = os.path.join(ETF_SHARD_DIR, f'{sid}.json')
+        if not os.path.exists(path) or content_hash(Path(path).read_bytes()) != h:
+            write_atomic(path, data)
+        shards[sid] = {'path': f'/etf-shards/{sid}.json', 'hash': h, 'bytes': len(data), 'count': len(etfs)}
+    for name in os.listdir(ETF_SHARD_DIR):
+        if name.endswith('.json') and name != SHARD_MANIFEST_NAME and name[:-5] not in shards:
+            os.remove(os.path.join(ETF_SHARD_DIR, name))
+
+    manifest = dumps({
+        'as_of':           as_of,
+        'sectorMeta':      sector_meta,
+        'superSectorDefs': super_sector_defs_export(),
+        'shards':          shards,
+    })
+    write_atomic(os.path.join(ETF_SHARD_DIR, SHARD_MANIFEST_NAME), manifest)
+
+    sizes = np.array([s['bytes'] for s in shards.values()] or [0])
+    print(f'  샤드: {len(shards)}개, 합계 {sizes.sum() / 1024:,.0f}KB '
+          f'(최소 {sizes.min() / 1024:.1f} · 중앙 {np.median(sizes) / 1024:.1f} · 최대 {sizes.max() / 1024:.1f}KB), '
+          f'매니페스트 {len(manifest) / 1024:.1f}KB → {ETF_SHARD_DIR}')
+    return shards
+
+
+def write_etf_data(as_of, sector_meta, all_etf_data, ranks=None):
+    """ranks (MetricRanks) 가 있으면 screener_ranks.json 따로 — 스크리너만 받아 정렬·백분위에 사용"""
+    if ETF_DATA_MONOLITH:
+        write_json(ETF_DATA_PATH, {
+            'as_of':           as_of,
+            'sectorMeta':      sector_meta,
+            'allData':         all_etf_data,
+            'superSectorDefs': super_sector_defs_export(),
+        })
+    if ranks is not None:
+        write_json(SCREENER_RANKS_PATH, {'as_of': as_of, **ranks.to_doc()})
+
+    # 열 지향 인코딩 (allData 만, 디코더: output/etf-columnar.js)
+    write_json(ETF_COLUMNAR_PATH, {'as_of': as_of, 'allData': encode_all_data(all_etf_data)})
+    write_etf_shards(as_of, sector_meta, all_etf_data)
+
+
+def stage_write_json(metrics, classify, legacy):
+    print('\n[write_json] etf_data.json · classification.json 저장...')
+    write_etf_data(metrics['as_of'], metrics['sector_meta'], metrics['all_etf_data'], metrics['ranks'])
+
     cls_export = {}
-    for ticker, info in classification.items():
+    for ticker, info in classify.items():
         sid  = info['sector']
         sdef = SECTOR_DEFS[sid]
         cls_export[ticker] = {
@@ -181,44 +310,333 @@ def main():
             'asset_class':   sdef['asset_class'],
             'method':        info['method'],
             'r_anchor':      info['r_anchor'],
-            'is_legacy':     legacy_results.get(ticker, {}).get('is_legacy', False),
-            'legacy_reasons': legacy_results.get(ticker, {}).get('reasons', []),
+            'is_legacy':     legacy.get(ticker, {}).get('is_legacy', False),
+            'legacy_reasons': legacy.get(ticker, {}).get('reasons', []),
         }
-    with open(cls_path, 'w', encoding='utf-8') as f:
-        json.dump(cls_export, f, ensure_ascii=False, indent=2)
-    print(f'  저장: {cls_path}')
-
-    # ── 6b. 개별 ETF JSON 생성 ───────────────────────────────────
-    print('\n=== build_etf_pages: 개별 ETF JSON 생성 ===')
-    sys.path.insert(0, str(ROOT))
-    from build_etf_pages import main as build_etf_pages_main
-    build_etf_pages_main()
-    print('✅ 개별 ETF JSON 생성 완료')
-
-    # ── 6c. 백테스트 실수익률 데이터 생성 ────────────────────────
-    print('\n=== build_backtest_data: 연도별 실수익률 생성 ===')
-    from build_backtest_data import main as build_backtest_data_main
-    build_backtest_data_main()
-    print('✅ backtest_data.json 생성 완료')
-
-    # ── 6d. 상관계수 월간 수익률 데이터 생성 ────────────────────────
-    print('\n=== build_corr_data: 월간 수익률 JSON 생성 ===')
-    from build_corr_data import main as build_corr_data_main
-    build_corr_data_main()
-    print('✅ corr_returns.json 생성 완료')
-
-    # ── 7. HTML 생성 ─────────────────────────────────────────────
-    print('\n[7/7] HTML 생성...')
-    render_script = str(ROOT / 'render_html.py')
-    subprocess.run([sys.executable, render_script], check=True)
-
-    # ── 완료 요약 ─────────────────────────────────────────────────
-    total  = sum(m['count']  for m in sector_meta.values())
-    active = sum(m['active'] for m in sector_meta.values())
-    legacy = sum(m['legacy'] for m in sector_meta.values())
+    write_json(CLASSIFICATION_PATH, cls_export, indent=True)
+
+    total  = sum(m['count']  for m in metrics['sector_meta'].values())
+    active = sum(m['active'] for m in metrics['sector_meta'].values())
+    legacy_n = sum(m['legacy'] for m in metrics['sector_meta'].values())
+    print(f'  전체: {total:,}  Active: {active:,}  Legacy: {legacy_n:,}')
+
+
+# build_* 스테이지는 etf_data.json · parquet 을 다시 읽지 않고 메모리 산출물을 그대로 넘겨받음
+
+def stage_etf_pages(load, metrics):
+    print('\n[etf_pages] 개별 ETF JSON 생성...')
+    build_etf_pages(metrics['all_etf_data'], metrics['as_of'], load['df_price'])
+
+
+def stage_graph(corr_monthly, metrics, legacy):
+    print('\n[graph] 상관 그래프 데이터 생성...')
+    build_graph(corr_monthly, metrics['all_etf_data'], legacy)
+
+
+def stage_backtest_data(resample):
+    print('\n[backtest_data] 연도별 실수익률 생성...')
+    build_backtest_data(yearly=resample['yearly'])
+
+
+def stage_backtest_monthly(load, resample):
+    print('\n[backtest_monthly] 월간 실수익률 청크 생성...')
+    build_backtest_monthly(load['df_price'], resample['monthly'])
+
+
+def stage_backtest_presets(backtest_data, backtest_monthly):
+    """기록된 backtest_data.json · bt-monthly 를 페이지와 같은 입력으로 읽어 계산 (상위 스테이지 값은 순서 보장용)"""
+    print('\n[backtest_presets] 프리셋 백테스트 사전 계산...')
+    build_backtest_presets()
+
+
+def stage_corr_data(load, resample):
+    print('\n[corr_data] 월간 수익률 JSON 생성...')
+    build_corr_data(load['df_price'], resample['monthly'])
+
+
+def stage_return_index(load, resample):
+    print('\n[return_index] 누적 로그수익률 인덱스 생성...')
+    build_return_index(load['df_price'], resample['monthly'])
+
+
+def stage_search_index(metrics):
+    print('\n[search_index] 자동완성 검색 인덱스 생성...')
+    build_search_index(metrics['all_etf_data'], metrics['as_of'])
+
+
+def stage_assets(write_json, graph, backtest_data, corr_data, return_index, search_index):
+    """JSON 산출물 해시 사본·.gz·.br → {원래 경로: 해시 경로} (상위 스테이지 값은 순서 보장용)"""
+    print('\n[assets] 사전 압축 · 해시 파일명...')
+    return build_assets()
+
+
+def stage_render(metrics, assets):
+    print('\n[render] HTML 생성...')
+    render_index_html(metrics['sector_meta'], assets)
+
+
+# ════════════════════════════════════════════════════════════════════
+# DAG 선언
+# ════════════════════════════════════════════════════════════════════
+
+ETF_DATA_PATH       = os.path.join(OUTPUT_DIR, 'etf_data.json')
+ETF_COLUMNAR_PATH   = os.path.join(OUTPUT_DIR, 'etf_data_columnar.json')
+ETF_SHARD_DIR       = os.path.join(OUTPUT_DIR, 'etf-shards')
+SHARD_MANIFEST_NAME = '_manifest.json'
+SCREENER_RANKS_PATH = os.path.join(OUTPUT_DIR, 'screener_ranks.json')
+ETF_DATA_OUTPUTS    = ((ETF_DATA_PATH,) if ETF_DATA_MONOLITH else ()) + (ETF_COLUMNAR_PATH, ETF_SHARD_DIR,
+                                                                          SCREENER_RANKS_PATH)
+CLASSIFICATION_PATH = os.path.join(OUTPUT_DIR, 'classification.json')
+CORR_OUTPUTS        = (str(CORR_OUT_PATH), str(CORR_BIN_PATH), str(CORR_INDEX_PATH))
+RETURN_INDEX_OUTPUTS = tuple(str(p) for p in return_index_paths('M'))
+PROFILE_DIR         = os.path.join(CACHE_DIR, 'profile')
+
+
+def _code(*names):
+    """캐시 키에 포함할 코드 파일 (바뀌면 해당 스테이지 재실행)"""
+    return tuple(str(ROOT / n) for n in names)
+
+
+CONFIG_CODE = _code('src/config.py')
+
+
+def build_pipeline():
+    return Pipeline([
+        Stage('load', stage_load,
+              files=(str(PRICES_PARQUET), str(META_PARQUET)) + _code('src/data_loader.py', 'src/ticker_index.py'),
+              cache=False),
+        Stage('perf', stage_perf, deps=('load',),
+              files=CONFIG_CODE + _code('src/data_loader.py'), parallel=True),
+        Stage('resample', stage_resample, deps=('load',),
+              files=_code('src/data_loader.py')),
+        Stage('corr_monthly', stage_corr_monthly, deps=('load', 'resample'),
+              files=_code('src/data_loader.py'), parallel=True),
+        Stage('corr_daily', stage_corr_daily, deps=('load',),
+              files=_code('src/data_loader.py'), parallel=True),
+        Stage('classify', stage_classify, deps=('load', 'corr_monthly', 'corr_daily'),
+              files=CONFIG_CODE + _code('src/classify.py', 'src/verify.py')),
+        Stage('legacy', stage_legacy, deps=('load', 'perf', 'corr_monthly', 'corr_daily', 'classify'),
+              files=CONFIG_CODE + _code('src/legacy.py')),
+        Stage('metrics', stage_metrics, deps=('load', 'perf', 'corr_monthly', 'corr_daily', 'classify', 'legacy'),
+              files=CONFIG_CODE + _code('src/metrics.py', 'scripts/compute_all.py')),
+        Stage('write_json', stage_write_json, deps=('metrics', 'classify', 'legacy'),
+              files=CONFIG_CODE + _code('scripts/compute_all.py'),
+              outputs=ETF_DATA_OUTPUTS + (CLASSIFICATION_PATH,)),
+        Stage('etf_pages', stage_etf_pages, deps=('load', 'metrics'),
+              files=(HOLDINGS_PATH,) + _code('build_etf_pages.py', 'src/downsample.py'),
+              outputs=(ETF_DIR,), parallel=True),
+        Stage('graph', stage_graph, deps=('corr_monthly', 'metrics', 'legacy'),
+              files=CONFIG_CODE + _code('build_graph.py'),
+              outputs=(GRAPH_PATH, *GRAPH_EDGE_PATHS), parallel=True),
+        Stage('backtest_data', stage_backtest_data, deps=('resample',),
+              files=_code('build_backtest_data.py'),
+              outputs=(str(BACKTEST_OUT_PATH),), parallel=True),
+        Stage('backtest_monthly', stage_backtest_monthly, deps=('load', 'resample'),
+              files=_code('build_backtest_monthly.py', 'src/packed.py'),
+              outputs=(str(BT_MONTHLY_DIR),), parallel=True),
+        Stage('backtest_presets', stage_backtest_presets, deps=('backtest_data', 'backtest_monthly'),
+              files=(str(BACKTEST_OUT_PATH), str(BT_MONTHLY_DIR))
+              + _code('build_backtest_presets.py', 'src/backtest.py', 'src/packed.py'),
+              outputs=(str(BT_PRESETS_PATH),), parallel=True),
+        Stage('corr_data', stage_corr_data, deps=('load', 'resample'),
+              files=_code('build_corr_data.py'),
+              outputs=CORR_OUTPUTS, parallel=True),
+        Stage('return_index', stage_return_index, deps=('load', 'resample'),
+              files=_code('build_return_index.py', 'src/return_index.py', 'src/packed.py'),
+              outputs=RETURN_INDEX_OUTPUTS, parallel=True),
+        Stage('search_index', stage_search_index, deps=('metrics',),
+              files=_code('build_search_index.py', 'src/search_index.py'),
+              outputs=(str(SEARCH_INDEX_PATH),), parallel=True),
+        Stage('assets', stage_assets,
+              deps=('write_json', 'graph', 'backtest_data', 'corr_data', 'return_index', 'search_index'),
+              files=tuple(os.path.join(OUTPUT_DIR, n) for n in ARTIFACTS) + _code('build_assets.py'),
+              outputs=(str(ASSETS_DIR),), committed=False),   # gitignore — 배포 빌드가 생성
+        Stage('render', stage_render, deps=('metrics', 'assets'),
+              files=CONFIG_CODE + _code('render_html.py'),
+              outputs=(os.path.join(OUTPUT_DIR, 'index.html'),), parallel=True),
+    ])
+
+
+# ════════════════════════════════════════════════════════════════════
+# 일간 빠른 경로 (--daily-fast)
+# ════════════════════════════════════════════════════════════════════
+# 하루 사이 바뀌는 건 마지막 봉 기반 지표(z_score·ma200_pct·mdd_52w·rsi·range_52w)와
+# fetch_daily 가 갱신하는 메타(AUM·순위·수수료·배당)뿐 — 분류·레거시·상관·성과는 직전 etf_data.json 재사용.
+# 월이 바뀌었거나(월 첫 거래일) 유니버스·이름·상장일·설정·코드가 바뀌었으면 전체 실행으로 전환.
+
+DATA_FILES = (str(PRICES_PARQUET), str(META_PARQUET))
+
+
+def load_previous_etf_data():
+    """직전 etf_data (단일 파일이 없으면 샤드 매니페스트 + 샤드로 재구성)"""
+    try:
+        if os.path.exists(ETF_DATA_PATH):
+            return load_json(ETF_DATA_PATH)
+        manifest = load_json(os.path.join(ETF_SHARD_DIR, SHARD_MANIFEST_NAME))
+        all_data = {sid: load_json(os.path.join(ETF_SHARD_DIR, f'{sid}.json')) for sid in manifest['shards']}
+        return {'as_of': manifest['as_of'], 'sectorMeta': manifest['sectorMeta'], 'allData': all_data}
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def full_run_reason(prev, rules, saved, load):
+    """빠른 경로를 쓸 수 없는 이유 (없으면 None)"""
+    if prev is None:
+        return '이전 etf_data.json 없음'
+    if saved.get('rules') != rules:
+        return '설정·코드·holdings 변경 (또는 전체 실행 기록 없음)'
+    as_of = load['df_price'].index[-1]
+    if as_of.strftime('%Y-%m') != prev['as_of'][:7]:
+        return f'월 첫 거래일 ({as_of:%Y-%m-%d})'
+
+    prev_etfs = {e['ticker']: e for etfs in prev['allData'].values() for e in etfs}
+    universe = {t for t in load['df_price'].columns if not t.startswith('^')}
+    if set(prev_etfs) != universe:
+        return f'유니버스 변경 (+{len(universe - set(prev_etfs))} / -{len(set(prev_etfs) - universe)})'
+    scraped = load['scraped']
+    for t, e in prev_etfs.items():
+        info = scraped.get(t, {})
+        if info.get('fullname', t) != e['name'] or str(info.get('inception_date', '1900-01-01'))[:10] != e['inception']:
+            return f'메타 변경 ({t} 이름·상장일)'
+    return None
+
+
+def patch_etf_data(all_data, load):
+    """allData 항목의 가격 민감 지표·메타 필드만 갱신 (섹터 내 순서는 순위 기준 재정렬)"""
+    records = price_metric_records(compute_price_metrics(load['df_price']))
+    for sid, etfs in all_data.items():
+        for etf in etfs:
+            t = etf['ticker']
+            etf.update(records[t])
+            etf.update(meta_metric_fields(t, load['scraped'], load['expense_ratios'], load['dividend_yields']))
+        etfs.sort(key=lambda x: (-x['mine'], x['rank']))
+    return sum(len(etfs) for etfs in all_data.values())
+
+
+def refresh_ranks(all_data, sector_meta):
+    """갱신된 allData 로 백분위·정렬 순서를 다시 계산하고 섹터 통계(사분위 포함)를 덮어씀"""
+    ranks = compute_metric_ranks(all_data)
+    for sid, meta in sector_meta.items():
+        meta.update(compute_sector_stats(all_data.get(sid, []), ranks))
+    return ranks
+
+
+def run_daily_fast(pipeline, prev, rules, saved):
+    """빠른 경로 실행 → 전체 실행이 필요하면 그 이유(str), 완료하면 None"""
+    results = []
+
+    def step(name, func, outputs=()):
+        value, usage = measure(func, {})
+        results.append(StageResult(name, 'fast', usage.wall, cpu=usage.cpu,
+                                   rss_delta=usage.rss_delta, output_bytes=output_bytes(outputs)))
+        return value
+
+    load = step('load', stage_load)
+    reason = full_run_reason(prev, rules, saved, load)
+    if reason:
+        return reason
+
+    as_of = load['df_price'].index[-1].strftime('%Y-%m-%d')
+    print(f'\n[daily-fast] {prev["as_of"]} → {as_of}: 가격 민감 지표·메타 필드만 갱신')
+    n = step('patch', lambda: patch_etf_data(prev['allData'], load))
+    print(f'  갱신: {n:,} ETF (분류·레거시·상관·성과는 직전 값 유지)')
+    ranks = step('ranks', lambda: refresh_ranks(prev['allData'], prev['sectorMeta']))
+    step('write_json', lambda: write_etf_data(as_of, prev['sectorMeta'], prev['allData'], ranks), ETF_DATA_OUTPUTS)
+    step('etf_pages', lambda: build_etf_pages(prev['allData'], as_of, load['df_price']), (ETF_DIR,))
+    step('graph', lambda: build_graph(all_data=prev['allData']), (GRAPH_PATH, *GRAPH_EDGE_PATHS))   # 상관행렬은 캐시, AUM 만 갱신
+    step('backtest_data', lambda: build_backtest_data(load['df_price']), (str(BACKTEST_OUT_PATH),))
+    step('backtest_monthly', lambda: build_backtest_monthly(load['df_price']), (str(BT_MONTHLY_DIR),))
+    step('backtest_presets', build_backtest_presets, (str(BT_PRESETS_PATH),))
+    step('corr_data', lambda: build_corr_data(load['df_price']), CORR_OUTPUTS)
+    step('return_index', lambda: build_return_index(load['df_price']), RETURN_INDEX_OUTPUTS)
+    step('search_index', lambda: build_search_index(prev['allData'], as_of), (str(SEARCH_INDEX_PATH),))
+    assets = step('assets', build_assets, (str(ASSETS_DIR),))
+    step('render', lambda: render_index_html(prev['sectorMeta'], assets), (os.path.join(OUTPUT_DIR, 'index.html'),))
+    pipeline.results = results
+    return None
+
+
+# ════════════════════════════════════════════════════════════════════
+# 메인
+# ════════════════════════════════════════════════════════════════════
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='CORRYU ETF 전체 재계산 (DAG 스테이지 실행기)')
+    parser.add_argument('--only', type=lambda v: [s for s in v.split(',') if s],
+                        help='이 스테이지(쉼표 구분)와 필요한 상위 스테이지만 실행')
+    parser.add_argument('--from', dest='start',
+                        help='이 스테이지와 하위 스테이지 전부 캐시 무시하고 재실행')
+    parser.add_argument('--force', action='store_true',
+                        help='모든 스테이지 캐시 무시 (입력 변경이 없어도 재계산)')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='독립 스테이지 동시 실행 프로세스 수 (기본 1 = 순차)')
+    parser.add_argument('--profile', nargs='?', const=PROFILE_DIR, metavar='DIR',
+                        help=f'실행한 스테이지마다 cProfile 덤프 저장 (기본 {os.path.relpath(PROFILE_DIR, ROOT)})')
+    parser.add_argument('--daily-fast', action='store_true',
+                        help='가격 민감 지표·메타 필드만 갱신 (월 첫 거래일·유니버스/설정 변경 시 자동 전체 실행)')
+    args = parser.parse_args(argv)
+    if args.daily_fast and (args.only or args.start):
+        parser.error('--daily-fast 는 --only / --from 과 함께 쓸 수 없음')
+    return args
+
+
+def set_ci_output(name, value):
+    """GitHub Actions 스텝 출력 기록 (워크플로 밖에서는 무시)"""
+    path = os.environ.get('GITHUB_OUTPUT')
+    if path:
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(f'{name}={value}\n')
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    print('=' * 55)
+    print('CORRYU ETF 전체 재계산' + (' (daily-fast)' if args.daily_fast else ''))
+    print('=' * 55)
+
+    pipeline = build_pipeline()
+    fingerprint = pipeline.fingerprint()
+    plain = not (args.force or args.only or args.start)
+    if plain and pipeline.unchanged(fingerprint, modes=('full', 'fast') if args.daily_fast else ('full',)):
+        print(f'\n입력(가격·메타·설정·holdings·코드) 변경 없음 — 직전 출력 유지, 재계산 생략 (--force 로 강제)')
+        set_ci_output('changed', 'false')
+        return
+
+    rules = pipeline.fingerprint(exclude=DATA_FILES)
+    saved = pipeline.load_fingerprint()
+    mode = 'full'
+    with Meter() as meter:
+        if args.daily_fast and not args.force:
+            reason = run_daily_fast(pipeline, load_previous_etf_data(), rules, saved)
+            if reason is None:
+                mode = 'fast'
+            else:
+                print(f'\n[daily-fast] 전체 실행으로 전환: {reason}')
+        if mode == 'full':
+            pipeline.run(only=args.only, start=args.start, force=args.force, jobs=args.jobs,
+                         profile_dir=args.profile)
+
+    if mode == 'fast':
+        pipeline.save_fingerprint(fingerprint, mode='fast', rules=saved.get('rules'))
+    elif not args.only:
+        pipeline.save_fingerprint(fingerprint, rules=rules)
+    set_ci_output('changed', 'true')
+
     print(f'\n{"=" * 55}')
-    print(f'재계산 완료')
-    print(f'  전체: {total:,}  Active: {active:,}  Legacy: {legacy:,}')
+    print('재계산 완료' + (' (daily-fast)' if mode == 'fast' else ''))
+    pipeline.print_summary()
+    write_run_stats(pipeline.results, meter.usage, {
+        'mode': mode, 'jobs': args.jobs, 'force': args.force, 'only': args.only, 'from': args.start,
+        # 이 프로세스에서 기록한 산출물별 직렬화 시간 (--jobs 워커 스테이지는 로그에만)
+        'serialize': {'backend': BACKEND, 'artifacts': [
+            {'path': os.path.relpath(t.path, ROOT), 'bytes': t.bytes,
+             'encode': round(t.encode, 4), 'write': round(t.write, 4)}
+            for t in SERIALIZE_TIMINGS
+        ]},
+    })
+    print(f'  실행 통계: {RUN_STATS_PATH}  (총 {meter.usage.wall:.1f}s)')
+    if args.profile:
+        print(f'  프로파일: {args.profile}/<stage>.prof  (python -m pstats 로 확인)')
     print(f'{"=" * 55}')
 
 
@@ -18,7 +18,6 @@ yfinance로 전체 ETF 수수료(expense ratio) 수집 스크립트
 """
 
 import argparse
-import json
 import logging
 import os
 import pickle
@@ -38,6 +37,9 @@ BASE_DIR   = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 OUTPUT_DIR = os.path.join(BASE_DIR, 'output')
 DATA_SCRAPED = os.path.join(BASE_DIR, 'data_scraped')
 
+sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
+from serialize import load as load_json, write_json
+
 CHECKPOINT_JSON = os.path.join(DATA_SCRAPED, 'expense_ratios_raw.json')
 OUTPUT_PKL      = os.path.join(DATA_SCRAPED, 'expense_ratios.pkl')
 
@@ -48,8 +50,7 @@ CHECKPOINT_EVERY = 50     # N개 처리마다 체크포인트 저장
 def load_all_tickers() -> list[str]:
     """etf_data.json에서 전체 티커 목록 추출"""
     path = os.path.join(OUTPUT_DIR, 'etf_data.json')
-    with open(path, encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(path)
     tickers = []
     for etfs in (data.get('allData') or data).values():
         if isinstance(etfs, list):
@@ -60,15 +61,12 @@ def load_all_tickers() -> list[str]:
 def load_checkpoint() -> dict[str, float | None]:
     """기존 체크포인트 로드 (없으면 빈 dict)"""
     if os.path.exists(CHECKPOINT_JSON):
-        with open(CHECKPOINT_JSON, encoding='utf-8') as f:
-            return json.load(f)
+        return load_json(CHECKPOINT_JSON)
     return {}
 
 
 def save_checkpoint(results: dict):
-    os.makedirs(DATA_SCRAPED, exist_ok=True)
-    with open(CHECKPOINT_JSON, 'w', encoding='utf-8') as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
+    write_json(CHECKPOINT_JSON, results, indent=True, quiet=True)
 
 
 def fetch_one(ticker: str) -> float | None:
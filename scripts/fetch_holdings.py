@@ -11,7 +11,6 @@ yfinance로 전체 ETF 구성종목(top holdings) 월 1회 수집 스크립트
 실행 예시:
     python scripts/fetch_holdings.py
 """
-import json
 import os
 import sys
 import time
@@ -24,10 +23,12 @@ ETF_DATA_PATH = os.path.join(ROOT, 'output', 'etf_data.json')
 OUT_PATH      = os.path.join(ROOT, 'data_scraped', 'holdings.json')
 CHECKPOINT_PATH = OUT_PATH  # 체크포인트 겸용
 
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+from serialize import load as load_json, write_json
+
 
 def load_tickers():
-    with open(ETF_DATA_PATH, encoding='utf-8') as f:
-        raw = json.load(f)
+    raw = load_json(ETF_DATA_PATH)
     tickers = []
     for etfs in raw.get('allData', raw).values():
         if not isinstance(etfs, list):
@@ -46,8 +47,7 @@ def main():
     existing = {}
     if os.path.exists(CHECKPOINT_PATH):
         try:
-            with open(CHECKPOINT_PATH, encoding='utf-8') as f:
-                saved = json.load(f)
+            saved = load_json(CHECKPOINT_PATH)
             existing = saved.get('data', {})
             print(f'[체크포인트] 기존 {len(existing)}개 로드')
         except Exception:
@@ -103,8 +103,7 @@ def _save(data):
         'as_of': datetime.utcnow().strftime('%Y-%m-%d'),
         'data': data,
     }
-    with open(OUT_PATH, 'w', encoding='utf-8') as f:
-        json.dump(out, f, ensure_ascii=False, separators=(',', ':'))
+    write_json(OUT_PATH, out, quiet=True)
 
 
 if __name__ == '__main__':
@@ -15,7 +15,6 @@ ETF 원본 데이터 초기 다운로드 (최초 1회 실행)
     - 이후 매일은 fetch_daily.py 사용
 """
 
-import json
 import logging
 import math
 import os
@@ -28,6 +27,9 @@ import yfinance as yf
 
 # ── 경로 설정 ────────────────────────────────────────────────────────
 ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / 'src'))
+from serialize import load as load_json
+
 RAW_DIR = ROOT / 'raw'
 ETF_DB  = ROOT / 'etf_database.json'
 
@@ -54,8 +56,7 @@ log = logging.getLogger(__name__)
 
 def load_tickers() -> list[str]:
     """etf_database.json에서 티커 목록 로드"""
-    with open(ETF_DB, encoding='utf-8') as f:
-        db = json.load(f)
+    db = load_json(ETF_DB)
 
     # allData 하위의 모든 ETF 티커 수집
     tickers: set[str] = set()
@@ -0,0 +1,311 @@
+"""
+CORRYU ETF Dashboard - 백테스트 엔진 (벡터화)
+output/backtest-engine.js 의 simulate 와 같은 규칙을 가중치 행렬 단위로 계산
+- 가중치 K개 × 티커 N개를 한 번에: 월 포트폴리오 수익률 = 가중치 @ 수익률 행렬.T
+- 보유 티커 모두에 실제 월 수익률(bt-monthly)이 있는 달은 그 값, 없으면 연간 수익률의 12제곱근 근사
+- DCA · 벤치마크 · 리밸런싱 주기 (monthly = backtest.js 와 같은 규칙, 그 외는 비중 드리프트 추적)
+입력은 페이지가 받는 것과 같은 값 (backtest_data.json · bt-monthly/*.bin)
+프리셋 결과 사전 계산(build_backtest_presets.py)과 backtest.js 교차 검증(tests)에 사용
+"""
+import os
+from dataclasses import dataclass
+from typing import Any, Iterable, Sequence
+
+import numpy as np
+
+from packed import decode_chunk
+from serialize import load as load_json
+
+DCA_EVERY = {'monthly': 1, 'quarterly': 3, 'semiannual': 6, 'annually': 12}
+REBALANCE_EVERY = {**DCA_EVERY, 'none': 0}
+RFR = 0.04
+DEFAULT_END_YEAR = 2025    # backtest.js DATA_END_YEAR 초기값 (SPY 도 last_year 도 없을 때)
+
+
+@dataclass
+class ReturnPanel:
+    """티커별 연간·월간 수익률 — backtest.js 의 btData · btMonthly 와 같은 값"""
+    annual: dict[str, tuple[int, np.ndarray]]           # ticker → (첫 연도, 연간 수익률 (결측 NaN))
+    monthly: dict[str, tuple[int, np.ndarray]]          # ticker → (첫 달 연*12+월-1, 월 수익률 (결측 NaN))
+    data_end_year: int
+
+    @classmethod
+    def load(cls, backtest_data_path: str | os.PathLike[str], monthly_dir: str | os.PathLike[str] | None = None,
+             tickers: Iterable[str] | None = None) -> 'ReturnPanel':
+        """backtest_data.json (backtest-v2 또는 이전 {연도: 수익률}) + bt-monthly/{T}.bin"""
+        doc = load_json(backtest_data_path)
+        if doc.get('format') == 'backtest-v2':
+            returns = doc['returns']
+            last_year = doc.get('last_year')
+        else:
+            returns = {t: _compact(rec) for t, rec in doc.items() if any(v is not None for v in rec.values())}
+            last_year = None
+        wanted = set(tickers) if tickers is not None else None
+        annual = {t: (int(first), np.array([np.nan if v is None else v for v in vals], dtype=float))
+                  for t, (first, vals) in returns.items() if wanted is None or t in wanted}
+
+        monthly: dict[str, tuple[int, np.ndarray]] = {}
+        if monthly_dir is not None and os.path.isdir(monthly_dir):
+            names = (f'{t}.bin' for t in wanted) if wanted is not None else os.listdir(monthly_dir)
+            for name in names:
+                path = os.path.join(monthly_dir, name)
+                if name.endswith('.bin') and os.path.exists(path):
+                    with open(path, 'rb') as f:
+                        monthly[name[:-4]] = decode_chunk(f.read())
+
+        # backtest.js: DATA_END_YEAR = SPY 마지막 연도
+        if 'SPY' in returns:
+            first, vals = returns['SPY']
+            end_year = int(first) + len(vals) - 1
+        else:
+            end_year = int(last_year) if last_year else DEFAULT_END_YEAR
+        return cls(annual, monthly, end_year)
+
+    def first_year(self, ticker: str) -> int | None:
+        """backtest.js getETFFirstYear — 연간 데이터 첫 연도 (페이지의 상장 연도 폴백은 입력에 상장일이 없어 None)"""
+        return self.annual[ticker][0] if ticker in self.annual else None
+
+    def annual_matrix(self, tickers: Sequence[str], years: np.ndarray) -> np.ndarray:
+        """(연도 × 티커) 연간 수익률 — 없으면 0 (backtest.js getActualReturn)"""
+        out = np.zeros((len(years), len(tickers)))
+        for j, t in enumerate(tickers):
+            if t in self.annual:
+                _fill(out[:, j], years, *self.annual[t])
+        return np.nan_to_num(out, nan=0.0)
+
+    def monthly_matrix(self, tickers: Sequence[str], months: np.ndarray) -> np.ndarray:
+        """(월 × 티커) 실제 월 수익률 — 없으면 NaN"""
+        out = np.full((len(months), len(tickers)), np.nan)
+        for j, t in enumerate(tickers):
+            if t in self.monthly:
+                _fill(out[:, j], months, *self.monthly[t])
+        return out
+
+
+def _compact(rec: dict[str, float | None]) -> tuple[int, list[float | None]]:
+    years = sorted(int(y) for y, v in rec.items() if v is not None)
+    return years[0], [rec.get(str(y)) for y in range(years[0], years[-1] + 1)]
+
+
+def _fill(col: np.ndarray, keys: np.ndarray, start: int, values: np.ndarray) -> None:
+    """col[i] = values[keys[i] - start] (범위 안인 것만)"""
+    pos = keys - start
+    ok = (pos >= 0) & (pos < len(values))
+    col[ok] = values[pos[ok]]
+
+
+@dataclass
+class BatchResult:
+    """가중치 K개 결과 — 통계는 (K,) 배열, 연도별 값은 포트폴리오별 리스트 (시작 연도가 달라 길이가 다름)"""
+    tickers: list[str]
+    weights: np.ndarray
+    start_year: np.ndarray
+    constraining: list[str | None]
+    stats: dict[str, np.ndarray]                 # backtest.js stats 와 같은 키
+    annual: list[np.ndarray]                     # 연도별 포트폴리오 수익률
+    bench_annual: list[np.ndarray]
+    year_end_values: list[np.ndarray]            # [초기값, 1년 말, 2년 말, ...]
+    bench_year_end_values: list[np.ndarray]
+    invested: list[np.ndarray]
+
+    def to_js(self, k: int, bench: str | None) -> dict[str, Any]:
+        """k번째 포트폴리오 → backtest-engine.js simulate 반환값과 같은 모양"""
+        start = int(self.start_year[k])
+        years = range(start, start + len(self.annual[k]))
+        has_bench = bench is not None
+        stats = {name: _num(v[k]) for name, v in self.stats.items()}
+        return {
+            'effectiveStartYear': start,
+            'effectivePeriod': len(self.annual[k]),
+            'constrainingTicker': self.constraining[k],
+            'portSeries': [{'year': start + i, 'val': float(v)} for i, v in enumerate(self.year_end_values[k])],
+            'benchSeries': ([{'year': start + i, 'val': float(v)} for i, v in enumerate(self.bench_year_end_values[k])]
+                            if has_bench else []),
+            'investedSeries': [{'year': start + i, 'val': float(v)} for i, v in enumerate(self.invested[k])],
+            'annualData': [{'year': y, 'portRet': float(p), 'benchRet': float(b) if has_bench else 0}
+                           for y, p, b in zip(years, self.annual[k], self.bench_annual[k])],
+            'stats': stats,
+        }
+
+
+def _num(v: Any) -> float | None:
+    v = float(v)
+    return None if np.isnan(v) else v
+
+
+def _start_years(panel: ReturnPanel, tickers: Sequence[str], nonzero: np.ndarray, bench: str | None,
+                 user_start: int, order: np.ndarray) -> tuple[np.ndarray, list[str | None]]:
+    """포트폴리오별 effectiveStartYear · constrainingTicker (보유 순서 → 벤치마크 순, 처음으로 최대인 티커)
+
+    order: (K × N) 포트폴리오별 보유 순서 — 첫 연도가 같은 티커끼리는 먼저 담은 티커 (backtest-engine.js 와 같음)
+    """
+    fy = np.array([panel.first_year(t) or -1 for t in tickers])
+    bench_fy = (panel.first_year(bench) or -1) if bench else -1
+    held = np.where(nonzero, fy, -1)
+    best = held.max(axis=1)
+    idx = np.where(nonzero & (held == best[:, None]), order, np.inf).argmin(axis=1)
+    starts = np.maximum(user_start, np.maximum(best, bench_fy))
+    constraining: list[str | None] = []
+    for k in range(len(held)):
+        if best[k] > user_start and best[k] >= bench_fy:
+            constraining.append(tickers[idx[k]])
+        elif bench_fy > user_start and bench_fy > best[k]:
+            constraining.append(bench)
+        else:
+            constraining.append(None)
+    return starts, constraining
+
+
+def run_batch(panel: ReturnPanel, tickers: Sequence[str], weights: Any, period: int,
+              init_val: float = 10000.0, bench: str | None = 'SPY', dca_freq: str = 'none',
+              dca_amount: float = 0.0, rebalance: str = 'monthly', order: Any = None) -> BatchResult:
+    """weights (K × N, 행 합 1) 포트폴리오 K개를 한 번에 백테스트
+
+    tickers 는 weights 열 순서. 가중치 0 인 티커는 보유하지 않은 것으로 봄 (backtest.js 와 같음).
+    order: (K × N) 포트폴리오별 보유 순서 (constrainingTicker 동점 처리, 없으면 열 순서).
+    시작 연도(가장 늦게 상장한 보유 티커 기준)가 같은 포트폴리오끼리 묶어 행렬 연산.
+    """
+    tickers = list(tickers)
+    W = np.atleast_2d(np.asarray(weights, dtype=float))
+    if W.shape[1] != len(tickers):
+        raise ValueError(f'weights 열 {W.shape[1]}개 ≠ tickers {len(tickers)}개')
+    if rebalance not in REBALANCE_EVERY:
+        raise ValueError(f'알 수 없는 리밸런싱 주기: {rebalance}')
+    K = len(W)
+    nonzero = W != 0
+    curr_year = panel.data_end_year + 1
+    order = (np.broadcast_to(np.arange(len(tickers)), W.shape) if order is None
+             else np.asarray(order, dtype=float).reshape(W.shape))
+    starts, constraining = _start_years(panel, tickers, nonzero, bench, curr_year - period, order)
+    has_dca = dca_freq != 'none' and dca_amount > 0
+    dca_every = DCA_EVERY.get(dca_freq, 0)
+
+    names = ('cagr', 'vol', 'mdd', 'sharpe', 'sortino', 'totalRet', 'alpha',
+             'initVal', 'totalInvested', 'portVal', 'totalGain')
+    stats = {n: np.full(K, np.nan) for n in names}
+    empty = np.empty(0)
+    annual: list[np.ndarray] = [empty] * K
+    bench_annual: list[np.ndarray] = [empty] * K
+    year_end: list[np.ndarray] = [np.array([init_val])] * K
+    bench_end: list[np.ndarray] = [np.array([init_val])] * K
+    invested: list[np.ndarray] = [np.array([init_val])] * K
+
+    for start in np.unique(starts):
+        rows = np.flatnonzero(starts == start)
+        P = int(curr_year - start)
+        if P <= 0:
+            continue
+        Wg, nz = W[rows], nonzero[rows]
+        years = np.arange(start, curr_year)
+        months = start * 12 + np.arange(P * 12)
+
+        # 월 수익률 (G × M): 실제 월간 (보유 티커 모두 있을 때) 또는 연간 근사
+        A = panel.annual_matrix(tickers, years)
+        Mo = panel.monthly_matrix(tickers, months)
+        missing = np.isnan(Mo)
+        if rebalance == 'monthly':
+            approx = np.repeat((1 + Wg @ A.T) ** (1 / 12) - 1, 12, axis=1)
+            avail = (nz.astype(float) @ missing.T) == 0
+            port_mo = np.where(avail, Wg @ np.nan_to_num(Mo).T, approx)
+            values, inv = _compound(port_mo, init_val, has_dca, dca_every, dca_amount)
+        else:
+            asset_mo = np.where(missing, np.repeat((1 + A) ** (1 / 12) - 1, 12, axis=0), Mo)
+            values, inv = _compound_drift(Wg, asset_mo, init_val, REBALANCE_EVERY[rebalance],
+                                          has_dca, dca_every, dca_amount)
+
+        if bench:
+            bA = panel.annual_matrix([bench], years)[:, 0]
+            bMo = panel.monthly_matrix([bench], months)[:, 0]
+            bench_mo = np.where(np.isnan(bMo), np.repeat((1 + bA) ** (1 / 12) - 1, 12), bMo)
+            bench_vals = init_val * np.cumprod(1 + bench_mo)
+        else:
+            bench_vals = np.full(P * 12, init_val)
+
+        # 연말 값 · 연도별 수익률
+        ends = np.concatenate([np.full((len(rows), 1), init_val), values[:, 11::12]], axis=1)
+        rets = ends[:, 1:] / ends[:, :-1] - 1
+        b_ends = np.concatenate([[init_val], bench_vals[11::12]])
+        b_rets = b_ends[1:] / b_ends[:-1] - 1 if bench else np.zeros(P)
+
+        # 통계 (backtest-engine.js 와 같은 식)
+        n = P
+        mean = rets.mean(axis=1, keepdims=True)
+        vol = np.sqrt(((rets - mean) ** 2).sum(axis=1) / max(n - 1, 1)) * 100
+        path = np.concatenate([np.full((len(rows), 1), init_val), values], axis=1)
+        peak = np.maximum.accumulate(path, axis=1)
+        mdd = ((path - peak) / peak).min(axis=1)
+        final, total_inv = values[:, -1], inv[-1]
+        base = np.maximum(final / total_inv, 1e-6) if has_dca else final / init_val
+        cagr = (base ** (1 / n) - 1) * 100
+        sharpe = np.where(vol > 0, (cagr / 100 - RFR) / np.where(vol > 0, vol, 1) * 100, 0.0)
+        down = np.sqrt((np.where(rets < 0, rets, 0) ** 2).sum(axis=1) / max(n, 1))
+        sortino = np.where(down > 0, (cagr / 100 - RFR) / np.where(down > 0, down, 1), 5.0)
+        bench_cagr = ((bench_vals[-1] / init_val) ** (1 / n) - 1) * 100 if bench else np.nan
+
+        group = {
+            'cagr': cagr, 'vol': vol, 'mdd': mdd * 100, 'sharpe': sharpe, 'sortino': sortino,
+            'totalRet': (final / total_inv - 1) * 100, 'alpha': cagr - bench_cagr,
+            'initVal': np.full(len(rows), init_val), 'totalInvested': np.full(len(rows), total_inv),
+            'portVal': final, 'totalGain': final - total_inv,
+        }
+        for name, v in group.items():
+            stats[name][rows] = v
+        inv_ends = np.concatenate([[init_val], inv[11::12]])
+        for i, k in enumerate(rows):
+            annual[k], bench_annual[k] = rets[i], b_rets
+            year_end[k], bench_end[k], invested[k] = ends[i], b_ends, inv_ends
+
+    return BatchResult(tickers, W, starts, constraining, stats, annual, bench_annual,
+                       year_end, bench_end, invested)
+
+
+def _deposits(M: int, has_dca: bool, every: int, amount: float) -> np.ndarray:
+    """월 m 말 입금액 (m=0 은 초기 납입이라 제외)"""
+    d = np.zeros(M)
+    if has_dca and every:
+        d[every::every] = amount
+    return d
+
+
+def _compound(port_mo: np.ndarray, init_val: float, has_dca: bool, every: int,
+              amount: float) -> tuple[np.ndarray, np.ndarray]:
+    """월 수익률 (G × M) → 월말 평가액 (G × M), 누적 납입 (M,) — 수익 반영 후 입금 (backtest.js 순서)"""
+    d = _deposits(port_mo.shape[1], has_dca, every, amount)
+    if not d.any():
+        return init_val * np.cumprod(1 + port_mo, axis=1), np.full(port_mo.shape[1], init_val)
+    values = np.empty_like(port_mo)
+    v = np.full(len(port_mo), init_val)
+    for m in range(port_mo.shape[1]):
+        v = v * (1 + port_mo[:, m]) + d[m]
+        values[:, m] = v
+    return values, init_val + np.cumsum(d)
+
+
+def _compound_drift(Wg: np.ndarray, asset_mo: np.ndarray, init_val: float, rebalance_every: int,
+                    has_dca: bool, every: int, amount: float) -> tuple[np.ndarray, np.ndarray]:
+    """자산별 보유액 추적 — rebalance_every 개월마다 목표 비중으로 (0 이면 리밸런싱 없음), 입금은 목표 비중대로"""
+    M = len(asset_mo)
+    d = _deposits(M, has_dca, every, amount)
+    H = Wg * init_val
+    values = np.empty((len(Wg), M))
+    for m in range(M):
+        H = H * (1 + asset_mo[m])
+        H = H + Wg * d[m]
+        total = H.sum(axis=1)
+        if rebalance_every and (m + 1) % rebalance_every == 0:
+            H = Wg * total[:, None]
+        values[:, m] = total
+    return values, init_val + np.cumsum(d)
+
+
+def run(panel: ReturnPanel, holdings: Sequence[tuple[str, float]], period: int, init_val: float = 10000.0,
+        bench: str | None = 'SPY', dca_freq: str = 'none', dca_amount: float = 0.0,
+        rebalance: str = 'monthly') -> dict[str, Any]:
+    """포트폴리오 1개 → backtest-engine.js simulate 와 같은 모양의 결과"""
+    tickers = [t for t, _ in holdings]
+    weights = [[w for _, w in holdings]]
+    res = run_batch(panel, tickers, weights, period, init_val, bench, dca_freq, dca_amount, rebalance)
+    out = res.to_js(0, bench)
+    out['hasDCA'] = dca_freq != 'none' and dca_amount > 0
+    out['dcaAmount'] = dca_amount if dca_freq != 'none' else 0
+    return out
@@ -5,6 +5,7 @@ CORRYU ETF Dashboard - MECE 섹터 분류 엔진
 import re
 from collections import defaultdict
 from typing import Any
+import numpy as np
 import pandas as pd
 
 from config import (
@@ -12,7 +13,8 @@ from config import (
     PROTECT_EQUITIES, SHORT_TERM_BOND_WORDS, ANCHOR_TO_SECTOR,
     MANUAL_SECTOR_OVERRIDES,
 )
-from data_loader import get_fullname, get_corr_value
+from data_loader import get_fullname, get_corr_value, get_corr_matrix
+from ticker_index import TickerIndex
 
 
 def _match_keywords(text_lower: str, keywords: list[str]) -> bool:
@@ -99,7 +101,39 @@ def classify_by_correlation(ticker: str, df_corr_monthly: pd.DataFrame, df_corr_
         return 'S24', best_corr  # Fallback: 테마/특수목적
 
 
-def classify_all(all_tickers: set[str], scraped: dict[str, Any], df_corr_monthly: pd.DataFrame, df_corr_daily: pd.DataFrame) -> dict[str, dict[str, Any]]:
+def classify_by_correlation_batch(tickers: list[str], df_corr_monthly: pd.DataFrame, df_corr_daily: pd.DataFrame) -> tuple[list[str], np.ndarray]:
+    """Pass 2 & 3 벡터화: classify_by_correlation을 여러 티커에 한 번에 적용
+
+    앵커 × 티커 상관계수 행렬을 한 번 만들고 열 방향 argmax로 최고 앵커를 고른다.
+    동률이면 SECTOR_DEFS 순서상 앞 섹터 (단일 버전의 strict '>' 비교와 동일).
+
+    Returns:
+        (섹터 ID 리스트, 최고 상관계수 배열)
+    """
+    sids = [sid for sid, sdef in SECTOR_DEFS.items() if sdef['anchor']]
+    anchors = [SECTOR_DEFS[sid]['anchor'] for sid in sids]
+    r = get_corr_matrix(anchors, tickers, df_corr_monthly, df_corr_daily)
+
+    # 주식 보호: PROTECT_EQUITIES 티커는 비주식 앵커 후보에서 제외
+    non_equity = np.array([SECTOR_DEFS[sid]['asset_class'] != 'EQUITY' for sid in sids])
+    protected = np.array([t in PROTECT_EQUITIES for t in tickers], dtype=bool)
+    r = np.where(non_equity[:, None] & protected[None, :], -np.inf, r)
+
+    best = r.argmax(axis=0)
+    best_r = r[best, np.arange(len(tickers))]
+
+    # 상관계수 데이터 없음 → 테마/특수목적, r=0
+    cols = pd.Index(tickers)
+    has_data = cols.isin(df_corr_monthly.columns) | cols.isin(df_corr_daily.columns)
+    best_r = np.where(has_data, best_r, 0.0)
+
+    sid_arr = np.array(sids, dtype=object)[best]
+    sectors = np.where(has_data & (best_r >= CORR_THRESHOLD), sid_arr, 'S24').tolist()
+    return sectors, best_r
+
+
+def classify_all(all_tickers: set[str], scraped: dict[str, Any], df_corr_monthly: pd.DataFrame, df_corr_daily: pd.DataFrame,
+                 ticker_index: TickerIndex | None = None) -> dict[str, dict[str, Any]]:
     """전체 ETF를 섹터로 분류
 
     Args:
@@ -107,14 +141,18 @@ def classify_all(all_tickers: set[str], scraped: dict[str, Any], df_corr_monthly
         scraped: 스크래핑 정보 dict
         df_corr_monthly: 월간 상관계수 매트릭스
         df_corr_daily: 일간 상관계수 매트릭스
+        ticker_index: 파이프라인 공용 티커 인덱스 (all_tickers를 포함해야 함 — 없는 티커가 있으면 ValueError, 없으면 생성)
 
     Returns:
         dict: ticker → {'sector': 섹터ID, 'method': 분류방법, 'r_anchor': 상관계수}
     """
-    classification: dict[str, dict[str, Any]] = {}
+    index = ticker_index if ticker_index is not None else TickerIndex(all_tickers)
+    tickers = index.tickers_of(index.require_ids(all_tickers))  # ID 순 = 티커 정렬 순
+
+    entries: dict[str, dict[str, Any] | None] = {}
     method_counts: defaultdict[str, int] = defaultdict(int)
 
-    for ticker in sorted(all_tickers):
+    for ticker in tickers:
         fullname = get_fullname(ticker, scraped)
 
         # Pass 0: 앵커 ETF는 자기 섹터에 무조건 배정
@@ -122,7 +160,7 @@ def classify_all(all_tickers: set[str], scraped: dict[str, Any], df_corr_monthly
         sector: str | None = None
         if ticker in ANCHOR_TO_SECTOR:
             sector = ANCHOR_TO_SECTOR[ticker]
-            classification[ticker] = {
+            entries[ticker] = {
                 'sector': sector,
                 'method': 'anchor',
                 'r_anchor': 1.0,
@@ -133,7 +171,7 @@ def classify_all(all_tickers: set[str], scraped: dict[str, Any], df_corr_monthly
         # Pass 0.5: 수동 섹터 오버라이드 (키워드/상관계수보다 우선)
         if ticker in MANUAL_SECTOR_OVERRIDES:
             sector = MANUAL_SECTOR_OVERRIDES[ticker]
-            classification[ticker] = {
+            entries[ticker] = {
                 'sector': sector,
                 'method': 'manual_override',
                 'r_anchor': 0.0,  # 나중에 fill_anchor_correlations에서 채움
@@ -144,7 +182,7 @@ def classify_all(all_tickers: set[str], scraped: dict[str, Any], df_corr_monthly
         # Pass 1: 키워드 룰
         sector = classify_by_keywords(ticker, fullname)
         if sector:
-            classification[ticker] = {
+            entries[ticker] = {
                 'sector': sector,
                 'method': 'keyword',
                 'r_anchor': 0.0,  # 키워드로 분류된 것은 나중에 상관계수 채움
@@ -152,17 +190,22 @@ def classify_all(all_tickers: set[str], scraped: dict[str, Any], df_corr_monthly
             method_counts['keyword'] += 1
             continue
 
-        # Pass 2 & 3: 상관계수 기반
-        sector, r_val = classify_by_correlation(
-            ticker, df_corr_monthly, df_corr_daily, scraped
-        )
-        method = 'correlation' if r_val >= CORR_THRESHOLD else 'fallback'
-        classification[ticker] = {
-            'sector': sector,
-            'method': method,
-            'r_anchor': round(r_val, 4),
-        }
-        method_counts[method] += 1
+        entries[ticker] = None  # Pass 2 & 3 대기 (삽입 순서 유지용 자리)
+
+    # Pass 2 & 3: 상관계수 기반 (남은 티커 일괄 처리)
+    pending = [t for t, e in entries.items() if e is None]
+    if pending:
+        sectors, r_vals = classify_by_correlation_batch(pending, df_corr_monthly, df_corr_daily)
+        for ticker, sector, r_val in zip(pending, sectors, r_vals.tolist()):
+            method = 'correlation' if r_val >= CORR_THRESHOLD else 'fallback'
+            entries[ticker] = {
+                'sector': sector,
+                'method': method,
+                'r_anchor': round(r_val, 4),
+            }
+            method_counts[method] += 1
+
+    classification: dict[str, dict[str, Any]] = {t: e for t, e in entries.items() if e is not None}
 
     print(f"\n--- 분류 방법별 통계 ---")
     for method, count in sorted(method_counts.items()):
@@ -183,6 +226,18 @@ def get_sector_members(classification: dict[str, dict[str, Any]]) -> dict[str, s
     return dict(members)
 
 
+def get_sector_masks(classification: dict[str, dict[str, Any]], ticker_index: TickerIndex) -> dict[str, np.ndarray]:
+    """분류 결과를 섹터별 불리언 마스크로 변환 (멤버십 판정 = 마스크 연산)
+
+    Returns:
+        dict: sector_id → bool 배열 (len(ticker_index),)
+    """
+    sector_of = np.array(
+        [classification.get(t, {}).get('sector', '') for t in ticker_index.tickers], dtype=object,
+    )
+    return {sid: sector_of == sid for sid in SECTOR_DEFS if (sector_of == sid).any()}
+
+
 def fill_anchor_correlations(classification: dict[str, dict[str, Any]], sector_members: dict[str, set[str]], df_corr_monthly: pd.DataFrame, df_corr_daily: pd.DataFrame) -> None:
     """키워드로 분류된 ETF의 r_anchor를 실제 상관계수로 채움"""
     for sector_id, tickers in sector_members.items():
@@ -190,10 +245,15 @@ def fill_anchor_correlations(classification: dict[str, dict[str, Any]], sector_m
         if not anchor:
             continue
 
-        for ticker in tickers:
-            if classification[ticker]['r_anchor'] == 0.0 or classification[ticker]['method'] == 'keyword':
-                r = get_corr_value(anchor, ticker, df_corr_monthly, df_corr_daily)
-                classification[ticker]['r_anchor'] = round(r, 4)
+        targets = sorted(
+            t for t in tickers
+            if classification[t]['r_anchor'] == 0.0 or classification[t]['method'] == 'keyword'
+        )
+        if not targets:
+            continue
+        r_row = get_corr_matrix([anchor], targets, df_corr_monthly, df_corr_daily)[0]
+        for ticker, r in zip(targets, r_row.tolist()):
+            classification[ticker]['r_anchor'] = round(r, 4)
 
 
 def fill_super_anchor_correlations(classification: dict[str, dict[str, Any]], df_corr_monthly: pd.DataFrame, df_corr_daily: pd.DataFrame) -> None:
@@ -207,13 +267,18 @@ def fill_super_anchor_correlations(classification: dict[str, dict[str, Any]], df
         for sid in ss_def['sub_sectors']:
             sector_to_ss_anchor[sid] = ss_def['anchor']
 
-    updated = 0
+    # 앵커별로 대상 티커를 모아 한 행씩 일괄 조회
+    by_anchor: defaultdict[str, list[str]] = defaultdict(list)
     for ticker, info in classification.items():
         sid = info['sector']
         if sid in sector_to_ss_anchor:
-            anchor = sector_to_ss_anchor[sid]
-            r = get_corr_value(anchor, ticker, df_corr_monthly, df_corr_daily)
+            by_anchor[sector_to_ss_anchor[sid]].append(ticker)
+
+    updated = 0
+    for anchor, targets in by_anchor.items():
+        r_row = get_corr_matrix([anchor], targets, df_corr_monthly, df_corr_daily)[0]
+        for ticker, r in zip(targets, r_row.tolist()):
             classification[ticker]['r_anchor'] = round(r, 4)
-            updated += 1
+        updated += len(targets)
 
     print(f"  슈퍼섹터 앵커 재계산 완료: {updated}개 ETF (앵커: QQQ)")
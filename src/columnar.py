@@ -0,0 +1,78 @@
+"""
+CORRYU ETF Dashboard - allData 열 지향(columnar) 인코딩 모듈
+ETF마다 키 이름 22개를 반복하는 행 객체 대신 섹터별 필드 배열로 저장
+- 키 이름은 헤더 fields 에 한 번만
+- 반복 문자열(레거시 사유·설명)은 공용 사전 dict 의 정수 코드로
+- 불리언은 0/1
+프론트엔드는 output/etf-columnar.js 로 보는 섹터만 지연 디코딩
+"""
+from typing import Any
+
+FORMAT = 'columnar-v1'
+
+# 값이 문자열 리스트이고 종목 간 반복이 많은 필드 → 사전 코드 리스트로
+DICT_FIELDS: tuple[str, ...] = ('legacy_reasons', 'legacy_detail')
+
+
+def _field_order(all_data: dict[str, list[dict[str, Any]]]) -> list[str]:
+    """전 섹터 행의 키 (처음 나온 순서) — 행마다 키 구성이 다르면 ValueError"""
+    fields: list[str] = []
+    for etfs in all_data.values():
+        for etf in etfs:
+            if not fields:
+                fields = list(etf)
+            elif list(etf) != fields:
+                raise ValueError(f'{etf.get("ticker")}: 행 키 구성이 다름 {sorted(set(etf) ^ set(fields))}')
+    return fields
+
+
+def encode_all_data(all_data: dict[str, list[dict[str, Any]]]) -> dict[str, Any]:
+    """{sid: [etf, ...]} → {'format', 'fields', 'bools', 'dict', 'sectors': {sid: {'n', 'cols'}}}
+
+    섹터 내 행 순서는 그대로 (cols[f][i] 가 i번째 ETF)
+    """
+    fields = _field_order(all_data)
+    bools = [f for f in fields
+             if any(isinstance(etf[f], bool) for etfs in all_data.values() for etf in etfs)]
+    words: dict[str, int] = {}
+
+    def code(s: str) -> int:
+        return words.setdefault(s, len(words))
+
+    sectors: dict[str, Any] = {}
+    for sid, etfs in all_data.items():
+        cols: dict[str, list[Any]] = {}
+        for f in fields:
+            values = [etf[f] for etf in etfs]
+            if f in DICT_FIELDS:
+                values = [[code(s) for s in v] for v in values]
+            elif f in bools:
+                values = [int(v) for v in values]
+            cols[f] = values
+        sectors[sid] = {'n': len(etfs), 'cols': cols}
+    return {'format': FORMAT, 'fields': fields, 'bools': bools,
+            'dict': list(words), 'sectors': sectors}
+
+
+def decode_sector(doc: dict[str, Any], sid: str) -> list[dict[str, Any]]:
+    """한 섹터만 행 객체 리스트로 복원 (etf-columnar.js 와 같은 규칙)"""
+    words = doc['dict']
+    bools = set(doc['bools'])
+    sector = doc['sectors'][sid]
+    cols = sector['cols']
+    rows: list[dict[str, Any]] = [{} for _ in range(sector['n'])]
+    for f in doc['fields']:
+        for row, v in zip(rows, cols[f]):
+            if f in DICT_FIELDS:
+                v = [words[c] for c in v]
+            elif f in bools:
+                v = bool(v)
+            row[f] = v
+    return rows
+
+
+def decode_all_data(doc: dict[str, Any]) -> dict[str, list[dict[str, Any]]]:
+    """열 지향 문서 → 원래 allData (왕복 시 동일)"""
+    if doc.get('format') != FORMAT:
+        raise ValueError(f'알 수 없는 형식: {doc.get("format")}')
+    return {sid: decode_sector(doc, sid) for sid in doc['sectors']}
@@ -9,6 +9,8 @@ from typing import Any
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 RAW_DIR = os.path.join(BASE_DIR, 'raw')           # 원본 데이터 (parquet, append-only)
 OUTPUT_DIR = os.path.join(BASE_DIR, 'output')
+CACHE_DIR = os.path.join(BASE_DIR, '.cache')      # 파이프라인 중간 산출물 캐시 (커밋 안 함)
+ETF_DATA_MONOLITH = True   # output/etf_data.json 단일 파일도 생성 (섹터별 샤드와 별도, 기존 페이지 호환)
 
 # 하위 호환용 (구 pkl/csv 경로 — 더 이상 사용 안 함)
 # DATA_PROCESSED = os.path.join(BASE_DIR, 'data_processed')  # DEPRECATED
@@ -10,6 +10,7 @@ import numpy as np
 import pandas as pd
 
 from config import RAW_DIR, MAR_ANNUAL, MAR_DAILY, MIN_ROLLING_DAYS
+from return_index import ReturnIndex
 
 PRICES_PARQUET = Path(RAW_DIR) / 'prices_close.parquet'
 META_PARQUET   = Path(RAW_DIR) / 'meta.parquet'
@@ -90,9 +91,33 @@ def compute_perf_stats(df_price: pd.DataFrame) -> dict[str, dict[str, Any]]:
     return stats
 
 
-def compute_corr_monthly(df_price: pd.DataFrame) -> pd.DataFrame:
-    """월말 수익률 기반 상관계수 행렬 계산 (분류에 사용)"""
-    monthly = df_price.resample('ME').last().pct_change().dropna(how='all')
+def compute_monthly_close(df_price: pd.DataFrame) -> pd.DataFrame:
+    """월말 종가 (상관계수·corr_returns.json 공용 리샘플)"""
+    return df_price.resample('ME').last()
+
+
+def compute_yearly_close(df_price: pd.DataFrame) -> pd.DataFrame:
+    """연말 종가 (backtest_data.json 용 리샘플)"""
+    return df_price.resample('YE').last()
+
+
+def compute_return_index(df_price: pd.DataFrame, freq: str = 'M',
+                         closes: pd.DataFrame | None = None) -> ReturnIndex:
+    """기간 말 누적 로그수익률 인덱스 (임의 구간·다기간 수익률 조회용)
+
+    freq 'M' 이면 compute_monthly_close 결과를 closes 로 넘겨 리샘플 재사용.
+    """
+    return ReturnIndex.from_prices(df_price, freq, closes)
+
+
+def compute_corr_monthly(df_price: pd.DataFrame, monthly_close: pd.DataFrame | None = None) -> pd.DataFrame:
+    """월말 수익률 기반 상관계수 행렬 계산 (분류에 사용)
+
+    monthly_close가 주어지면 리샘플을 다시 하지 않고 재사용.
+    """
+    if monthly_close is None:
+        monthly_close = compute_monthly_close(df_price)
+    monthly = monthly_close.pct_change().dropna(how='all')
     # 36개월 미만 데이터는 제외 (NaN 열 → 상관계수 0)
     valid = monthly.columns[monthly.notna().sum() >= 36]
     return monthly[valid].corr()
@@ -192,3 +217,29 @@ def get_corr_value(
     else:
         return 0.0
     return 0.0 if pd.isna(r) else float(r)
+
+
+def get_corr_matrix(
+    ref_tickers: list[str],
+    tickers: list[str],
+    df_corr_monthly: pd.DataFrame,
+    df_corr_daily: pd.DataFrame,
+) -> np.ndarray:
+    """get_corr_value의 벡터화 버전 — (len(ref_tickers), len(tickers)) 행렬 반환
+
+    쌍마다 월간 우선, 두 티커가 모두 월간에 없으면 일간 fallback, 둘 다 없으면 0.
+    NaN 상관계수는 0으로 처리 (get_corr_value와 동일 규칙).
+    """
+    refs = pd.Index(ref_tickers)
+    cols = pd.Index(tickers)
+    out = np.zeros((len(refs), len(cols)))
+    # 월간을 나중에 덮어써서 우선순위 부여
+    for df in (df_corr_daily, df_corr_monthly):
+        ref_in = refs.isin(df.columns)
+        col_in = cols.isin(df.columns)
+        both = ref_in[:, None] & col_in[None, :]
+        if not both.any():
+            continue
+        vals = df.reindex(index=cols, columns=refs).to_numpy(dtype=float).T
+        out = np.where(both, np.nan_to_num(vals, nan=0.0), out)
+    return out
@@ -0,0 +1,107 @@
+"""
+CORRYU ETF Dashboard - 가격 이력 다운샘플 (LTTB, 티커 전체 벡터화)
+Largest-Triangle-Three-Buckets: 첫·끝 점을 고정하고 가운데를 budget-2 개 버킷으로 나눠
+버킷마다 (직전 선택 점, 다음 버킷 평균) 과 만드는 삼각형 넓이가 가장 큰 점 하나를 고름
+→ 점 수를 고정 예산으로 줄여도 고점·저점·급락 모양이 남음 (균등 간격 추출은 놓침)
+- 버킷 순서대로 진행 (직전 선택에 의존) 하되 각 단계는 티커 전체를 한 번에 계산
+- x 는 행 번호 (등간격 — 주간 · 일별 거래일 순번)
+price_histories: 티커별 가격 이력 (history) — compute_all 의 etf_pages 스테이지가 만들어 build_etf_pages 에 넘김
+"""
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from packed import trim_bounds
+from return_index import WEEK_EPOCH
+from serialize import round_list
+
+HISTORY_WEEKLY_POINTS = 260   # 주간 구간 LTTB 점 수
+HISTORY_DAILY_POINTS  = 120   # 일별 구간 LTTB 점 수
+HISTORY_DAILY_DAYS    = 365   # 일별 구간 길이 (최신 거래일 기준 달력일)
+HISTORY_SIG_DIGITS    = 5     # 종가 유효숫자 (티커별 최댓값 기준 소수 자릿수)
+EPOCH = pd.Timestamp('1970-01-01')
+
+
+def lttb_indices(values: np.ndarray, budget: int) -> np.ndarray:
+    """values: T×N (열 = 티커, 유효 구간 밖 NaN, 구간 안 결측은 호출 쪽에서 채움)
+    → N×budget 선택 행 번호 (오름차순, 남는 칸 -1) — 유효 점이 budget 이하면 전부"""
+    if budget < 3:
+        raise ValueError(f'budget 은 3 이상: {budget}')
+    values = np.asarray(values, dtype=float)
+    n_cols = values.shape[1]
+    first, last, has_any = trim_bounds(values)
+    n = np.where(has_any, last - first + 1, 0)
+    slots = np.arange(budget)
+    out = np.where(slots < n[:, None], first[:, None] + slots, -1)
+
+    cols = np.flatnonzero(n > budget)
+    if not len(cols):
+        return out
+    y = values[:, cols]
+    base, length = first[cols], n[cols]
+    every = (length - 2) / (budget - 2)
+    # 다음 버킷 평균용 누적합 (NaN 은 유효 구간 밖뿐 → 0)
+    csum = np.vstack([np.zeros(len(cols)), np.nancumsum(y, axis=0)])
+    lane = np.arange(len(cols))
+    picked = np.empty((len(cols), budget), dtype=np.int64)
+    picked[:, 0] = 0
+    picked[:, -1] = length - 1
+    a = np.zeros(len(cols), dtype=np.int64)
+    for i in range(budget - 2):
+        lo = np.floor(i * every).astype(np.int64) + 1
+        hi = np.floor((i + 1) * every).astype(np.int64) + 1
+        nxt = np.minimum(np.floor((i + 2) * every).astype(np.int64) + 1, length)
+        avg_x = (hi + nxt - 1) / 2
+        avg_y = (csum[base + nxt, lane] - csum[base + hi, lane]) / (nxt - hi)
+        ax, ay = a, y[base + a, lane]
+        # 버킷 폭은 티커마다 다름 → 최대 폭으로 펼치고 넘치는 칸은 제외
+        width = hi - lo
+        cand = lo[:, None] + np.arange(width.max())
+        inside = cand < hi[:, None]
+        cy = y[base[:, None] + np.where(inside, cand, lo[:, None]), lane[:, None]]
+        area = np.abs((ax - avg_x)[:, None] * (cy - ay[:, None])
+                      - (ax[:, None] - cand) * (avg_y - ay)[:, None])
+        area[~inside] = -1
+        a = cand[lane, area.argmax(axis=1)]
+        picked[:, i + 1] = a
+    out[cols] = picked + base[:, None]
+    return out
+
+
+def price_histories(df_price: pd.DataFrame) -> dict[str, dict[str, dict[str, list[Any]]]]:
+    """일별 종가 (행=거래일, 열=티커) → {ticker: {'w': {'t', 'c'}, 'd': {'t', 'c'}}}
+
+    티커 유효 구간 안 결측은 직전 종가로 채운 뒤 주간 · 일별 구간을 각각 lttb_indices 로 한 번에 줄임.
+    """
+    values = df_price.to_numpy(dtype=float)
+    first, last, has_any = trim_bounds(values)
+    filled = pd.DataFrame(values).ffill().to_numpy(copy=True)
+    rows = np.arange(len(values))[:, None]
+    filled[(rows < first) | (rows > last)] = np.nan
+
+    days = np.asarray((df_price.index - EPOCH).days, dtype=np.int64)
+    daily = df_price.index > df_price.index[-1] - pd.Timedelta(days=HISTORY_DAILY_DAYS)
+    # 거래일 → 그 주 금요일 (W-FRI) 기준 주 번호 (토~금이 한 주)
+    week = (np.asarray((df_price.index - WEEK_EPOCH).days) + 6) // 7
+    week_end = np.append(week[1:] != week[:-1], True)
+    segments = {'w': (np.flatnonzero(week_end & ~daily), HISTORY_WEEKLY_POINTS),
+                'd': (np.flatnonzero(daily), HISTORY_DAILY_POINTS)}
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        top = np.nanmax(np.where(np.isnan(filled), -np.inf, np.abs(filled)), axis=0)
+        decimals = np.clip(HISTORY_SIG_DIGITS - 1 - np.floor(np.log10(top)), 0, 8)
+    decimals[~np.isfinite(decimals)] = 0
+
+    out: dict[str, dict[str, dict[str, list[Any]]]] = {}
+    for key, (seg_rows, budget) in segments.items():
+        if not len(seg_rows):
+            continue
+        picks = lttb_indices(filled[seg_rows], budget)
+        for j in np.flatnonzero(picks[:, 0] >= 0):
+            sel = seg_rows[picks[j][picks[j] >= 0]]
+            out.setdefault(str(df_price.columns[j]), {})[key] = {
+                't': days[sel].tolist(),
+                'c': round_list(filled[sel, j], int(decimals[j])),
+            }
+    return out
@@ -0,0 +1,172 @@
+"""
+CORRYU ETF Dashboard - 스테이지 계측 모듈
+스테이지별 wall·CPU 시간, 최대 RSS 증가분, 출력 바이트를 측정해
+.cache/run_stats/ 의 run_stats.json(이번 실행)과 history.jsonl(최근 N회 누적)에 기록
+(배포 디렉터리 output/ 에는 쓰지 않음 — CI 는 워크플로 아티팩트로 올리고 히스토리는 actions/cache 로 유지)
+--profile: 스테이지마다 cProfile 덤프(.prof) 저장 → python -m pstats / snakeviz 로 확인
+"""
+import cProfile
+import json
+import os
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+from config import CACHE_DIR
+
+RUN_STATS_DIR      = os.path.join(CACHE_DIR, 'run_stats')
+RUN_STATS_PATH     = os.path.join(RUN_STATS_DIR, 'run_stats.json')
+RUN_HISTORY_PATH   = os.path.join(RUN_STATS_DIR, 'history.jsonl')
+HISTORY_KEEP       = 120   # 히스토리 보관 실행 수 (평일 1회 ≈ 반년)
+
+
+@dataclass
+class Usage:
+    """한 구간의 자원 사용량
+
+    rss_delta는 프로세스 최대 RSS(high-water mark)의 증가분 —
+    앞선 스테이지가 이미 더 높은 피크를 찍었다면 0이 된다.
+    """
+    wall: float = 0.0
+    cpu: float = 0.0
+    rss_delta: int = 0     # bytes
+
+
+def peak_rss() -> int:
+    """현재 프로세스 최대 RSS (bytes, 측정 불가면 0)"""
+    if resource is None:
+        return 0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024   # Linux는 KB 단위
+
+
+class Meter:
+    """with 블록의 wall·CPU 시간과 최대 RSS 증가분 측정"""
+
+    def __enter__(self) -> 'Meter':
+        self.usage = Usage()
+        self._rss0 = peak_rss()
+        self._cpu0 = time.process_time()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.usage.wall = time.perf_counter() - self._t0
+        self.usage.cpu = time.process_time() - self._cpu0
+        self.usage.rss_delta = max(0, peak_rss() - self._rss0)
+
+
+def measure(func: Callable[..., Any], kwargs: dict[str, Any],
+            profile_path: str | None = None) -> tuple[Any, Usage]:
+    """func(**kwargs) 실행 + 계측 (profile_path가 있으면 cProfile 덤프 저장)"""
+    profiler = cProfile.Profile() if profile_path else None
+    with Meter() as m:
+        if profiler is not None:
+            value = profiler.runcall(func, **kwargs)
+        else:
+            value = func(**kwargs)
+    if profiler is not None and profile_path:
+        os.makedirs(os.path.dirname(profile_path) or '.', exist_ok=True)
+        profiler.dump_stats(profile_path)
+    return value, m.usage
+
+
+def output_bytes(paths: Iterable[str]) -> int:
+    """출력 파일·디렉토리 총 바이트 (없는 경로는 0)"""
+    total = 0
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                total += sum(os.path.getsize(os.path.join(root, f)) for f in files)
+        elif os.path.exists(path):
+            total += os.path.getsize(path)
+    return total
+
+
+# ── 기록 ─────────────────────────────────────────────────────────────
+
+def load_history(path: str = RUN_HISTORY_PATH) -> list[dict[str, Any]]:
+    """히스토리 파일(JSON Lines) 로드 — 깨진 줄은 무시"""
+    if not os.path.exists(path):
+        return []
+    runs = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                runs.append(json.loads(line))
+            except ValueError:
+                continue
+    return runs
+
+
+def _trend(history: list[dict[str, Any]], name: str) -> float | None:
+    """과거 실행에서 해당 스테이지가 실제로 돈(miss/forced) wall 시간의 중앙값"""
+    walls = [
+        s['wall'] for run in history for s in run.get('stages', [])
+        if s['name'] == name and s['status'] in ('miss', 'forced')
+    ]
+    return round(statistics.median(walls), 3) if walls else None
+
+
+def write_run_stats(results: Iterable[Any], total: Usage, info: dict[str, Any] | None = None,
+                    path: str = RUN_STATS_PATH, history_path: str = RUN_HISTORY_PATH,
+                    keep: int = HISTORY_KEEP) -> dict[str, Any]:
+    """이번 실행 통계를 path에 쓰고 history_path에 한 줄 추가 (최근 keep회만 유지)
+
+    Args:
+        results: StageResult 목록 (name, status, seconds, cpu, rss_delta, output_bytes)
+        total:   실행 전체 Usage (메인 프로세스 기준)
+        info:    실행 옵션 등 부가 정보 (jobs, force, ...)
+
+    Returns:
+        dict: 기록한 통계 (stages[].median_wall = 히스토리 기준 과거 중앙값)
+    """
+    history = load_history(history_path)
+    stages = [{
+        'name':         r.name,
+        'status':       r.status,
+        'wall':         round(r.seconds, 3),
+        'cpu':          round(r.cpu, 3),
+        'rss_delta':    r.rss_delta,
+        'output_bytes': r.output_bytes,
+    } for r in results]
+    stats = {
+        'started_at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        **(info or {}),
+        'total':      {k: round(v, 3) if isinstance(v, float) else v for k, v in asdict(total).items()},
+        'peak_rss':   peak_rss(),
+        'stages':     stages,
+    }
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({**stats, 'stages': [{**s, 'median_wall': _trend(history, s['name'])} for s in stages]},
+                  f, ensure_ascii=False, indent=2)
+
+    os.makedirs(os.path.dirname(history_path) or '.', exist_ok=True)
+    lines = [json.dumps(run, ensure_ascii=False, separators=(',', ':'))
+             for run in (history + [stats])[-keep:]]
+    tmp = history_path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+    os.replace(tmp, history_path)
+    return stats
+
+
+def format_bytes(n: float) -> str:
+    """바이트 수 → 사람이 읽는 단위 (예: 653.2KB)"""
+    if abs(n) < 1024:
+        return f'{n:.0f}B'
+    for unit in ('KB', 'MB'):
+        n /= 1024
+        if abs(n) < 1024:
+            return f'{n:.1f}{unit}'
+    return f'{n / 1024:.1f}GB'
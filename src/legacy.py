@@ -12,88 +12,92 @@ from config import (
     LEGACY_TRACKING_ERROR_THRESHOLD, LEGACY_NEAR_DUPLICATE_CORR,
     LEGACY_NEAR_DUPLICATE_TOP_N, SHORT_HISTORY_CUTOFF,
 )
+from ticker_index import TickerIndex
 
 
-def assess_sector_legacy(sector_id: str, sector_tickers: set[str], classification: dict[str, Any],
-                         df_corr_monthly: pd.DataFrame, df_corr_daily: pd.DataFrame,
-                         scraped: dict[str, Any], perf_stats: dict[str, Any], df_price: pd.DataFrame) -> dict[str, dict[str, Any]]:
-    """단일 섹터의 레거시 ETF를 판별
+def _legacy_flags(index: TickerIndex, scraped: dict[str, Any]) -> dict[str, np.ndarray]:
+    """자동 레거시 규칙을 인덱스 전체에 대해 마스크 연산으로 판정
 
     Returns:
-        dict: ticker → {is_legacy, reasons, details}
+        dict: 규칙명 → bool 배열 (len(index),)
     """
-    anchor = SECTOR_DEFS[sector_id]['anchor']
-    results = {}
-
-    # 섹터 내 소르티노 분포 계산 (하위 20% 기준)
-    sortinos = []
-    for t in sector_tickers:
-        s = perf_stats.get(t, {}).get('Sortino', None)
-        if s is not None and s != 0:
-            sortinos.append(s)
-    sortino_20th = np.percentile(sortinos, 20) if len(sortinos) >= 5 else -999
-
-    # AUM 기준 상위 N개 추출 (중복 체크용)
-    aum_sorted = sorted(
-        sector_tickers,
-        key=lambda t: scraped.get(t, {}).get('market_cap', 0),
-        reverse=True
+    manual = index.mask_of(MANUAL_LEGACY_OVERRIDES)
+    exempt = index.mask_of(LEGACY_EXEMPTIONS)
+    inception = np.array(
+        [str(scraped.get(t, {}).get('inception_date', '1900-01-01'))[:10] for t in index.tickers],
+        dtype=str,
     )
-    top_n_tickers = set(aum_sorted[:LEGACY_NEAR_DUPLICATE_TOP_N])
+    aum = index.take(scraped, 'market_cap', default=0.0)
+
+    # 자동 규칙: SHORT_HISTORY_CUTOFF 이후 상장 → 상장기간 너무 짧음 (모든 카테고리 적용)
+    short = ~manual & ~exempt & (inception != '1900-01-01') & (inception > SHORT_HISTORY_CUTOFF)
+    # 자동 규칙: AUM ≤ $100M → AUM 너무 적음 (다른 사유가 없는 active ETF에만 적용)
+    low_aum = ~manual & ~short & ~exempt & (aum > 0) & (aum <= LEGACY_MIN_AUM)
+    return {'MANUAL': manual, 'SHORT_HISTORY': short, 'LOW_AUM': low_aum}
+
 
-    for ticker in sector_tickers:
+def _sector_results(index: TickerIndex, ids: np.ndarray, flags: dict[str, np.ndarray]) -> dict[str, dict[str, Any]]:
+    """ID 배열(섹터 멤버)에 대한 레거시 결과 dict 생성 — 문자열은 여기서만 복원"""
+    manual = flags['MANUAL'][ids]
+    short = flags['SHORT_HISTORY'][ids]
+    low_aum = flags['LOW_AUM'][ids]
+
+    results = {}
+    for ticker, m, sh, la in zip(index.tickers_of(ids), manual.tolist(), short.tolist(), low_aum.tolist()):
         reasons = []
         details = []
-
-        # 수동 오버라이드
-        if ticker in MANUAL_LEGACY_OVERRIDES:
+        if m:
             reasons.append('MANUAL')
             details.append(f'{MANUAL_LEGACY_OVERRIDES[ticker]}')
-
-        # 자동 규칙: 2023년 이후 상장 → 상장기간 너무 짧음 (모든 카테고리 적용)
-        if ticker not in MANUAL_LEGACY_OVERRIDES and ticker not in LEGACY_EXEMPTIONS:
-            try:
-                inc = str(scraped.get(ticker, {}).get('inception_date', '1900-01-01'))[:10]
-                if inc != '1900-01-01' and inc > SHORT_HISTORY_CUTOFF:
-                    reasons.append('SHORT_HISTORY')
-                    details.append('상장기간 너무 짧음')
-            except Exception:
-                pass
-
-        # 자동 규칙: AUM ≤ $100M → AUM 너무 적음 (active ETF에만 적용)
-        if not reasons and ticker not in LEGACY_EXEMPTIONS:
-            aum = scraped.get(ticker, {}).get('market_cap', 0)
-            if 0 < aum <= LEGACY_MIN_AUM:
-                reasons.append('LOW_AUM')
-                details.append('AUM 너무 적음')
-
-        is_legacy = len(reasons) >= 1
+        if sh:
+            reasons.append('SHORT_HISTORY')
+            details.append('상장기간 너무 짧음')
+        if la:
+            reasons.append('LOW_AUM')
+            details.append('AUM 너무 적음')
         results[ticker] = {
-            'is_legacy': is_legacy,
+            'is_legacy': len(reasons) >= 1,
             'reasons': reasons,
             'details': details,
         }
-
     return results
 
 
+def assess_sector_legacy(sector_tickers: set[str], scraped: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """단일 섹터의 레거시 ETF를 판별 (자동 규칙은 scraped 의 상장일·AUM 만 사용)
+
+    Returns:
+        dict: ticker → {is_legacy, reasons, details}
+    """
+    index = TickerIndex(sector_tickers)
+    ids = np.arange(len(index))
+    return _sector_results(index, ids, _legacy_flags(index, scraped))
+
+
 def assess_all_legacy(sector_members: dict[str, set[str]], classification: dict[str, Any],
                       df_corr_monthly: pd.DataFrame, df_corr_daily: pd.DataFrame,
-                      scraped: dict[str, Any], perf_stats: dict[str, Any], df_price: pd.DataFrame) -> dict[str, dict[str, Any]]:
+                      scraped: dict[str, Any], perf_stats: dict[str, Any], df_price: pd.DataFrame,
+                      ticker_index: TickerIndex | None = None) -> dict[str, dict[str, Any]]:
     """전체 섹터에 대해 레거시 판별 실행
 
+    규칙 마스크는 ticker_index 전체에 대해 한 번만 계산하고 섹터별로 ID 슬라이스.
+    sector_members 의 티커는 모두 ticker_index 에 있어야 함 (없으면 ValueError).
+    classification · df_corr_monthly · df_corr_daily · perf_stats · df_price 는 현재 규칙에서 쓰지 않음
+    (파이프라인 스테이지 입력 순서를 유지하려고 남겨 둔 인자).
+
     Returns:
         dict: ticker → {is_legacy, reasons, details}
     """
+    index = ticker_index if ticker_index is not None else TickerIndex(
+        t for tickers in sector_members.values() for t in tickers
+    )
+    flags = _legacy_flags(index, scraped)
+
     all_legacy = {}
     legacy_summary = {}
 
     for sector_id, tickers in sorted(sector_members.items()):
-        results = assess_sector_legacy(
-            sector_id, tickers, classification,
-            df_corr_monthly, df_corr_daily,
-            scraped, perf_stats, df_price
-        )
+        results = _sector_results(index, index.require_ids(tickers), flags)
         all_legacy.update(results)
 
         legacy_count = sum(1 for v in results.values() if v['is_legacy'])
@@ -1,8 +1,11 @@
 """
 CORRYU ETF Dashboard - 지표 계산 모듈
 Z-score, 200DMA 이격도, 52주 MDD
+가격 민감 지표(z_score·ma200_pct·mdd_52w·rsi·range_52w)는 전 종목 한 번에 계산하는 벡터화 경로도 제공
+스크리너 지표별 전체·섹터 내 백분위와 정렬 순서(compute_metric_ranks)도 전 종목 한 번에 계산
 """
-from typing import Any
+from dataclasses import dataclass, field
+from typing import Any, Iterable
 import pandas as pd
 import numpy as np
 
@@ -80,18 +83,149 @@ def compute_52w_range_pct(prices: pd.Series) -> float | None:
     return round(float((current - low) / (high - low) * 100), 1)
 
 
+# ── 가격 민감 지표 (전 종목 벡터화) ─────────────────────────────────
+
+PRICE_METRIC_FIELDS = ('z_score', 'ma200_pct', 'mdd_52w', 'rsi', 'range_52w')
+
+# RSI(Wilder EWM)는 전체 이력에 의존 — (13/14)^1000 ≈ 1e-32 라 최근 1000개 유효값이면 float 정밀도로 동일
+RSI_TAIL = 1000
+
+
+def _valid_tail(values: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """각 열의 NaN을 건너뛴 마지막 k개 유효값을 아래쪽 정렬한 (k × N) 배열과 열별 유효값 개수
+
+    종목별 ts = df_price[ticker].dropna() 의 tail(k) 를 모든 열에 대해 한 번에 만든 것과 같다
+    (유효값이 k보다 적으면 위쪽은 NaN).
+    """
+    valid = ~np.isnan(values)
+    counts = valid.sum(axis=0)
+    from_end = np.cumsum(valid[::-1], axis=0)[::-1]      # 유효 셀: 끝에서 몇 번째 유효값인지 (1부터)
+    rows, cols = np.nonzero(valid & (from_end <= k))
+    out = np.full((k, values.shape[1]), np.nan)
+    out[k - from_end[rows, cols], cols] = values[rows, cols]
+    return out, counts
+
+
+def _wilder_rsi(tail: np.ndarray, period: int = 14) -> np.ndarray:
+    """compute_rsi 의 열별 벡터화 (pandas ewm(adjust=False) 갱신식을 그대로 따름)"""
+    delta = np.diff(tail, axis=0)
+    gain = np.clip(delta, 0, None)
+    loss = -np.clip(delta, None, 0)
+    alpha = 1 / period
+    old_wt = 1 - alpha
+    denom = old_wt + alpha
+    avg_gain = np.full(tail.shape[1], np.nan)
+    avg_loss = np.full(tail.shape[1], np.nan)
+    n_obs = np.zeros(tail.shape[1], dtype=int)
+    for g, l in zip(gain, loss):
+        obs = ~np.isnan(g)
+        start = obs & np.isnan(avg_gain)
+        step = obs & ~start
+        avg_gain = np.where(start, g, avg_gain)
+        avg_loss = np.where(start, l, avg_loss)
+        avg_gain = np.where(step & (avg_gain != g), (old_wt * avg_gain + alpha * g) / denom, avg_gain)
+        avg_loss = np.where(step & (avg_loss != l), (old_wt * avg_loss + alpha * l) / denom, avg_loss)
+        n_obs += obs
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = avg_gain / np.where(avg_loss == 0, np.nan, avg_loss)
+        rsi = 100 - (100 / (1 + rs))
+    return np.where(n_obs >= period, rsi, np.nan)
+
+
+def compute_price_metrics(df_price: pd.DataFrame) -> pd.DataFrame:
+    """전 종목 가격 민감 지표를 한 번에 계산 (compute_etf_metrics 의 종목별 계산과 같은 규칙)
+
+    Returns:
+        DataFrame: index=ticker, columns=PRICE_METRIC_FIELDS
+                   (반올림 완료 값, rsi·range_52w 는 데이터 부족 시 NaN)
+    """
+    values = df_price.to_numpy(dtype=float)
+    tail, counts = _valid_tail(values, max(RSI_TAIL, 252))
+    last = tail[-1]
+    w200, w252 = tail[-200:], tail[-252:]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ma200 = w200.mean(axis=0)
+        std200 = w200.std(axis=0, ddof=1)
+        z = np.where(np.isnan(std200) | (std200 == 0), 0.0, (last - ma200) / std200)
+        ma_pct = np.where(np.isnan(ma200) | (ma200 == 0), 0.0, (last / ma200 - 1) * 100)
+        high = np.nanmax(np.where(np.isnan(w252), -np.inf, w252), axis=0)
+        low = np.nanmin(np.where(np.isnan(w252), np.inf, w252), axis=0)
+        mdd = np.where(high == 0, 0.0, (last / high - 1) * 100)
+        rng = np.where(high == low, np.nan, (last - low) / (high - low) * 100)
+    rsi = _wilder_rsi(tail)
+
+    long_enough = counts >= 200
+    has_15 = counts >= 15
+    out = pd.DataFrame({
+        'z_score':   np.where(long_enough, np.round(z, 2), 0.0),
+        'ma200_pct': np.where(long_enough, np.round(ma_pct, 1), 0.0),
+        'mdd_52w':   np.where(long_enough, np.round(mdd, 1), 0.0),
+        'rsi':       np.where(has_15, np.round(rsi, 1), np.nan),
+        'range_52w': np.where(has_15, np.round(rng, 1), np.nan),
+    }, index=df_price.columns)
+    return out
+
+
+def price_metric_records(price_metrics: pd.DataFrame) -> dict[str, dict[str, Any]]:
+    """compute_price_metrics 결과 → ticker → etf_data 항목 필드 (NaN → None)"""
+    cols = [price_metrics[f].tolist() for f in PRICE_METRIC_FIELDS]
+    return {
+        ticker: {
+            'z_score':   z,
+            'ma200_pct': ma,
+            'mdd_52w':   mdd,
+            'rsi':       None if rsi != rsi else rsi,
+            'range_52w': None if rng != rng else rng,
+        }
+        for ticker, z, ma, mdd, rsi, rng in zip(price_metrics.index, *cols)
+    }
+
+
+META_METRIC_FIELDS = ('rank', 'aum', 'exp_ratio', 'div_yield')
+
+
+def meta_metric_fields(ticker: str, scraped: dict[str, Any],
+                       expense_ratios: dict[str, float] | None = None,
+                       dividend_yields: dict[str, float] | None = None) -> dict[str, Any]:
+    """메타(AUM·순위·수수료·배당) 기반 필드 — 매일 fetch_daily 가 갱신하는 값"""
+    info = scraped.get(ticker, {})
+
+    # 수수료 (expense_ratios dict에서 조회, 없으면 None)
+    exp_ratio = None
+    if expense_ratios:
+        v = expense_ratios.get(ticker)
+        if v is not None:
+            exp_ratio = round(float(v), 6)
+
+    # 배당수익률 (dividend_yields dict에서 조회, 없으면 None)
+    div_yield = None
+    if dividend_yields:
+        v = dividend_yields.get(ticker)
+        if v is not None:
+            div_yield = round(float(v) * 100, 2)  # 소수 → 퍼센트 (0.0275 → 2.75)
+
+    return {
+        'rank':      info.get('rank', 9999),
+        'aum':       info.get('market_cap', 0),
+        'exp_ratio': exp_ratio,
+        'div_yield': div_yield,
+    }
+
+
 def compute_etf_metrics(ticker: str, df_price: pd.DataFrame, perf_stats: dict[str, Any], scraped: dict[str, Any], classification: dict[str, Any],
                         df_corr_monthly: pd.DataFrame, df_corr_daily: pd.DataFrame, legacy_info: dict[str, Any],
                         expense_ratios: dict[str, float] | None = None,
-                        dividend_yields: dict[str, float] | None = None) -> dict[str, Any]:
+                        dividend_yields: dict[str, float] | None = None,
+                        price_metrics: dict[str, Any] | None = None) -> dict[str, Any]:
     """단일 ETF의 모든 대시보드 지표를 계산
 
+    price_metrics가 주어지면(price_metric_records 의 한 항목) 가격 민감 지표를 다시 계산하지 않음.
+
     Returns:
         dict: 대시보드 JSON 데이터 항목
     """
     fullname = scraped.get(ticker, {}).get('fullname', ticker)
-    rank = scraped.get(ticker, {}).get('rank', 9999)
-    market_cap = scraped.get(ticker, {}).get('market_cap', 0)
     p = perf_stats.get(ticker, {})
     cl = classification.get(ticker, {})
     leg = legacy_info.get(ticker, {})
@@ -119,7 +253,10 @@ def compute_etf_metrics(ticker: str, df_price: pd.DataFrame, perf_stats: dict[st
     rsi = None
     range_52w = None
 
-    if ticker in df_price.columns:
+    if price_metrics is not None:
+        z_score, ma200_pct, mdd_52w = price_metrics['z_score'], price_metrics['ma200_pct'], price_metrics['mdd_52w']
+        rsi, range_52w = price_metrics['rsi'], price_metrics['range_52w']
+    elif ticker in df_price.columns:
         ts = df_price[ticker].dropna()
         if len(ts) >= 200:
             z_score = compute_z_score(ts)
@@ -132,25 +269,13 @@ def compute_etf_metrics(ticker: str, df_price: pd.DataFrame, perf_stats: dict[st
     # r_spy (글로벌 참조 상관계수)
     r_spy = get_corr_value('SPY', ticker, df_corr_monthly, df_corr_daily)
 
-    # 수수료 (expense_ratios dict에서 조회, 없으면 None)
-    exp_ratio = None
-    if expense_ratios:
-        v = expense_ratios.get(ticker)
-        if v is not None:
-            exp_ratio = round(float(v), 6)
-
-    # 배당수익률 (dividend_yields dict에서 조회, 없으면 None)
-    div_yield = None
-    if dividend_yields:
-        v = dividend_yields.get(ticker)
-        if v is not None:
-            div_yield = round(float(v) * 100, 2)  # 소수 → 퍼센트 (0.0275 → 2.75)
+    meta = meta_metric_fields(ticker, scraped, expense_ratios, dividend_yields)
 
     return {
         'ticker': ticker,
         'name': fullname,
-        'rank': rank,
-        'aum': market_cap,
+        'rank': meta['rank'],
+        'aum': meta['aum'],
         'r_anchor': round(float(cl.get('r_anchor', 0)), 3),
         'r_spy': round(float(r_spy), 3),
         'z_score': round(float(z_score), 2),
@@ -163,19 +288,127 @@ def compute_etf_metrics(ticker: str, df_price: pd.DataFrame, perf_stats: dict[st
         'sortino': round(float(p.get('Sortino', 0)), 2),
         'short_history': short_history,
         'inception': inception,
-        'exp_ratio': exp_ratio,
-        'div_yield': div_yield,
+        'exp_ratio': meta['exp_ratio'],
+        'div_yield': meta['div_yield'],
         'is_legacy': leg.get('is_legacy', False),
         'legacy_reasons': leg.get('reasons', []),
         'legacy_detail': leg.get('details', []),
     }
 
 
-def compute_sector_stats(sector_etf_data: list[dict[str, Any]]) -> dict[str, Any]:
-    """섹터의 요약 통계 계산"""
+# 스크리너 정렬·백분위 대상 지표 → 사분위 반올림 자릿수 (etf_data 항목 값과 같은 자릿수)
+RANK_FIELDS: dict[str, int] = {
+    'cagr': 1, 'vol': 1, 'sortino': 2, 'z_score': 2, 'rsi': 1, 'mdd_52w': 1,
+    'exp_ratio': 6, 'div_yield': 2, 'aum': 0,
+}
+RANK_FORMAT = 'ranks-v1'
+
+
+def _pct_ranks(values: np.ndarray, groups: np.ndarray) -> np.ndarray:
+    """그룹 안 백분위 (0~100], 동점은 평균 순위 — pandas rank(pct=True) × 100 과 같음, NaN 은 NaN
+
+    (그룹, 값의 조밀 순위) 를 정수 키 하나로 묶어 정렬 한 번 + searchsorted 로 전 그룹 동시 계산
+    """
+    out = np.full(len(values), np.nan)
+    valid = ~np.isnan(values)
+    if not valid.any():
+        return out
+    g = groups[valid].astype(np.int64)
+    _, dense = np.unique(values[valid], return_inverse=True)
+    width = int(dense.max()) + 1
+    key = g * width + dense
+    ordered = np.sort(key)
+    start = np.searchsorted(ordered, g * width, 'left')
+    less = np.searchsorted(ordered, key, 'left') - start
+    leq = np.searchsorted(ordered, key, 'right') - start
+    out[valid] = (less + leq + 1) / 2 / np.bincount(g)[g] * 100
+    return out
+
+
+@dataclass
+class MetricRanks:
+    """지표별 전체·섹터 내 백분위 + 내림차순 정렬 순서 — ID = allData 를 섹터 순서대로 펼친 위치"""
+    tickers: list[str]
+    sectors: list[str]
+    fields: tuple[str, ...]
+    values: np.ndarray       # N×F (None → NaN)
+    pct: np.ndarray          # N×F 전체 백분위
+    sector_pct: np.ndarray   # N×F 섹터 내 백분위
+    order: np.ndarray        # F×N 값 내림차순 ID (동점은 ID 순, 값 없음은 맨 뒤)
+    _ids: dict[str, int] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._ids = {t: i for i, t in enumerate(self.tickers)}
+
+    @property
+    def n_valid(self) -> np.ndarray:
+        return (~np.isnan(self.values)).sum(axis=0)
+
+    def quartiles(self, tickers: Iterable[str]) -> dict[str, list[float] | None]:
+        """주어진 종목들의 지표별 [Q1, 중앙값, Q3] (np.percentile 선형 보간과 같음, 값 없는 지표는 None)
+
+        정렬 순서(order)에서 해당 종목만 골라 쓰므로 섹터마다 다시 정렬하지 않음
+        """
+        member = np.zeros(len(self.tickers), dtype=bool)
+        member[[self._ids[t] for t in tickers if t in self._ids]] = True
+        out: dict[str, list[float] | None] = {}
+        for j, f in enumerate(self.fields):
+            ranked = self.values[self.order[j][member[self.order[j]]], j]
+            asc = ranked[~np.isnan(ranked)][::-1]
+            if not len(asc):
+                out[f] = None
+                continue
+            pos = np.array([0.25, 0.5, 0.75]) * (len(asc) - 1)
+            lo = np.floor(pos).astype(np.int64)
+            hi = np.minimum(lo + 1, len(asc) - 1)
+            q = asc[lo] + (asc[hi] - asc[lo]) * (pos - lo)
+            digits = RANK_FIELDS[f]
+            out[f] = [round(float(v), digits) if digits else int(round(float(v))) for v in q]
+        return out
+
+    def to_doc(self) -> dict[str, Any]:
+        """screener_ranks.json — 백분위는 정수 (값 없음 None)
+        오름차순은 valid 개까지를 뒤에서부터 같은 값 묶음 단위로 (묶음 안은 ID 순 그대로), 나머지는 그대로"""
+        def pct_list(col: np.ndarray) -> list[int | None]:
+            return [None if v != v else int(v) for v in np.rint(col).tolist()]
+
+        return {
+            'format':     RANK_FORMAT,
+            'fields':     list(self.fields),
+            'tickers':    self.tickers,
+            'valid':      dict(zip(self.fields, self.n_valid.tolist())),
+            'order':      {f: self.order[j].tolist() for j, f in enumerate(self.fields)},
+            'pct':        {f: pct_list(self.pct[:, j]) for j, f in enumerate(self.fields)},
+            'sector_pct': {f: pct_list(self.sector_pct[:, j]) for j, f in enumerate(self.fields)},
+        }
+
+
+def compute_metric_ranks(all_data: dict[str, list[dict[str, Any]]],
+                         fields: Iterable[str] = RANK_FIELDS) -> MetricRanks:
+    """allData → 지표별 전체·섹터 내 백분위와 정렬 순서 (지표마다 전 종목 한 번에)"""
+    fields = tuple(fields)
+    rows = [(sid, etf) for sid, etfs in all_data.items() for etf in etfs]
+    values = np.array([[np.nan if etf.get(f) is None else etf[f] for f in fields] for _, etf in rows],
+                      dtype=float).reshape(len(rows), len(fields))
+    sectors = [sid for sid, _ in rows]
+    _, codes = np.unique(np.array(sectors, dtype=object), return_inverse=True)
+    everyone = np.zeros(len(rows), dtype=np.int64)
+    order = np.argsort(np.where(np.isnan(values), np.inf, -values), axis=0, kind='stable').T
+    pct, sector_pct = np.empty_like(values), np.empty_like(values)
+    for j in range(len(fields)):
+        pct[:, j] = _pct_ranks(values[:, j], everyone)
+        sector_pct[:, j] = _pct_ranks(values[:, j], codes)
+    return MetricRanks([etf['ticker'] for _, etf in rows], sectors, fields, values, pct, sector_pct,
+                       np.ascontiguousarray(order))
+
+
+def compute_sector_stats(sector_etf_data: list[dict[str, Any]],
+                         ranks: MetricRanks | None = None) -> dict[str, Any]:
+    """섹터의 요약 통계 계산 — ranks 가 있으면 지표별 사분위(quartiles)도"""
+    quartiles = {} if ranks is None else {'quartiles': ranks.quartiles(e['ticker'] for e in sector_etf_data)}
     if not sector_etf_data:
         return {'count': 0, 'active': 0, 'legacy': 0,
-                'avg_cagr': 0, 'avg_vol': 0, 'avg_sortino': 0}
+                'avg_cagr': 0, 'avg_vol': 0, 'avg_sortino': 0, **quartiles}
 
     active_data = [e for e in sector_etf_data if not e['is_legacy'] and not e['short_history']]
     cagrs = [e['cagr'] for e in active_data if e['cagr'] != 0]
@@ -189,4 +422,5 @@ def compute_sector_stats(sector_etf_data: list[dict[str, Any]]) -> dict[str, Any
         'avg_cagr': round(np.mean(cagrs), 1) if cagrs else 0,
         'avg_vol': round(np.mean(vols), 1) if vols else 0,
         'avg_sortino': round(np.mean(sortinos), 2) if sortinos else 0,
+        **quartiles,
     }
@@ -0,0 +1,73 @@
+"""
+CORRYU ETF Dashboard - 티커별 유효 구간 패킹 공용 모듈
+(행=기간, 열=티커) 행렬에서 티커마다 첫 유효값 ~ 마지막 유효값 구간만 잘라 담는다
+- JSON 호환 포맷: 티커별 [start, [v, ...]] (구간 안 결측은 null)
+- 바이너리 포맷: 구간들을 열 순서대로 이어 붙인 1차원 배열 + 티커별 (offset, start, length)
+- int16 청크: 헤더(start, scale, length) + 열별 스케일로 양자화한 int16 (bt-monthly)
+build_corr_data (월간 수익률) · build_backtest_data (연간 수익률) · build_backtest_monthly 공용
+"""
+import struct
+from typing import Any, Iterator
+
+import numpy as np
+
+
+def trim_bounds(values: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """열마다 (첫 유효 행, 마지막 유효 행, 유효값 존재 여부) — 전부 결측인 열의 first/last 는 의미 없음"""
+    valid = ~np.isnan(values)
+    has_any = valid.any(axis=0)
+    first = valid.argmax(axis=0)
+    last = len(values) - 1 - valid[::-1].argmax(axis=0)
+    return first, last, has_any
+
+
+def iter_slices(values: np.ndarray, first: np.ndarray, last: np.ndarray,
+                has_any: np.ndarray) -> Iterator[tuple[int, int, np.ndarray]]:
+    """유효 열마다 (열 번호, 시작 행, 구간 값 뷰)"""
+    for j in np.flatnonzero(has_any):
+        yield int(j), int(first[j]), values[first[j]:last[j] + 1, j]
+
+
+def pack_slices(values: np.ndarray, first: np.ndarray, last: np.ndarray, has_any: np.ndarray,
+                dtype: Any = np.float32) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """유효 열의 구간을 한 번의 마스크 추출로 이어 붙임 → (flat, 열 번호, 원소 단위 offset, 길이)
+
+    values.T 를 C 순서로 훑으므로 열 j 의 구간이 행 순서대로 연속 배치된다.
+    """
+    rows = np.arange(len(values))[:, None]
+    inside = (rows >= first) & (rows <= last) & has_any
+    flat = values.T[inside.T].astype(dtype)
+    cols = np.flatnonzero(has_any)
+    lengths = (last - first + 1)[cols]
+    offsets = (np.cumsum(lengths) - lengths).astype(np.int64)
+    return flat, cols, offsets, lengths
+
+
+# ── int16 청크 (bt-monthly-v1) ───────────────────────────────────────
+
+CHUNK_HEADER = struct.Struct('<ifi')   # start, scale, length (little-endian)
+QMAX = 32767
+MISSING = -32768
+
+
+def quantize(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """열별 스케일(최대 |값| / QMAX)로 int16 양자화 → (int16 행렬 (결측 MISSING), float32 스케일)"""
+    absmax = np.abs(np.nan_to_num(values, nan=0.0)).max(axis=0, initial=0.0)
+    scale = (absmax / QMAX).astype(np.float32)
+    scale[scale == 0] = 1.0
+    with np.errstate(invalid='ignore'):
+        q = np.clip(np.rint(values / scale.astype(float)), -QMAX, QMAX)
+    return np.where(np.isnan(values), MISSING, q).astype('<i2'), scale
+
+
+def encode_chunk(start: int, scale: float, q: np.ndarray) -> bytes:
+    return CHUNK_HEADER.pack(start, scale, len(q)) + q.astype('<i2').tobytes()
+
+
+def decode_chunk(data: bytes) -> tuple[int, np.ndarray]:
+    """청크 바이트 → (start, float 배열 (결측 NaN))"""
+    start, scale, length = CHUNK_HEADER.unpack_from(data)
+    q = np.frombuffer(data, dtype='<i2', count=length, offset=CHUNK_HEADER.size)
+    values = q.astype(float) * float(np.float32(scale))
+    values[q == MISSING] = np.nan
+    return start, values
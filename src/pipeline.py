@@ -0,0 +1,455 @@
+"""
+CORRYU ETF Dashboard - DAG 스테이지 실행기
+각 스테이지가 입력(상위 스테이지 산출물·원본 파일·코드)과 출력 파일을 선언하고,
+산출물은 콘텐츠 해시로 캐시에 저장 → 입력이 그대로면 스테이지를 건너뛰고 캐시 재사용
+--jobs N: 서로 독립인 스테이지를 프로세스 풀에서 동시 실행 (가격 행렬은 메모리맵 공유)
+스테이지마다 wall·CPU·최대 RSS 증가분·출력 바이트를 StageResult에 기록 (instrument.py)
+무변경 감지: 전체 입력 파일 지문 + 출력 해시가 직전 성공 실행과 같으면 DAG를 돌리지 않고 종료
+"""
+import hashlib
+import json
+import os
+import pickle
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable
+
+import numpy as np
+import pandas as pd
+
+from config import CACHE_DIR
+from instrument import Usage, format_bytes, measure, output_bytes
+
+PIPELINE_CACHE_DIR = os.path.join(CACHE_DIR, 'pipeline')
+
+_CHUNK = 1 << 20
+
+
+@dataclass
+class Stage:
+    """파이프라인 스테이지 선언
+
+    Attributes:
+        name:    스테이지 이름 (--only / --from 에서 사용)
+        func:    func(**{dep: 산출물}) → 산출물
+        deps:    상위 스테이지 이름 (산출물이 같은 이름의 키워드 인자로 전달됨)
+                 캐시 키에는 상위 산출물 digest 와 상위가 선언한 outputs 해시가 함께 들어감
+                 (파일만 쓰고 None 을 반환하는 스테이지도 출력이 바뀌면 하위가 재실행)
+        files:   캐시 키에 포함할 외부 입력 파일 (원본 데이터, 코드, 설정)
+        outputs: 스테이지가 쓰는 파일/디렉토리 (사라지거나 바뀌면 재실행)
+        cache:   False면 산출물을 저장하지 않고 필요할 때 다시 실행 (parquet 로드처럼 더 싼 경우)
+        parallel: True면 --jobs ≥ 2일 때 워커 프로세스에서 실행 (func는 모듈 최상위 함수여야 함)
+        committed: False면 outputs 가 저장소에 커밋되지 않음 (배포 빌드가 생성, 새 체크아웃엔 없음)
+                 — 무변경 판정(unchanged · save_fingerprint)의 출력 검사에서 제외
+    """
+    name: str
+    func: Callable[..., Any]
+    deps: tuple[str, ...] = ()
+    files: tuple[str, ...] = ()
+    outputs: tuple[str, ...] = ()
+    cache: bool = True
+    parallel: bool = False
+    committed: bool = True
+
+
+@dataclass
+class StageResult:
+    """스테이지 1회 실행 결과 (hit/miss 표 한 줄)"""
+    name: str
+    status: str            # 'hit' | 'miss' | 'forced' | 'skip' | 'fast'(--daily-fast 단계)
+    seconds: float = 0.0
+    artifact: str = ''
+    cpu: float = 0.0
+    rss_delta: int = 0     # 최대 RSS 증가분 (bytes, 워커 실행이면 워커 프로세스 기준)
+    output_bytes: int = 0
+
+
+# ── 해시 ─────────────────────────────────────────────────────────────
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_path(path: str) -> str:
+    """파일 내용 해시 (디렉토리면 하위 파일 경로+내용 전체, 없으면 '')"""
+    if os.path.isdir(path):
+        h = hashlib.sha256()
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                full = os.path.join(root, name)
+                h.update(os.path.relpath(full, path).encode())
+                h.update(hash_path(full).encode())
+        return h.hexdigest()
+    if not os.path.exists(path):
+        return ''
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+# ── 병렬 실행 보조 ───────────────────────────────────────────────────
+
+def _run_stage(func: Callable[..., Any], kwargs: dict[str, Any],
+               profile_path: str | None = None) -> tuple[Any, Usage]:
+    """스테이지 함수 실행 (워커 프로세스에서도 호출됨) → (산출물, 자원 사용량)"""
+    return measure(func, _FrameSpill.restore(kwargs), profile_path)
+
+
+class _FrameHandle:
+    """.npy로 내려쓴 DataFrame의 피클 가능한 포인터 (워커에서 메모리맵으로 복원)"""
+
+    def __init__(self, path: str, index: pd.Index, columns: pd.Index) -> None:
+        self.path = path
+        self.index = index
+        self.columns = columns
+
+    def open(self) -> pd.DataFrame:
+        arr = np.load(self.path, mmap_mode='r')
+        return pd.DataFrame(arr, index=self.index, columns=self.columns, copy=False)
+
+
+class _FrameSpill:
+    """워커로 넘기는 인자 중 큰 실수형 DataFrame(가격 행렬 등)을 메모리맵 파일로 공유
+
+    피클로 수십 MB 행렬을 워커마다 복사하는 대신 실행당 한 번 .npy로 쓰고,
+    워커는 np.load(mmap_mode='r')로 같은 페이지 캐시를 읽는다.
+    """
+
+    MIN_BYTES = 1 << 20
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self._handles: dict[int, _FrameHandle] = {}
+
+    def _handle(self, df: pd.DataFrame) -> _FrameHandle:
+        if id(df) not in self._handles:
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, f'{os.getpid()}_{len(self._handles)}.npy')
+            np.save(path, df.to_numpy())
+            self._handles[id(df)] = _FrameHandle(path, df.index, df.columns)
+        return self._handles[id(df)]
+
+    def _share_value(self, v: Any) -> Any:
+        if (isinstance(v, pd.DataFrame) and v.size and v.memory_usage().sum() >= self.MIN_BYTES
+                and all(dt.kind == 'f' for dt in v.dtypes) and v.dtypes.nunique() == 1):
+            return self._handle(v)
+        return v
+
+    def share(self, kwargs: dict[str, Any]) -> dict[str, Any]:
+        """인자 dict(1단계 중첩 dict 포함)의 큰 DataFrame을 핸들로 교체"""
+        out: dict[str, Any] = {}
+        for k, v in kwargs.items():
+            if isinstance(v, dict):
+                out[k] = {kk: self._share_value(vv) for kk, vv in v.items()}
+            else:
+                out[k] = self._share_value(v)
+        return out
+
+    @staticmethod
+    def restore(kwargs: dict[str, Any]) -> dict[str, Any]:
+        """share()의 역변환 — 핸들을 메모리맵 DataFrame으로"""
+        def _open(v: Any) -> Any:
+            return v.open() if isinstance(v, _FrameHandle) else v
+        return {
+            k: {kk: _open(vv) for kk, vv in v.items()} if isinstance(v, dict) else _open(v)
+            for k, v in kwargs.items()
+        }
+
+    def cleanup(self) -> None:
+        for h in self._handles.values():
+            if os.path.exists(h.path):
+                os.remove(h.path)
+        self._handles.clear()
+
+
+# ── 실행기 ───────────────────────────────────────────────────────────
+
+@dataclass
+class Pipeline:
+    """스테이지 DAG (선언 순서가 위상 순서여야 함)"""
+    stages: list[Stage]
+    cache_dir: str = PIPELINE_CACHE_DIR
+    results: list[StageResult] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        self._by_name = {s.name: s for s in self.stages}
+        seen: set[str] = set()
+        for s in self.stages:
+            for d in s.deps:
+                if d not in seen:
+                    raise ValueError(f'스테이지 {s.name}: 의존 스테이지 {d}가 먼저 선언되어야 함')
+            seen.add(s.name)
+        self._artifact_dir = os.path.join(self.cache_dir, 'artifacts')
+        self._index_path = os.path.join(self.cache_dir, 'index.json')
+        self._fingerprint_path = os.path.join(self.cache_dir, 'fingerprint.json')
+
+    @property
+    def names(self) -> list[str]:
+        return [s.name for s in self.stages]
+
+    def upstream(self, names: Iterable[str]) -> set[str]:
+        """names와 그 모든 상위 스테이지"""
+        out: set[str] = set()
+        todo = list(names)
+        while todo:
+            n = todo.pop()
+            if n in out:
+                continue
+            out.add(n)
+            todo.extend(self._by_name[n].deps)
+        return out
+
+    def downstream(self, name: str) -> set[str]:
+        """name과 그 모든 하위 스테이지"""
+        out = {name}
+        for s in self.stages:
+            if any(d in out for d in s.deps):
+                out.add(s.name)
+        return out
+
+    # ── 캐시 인덱스 ──────────────────────────────────────────────────
+
+    def _load_index(self) -> dict[str, Any]:
+        if not os.path.exists(self._index_path):
+            return {}
+        try:
+            with open(self._index_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self, index: dict[str, Any]) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = self._index_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(index, f, indent=2, sort_keys=True)
+        os.replace(tmp, self._index_path)
+
+    def _artifact_path(self, digest: str) -> str:
+        return os.path.join(self._artifact_dir, f'{digest}.pkl')
+
+    def _store(self, value: Any) -> str:
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        digest = hash_bytes(data)
+        path = self._artifact_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(self._artifact_dir, exist_ok=True)
+            tmp = path + '.tmp'
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        return digest
+
+    def _load(self, digest: str) -> Any:
+        with open(self._artifact_path(digest), 'rb') as f:
+            return pickle.load(f)
+
+    def cached(self, name: str) -> Any | None:
+        """name 스테이지의 마지막 캐시 산출물 (입력 변경 여부는 보지 않음, 없으면 None)"""
+        entry = self._load_index().get(name, {})
+        path = self._artifact_path(entry.get('artifact') or '-')
+        return self._load(entry['artifact']) if os.path.exists(path) else None
+
+    def _prune(self, index: dict[str, Any]) -> None:
+        """인덱스가 참조하지 않는 산출물 삭제"""
+        if not os.path.isdir(self._artifact_dir):
+            return
+        live = {f"{e['artifact']}.pkl" for e in index.values() if e.get('artifact')}
+        for name in os.listdir(self._artifact_dir):
+            if name not in live:
+                os.remove(os.path.join(self._artifact_dir, name))
+
+    # ── 무변경 감지 ──────────────────────────────────────────────────
+
+    @property
+    def input_files(self) -> list[str]:
+        """모든 스테이지가 선언한 외부 입력 파일 (중복 제거, 선언 순서)
+
+        다른 스테이지의 출력 파일을 입력으로 읽는 경우(assets 등)는 외부 입력이 아니므로 제외
+        """
+        produced = set(self.output_paths)
+        return list(dict.fromkeys(p for s in self.stages for p in s.files if p not in produced))
+
+    @property
+    def output_paths(self) -> list[str]:
+        return list(dict.fromkeys(p for s in self.stages for p in s.outputs))
+
+    @property
+    def committed_outputs(self) -> list[str]:
+        """저장소에 커밋되는 출력 (새 CI 체크아웃에도 있는 것 — 무변경 판정 대상)"""
+        return list(dict.fromkeys(p for s in self.stages if s.committed for p in s.outputs))
+
+    def fingerprint(self, exclude: Iterable[str] = ()) -> str:
+        """입력 파일(원본 데이터·설정·코드) 전체의 내용 지문 (exclude 경로는 제외)"""
+        skip = set(exclude)
+        h = hashlib.sha256()
+        for path in self.input_files:
+            if path not in skip:
+                h.update(f'{os.path.basename(path)}={hash_path(path)}'.encode())
+        return h.hexdigest()
+
+    def load_fingerprint(self) -> dict[str, Any]:
+        """직전 기록 ({'inputs', 'mode', 'outputs', ...}, 없으면 {})"""
+        try:
+            with open(self._fingerprint_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def unchanged(self, fingerprint: str, modes: Iterable[str] = ('full',)) -> bool:
+        """직전 실행(modes 중 하나) 이후 입력이 그대로이고 출력도 그때 그대로인가"""
+        saved = self.load_fingerprint()
+        if saved.get('inputs') != fingerprint or saved.get('mode', 'full') not in set(modes):
+            return False
+        outputs = saved.get('outputs', {})
+        return set(outputs) == set(self.committed_outputs) and all(
+            h and hash_path(p) == h for p, h in outputs.items()
+        )
+
+    def save_fingerprint(self, fingerprint: str, mode: str = 'full', **extra: Any) -> None:
+        """실행 성공 후 입력 지문과 출력 해시 기록 (mode: 'full' | 'fast' 등 실행 종류)"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        record = {
+            'inputs':  fingerprint,
+            'mode':    mode,
+            'outputs': {p: hash_path(p) for p in self.committed_outputs},
+            **extra,
+        }
+        with open(self._fingerprint_path, 'w', encoding='utf-8') as f:
+            json.dump(record, f, indent=2, sort_keys=True)
+
+    # ── 실행 ─────────────────────────────────────────────────────────
+
+    def _key(self, stage: Stage, dep_ids: dict[str, str],
+             dep_outputs: dict[str, dict[str, str]] | None = None) -> str:
+        h = hashlib.sha256(stage.name.encode())
+        for d in stage.deps:
+            h.update(f'dep:{d}={dep_ids[d]}'.encode())
+            for path, digest in (dep_outputs or {}).get(d, {}).items():
+                h.update(f'dep-out:{d}:{os.path.basename(path)}={digest}'.encode())
+        for path in stage.files:
+            h.update(f'file:{os.path.basename(path)}={hash_path(path)}'.encode())
+        return h.hexdigest()
+
+    def run(self, only: Iterable[str] | None = None, start: str | None = None,
+            force: bool = False, jobs: int = 1, profile_dir: str | None = None) -> dict[str, Any]:
+        """DAG 실행
+
+        Args:
+            only:  이 스테이지들(과 필요한 상위 스테이지)만 실행 대상으로 제한
+            start: 이 스테이지와 모든 하위 스테이지는 캐시 무시 (--from)
+            force: 모든 스테이지 캐시 무시
+            jobs:  2 이상이면 parallel=True 스테이지를 프로세스 풀에서 동시 실행
+            profile_dir: 지정하면 실행한 스테이지마다 {stage}.prof (cProfile) 저장
+
+        Returns:
+            dict: 스테이지 이름 → 산출물 (이번 실행에서 메모리에 올라온 것만)
+        """
+        for n in list(only or []) + ([start] if start else []):
+            if n not in self._by_name:
+                raise ValueError(f'알 수 없는 스테이지: {n} (가능: {", ".join(self.names)})')
+
+        selected = self.upstream(only) if only else set(self.names)
+        forced = set(self.names) if force else (self.downstream(start) if start else set())
+
+        index = self._load_index()
+        values: dict[str, Any] = {}
+        ids: dict[str, str] = {}
+        outs: dict[str, dict[str, str]] = {}   # 스테이지 → 선언 출력 해시 (하위 캐시 키용)
+        self.results = [StageResult(s.name, 'skip') for s in self.stages if s.name not in selected]
+
+        def resolve(name: str) -> Any:
+            """산출물을 메모리로 (캐시 hit면 역직렬화, 비캐시 스테이지면 재실행)"""
+            if name not in values:
+                stage = self._by_name[name]
+                if stage.cache:
+                    values[name] = self._load(ids[name])
+                else:
+                    values[name] = stage.func(**{d: resolve(d) for d in stage.deps})
+            return values[name]
+
+        def profile_path(stage: Stage) -> str | None:
+            return os.path.join(profile_dir, f'{stage.name}.prof') if profile_dir else None
+
+        def finish(stage: Stage, key: str, value: Any, usage: Usage) -> None:
+            values[stage.name] = value
+            ids[stage.name] = self._store(value) if stage.cache else key
+            outs[stage.name] = {p: hash_path(p) for p in stage.outputs}
+            index[stage.name] = {
+                'key':      key,
+                'artifact': ids[stage.name] if stage.cache else '',
+                'outputs':  outs[stage.name],
+            }
+            self._save_index(index)
+            status = 'forced' if stage.name in forced else 'miss'
+            self.results.append(StageResult(
+                stage.name, status, usage.wall, ids[stage.name],
+                cpu=usage.cpu, rss_delta=usage.rss_delta, output_bytes=output_bytes(stage.outputs),
+            ))
+
+        pending = [s for s in self.stages if s.name in selected]
+        pool = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+        running: dict[Future[tuple[Any, Usage]], tuple[Stage, str]] = {}
+        spill = _FrameSpill(os.path.join(self.cache_dir, 'shm'))
+        try:
+            while pending or running:
+                # 상위 스테이지가 모두 끝난(ids 확정) 스테이지를 선언 순서대로 처리
+                for stage in [s for s in pending if all(d in ids for d in s.deps)]:
+                    pending.remove(stage)
+                    key = self._key(stage, ids, outs)
+                    prev = index.get(stage.name, {})
+                    fresh = (
+                        stage.name not in forced
+                        and prev.get('key') == key
+                        and (not stage.cache or os.path.exists(self._artifact_path(prev.get('artifact', ''))))
+                        and all(hash_path(p) == prev.get('outputs', {}).get(p) for p in stage.outputs)
+                    )
+                    if fresh:
+                        ids[stage.name] = prev['artifact'] if stage.cache else key
+                        outs[stage.name] = {p: prev['outputs'][p] for p in stage.outputs}
+                        self.results.append(StageResult(stage.name, 'hit', artifact=ids[stage.name],
+                                                        output_bytes=output_bytes(stage.outputs)))
+                        continue
+
+                    kwargs = {d: resolve(d) for d in stage.deps}
+                    if pool is not None and stage.parallel:
+                        fut = pool.submit(_run_stage, stage.func, spill.share(kwargs), profile_path(stage))
+                        running[fut] = (stage, key)
+                    else:
+                        value, usage = _run_stage(stage.func, kwargs, profile_path(stage))
+                        finish(stage, key, value, usage)
+
+                if running:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        stage, key = running.pop(fut)
+                        finish(stage, key, *fut.result())
+                elif pending and not any(all(d in ids for d in s.deps) for s in pending):
+                    raise RuntimeError(f'실행 불가 스테이지: {[s.name for s in pending]}')
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+            spill.cleanup()
+
+        order = {n: i for i, n in enumerate(self.names)}
+        self.results.sort(key=lambda r: order[r.name])
+        self._prune(index)
+        return values
+
+    def print_summary(self) -> None:
+        """스테이지별 hit/miss · 시간 · 메모리 · 출력 크기 표 출력"""
+        w = max([15] + [len(r.name) for r in self.results])
+        print(f'\n  {"stage":<{w}} {"status":<7} {"wall":>8} {"cpu":>8} {"+rss":>8} {"output":>9}  artifact')
+        print(f'  {"─" * w} {"─" * 7} {"─" * 8} {"─" * 8} {"─" * 8} {"─" * 9}  {"─" * 12}')
+        for r in self.results:
+            ran = r.status not in ('hit', 'skip')
+            wall = f'{r.seconds:7.2f}s' if ran else '—'
+            cpu = f'{r.cpu:7.2f}s' if ran else '—'
+            rss = format_bytes(r.rss_delta) if ran else '—'
+            out = format_bytes(r.output_bytes) if r.output_bytes else '—'
+            print(f'  {r.name:<{w}} {r.status:<7} {wall:>8} {cpu:>8} {rss:>8} {out:>9}  {r.artifact[:12]}')
+        counts = {s: sum(1 for r in self.results if r.status == s) for s in ('hit', 'miss', 'forced', 'skip', 'fast')}
+        print('  ' + ' · '.join(f'{s} {n}' for s, n in counts.items() if n or s != 'fast'))
@@ -0,0 +1,108 @@
+"""
+CORRYU ETF Dashboard - 누적 로그수익률 인덱스 (prefix sum)
+L[t] = ln(종가[t] / 첫 종가) 를 기간(월·주) 단위로 한 번 만들어 두면
+임의 구간 수익률 = exp(L[b] - L[a]) - 1 — 수익률 시계열을 다시 훑지 않고 조회 두 번
+- 기간 키: 월 = 연*12+월-1 (bt-monthly 와 같음), 주 = 1970-01-02(금) 부터의 주 번호
+- 구간 안 결측 기간은 직전 종가 유지 (그 기간 수익률 0, 구간 수익률은 정확)
+- 마지막 행은 진행 중인 기간이면 최신 종가 (to-date)
+build_return_index.py (float32 .bin + 인덱스) 와 data_loader.compute_return_index 가 사용
+"""
+from typing import Any, Sequence
+
+import numpy as np
+import pandas as pd
+
+from packed import trim_bounds
+
+FREQ_RULES = {'M': 'ME', 'W': 'W-FRI'}
+PERIODS_PER_YEAR = {'M': 12, 'W': 52}
+WEEK_EPOCH = pd.Timestamp('1970-01-02')   # 금요일 (W-FRI 라벨과 같은 요일)
+
+
+def period_key(dates: pd.DatetimeIndex, freq: str) -> np.ndarray:
+    """기간 끝 날짜 → 정수 키 (연속 기간은 연속 키)"""
+    if freq == 'M':
+        return np.asarray(dates.year * 12 + dates.month - 1, dtype=np.int64)
+    if freq == 'W':
+        return np.asarray((dates - WEEK_EPOCH).days // 7, dtype=np.int64)
+    raise ValueError(f'알 수 없는 주기: {freq}')
+
+
+class ReturnIndex:
+    """(기간 × 티커) 누적 로그수익률 — 티커 구간 밖은 NaN"""
+
+    def __init__(self, log_index: np.ndarray, start_key: int, tickers: Sequence[str], freq: str = 'M'):
+        self.log_index = log_index
+        self.start_key = int(start_key)
+        self.tickers = list(tickers)
+        self.freq = freq
+        self._col = {t: j for j, t in enumerate(self.tickers)}
+
+    @classmethod
+    def from_prices(cls, df_price: pd.DataFrame, freq: str = 'M',
+                    closes: pd.DataFrame | None = None) -> 'ReturnIndex':
+        """일별 종가 → 인덱스 (closes: 이미 리샘플한 기간 말 종가가 있으면 재사용)"""
+        if closes is None:
+            closes = df_price.resample(FREQ_RULES[freq]).last()
+        prices = closes.to_numpy(dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            logp = np.log(prices)
+        logp[~np.isfinite(logp)] = np.nan
+        first, last, has_any = trim_bounds(logp)
+        filled = pd.DataFrame(logp).ffill().to_numpy()
+        cols = np.arange(logp.shape[1])
+        log_index = filled - filled[first, cols]
+        rows = np.arange(len(logp))[:, None]
+        log_index[(rows < first) | (rows > last) | ~has_any] = np.nan
+        return cls(log_index, period_key(closes.index[:1], freq)[0] if len(closes) else 0,
+                   closes.columns.astype(str), freq)
+
+    @property
+    def end_key(self) -> int:
+        return self.start_key + len(self.log_index) - 1
+
+    def column(self, ticker: str) -> np.ndarray:
+        return self.log_index[:, self._col[ticker]]
+
+    def _rows(self, keys: Any) -> tuple[np.ndarray, np.ndarray]:
+        pos = np.asarray(keys, dtype=np.int64) - self.start_key
+        ok = (pos >= 0) & (pos < len(self.log_index))
+        return np.where(ok, pos, 0), ok
+
+    def _cols(self, tickers: Sequence[str] | None) -> np.ndarray:
+        if tickers is None:
+            return np.arange(len(self.tickers))
+        return np.array([self._col.get(t, -1) for t in tickers], dtype=np.int64)
+
+    def period_return(self, tickers: Sequence[str] | None, start_key: Any, end_key: Any) -> np.ndarray:
+        """start_key 기간 말 → end_key 기간 말 총수익률 (티커별, 키는 스칼라 또는 티커 수만큼 배열)
+
+        구간 밖·없는 티커는 NaN.
+        """
+        cols = self._cols(tickers)
+        a, ok_a = self._rows(np.broadcast_to(start_key, cols.shape))
+        b, ok_b = self._rows(np.broadcast_to(end_key, cols.shape))
+        safe = np.where(cols >= 0, cols, 0)
+        diff = self.log_index[b, safe] - self.log_index[a, safe]
+        return np.where(ok_a & ok_b & (cols >= 0), np.expm1(diff), np.nan)
+
+    def trailing(self, horizons: Sequence[int], tickers: Sequence[str] | None = None,
+                 annualize: bool = False) -> pd.DataFrame:
+        """마지막 행 기준 h 기간 전부터의 수익률 (티커 × 기간 수) — 이력이 짧으면 NaN
+
+        annualize=True 면 연환산 ((1+r)^(연간 기간 수 / h) - 1, h 가 1년 미만이면 그대로).
+        """
+        cols = self._cols(tickers)
+        out = np.column_stack([self.period_return(tickers, self.end_key - h, self.end_key)
+                               for h in horizons]) if horizons else np.empty((len(cols), 0))
+        if annualize:
+            per_year = PERIODS_PER_YEAR[self.freq]
+            for i, h in enumerate(horizons):
+                if h > per_year:
+                    out[:, i] = np.expm1(np.log1p(out[:, i]) * per_year / h)
+        index = self.tickers if tickers is None else list(tickers)
+        return pd.DataFrame(out, index=index, columns=list(horizons))
+
+    def to_float32(self) -> np.ndarray:
+        """기록용 float32 (구간 밖 NaN 그대로 — packed.pack_slices 가 잘라냄)"""
+        return self.log_index.astype(np.float32)
@@ -0,0 +1,129 @@
+"""
+CORRYU ETF Dashboard - 자동완성 검색 인덱스
+티커 접두어 · 펀드명 단어 접두어(edge n-gram) → 정수 ETF ID
+- ID = AUM 순위(rank) 순서의 etfs 배열 위치 → ID 가 작을수록 AUM 이 큼 (목록을 ID 순으로 두면 곧 AUM 순)
+- 티커 접두어: 티커 사전순 ID 배열 (by_ticker) 에서 이진 탐색한 구간 = 그 접두어로 시작하는 티커 전부
+  (접두어마다 목록을 두는 것보다 작음 — 구간만 ID 순 정렬해 상위 k 개)
+- 이름 n-gram: 정규화한 단어의 앞 NAME_GRAM_MIN~NAME_GRAM_MAX 글자 → ID 목록 (차이값으로 저장, 여러 단어는 교집합)
+  더 긴 검색어 단어는 NAME_GRAM_MAX 글자로 찾은 뒤 정규화한 이름으로 확인
+- SearchIndex.query(): output/search-index.js 와 같은 규칙의 기준 구현
+build_search_index.py → output/search_index.json
+"""
+import bisect
+import re
+import unicodedata
+from typing import Any, Iterable
+
+FORMAT = 'search-v1'
+NAME_GRAM_MIN = 2
+NAME_GRAM_MAX = 6
+STOPWORDS = frozenset({'ETF', 'FUND', 'THE', 'OF', 'AND', 'INDEX', 'TRUST'})
+
+_NON_ALNUM = re.compile(r'[^0-9A-Z]+')
+
+
+def normalize(text: str) -> list[str]:
+    """대문자 · 악센트 제거 · 영숫자 외 구분자 → 단어 목록 ('S&P 500' → ['S', 'P', '500'])"""
+    folded = unicodedata.normalize('NFKD', text or '').encode('ascii', 'ignore').decode().upper()
+    return [w for w in _NON_ALNUM.split(folded) if w]
+
+
+def name_tokens(name: str) -> list[str]:
+    return [w for w in normalize(name) if w not in STOPWORDS]
+
+
+def name_grams(name: str) -> set[str]:
+    return {w[:k] for w in name_tokens(name) for k in range(NAME_GRAM_MIN, min(len(w), NAME_GRAM_MAX) + 1)}
+
+
+def _delta(ids: list[int]) -> list[int]:
+    return [b - a for a, b in zip([0] + ids, ids)]
+
+
+def _undelta(gaps: list[int]) -> list[int]:
+    out, acc = [], 0
+    for g in gaps:
+        acc += g
+        out.append(acc)
+    return out
+
+
+class SearchIndex:
+    """etfs[ID] = (ticker, name) — ID 는 AUM 순위 순"""
+
+    def __init__(self, etfs: list[tuple[str, str]], grams: dict[str, list[int]]):
+        self.etfs = etfs
+        self.grams = grams
+        self.by_ticker = sorted(range(len(etfs)), key=lambda i: etfs[i][0])
+        self._sorted = [etfs[i][0] for i in self.by_ticker]
+        self._tokens: dict[int, list[str]] = {}
+
+    @classmethod
+    def build(cls, records: Iterable[dict[str, Any]]) -> 'SearchIndex':
+        """etf 레코드 (ticker, name, rank) → 인덱스 (티커 중복은 마지막 레코드)"""
+        rows = sorted({r['ticker'].upper(): r for r in records if r.get('ticker')}.items(),
+                      key=lambda kv: (kv[1].get('rank', 9999), kv[0]))
+        etfs = [(t, r.get('name') or '') for t, r in rows]
+        grams: dict[str, list[int]] = {}
+        for i, (_, name) in enumerate(etfs):
+            for g in name_grams(name):
+                grams.setdefault(g, []).append(i)
+        return cls(etfs, grams)
+
+    @classmethod
+    def from_doc(cls, doc: dict[str, Any]) -> 'SearchIndex':
+        if doc.get('format') != FORMAT:
+            raise ValueError(f"알 수 없는 검색 인덱스 포맷: {doc.get('format')}")
+        return cls([(t, n) for t, n in doc['etfs']], {g: _undelta(v) for g, v in doc['grams'].items()})
+
+    def to_doc(self, as_of: str = '') -> dict[str, Any]:
+        """search-v1 {format, as_of, etfs: [[ticker, name]], by_ticker: [ID], grams: {gram: [ID 차이값]}}"""
+        return {
+            'format': FORMAT,
+            'as_of': as_of,
+            'etfs': [list(e) for e in self.etfs],
+            'by_ticker': self.by_ticker,
+            'grams': {g: _delta(ids) for g, ids in sorted(self.grams.items())},
+        }
+
+    def ticker_prefix(self, prefix: str) -> list[int]:
+        """prefix 로 시작하는 티커 ID 전부 (AUM 순)"""
+        lo = bisect.bisect_left(self._sorted, prefix)
+        hi = bisect.bisect_left(self._sorted, prefix + '\uffff', lo)
+        return sorted(self.by_ticker[lo:hi])
+
+    def _name_tokens(self, i: int) -> list[str]:
+        if i not in self._tokens:
+            self._tokens[i] = name_tokens(self.etfs[i][1])
+        return self._tokens[i]
+
+    def name_match(self, query: str) -> list[int]:
+        """검색어의 모든 단어가 이름 단어의 접두어인 ID (AUM 순) — 2글자 미만 · 불용어 단어는 무시"""
+        words = [w for w in normalize(query) if len(w) >= NAME_GRAM_MIN and w not in STOPWORDS]
+        if not words:
+            return []
+        lists = sorted((self.grams.get(w[:NAME_GRAM_MAX], []) for w in words), key=len)
+        ids = lists[0]
+        for other in lists[1:]:
+            keep = set(other)
+            ids = [i for i in ids if i in keep]
+        long_words = [w for w in words if len(w) > NAME_GRAM_MAX]
+        if long_words:
+            ids = [i for i in ids if all(any(t.startswith(w) for t in self._name_tokens(i)) for w in long_words)]
+        return ids
+
+    def query(self, query: str, limit: int = 8) -> list[dict[str, str]]:
+        """검색어 → [{ticker, name}] 최대 limit 개
+
+        1순위: 티커 접두어 (정확히 같은 티커 먼저, 나머지 AUM 순)
+        2순위: 이름 단어 접두어 (AUM 순)
+        """
+        key = (query or '').strip().upper()
+        if not key:
+            return []
+        hits = self.ticker_prefix(key)
+        hits.sort(key=lambda i: self.etfs[i][0] != key)
+        if len(hits) < limit:
+            taken = set(hits)
+            hits += [i for i in self.name_match(query) if i not in taken]
+        return [{'ticker': self.etfs[i][0], 'name': self.etfs[i][1]} for i in hits[:limit]]
@@ -0,0 +1,279 @@
+"""
+CORRYU ETF Dashboard - JSON 직렬화 공용 모듈
+모든 산출물 작성기(compute_all · build_* · fetch_*)가 이 모듈로 읽고 쓴다
+
+- 백엔드: orjson 이 설치돼 있으면 사용, 없으면 표준 json — 두 백엔드의 출력 바이트가 같다
+  (표준 json 쪽에서 NaN/Inf → null, 지수 표기를 orjson 과 같게: 1e+16 → 1e16, 2.5e-05 → 0.000025, 1.5e-07 → 1.5e-7)
+- numpy 배열·스칼라 직접 인코딩 (NaN → null)
+- round_list: 반올림을 파이썬 루프 대신 배열 단위로 (np.round) 처리한 뒤 리스트로
+- write_json_stream: {"head"..., "key": {k: v, ...}} 를 항목 단위로 인코딩해 바로 기록 (전체 문자열을 메모리에 만들지 않음)
+- 기록은 임시 파일 → rename (원자적), 산출물별 인코딩 시간·크기를 출력하고 TIMINGS 에 누적
+- write_changed: 티커별 파일 묶음 중 직전 매니페스트(_manifest.json)와 해시가 다른 것만 기록 (etf-data · bt-monthly)
+
+numpy 는 배열을 다룰 때만 불러온다 (Vercel 빌드 커맨드의 build_etf_pages 는 표준 라이브러리만으로 동작).
+"""
+import hashlib
+import json
+import math
+import os
+import re
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성
+    orjson = None  # type: ignore[assignment]
+
+BACKEND = 'orjson' if orjson is not None else 'json'
+
+# mkstemp 는 0600 으로 만듦 → rename 전에 일반 파일 권한(0666 & ~umask)으로 맞춤
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+FILE_MODE = 0o666 & ~_UMASK
+
+MANIFEST_NAME = '_manifest.json'    # write_changed 묶음 디렉토리의 매니페스트
+WRITE_WORKERS = 8
+
+
+@dataclass
+class WriteStat:
+    """산출물 1개 기록 통계"""
+    path: str
+    bytes: int
+    encode: float      # 인코딩 시간 (초)
+    write: float       # 디스크 기록 시간 (초, 스트리밍이면 인코딩 제외한 나머지)
+
+    def line(self) -> str:
+        return (f'  직렬화: {os.path.basename(self.path)} {self.bytes / 1024:,.0f}KB · '
+                f'encode {self.encode * 1000:,.1f}ms · write {self.write * 1000:,.1f}ms ({BACKEND})')
+
+
+# 이 프로세스에서 기록한 산출물 (워커 프로세스 스테이지는 각자 출력만)
+TIMINGS: list[WriteStat] = []
+
+
+# ── 인코딩 ───────────────────────────────────────────────────────────
+
+def to_list(values: Any) -> list[Any]:
+    """배열 → 파이썬 리스트 (NaN → None)"""
+    import numpy as np
+    arr = np.asarray(values)
+    if arr.dtype.kind != 'f':
+        return arr.tolist()
+    nan = np.isnan(arr)
+    if not nan.any():
+        return arr.tolist()
+    obj = arr.astype(object)
+    obj[nan] = None
+    return obj.tolist()
+
+
+def round_list(values: Any, decimals: int) -> list[Any]:
+    """배열 단위 반올림 후 리스트 (NaN → None) — [round(v, d) for v in ...] 대체"""
+    import numpy as np
+    return to_list(np.round(np.asarray(values, dtype=float), decimals))
+
+
+def _default(obj: Any) -> Any:
+    if type(obj).__module__ == 'numpy':
+        import numpy as np
+        if isinstance(obj, np.ndarray):
+            return to_list(obj)
+        if isinstance(obj, np.generic):
+            value = obj.item()
+            return None if isinstance(value, float) and not math.isfinite(value) else value
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj)
+    raise TypeError(f'JSON 직렬화 불가: {type(obj).__name__}')
+
+
+def _finite(obj: Any) -> Any:
+    """NaN/Inf 실수 → None (표준 json 백엔드용 — orjson 은 null 로 씀)"""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {k: _finite(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(v) for v in obj]
+    return obj
+
+
+# 문자열 토큰은 그대로 두고 지수 표기 실수만 잡음
+_EXP_FLOAT = re.compile(r'"(?:[^"\\]|\\.)*"|(-?)(\d)(?:\.(\d+))?e([+-])(\d+)')
+
+
+def _orjson_float(m: re.Match[str]) -> str:
+    """repr 지수 표기 → orjson 표기 (지수 앞 0·'+' 제거, 1e-5 자리는 소수 표기)"""
+    sign, digit, frac, exp_sign, exp = m.groups()
+    if digit is None:
+        return m.group(0)
+    e = int(exp)
+    if exp_sign == '-' and e == 5:     # repr 은 1e-5 자리부터 지수, orjson 은 1e-6 자리부터
+        return f'{sign}0.0000{digit}{frac or ""}'
+    return f'{sign}{digit}{"." + frac if frac else ""}e{"-" if exp_sign == "-" else ""}{e}'
+
+
+def _json_dumps(obj: Any, indent: bool, sort_keys: bool) -> str:
+    kwargs: dict[str, Any] = dict(ensure_ascii=False, default=_default, sort_keys=sort_keys, allow_nan=False,
+                                  indent=2 if indent else None, separators=None if indent else (',', ':'))
+    try:
+        text = json.dumps(obj, **kwargs)
+    except ValueError:           # NaN/Inf 가 있을 때만 한 번 더 훑음
+        text = json.dumps(_finite(obj), **kwargs)
+    return _EXP_FLOAT.sub(_orjson_float, text)
+
+
+def dumps(obj: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """compact(기본) 또는 2칸 들여쓰기 UTF-8 JSON 바이트"""
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=_default, option=option)
+    return _json_dumps(obj, indent, sort_keys).encode('utf-8')
+
+
+def loads(data: bytes | str) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def load(path: str | os.PathLike[str]) -> Any:
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+# ── 기록 ─────────────────────────────────────────────────────────────
+
+def write_atomic(path: str | os.PathLike[str], data: bytes) -> None:
+    """같은 디렉토리의 임시 파일에 쓴 뒤 rename — 읽는 쪽은 항상 완전한 파일만 봄"""
+    path = os.fspath(path)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp, FILE_MODE)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _record(stat: WriteStat, quiet: bool) -> WriteStat:
+    TIMINGS.append(stat)
+    if not quiet:
+        print(stat.line())
+    return stat
+
+
+def write_json(path: str | os.PathLike[str], obj: Any, indent: bool = False,
+               sort_keys: bool = False, quiet: bool = False) -> WriteStat:
+    """obj 를 path 에 원자적으로 기록 → 크기·인코딩/기록 시간"""
+    path = os.fspath(path)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    t0 = time.perf_counter()
+    data = dumps(obj, indent=indent, sort_keys=sort_keys)
+    if indent:
+        data += b'\n'
+    t1 = time.perf_counter()
+    write_atomic(path, data)
+    return _record(WriteStat(path, len(data), t1 - t0, time.perf_counter() - t1), quiet)
+
+
+def write_json_stream(path: str | os.PathLike[str], head: dict[str, Any], key: str,
+                      items: Iterable[tuple[str, Any]], quiet: bool = False) -> WriteStat:
+    """{**head, key: {k: v for k, v in items}} 를 항목 단위로 인코딩하며 기록
+
+    items 는 제너레이터여도 됨 — 한 항목씩 인코딩해 바로 파일에 쓰므로
+    출력 전체 문자열이 메모리에 올라가지 않는다 (corr_returns 처럼 큰 산출물용).
+    """
+    path = os.fspath(path)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    encode = 0.0
+    size = 0
+    t_start = time.perf_counter()
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            def put(chunk: bytes) -> None:
+                nonlocal size
+                f.write(chunk)
+                size += len(chunk)
+
+            def enc(value: Any) -> bytes:
+                nonlocal encode
+                t = time.perf_counter()
+                out = dumps(value)
+                encode += time.perf_counter() - t
+                return out
+
+            put(b'{')
+            for k, v in head.items():
+                put(enc(k) + b':' + enc(v) + b',')
+            put(enc(key) + b':{')
+            for i, (k, v) in enumerate(items):
+                put((b',' if i else b'') + enc(k) + b':' + enc(v))
+            put(b'}}')
+        os.chmod(tmp, FILE_MODE)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    total = time.perf_counter() - t_start
+    return _record(WriteStat(path, size, encode, total - encode), quiet)
+
+
+# ── 변경분 기록 (티커별 파일 묶음 + 매니페스트) ─────────────────────
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def load_manifest(directory: str | os.PathLike[str]) -> dict[str, Any]:
+    """직전 빌드 매니페스트 {'files': {ticker: hash}, ...} (없거나 깨졌으면 빈 dict)"""
+    try:
+        manifest = load(os.path.join(directory, MANIFEST_NAME))
+        return manifest if isinstance(manifest.get('files'), dict) else {}
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+
+def write_changed(files: dict[str, bytes], directory: str | os.PathLike[str], previous: dict[str, Any],
+                  workers: int = WRITE_WORKERS, ext: str = '.json', hashes: dict[str, str] | None = None,
+                  rewrite: Iterable[str] = ()) -> tuple[dict[str, str], list[str], list[str]]:
+    """files: {ticker: bytes} → 해시가 다르거나 파일이 없는 것만 기록, (hashes, changed, removed)
+
+    changed 는 직전 매니페스트 대비 내용이 바뀐 것만 (디스크에 없어서 다시 쓴 파일은 제외 — 새 체크아웃 빌드)
+    hashes: 매니페스트에 남길 해시 (없으면 files 바이트의 해시), rewrite: 해시가 같아도 다시 쓸 키
+    """
+    directory = os.fspath(directory)
+    prev_hashes = previous.get('files', {})
+    if hashes is None:
+        hashes = {t: content_hash(data) for t, data in files.items()}
+    changed = sorted(t for t, h in hashes.items() if prev_hashes.get(t) != h)
+    to_write = sorted(set(changed) | set(rewrite)
+                      | {t for t in hashes if not os.path.exists(os.path.join(directory, f'{t}{ext}'))})
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # list() 로 소진해야 작업 중 예외가 여기서 올라옴
+        list(pool.map(lambda t: write_atomic(os.path.join(directory, f'{t}{ext}'), files[t]), to_write))
+
+    # 직전 빌드가 쓴 파일 중 유니버스에서 빠진 티커는 삭제
+    removed = sorted(set(prev_hashes) - set(hashes))
+    for t in removed:
+        path = os.path.join(directory, f'{t}{ext}')
+        if os.path.exists(path):
+            os.remove(path)
+    return hashes, changed, removed
+
+
+def timed_dumps(objs: Iterable[tuple[str, Any]],
+                encoder: Callable[[Any], bytes] = dumps) -> tuple[dict[str, bytes], float]:
+    """작은 문서 여러 개 인코딩 → ({이름: 바이트}, 총 인코딩 시간) (티커별 JSON 용)"""
+    t0 = time.perf_counter()
+    out = {name: encoder(obj) for name, obj in objs}
+    return out, time.perf_counter() - t0
@@ -0,0 +1,144 @@
+"""
+CORRYU ETF Dashboard - 합성 유니버스 생성 모듈
+실제 parquet·네트워크 없이 파이프라인 전체를 돌려보기 위한 결정적(seed 고정) 가격·메타 생성기
+벤치마크(benchmarks/bench_pipeline.py)와 골든 출력 비교 테스트에서 공용
+
+- 시장 팩터 + 섹터별 팩터 (앵커 ETF는 자기 섹터 팩터에 강하게 노출 → 상관 분류가 실제처럼 동작)
+- 상장일 분산(ragged inception): 앞부분 NaN
+- 상장 이후 결측일(gap): 일부 티커에 산발적 NaN
+- 섹터 힌트 키워드가 섞인 이름 (Pass 1 키워드 분류 경로도 통과)
+"""
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from config import SECTOR_DEFS, SUPER_SECTOR_DEFS, PROTECT_EQUITIES, MY_PORTFOLIO, ANCHOR_TO_SECTOR
+
+# 자산군별 (시장 베타, 섹터 팩터 노출, 개별 변동성)
+_CLASS_PROFILE: dict[str, tuple[float, float, float]] = {
+    'EQUITY':       (1.0, 0.6, 0.006),
+    'FIXED_INCOME': (0.1, 0.4, 0.002),
+    'REAL_ASSETS':  (0.4, 1.0, 0.008),
+    'ALTERNATIVE':  (0.6, 2.0, 0.015),
+    'THEMATIC':     (0.8, 0.0, 0.012),
+}
+
+# Pass 1 키워드 분류를 타는 이름 힌트 (config.KEYWORD_RULES 키워드 일부)
+_NAME_HINTS: dict[str, str] = {
+    'S15': 'Short-Term Treasury',
+    'S16': 'High Yield Bond',
+    'S17': 'TIPS Bond',
+    'S18': 'Gold Trust',
+    'S20': 'Real Estate',
+    'S21': 'Bitcoin Strategy',
+    'S22': 'Inverse',
+}
+
+
+@dataclass
+class SyntheticUniverse:
+    """load 스테이지 산출물과 같은 모양의 합성 데이터"""
+    df_price: pd.DataFrame
+    scraped: dict[str, dict[str, Any]]
+    expense_ratios: dict[str, float]
+    dividend_yields: dict[str, float]
+    sectors: dict[str, str]            # 생성 시 부여한 '정답' 섹터 (앵커·S24 포함)
+
+    def meta_df(self) -> pd.DataFrame:
+        """raw/meta.parquet 과 같은 열 구성의 메타 DataFrame"""
+        df = pd.DataFrame.from_dict(self.scraped, orient='index')
+        df['expense_ratio'] = pd.Series(self.expense_ratios)
+        df['div_yield'] = pd.Series(self.dividend_yields)
+        df.index.name = 'ticker'
+        return df
+
+
+def anchor_tickers() -> list[str]:
+    """분류·레거시·포트폴리오 로직이 이름으로 참조하는 티커 (항상 포함)"""
+    names = {s['anchor'] for s in SECTOR_DEFS.values() if s['anchor']}
+    names |= {s['anchor'] for s in SUPER_SECTOR_DEFS.values() if s.get('anchor')}
+    names |= set(PROTECT_EQUITIES) | set(MY_PORTFOLIO) | {'SPY'}
+    return sorted(names)
+
+
+def make_universe(n_tickers: int = 1000, n_days: int = 2520, seed: int = 0,
+                  end: str = '2026-09-30', ragged: float = 0.5, gap_rate: float = 0.03) -> SyntheticUniverse:
+    """합성 가격·메타 생성 (같은 인자면 항상 같은 결과)
+
+    Args:
+        n_tickers: ETF 수 (앵커 포함, ^GSPC 제외)
+        n_days:    거래일 수 (end에서 거슬러 올라감)
+        seed:      난수 시드
+        end:       마지막 거래일
+        ragged:    상장일이 시작일 이후인 티커 비율
+        gap_rate:  상장 이후 산발적 결측일이 있는 티커 비율
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end=end, periods=n_days)
+
+    anchors = anchor_tickers()
+    n_syn = max(0, n_tickers - len(anchors))
+    tickers = anchors + [f'SYN{i:05d}' for i in range(n_syn)]
+    n = len(tickers)
+
+    sector_ids = sorted(SECTOR_DEFS)
+    equity = [s for s in sector_ids if SECTOR_DEFS[s]['asset_class'] == 'EQUITY']
+    sectors = [ANCHOR_TO_SECTOR.get(t) or (str(rng.choice(equity)) if t in PROTECT_EQUITIES else str(rng.choice(sector_ids)))
+               for t in tickers]
+
+    # 팩터 수익률: 0 = 시장, 1.. = 섹터
+    col = {sid: i + 1 for i, sid in enumerate(sector_ids)}
+    factors = rng.normal(0.0003, 0.01, (n_days, len(sector_ids) + 1))
+    loadings = np.zeros((n, len(sector_ids) + 1))
+    idio = np.empty(n)
+    for j, (t, sid) in enumerate(zip(tickers, sectors)):
+        beta, expo, vol = _CLASS_PROFILE[SECTOR_DEFS[sid]['asset_class']]
+        scale = 1.0 if t in ANCHOR_TO_SECTOR else rng.uniform(0.6, 1.4)
+        loadings[j, 0] = beta * scale * (-rng.uniform(1, 3) if sid == 'S22' else 1.0)
+        if sid == 'S24':
+            loadings[j, 1:] = rng.normal(0, 0.5, len(sector_ids)) * (rng.random(len(sector_ids)) < 0.2)
+        else:
+            loadings[j, col[sid]] = expo * scale
+        idio[j] = vol * (0.5 if t in ANCHOR_TO_SECTOR else rng.uniform(0.8, 2.5))
+
+    ret = factors @ loadings.T + rng.normal(0, 1, (n_days, n)) * idio
+    prices = 100 * np.exp(np.cumsum(ret, axis=0))
+
+    # 상장일 분산 (앵커는 전 기간 보유)
+    start = np.where(rng.random(n) < ragged, rng.integers(0, max(1, n_days - 60), n), 0)
+    start[:len(anchors)] = 0
+    for j, s in enumerate(start):
+        prices[:s, j] = np.nan
+        if rng.random() < gap_rate and n_days - s > 10:
+            prices[rng.integers(s + 1, n_days - 1, rng.integers(1, 6)), j] = np.nan
+
+    df_price = pd.DataFrame(prices, index=dates, columns=tickers)
+    gspc = 100 * np.exp(np.cumsum(factors[:, 0] + rng.normal(0, 0.001, n_days)))
+    df_price['^GSPC'] = gspc
+
+    # 메타: 시총 로그정규 → rank, 상장일은 첫 가격일 (이전 이력 티커는 더 과거로)
+    caps = np.exp(rng.normal(20, 2.0, n))
+    caps[:len(anchors)] *= 50
+    rank = np.empty(n, dtype=int)
+    rank[np.argsort(-caps)] = np.arange(1, n + 1)
+    scraped: dict[str, dict[str, Any]] = {}
+    expense_ratios: dict[str, float] = {}
+    dividend_yields: dict[str, float] = {}
+    for j, t in enumerate(tickers):
+        sid = sectors[j]
+        hint = _NAME_HINTS.get(sid) if rng.random() < 0.5 else None
+        back = int(rng.integers(0, 3000)) if start[j] == 0 else 0
+        inception = dates[start[j]] - pd.Timedelta(days=back)
+        scraped[t] = {
+            'fullname':       f'Synthetic {hint or SECTOR_DEFS[sid]["name_en"]} ETF {t}',
+            'market_cap':     float(round(caps[j], 0)),
+            'rank':           int(rank[j]),
+            'inception_date': inception.strftime('%Y-%m-%d'),
+        }
+        expense_ratios[t] = round(float(rng.uniform(0.0003, 0.0095)), 4)
+        if rng.random() < 0.8:
+            dividend_yields[t] = round(float(rng.uniform(0, 0.06)), 4)
+
+    return SyntheticUniverse(df_price, scraped, expense_ratios, dividend_yields, dict(zip(tickers, sectors)))
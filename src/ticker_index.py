@@ -0,0 +1,90 @@
+"""
+CORRYU ETF Dashboard - 티커 ID 인터닝 모듈
+가격 저장소 컬럼에서 티커 → 정수 ID를 한 번만 부여하고,
+이후 단계(성과·상관계수·메타·분류)는 ID 배열 인덱싱과 불리언 마스크로 조인·멤버십 판정
+문자열 티커는 I/O 경계(JSON 출력, dict 반환값)에서만 사용
+"""
+from typing import Any, Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+
+class TickerIndex:
+    """티커 ↔ 정수 ID 사전
+
+    ID는 티커 문자열 정렬 순서로 부여되므로 같은 유니버스면 실행마다 동일하고,
+    ID 오름차순 순회 = sorted(tickers) 순회가 된다 (재정렬 불필요).
+    """
+
+    def __init__(self, tickers: Iterable[str]) -> None:
+        self.tickers: list[str] = sorted({str(t) for t in tickers})
+        self._ids: dict[str, int] = {t: i for i, t in enumerate(self.tickers)}
+        self._array = np.array(self.tickers, dtype=object)
+
+    @classmethod
+    def from_price(cls, df_price: pd.DataFrame) -> 'TickerIndex':
+        """가격 저장소(wide DataFrame) 컬럼으로 인덱스 생성"""
+        return cls(df_price.columns)
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    def __contains__(self, ticker: object) -> bool:
+        return ticker in self._ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.tickers)
+
+    # ── 변환 ─────────────────────────────────────────────────────────
+
+    def id_of(self, ticker: str) -> int:
+        """티커 → ID (없으면 -1)"""
+        return self._ids.get(ticker, -1)
+
+    def ids_of(self, tickers: Iterable[str]) -> np.ndarray:
+        """티커 목록 → ID 배열 (인덱스에 없는 티커는 제외, ID 오름차순)"""
+        ids = [self._ids[t] for t in tickers if t in self._ids]
+        return np.sort(np.asarray(ids, dtype=np.int32))
+
+    def require_ids(self, tickers: Iterable[str]) -> np.ndarray:
+        """ids_of 와 같되 인덱스에 없는 티커가 있으면 ValueError (멤버십이 조용히 줄지 않게)"""
+        tickers = list(tickers)
+        missing = sorted({t for t in tickers if t not in self._ids})
+        if missing:
+            raise ValueError(f'티커 인덱스에 없는 티커 {len(missing)}개: {", ".join(missing[:10])}')
+        return self.ids_of(tickers)
+
+    def tickers_of(self, ids: np.ndarray) -> list[str]:
+        """ID 배열 → 티커 리스트"""
+        return self._array[np.asarray(ids, dtype=np.intp)].tolist()
+
+    def mask_of(self, tickers: Iterable[str]) -> np.ndarray:
+        """티커 집합 → 불리언 마스크 (len(self),)"""
+        mask = np.zeros(len(self), dtype=bool)
+        mask[self.ids_of(tickers)] = True
+        return mask
+
+    def from_mask(self, mask: np.ndarray) -> list[str]:
+        """불리언 마스크 → 티커 리스트 (ID 순)"""
+        return self.tickers_of(np.flatnonzero(mask))
+
+    # ── 정렬된 배열 조인 ─────────────────────────────────────────────
+
+    def take(self, mapping: dict[str, Any], key: str | None = None,
+             default: Any = 0, dtype: Any = float) -> np.ndarray:
+        """ticker → 값(또는 dict) 매핑을 ID 순 배열로 변환
+
+        key가 주어지면 mapping[ticker][key]를 꺼냄 (scraped, perf_stats 등).
+        """
+        out = np.empty(len(self), dtype=dtype)
+        for i, t in enumerate(self.tickers):
+            v = mapping.get(t)
+            if key is not None:
+                v = v.get(key, default) if v else default
+            out[i] = default if v is None else v
+        return out
+
+    def align(self, df: pd.DataFrame) -> np.ndarray:
+        """DataFrame 컬럼을 ID 순으로 정렬한 2D 배열 (없는 티커는 NaN 열)"""
+        return df.reindex(columns=self.tickers).to_numpy(dtype=float)
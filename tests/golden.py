@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+골든 출력 비교 하네스 — 참조 구현 vs 최적화 구현
+
+합성 유니버스(src/synthetic.py)와 실제 메타 표본(raw/meta.parquet 의 티커·이름·AUM·상장일)
+위에서 두 구현을 모두 돌려 출력 필드를 전부 비교하고(필드별 허용 오차), 속도를 나란히 출력한다.
+오프라인 실행 — tests/test_golden.py 가 같은 케이스를 pytest 로 돌린다.
+
+실행:
+    python tests/golden.py                   # 합성 + 표본, 600 티커
+    python tests/golden.py --tickers 1500 --repeat 3
+
+케이스 추가: CASES 에 GoldenCase(name, reference, optimized, tolerances) 등록.
+reference / optimized 는 GoldenContext 를 받아 비교할 값을 돌려준다.
+"""
+import argparse
+import contextlib
+import copy
+import io
+import math
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, HERE)
+
+import reference_impl as ref
+from config import SECTOR_DEFS
+from data_loader import (
+    META_PARQUET, compute_perf_stats, compute_corr_monthly, compute_corr_daily,
+    get_all_tickers, get_corr_value, get_corr_matrix,
+)
+from classify import (
+    classify_all, get_sector_members, fill_anchor_correlations, fill_super_anchor_correlations,
+)
+from legacy import assess_all_legacy
+from metrics import compute_price_metrics, price_metric_records
+from synthetic import SyntheticUniverse, make_universe, anchor_tickers
+from ticker_index import TickerIndex
+
+
+# ════════════════════════════════════════════════════════════════════
+# 입력 데이터
+# ════════════════════════════════════════════════════════════════════
+
+def sampled_universe(n_tickers: int = 600, n_days: int = 1500, seed: int = 0) -> SyntheticUniverse | None:
+    """실제 메타 표본 유니버스 — 합성 가격에 raw/meta.parquet 의 티커·이름·AUM·상장일을 입힘
+
+    실제 ETF 이름이라 키워드 분류·수동 오버라이드·레거시 규칙이 운영과 같은 경로를 탄다.
+    meta.parquet 이 없으면 None.
+    """
+    if not os.path.exists(META_PARQUET):
+        return None
+    meta = pd.read_parquet(META_PARQUET)
+    u = make_universe(n_tickers, n_days, seed)
+    synth = [t for t in u.df_price.columns if t.startswith('SYN')]
+    pool = sorted(set(meta.index.astype(str)) - set(anchor_tickers()))
+    rng = np.random.default_rng(seed)
+    picked = [str(t) for t in rng.choice(pool, size=min(len(synth), len(pool)), replace=False)]
+    rename = dict(zip(synth, picked))
+    dropped = set(synth[len(picked):])
+
+    def remap(d: dict[str, Any]) -> dict[str, Any]:
+        return {rename.get(t, t): v for t, v in d.items() if t not in dropped}
+
+    df_price = u.df_price.drop(columns=list(dropped)).rename(columns=rename)
+    scraped = {t: v for t, v in u.scraped.items() if t not in rename and t not in dropped}
+    for new in picked:
+        row = meta.loc[new]
+        scraped[new] = {
+            'fullname':       str(row.get('fullname', new)),
+            'market_cap':     float(row.get('market_cap', 0) or 0),
+            'rank':           int(row.get('rank', 9999) or 9999),
+            'inception_date': str(row.get('inception_date', '1900-01-01') or '1900-01-01'),
+        }
+    # 실제 rank 에는 동순위가 있고 합성 앵커 rank 와도 겹침 → (rank, ticker) 순으로 다시 매김
+    # (동순위끼리의 정렬은 set 순회 순서라 실행마다 달라짐 — 비교 대상이 아님)
+    for i, t in enumerate(sorted(scraped, key=lambda t: (scraped[t]['rank'], t)), 1):
+        scraped[t]['rank'] = i
+    return SyntheticUniverse(df_price, scraped, remap(u.expense_ratios),
+                             remap(u.dividend_yields), remap(u.sectors))
+
+
+@dataclass
+class GoldenContext:
+    """케이스 공용 입력 — 상위 단계는 참조 구현 결과로 고정해 케이스끼리 독립"""
+    label: str
+    u: SyntheticUniverse
+    index: TickerIndex = field(init=False)
+    perf: dict[str, Any] = field(init=False)
+    corr_m: pd.DataFrame = field(init=False)
+    corr_d: pd.DataFrame = field(init=False)
+    all_tickers: set[str] = field(init=False)
+    classification: dict[str, Any] = field(init=False)
+    members: dict[str, set[str]] = field(init=False)
+    legacy: dict[str, Any] = field(init=False)
+
+    def __post_init__(self) -> None:
+        df = self.u.df_price
+        self.index = TickerIndex.from_price(df)
+        self.perf = compute_perf_stats(df)
+        self.corr_m = compute_corr_monthly(df)
+        self.corr_d = compute_corr_daily(df)
+        self.all_tickers = get_all_tickers(self.corr_d)
+        self.classification = ref.classify_all(self.all_tickers, self.u.scraped, self.corr_m, self.corr_d)
+        self.members = ref.get_sector_members(self.classification)
+        ref.fill_anchor_correlations(self.classification, self.members, self.corr_m, self.corr_d)
+        ref.fill_super_anchor_correlations(self.classification, self.corr_m, self.corr_d)
+        self.legacy = ref.assess_all_legacy(self.members, self.u.scraped)
+
+
+def contexts(n_tickers: int = 600, n_days: int = 1500, seed: int = 0) -> list[GoldenContext]:
+    out = [GoldenContext('synthetic', make_universe(n_tickers, n_days, seed))]
+    sampled = sampled_universe(n_tickers, n_days, seed)
+    if sampled is not None:
+        out.append(GoldenContext('sampled', sampled))
+    return out
+
+
+# ════════════════════════════════════════════════════════════════════
+# 비교
+# ════════════════════════════════════════════════════════════════════
+
+def diff(expected: Any, actual: Any, tolerances: dict[str, float], default_tol: float = 0.0,
+         path: str = '', field_name: str = '') -> list[str]:
+    """중첩 dict/list/배열 전체 비교 → 불일치 경로 목록
+
+    실수는 필드 이름(dict 키)별 허용 오차(절대값) 적용, NaN끼리는 같음으로 본다.
+    """
+    tol = tolerances.get(field_name, default_tol)
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        out = []
+        if expected.keys() != actual.keys():
+            missing = sorted(map(str, expected.keys() - actual.keys()))
+            extra = sorted(map(str, actual.keys() - expected.keys()))
+            out.append(f'{path or "/"}: 키 불일치 (없음 {missing[:5]}, 추가 {extra[:5]})')
+        for k in expected.keys() & actual.keys():
+            out += diff(expected[k], actual[k], tolerances, default_tol, f'{path}/{k}', str(k))
+        return out
+    if isinstance(expected, (list, tuple)) and isinstance(actual, (list, tuple)):
+        if len(expected) != len(actual):
+            return [f'{path}: 길이 {len(expected)} ≠ {len(actual)}']
+        out = []
+        for i, (e, a) in enumerate(zip(expected, actual)):
+            out += diff(e, a, tolerances, default_tol, f'{path}[{i}]', field_name)
+        return out
+    if isinstance(expected, np.ndarray) or isinstance(actual, np.ndarray):
+        e, a = np.asarray(expected, dtype=float), np.asarray(actual, dtype=float)
+        if e.shape != a.shape:
+            return [f'{path}: shape {e.shape} ≠ {a.shape}']
+        bad = ~np.isclose(e, a, rtol=0, atol=tol, equal_nan=True)
+        return [f'{path}: {int(bad.sum())}개 원소 불일치 (최대 차 {np.nanmax(np.abs(e - a)):.3g})'] if bad.any() else []
+    if isinstance(expected, (bool, np.bool_)) or isinstance(actual, (bool, np.bool_)):
+        same = isinstance(expected, (bool, np.bool_)) and isinstance(actual, (bool, np.bool_)) and expected == actual
+        return [] if same else [f'{path}: {expected!r} ≠ {actual!r}']
+    if isinstance(expected, (int, float, np.number)) and isinstance(actual, (int, float, np.number)):
+        e, a = float(expected), float(actual)
+        if math.isnan(e) and math.isnan(a):
+            return []
+        return [] if abs(e - a) <= tol else [f'{path}: {expected!r} ≠ {actual!r} (허용 {tol:g})']
+    return [] if expected == actual else [f'{path}: {expected!r} ≠ {actual!r}']
+
+
+# ════════════════════════════════════════════════════════════════════
+# 케이스
+# ════════════════════════════════════════════════════════════════════
+
+@dataclass
+class GoldenCase:
+    """참조/최적화 구현 한 쌍
+
+    Attributes:
+        reference:  ctx → 값 (최적화 이전 구현)
+        optimized:  ctx → 값 (현재 src/ 구현)
+        tolerances: 필드 이름 → 허용 절대 오차 (없으면 default_tol)
+    """
+    name: str
+    reference: Callable[[GoldenContext], Any]
+    optimized: Callable[[GoldenContext], Any]
+    tolerances: dict[str, float] = field(default_factory=dict)
+    default_tol: float = 0.0
+
+
+@dataclass
+class GoldenResult:
+    case: str
+    label: str
+    ref_seconds: float
+    opt_seconds: float
+    mismatches: list[str]
+
+    @property
+    def speedup(self) -> float:
+        return self.ref_seconds / self.opt_seconds if self.opt_seconds > 0 else float('inf')
+
+
+def _anchors() -> list[str]:
+    return [s['anchor'] for s in SECTOR_DEFS.values() if s['anchor']]
+
+
+def _ref_corr_matrix(ctx: GoldenContext) -> np.ndarray:
+    tickers = sorted(ctx.all_tickers)
+    return np.array([[get_corr_value(a, t, ctx.corr_m, ctx.corr_d) for t in tickers] for a in _anchors()])
+
+
+def _opt_corr_matrix(ctx: GoldenContext) -> np.ndarray:
+    return get_corr_matrix(_anchors(), sorted(ctx.all_tickers), ctx.corr_m, ctx.corr_d)
+
+
+def _ref_classify(ctx: GoldenContext) -> dict[str, Any]:
+    c = ref.classify_all(ctx.all_tickers, ctx.u.scraped, ctx.corr_m, ctx.corr_d)
+    ref.fill_anchor_correlations(c, ref.get_sector_members(c), ctx.corr_m, ctx.corr_d)
+    ref.fill_super_anchor_correlations(c, ctx.corr_m, ctx.corr_d)
+    return c
+
+
+def _opt_classify(ctx: GoldenContext) -> dict[str, Any]:
+    c = classify_all(ctx.all_tickers, ctx.u.scraped, ctx.corr_m, ctx.corr_d, ticker_index=ctx.index)
+    fill_anchor_correlations(c, get_sector_members(c), ctx.corr_m, ctx.corr_d)
+    fill_super_anchor_correlations(c, ctx.corr_m, ctx.corr_d)
+    return c
+
+
+def _opt_legacy(ctx: GoldenContext) -> dict[str, Any]:
+    return assess_all_legacy(ctx.members, ctx.classification, ctx.corr_m, ctx.corr_d,
+                             ctx.u.scraped, ctx.perf, ctx.u.df_price, ticker_index=ctx.index)
+
+
+def _etf_data_args(ctx: GoldenContext) -> tuple[Any, ...]:
+    return (ctx.members, ctx.classification, ctx.legacy, ctx.u.df_price, ctx.perf, ctx.u.scraped,
+            ctx.corr_m, ctx.corr_d, ctx.u.expense_ratios, ctx.u.dividend_yields)
+
+
+def _opt_etf_data(ctx: GoldenContext) -> dict[str, Any]:
+    import compute_all
+    return compute_all.build_all_etf_data(*_etf_data_args(ctx), ticker_index=ctx.index)
+
+
+# 반올림 한 단위 (pandas rolling 누적합 vs numpy 구간 평균의 1e-15 차이가 반올림 경계에 걸릴 때)
+PRICE_METRIC_TOL = {'z_score': 0.01, 'ma200_pct': 0.1, 'mdd_52w': 0.1, 'rsi': 0.1, 'range_52w': 0.1}
+
+CASES: list[GoldenCase] = [
+    GoldenCase('get_corr_matrix', _ref_corr_matrix, _opt_corr_matrix, default_tol=1e-12),
+    GoldenCase('classify_all', _ref_classify, _opt_classify),
+    GoldenCase('assess_all_legacy', lambda ctx: ref.assess_all_legacy(ctx.members, ctx.u.scraped), _opt_legacy),
+    GoldenCase('compute_price_metrics', lambda ctx: ref.price_metrics(ctx.u.df_price),
+               lambda ctx: price_metric_records(compute_price_metrics(ctx.u.df_price)), PRICE_METRIC_TOL),
+    GoldenCase('build_all_etf_data', lambda ctx: ref.build_all_etf_data(*_etf_data_args(ctx)), _opt_etf_data,
+               PRICE_METRIC_TOL, default_tol=1e-9),
+]
+
+
+def _timed(func: Callable[[GoldenContext], Any], ctx: GoldenContext, repeat: int) -> tuple[Any, float]:
+    best = float('inf')
+    value = None
+    for _ in range(repeat):
+        run_ctx = copy.copy(ctx)
+        run_ctx.classification = copy.deepcopy(ctx.classification)   # fill_* 가 제자리 수정
+        with contextlib.redirect_stdout(io.StringIO()):
+            t0 = time.perf_counter()
+            value = func(run_ctx)
+            best = min(best, time.perf_counter() - t0)
+    return value, best
+
+
+def run_case(case: GoldenCase, ctx: GoldenContext, repeat: int = 1) -> GoldenResult:
+    expected, t_ref = _timed(case.reference, ctx, repeat)
+    actual, t_opt = _timed(case.optimized, ctx, repeat)
+    return GoldenResult(case.name, ctx.label, t_ref, t_opt,
+                        diff(expected, actual, case.tolerances, case.default_tol))
+
+
+def report(results: list[GoldenResult]) -> None:
+    print(f'\n  {"case":<22} {"data":<10} {"reference":>10} {"optimized":>10} {"speedup":>8}  result')
+    print(f'  {"─" * 22} {"─" * 10} {"─" * 10} {"─" * 10} {"─" * 8}  {"─" * 12}')
+    for r in results:
+        status = 'OK' if not r.mismatches else f'{len(r.mismatches)} mismatch'
+        print(f'  {r.case:<22} {r.label:<10} {r.ref_seconds:9.3f}s {r.opt_seconds:9.3f}s '
+              f'{r.speedup:7.1f}x  {status}')
+        for m in r.mismatches[:5]:
+            print(f'      {m}')
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='참조 구현 vs 최적화 구현 골든 출력 비교')
+    parser.add_argument('--tickers', type=int, default=600)
+    parser.add_argument('--days', type=int, default=1500)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        ctxs = contexts(args.tickers, args.days, args.seed)
+    results = [run_case(case, ctx, args.repeat) for ctx in ctxs for case in CASES]
+    report(results)
+    return 1 if any(r.mismatches for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""
+골든 출력 비교용 참조 구현 — 최적화 이전(티커별 스칼라 루프) 코드를 그대로 보존
+
+src/ 쪽을 벡터화·배치화할 때 결과가 바뀌지 않았는지 tests/golden.py 가 이 구현과 비교한다.
+동작을 바꾸는 수정(규칙 변경)이 아니면 이 파일은 고치지 않는다.
+(print 통계 출력만 제거)
+"""
+from collections import defaultdict
+
+from config import (
+    SECTOR_DEFS, SUPER_SECTOR_DEFS, CORR_THRESHOLD, PROTECT_EQUITIES,
+    ANCHOR_TO_SECTOR, MANUAL_SECTOR_OVERRIDES, MANUAL_LEGACY_OVERRIDES,
+    LEGACY_EXEMPTIONS, LEGACY_MIN_AUM, SHORT_HISTORY_CUTOFF, MY_PORTFOLIO,
+)
+from data_loader import get_fullname, get_corr_value
+from classify import classify_by_keywords
+from metrics import (
+    compute_etf_metrics, compute_z_score, compute_200dma_divergence, compute_52w_mdd,
+    compute_rsi, compute_52w_range_pct,
+)
+
+
+# ── classify ─────────────────────────────────────────────────────────
+
+def classify_by_correlation(ticker, df_corr_monthly, df_corr_daily):
+    non_equity_anchors = set()
+    for sid, sdef in SECTOR_DEFS.items():
+        if sdef['asset_class'] != 'EQUITY' and sdef['anchor']:
+            non_equity_anchors.add(sdef['anchor'])
+
+    if ticker not in df_corr_monthly.columns and ticker not in df_corr_daily.columns:
+        return 'S24', 0.0
+
+    best_sector = None
+    best_corr = -1.0
+    for sector_id, sdef in SECTOR_DEFS.items():
+        anchor = sdef['anchor']
+        if not anchor:
+            continue
+        r = get_corr_value(anchor, ticker, df_corr_monthly, df_corr_daily)
+        if ticker in PROTECT_EQUITIES and anchor in non_equity_anchors:
+            continue
+        if r > best_corr:
+            best_corr = r
+            best_sector = sector_id
+
+    if best_sector and best_corr >= CORR_THRESHOLD:
+        return best_sector, best_corr
+    return 'S24', best_corr
+
+
+def classify_all(all_tickers, scraped, df_corr_monthly, df_corr_daily):
+    classification = {}
+    for ticker in sorted(all_tickers):
+        fullname = get_fullname(ticker, scraped)
+        if ticker in ANCHOR_TO_SECTOR:
+            classification[ticker] = {'sector': ANCHOR_TO_SECTOR[ticker], 'method': 'anchor', 'r_anchor': 1.0}
+            continue
+        if ticker in MANUAL_SECTOR_OVERRIDES:
+            classification[ticker] = {'sector': MANUAL_SECTOR_OVERRIDES[ticker], 'method': 'manual_override', 'r_anchor': 0.0}
+            continue
+        sector = classify_by_keywords(ticker, fullname)
+        if sector:
+            classification[ticker] = {'sector': sector, 'method': 'keyword', 'r_anchor': 0.0}
+            continue
+        sector, r_val = classify_by_correlation(ticker, df_corr_monthly, df_corr_daily)
+        method = 'correlation' if r_val >= CORR_THRESHOLD else 'fallback'
+        classification[ticker] = {'sector': sector, 'method': method, 'r_anchor': round(r_val, 4)}
+    return classification
+
+
+def get_sector_members(classification):
+    members = defaultdict(set)
+    for ticker, info in classification.items():
+        members[info['sector']].add(ticker)
+    return dict(members)
+
+
+def fill_anchor_correlations(classification, sector_members, df_corr_monthly, df_corr_daily):
+    for sector_id, tickers in sector_members.items():
+        anchor = SECTOR_DEFS[sector_id]['anchor']
+        if not anchor:
+            continue
+        for ticker in tickers:
+            if classification[ticker]['r_anchor'] == 0.0 or classification[ticker]['method'] == 'keyword':
+                r = get_corr_value(anchor, ticker, df_corr_monthly, df_corr_daily)
+                classification[ticker]['r_anchor'] = round(r, 4)
+
+
+def fill_super_anchor_correlations(classification, df_corr_monthly, df_corr_daily):
+    sector_to_ss_anchor = {}
+    for ss_def in SUPER_SECTOR_DEFS.values():
+        for sid in ss_def['sub_sectors']:
+            sector_to_ss_anchor[sid] = ss_def['anchor']
+    for ticker, info in classification.items():
+        sid = info['sector']
+        if sid in sector_to_ss_anchor:
+            r = get_corr_value(sector_to_ss_anchor[sid], ticker, df_corr_monthly, df_corr_daily)
+            classification[ticker]['r_anchor'] = round(r, 4)
+
+
+# ── legacy ───────────────────────────────────────────────────────────
+
+def assess_sector_legacy(sector_tickers, scraped):
+    results = {}
+    for ticker in sector_tickers:
+        reasons = []
+        details = []
+        if ticker in MANUAL_LEGACY_OVERRIDES:
+            reasons.append('MANUAL')
+            details.append(f'{MANUAL_LEGACY_OVERRIDES[ticker]}')
+        if ticker not in MANUAL_LEGACY_OVERRIDES and ticker not in LEGACY_EXEMPTIONS:
+            inc = str(scraped.get(ticker, {}).get('inception_date', '1900-01-01'))[:10]
+            if inc != '1900-01-01' and inc > SHORT_HISTORY_CUTOFF:
+                reasons.append('SHORT_HISTORY')
+                details.append('상장기간 너무 짧음')
+        if not reasons and ticker not in LEGACY_EXEMPTIONS:
+            aum = scraped.get(ticker, {}).get('market_cap', 0)
+            if 0 < aum <= LEGACY_MIN_AUM:
+                reasons.append('LOW_AUM')
+                details.append('AUM 너무 적음')
+        results[ticker] = {'is_legacy': len(reasons) >= 1, 'reasons': reasons, 'details': details}
+    return results
+
+
+def assess_all_legacy(sector_members, scraped):
+    all_legacy = {}
+    for _, tickers in sorted(sector_members.items()):
+        all_legacy.update(assess_sector_legacy(tickers, scraped))
+    return all_legacy
+
+
+# ── metrics ──────────────────────────────────────────────────────────
+
+def price_metrics(df_price):
+    """종목별 가격 민감 지표 (compute_etf_metrics 의 가격 블록 그대로)"""
+    out = {}
+    for ticker in df_price.columns:
+        ts = df_price[ticker].dropna()
+        z_score = ma200_pct = mdd_52w = 0.0
+        rsi = range_52w = None
+        if len(ts) >= 200:
+            z_score = compute_z_score(ts)
+            ma200_pct = compute_200dma_divergence(ts)
+            mdd_52w = compute_52w_mdd(ts)
+        if len(ts) >= 15:
+            rsi = compute_rsi(ts)
+            range_52w = compute_52w_range_pct(ts)
+        out[ticker] = {
+            'z_score':   round(float(z_score), 2),
+            'ma200_pct': round(float(ma200_pct), 1),
+            'mdd_52w':   round(float(mdd_52w), 1),
+            'rsi':       rsi,
+            'range_52w': range_52w,
+        }
+    return out
+
+
+# ── compute_all ──────────────────────────────────────────────────────
+
+def build_all_etf_data(sector_members, classification, legacy_results, df_price, perf_stats, scraped,
+                       df_corr_monthly, df_corr_daily, expense_ratios, dividend_yields):
+    all_data = {}
+    for sid in sorted(SECTOR_DEFS.keys()):
+        etf_list = []
+        for ticker in sector_members.get(sid, set()):
+            info = compute_etf_metrics(
+                ticker, df_price, perf_stats, scraped, classification,
+                df_corr_monthly, df_corr_daily, legacy_results,
+                expense_ratios=expense_ratios, dividend_yields=dividend_yields,
+            )
+            info['mine'] = 1 if ticker in MY_PORTFOLIO else 0
+            etf_list.append(info)
+        etf_list.sort(key=lambda x: (-x['mine'], x['rank']))
+        all_data[sid] = etf_list
+    return all_data
@@ -0,0 +1,63 @@
+"""
+골든 출력 비교 테스트 — 최적화 구현이 참조 구현과 같은 결과를 내는지 (tests/golden.py 케이스 전체)
+
+실행:
+    python -m pytest tests/test_golden.py -v
+    python tests/golden.py             # 속도 비교 표
+"""
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import golden
+
+
+class TestGoldenOutputs(unittest.TestCase):
+    """합성·표본 유니버스에서 CASES 전부 허용 오차 이내 일치"""
+
+    @classmethod
+    def setUpClass(cls):
+        with contextlib.redirect_stdout(io.StringIO()):
+            cls.contexts = golden.contexts(n_tickers=200, n_days=800, seed=7)
+
+    def test_cases_match_reference(self):
+        for ctx in self.contexts:
+            for case in golden.CASES:
+                with self.subTest(case=case.name, data=ctx.label):
+                    result = golden.run_case(case, ctx)
+                    self.assertEqual(result.mismatches, [])
+
+    def test_sampled_uses_real_names(self):
+        labels = [c.label for c in self.contexts]
+        if 'sampled' not in labels:
+            self.skipTest('raw/meta.parquet 없음')
+        ctx = self.contexts[labels.index('sampled')]
+        self.assertFalse(any(t.startswith('SYN') for t in ctx.u.df_price.columns))
+        self.assertEqual(set(ctx.u.scraped), set(ctx.u.df_price.columns) - {'^GSPC'})
+
+
+class TestGoldenDiff(unittest.TestCase):
+    """diff: 필드별 허용 오차, NaN, 구조 불일치 검출"""
+
+    def test_tolerance_per_field(self):
+        exp = {'a': [{'z': 1.0, 'r': 0.5}], 'b': 'x'}
+        act = {'a': [{'z': 1.004, 'r': 0.5}], 'b': 'x'}
+        self.assertEqual(golden.diff(exp, act, {'z': 0.01}), [])
+        self.assertEqual(len(golden.diff(exp, act, {})), 1)
+
+    def test_nan_and_structure(self):
+        self.assertEqual(golden.diff({'v': float('nan')}, {'v': float('nan')}, {}), [])
+        self.assertEqual(len(golden.diff({'v': [1, 2]}, {'v': [1]}, {})), 1)
+        self.assertEqual(len(golden.diff({'v': 1}, {'w': 1}, {})), 1)
+        self.assertEqual(len(golden.diff(np.zeros(3), np.array([0, 0, 1e-3]), {}, 1e-6)), 1)
+        self.assertEqual(len(golden.diff({'f': True}, {'f': 1}, {})), 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -486,5 +486,1528 @@ class TestRenderHtml(unittest.TestCase):
         self.assertIn(str(total), self.html, "총 ETF 수가 HTML에 없음")
 
 
+# ─────────────────────────────────────────────────────────
+# 6. ticker_index — 정수 ID 인터닝 · 벡터화 조인
+# ─────────────────────────────────────────────────────────
+
+class TestTickerIndex(unittest.TestCase):
+    """TickerIndex 및 ID 배열 기반 조인 경로 검증"""
+
+    def test_ids_follow_sorted_order(self):
+        """ID 오름차순 = 티커 정렬 순"""
+        from ticker_index import TickerIndex
+        idx = TickerIndex(['VOO', 'AGG', 'QQQ', 'AGG'])
+        self.assertEqual(idx.tickers, ['AGG', 'QQQ', 'VOO'])
+        self.assertEqual(idx.id_of('QQQ'), 1)
+        self.assertEqual(idx.id_of('NOPE'), -1)
+
+    def test_mask_roundtrip(self):
+        """mask_of → from_mask 왕복, 인덱스 밖 티커는 무시"""
+        from ticker_index import TickerIndex
+        idx = TickerIndex(['A', 'B', 'C', 'D'])
+        mask = idx.mask_of({'D', 'B', 'ZZZ'})
+        self.assertEqual(mask.tolist(), [False, True, False, True])
+        self.assertEqual(idx.from_mask(mask), ['B', 'D'])
+
+    def test_take_nested_key(self):
+        """scraped 형식 dict에서 ID 순 배열 추출 (없으면 default)"""
+        from ticker_index import TickerIndex
+        idx = TickerIndex(['A', 'B', 'C'])
+        arr = idx.take({'A': {'market_cap': 5.0}, 'C': {}}, 'market_cap', default=0.0)
+        self.assertEqual(arr.tolist(), [5.0, 0.0, 0.0])
+
+    def test_corr_matrix_matches_corr_value(self):
+        """get_corr_matrix는 쌍별 get_corr_value와 동일 (월간 우선·일간 fallback·NaN→0)"""
+        from data_loader import get_corr_matrix, get_corr_value
+        rng = np.random.default_rng(0)
+        daily_t = ['A', 'B', 'C', 'D', 'E']
+        d = rng.uniform(-1, 1, (5, 5))
+        df_d = pd.DataFrame((d + d.T) / 2, index=daily_t, columns=daily_t)
+        monthly_t = ['A', 'B', 'C']
+        m = rng.uniform(-1, 1, (3, 3))
+        df_m = pd.DataFrame((m + m.T) / 2, index=monthly_t, columns=monthly_t)
+        df_m.loc['A', 'C'] = df_m.loc['C', 'A'] = np.nan
+        refs, cols = ['A', 'D', 'Z'], ['C', 'E', 'B', 'Z']
+        got = get_corr_matrix(refs, cols, df_m, df_d)
+        for i, r in enumerate(refs):
+            for j, c in enumerate(cols):
+                with self.subTest(ref=r, ticker=c):
+                    self.assertAlmostEqual(got[i, j], get_corr_value(r, c, df_m, df_d))
+
+    def test_legacy_masks_follow_rules(self):
+        """assess_all_legacy 마스크 판정: 수동 > 짧은 연혁 > 저AUM, 앵커 면제"""
+        from legacy import assess_all_legacy, assess_sector_legacy
+        from ticker_index import TickerIndex
+        manual = next(iter(MANUAL_LEGACY_OVERRIDES))
+        scraped = {
+            manual: {'market_cap': 1e6, 'inception_date': '2024-01-01'},
+            'XNEW': {'market_cap': 5e9, 'inception_date': '2024-01-01'},
+            'XSMALL': {'market_cap': 5e7, 'inception_date': '2010-01-01'},
+            'XBIG': {'market_cap': 5e9, 'inception_date': '2010-01-01'},
+            'GLD': {'market_cap': 1e6, 'inception_date': '2024-01-01'},
+        }
+        members = {'S18': set(scraped)}
+        empty = pd.DataFrame()
+        res = assess_all_legacy(members, {}, empty, empty, scraped, {}, empty,
+                                ticker_index=TickerIndex(list(scraped) + ['SPY']))
+        self.assertEqual(res[manual]['reasons'], ['MANUAL'])
+        self.assertEqual(res['XNEW']['reasons'], ['SHORT_HISTORY'])
+        self.assertEqual(res['XSMALL']['reasons'], ['LOW_AUM'])
+        self.assertFalse(res['XBIG']['is_legacy'])
+        self.assertFalse(res['GLD']['is_legacy'])
+        self.assertNotIn('SPY', res)
+        self.assertEqual(assess_sector_legacy(set(scraped), scraped), res)
+        with self.assertRaises(ValueError):
+            assess_all_legacy({'S18': {'XBIG', 'NOPE'}}, {}, empty, empty, scraped, {}, empty,
+                              ticker_index=TickerIndex(scraped))
+
+    def test_classify_rejects_unknown_tickers(self):
+        """공용 인덱스에 없는 티커는 조용히 빠지지 않고 ValueError"""
+        from classify import classify_all
+        from ticker_index import TickerIndex
+        empty = pd.DataFrame()
+        with self.assertRaises(ValueError):
+            classify_all({'SPY', 'NOPE'}, {}, empty, empty, ticker_index=TickerIndex(['SPY']))
+        self.assertEqual(set(classify_all({'SPY'}, {}, empty, empty, ticker_index=TickerIndex(['SPY', 'QQQ']))),
+                         {'SPY'})
+
+
+# ─────────────────────────────────────────────────────────
+# 7. pipeline.py — DAG 스테이지 캐시
+# ─────────────────────────────────────────────────────────
+
+def _pl_frame():
+    rng = np.random.default_rng(0)
+    return {'df': pd.DataFrame(rng.normal(size=(2000, 100)))}  # 1.6MB → 메모리맵 공유 대상
+
+
+def _pl_col_sum(frame):
+    return frame['df'].sum()
+
+
+def _pl_row_max(frame):
+    return frame['df'].max(axis=1)
+
+
+class TestPipeline(unittest.TestCase):
+    """콘텐츠 해시 캐시: 입력이 같으면 hit, 입력 파일·--from·--force 시 재실행"""
+
+    def setUp(self):
+        import tempfile
+        self.tmp = tempfile.mkdtemp()
+        self.src = os.path.join(self.tmp, 'input.txt')
+        with open(self.src, 'w') as f:
+            f.write('1')
+        self.calls = []
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _pipeline(self):
+        from pipeline import Pipeline, Stage
+        calls = self.calls
+
+        def read():
+            calls.append('read')
+            with open(self.src) as f:
+                return int(f.read())
+
+        def double(read):
+            calls.append('double')
+            return read * 2
+
+        def add(read, double):
+            calls.append('add')
+            return read + double
+
+        return Pipeline([
+            Stage('read', read, files=(self.src,)),
+            Stage('double', double, deps=('read',)),
+            Stage('add', add, deps=('read', 'double')),
+        ], cache_dir=os.path.join(self.tmp, 'cache'))
+
+    def _statuses(self, p):
+        return {r.name: r.status for r in p.results}
+
+    def test_second_run_hits(self):
+        self.assertEqual(self._pipeline().run()['add'], 3)
+        self.calls.clear()
+        p = self._pipeline()
+        p.run()
+        self.assertEqual(self.calls, [])
+        self.assertEqual(set(self._statuses(p).values()), {'hit'})
+
+    def test_cached_returns_last_artifact(self):
+        from pipeline import Pipeline
+        cache_dir = os.path.join(self.tmp, 'cache')
+        self.assertIsNone(Pipeline([], cache_dir=cache_dir).cached('double'))
+        self._pipeline().run()
+        self.assertEqual(Pipeline([], cache_dir=cache_dir).cached('double'), 2)
+
+    def test_input_change_invalidates(self):
+        self._pipeline().run()
+        with open(self.src, 'w') as f:
+            f.write('5')
+        self.assertEqual(self._pipeline().run()['add'], 15)
+
+    def test_from_forces_downstream_only(self):
+        self._pipeline().run()
+        p = self._pipeline()
+        p.run(start='double')
+        self.assertEqual(self._statuses(p), {'read': 'hit', 'double': 'forced', 'add': 'forced'})
+
+    def test_only_skips_unrelated(self):
+        p = self._pipeline()
+        p.run(only=['double'])
+        self.assertEqual(self._statuses(p)['add'], 'skip')
+
+    def test_parallel_matches_serial(self):
+        """jobs ≥ 2: 워커 실행 + 큰 DataFrame 메모리맵 공유 결과가 순차 실행과 동일"""
+        from pipeline import Pipeline, Stage
+        stages = [
+            Stage('frame', _pl_frame),
+            Stage('col_sum', _pl_col_sum, deps=('frame',), parallel=True),
+            Stage('row_max', _pl_row_max, deps=('frame',), parallel=True),
+        ]
+        serial = Pipeline(stages, cache_dir=os.path.join(self.tmp, 's')).run()
+        par = Pipeline(stages, cache_dir=os.path.join(self.tmp, 'p')).run(jobs=2)
+        for name in ('col_sum', 'row_max'):
+            with self.subTest(stage=name):
+                pd.testing.assert_series_equal(serial[name], par[name])
+        self.assertFalse(os.listdir(os.path.join(self.tmp, 'p', 'shm')))
+
+    def test_fingerprint_noop(self):
+        """입력·출력이 직전 전체 실행 그대로면 unchanged, 입력 내용이나 출력이 바뀌면 아님"""
+        from pipeline import Pipeline, Stage
+        out = os.path.join(self.tmp, 'out.txt')
+
+        def write(read):
+            with open(out, 'w') as f:
+                f.write(str(read))
+
+        def build():
+            with open(self.src) as f:
+                value = int(f.read())
+            return Pipeline([
+                Stage('read', lambda: value, files=(self.src,)),
+                Stage('write', write, deps=('read',), outputs=(out,)),
+            ], cache_dir=os.path.join(self.tmp, 'cache'))
+
+        p = build()
+        fp = p.fingerprint()
+        self.assertFalse(p.unchanged(fp))
+        p.run()
+        p.save_fingerprint(fp)
+        self.assertTrue(build().unchanged(build().fingerprint()))
+
+        with open(out, 'w') as f:
+            f.write('tampered')
+        self.assertFalse(build().unchanged(fp))
+        p.run()
+        self.assertTrue(build().unchanged(fp))
+
+        with open(self.src, 'w') as f:
+            f.write('2')
+        self.assertFalse(build().unchanged(build().fingerprint()))
+
+    def test_fingerprint_ignores_uncommitted_outputs(self):
+        """배포 때 생성되는(커밋 안 되는) 출력은 새 체크아웃에 없어도 무변경 판정을 막지 않음"""
+        import shutil
+        from pipeline import Pipeline, Stage
+        out = os.path.join(self.tmp, 'out.txt')
+        deploy_dir = os.path.join(self.tmp, 'assets')
+
+        def write(read):
+            with open(out, 'w') as f:
+                f.write(str(read))
+
+        def bundle(write):
+            os.makedirs(deploy_dir, exist_ok=True)
+            shutil.copy(out, os.path.join(deploy_dir, 'out.abc.txt'))
+
+        def build():
+            return Pipeline([
+                Stage('read', lambda: 1, files=(self.src,)),
+                Stage('write', write, deps=('read',), outputs=(out,)),
+                Stage('bundle', bundle, deps=('write',), outputs=(deploy_dir,), committed=False),
+            ], cache_dir=os.path.join(self.tmp, 'cache'))
+
+        p = build()
+        p.run()
+        p.save_fingerprint(p.fingerprint())
+        self.assertEqual(build().committed_outputs, [out])
+        shutil.rmtree(deploy_dir)                           # 새 CI 체크아웃 — gitignore 된 디렉토리 없음
+        self.assertTrue(build().unchanged(build().fingerprint()))
+        os.remove(out)
+        self.assertFalse(build().unchanged(build().fingerprint()))
+
+    def test_side_effect_dep_outputs_in_key(self):
+        """None 을 반환하고 파일만 쓰는 상위 스테이지: 출력 내용이 바뀌면 그 파일을 읽는 하위도 재실행"""
+        from pipeline import Pipeline, Stage
+        out = os.path.join(self.tmp, 'out.txt')
+
+        def write():
+            with open(self.src) as f, open(out, 'w') as g:
+                g.write(f.read())
+
+        def consume(write):
+            with open(out) as f:
+                return f.read()
+
+        def build():
+            return Pipeline([
+                Stage('write', write, files=(self.src,), outputs=(out,)),
+                Stage('consume', consume, deps=('write',)),
+            ], cache_dir=os.path.join(self.tmp, 'cache'))
+
+        self.assertEqual(build().run()['consume'], '1')
+        with open(self.src, 'w') as f:
+            f.write('2')
+        p = build()
+        self.assertEqual(p.run()['consume'], '2')
+        self.assertEqual(self._statuses(p), {'write': 'miss', 'consume': 'miss'})
+        p = build()
+        p.run()
+        self.assertEqual(set(self._statuses(p).values()), {'hit'})
+
+    def test_backtest_presets_reads_backtest_outputs(self):
+        """compute_all: backtest_data · bt-monthly 는 파일만 쓰므로 presets 가 그 파일을 입력으로 선언 → 바뀌면 재계산"""
+        from unittest import mock
+        from pipeline import Pipeline
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+        import compute_all
+        data_path = os.path.join(self.tmp, 'backtest_data.json')
+        monthly_dir = os.path.join(self.tmp, 'bt-monthly')
+        os.makedirs(monthly_dir)
+        calls = self.calls
+
+        def load():
+            with open(self.src) as f:
+                return f.read()
+
+        def backtest_data(resample):
+            with open(data_path, 'w') as f:
+                f.write(resample)
+
+        def backtest_monthly(load, resample):
+            with open(os.path.join(monthly_dir, 'chunk-0.bin'), 'w') as f:
+                f.write('m')
+
+        def backtest_presets(backtest_data, backtest_monthly):
+            calls.append('presets')
+            with open(data_path) as f:
+                return f.read()
+
+        def run():
+            p = Pipeline(compute_all.build_pipeline().stages, cache_dir=os.path.join(self.tmp, 'cache'))
+            return p, p.run(only=['backtest_presets'])
+
+        with mock.patch.multiple(compute_all, PRICES_PARQUET=self.src, META_PARQUET=self.src,
+                                 BACKTEST_OUT_PATH=data_path, BT_MONTHLY_DIR=monthly_dir,
+                                 BT_PRESETS_PATH=os.path.join(self.tmp, 'backtest_presets.json'),
+                                 stage_load=load, stage_resample=lambda load: load,
+                                 stage_backtest_data=backtest_data, stage_backtest_monthly=backtest_monthly,
+                                 stage_backtest_presets=backtest_presets):
+            p, values = run()
+            self.assertIn(data_path, p._by_name['backtest_presets'].files)
+            self.assertIn(monthly_dir, p._by_name['backtest_presets'].files)
+            self.assertEqual(values['backtest_presets'], '1')
+            p, _ = run()
+            self.assertEqual(self._statuses(p)['backtest_presets'], 'hit')
+            with open(self.src, 'w') as f:
+                f.write('2')
+            p, values = run()
+            self.assertEqual(self._statuses(p)['backtest_data'], 'miss')
+            self.assertEqual(self._statuses(p)['backtest_presets'], 'miss')
+            self.assertEqual(values['backtest_presets'], '2')
+        self.assertEqual(self.calls, ['presets', 'presets'])
+
+    def test_deps_must_be_declared_first(self):
+        from pipeline import Pipeline, Stage
+        with self.assertRaises(ValueError):
+            Pipeline([Stage('b', lambda a: a, deps=('a',)), Stage('a', lambda: 1)])
+
+
+# ─────────────────────────────────────────────────────────
+# 8. instrument.py — 스테이지 계측 · 실행 통계
+# ─────────────────────────────────────────────────────────
+
+class TestInstrument(unittest.TestCase):
+    """스테이지별 시간·메모리·출력 바이트 기록, 히스토리 롤링, --profile 덤프"""
+
+    def setUp(self):
+        import tempfile
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _run(self, **kwargs):
+        from pipeline import Pipeline, Stage
+        out = os.path.join(self.tmp, 'out.bin')
+
+        def write():
+            with open(out, 'wb') as f:
+                f.write(b'x' * 1000)
+
+        p = Pipeline([
+            Stage('make', lambda: np.ones(200_000)),
+            Stage('write', write, outputs=(out,)),
+        ], cache_dir=os.path.join(self.tmp, 'cache'))
+        p.run(**kwargs)
+        return p
+
+    def test_stage_usage_recorded(self):
+        p = self._run(profile_dir=os.path.join(self.tmp, 'prof'))
+        res = {r.name: r for r in p.results}
+        self.assertEqual(res['write'].output_bytes, 1000)
+        self.assertGreaterEqual(res['make'].cpu, 0.0)
+        self.assertTrue(os.path.exists(os.path.join(self.tmp, 'prof', 'make.prof')))
+        self.assertEqual(self._run().results[1].output_bytes, 1000)   # hit도 출력 크기 기록
+
+    def test_run_stats_history_rolls(self):
+        import json
+        from instrument import Usage, load_history, write_run_stats
+        path = os.path.join(self.tmp, 'stats.json')
+        hist = os.path.join(self.tmp, 'hist.jsonl')
+        p = self._run(force=True)
+        for _ in range(4):
+            write_run_stats(p.results, Usage(wall=1.0), {'jobs': 1}, path=path, history_path=hist, keep=3)
+        self.assertEqual(len(load_history(hist)), 3)
+        with open(path) as f:
+            stats = json.load(f)
+        self.assertEqual([s['name'] for s in stats['stages']], ['make', 'write'])
+        self.assertIsNotNone(stats['stages'][0]['median_wall'])
+        self.assertEqual(stats['total']['wall'], 1.0)
+
+    def test_run_stats_outside_output(self):
+        """실행 통계는 배포 디렉터리(output/) 밖 .cache/ 에 기록"""
+        from config import CACHE_DIR, OUTPUT_DIR
+        from instrument import RUN_STATS_PATH, RUN_HISTORY_PATH
+        for path in (RUN_STATS_PATH, RUN_HISTORY_PATH):
+            self.assertTrue(path.startswith(CACHE_DIR + os.sep))
+            self.assertFalse(path.startswith(OUTPUT_DIR + os.sep))
+
+
+# ─────────────────────────────────────────────────────────
+# 9. synthetic.py · benchmarks — 합성 유니버스 · 회귀 검사
+# ─────────────────────────────────────────────────────────
+
+class TestSyntheticUniverse(unittest.TestCase):
+    """결정적 생성, 앵커 포함, 상장일 분산, 벤치마크 회귀 판정"""
+
+    def test_deterministic(self):
+        from synthetic import make_universe
+        a = make_universe(120, 300, seed=3)
+        b = make_universe(120, 300, seed=3)
+        pd.testing.assert_frame_equal(a.df_price, b.df_price)
+        self.assertEqual(a.scraped, b.scraped)
+        self.assertFalse(a.df_price.equals(make_universe(120, 300, seed=4).df_price))
+
+    def test_shape_and_anchors(self):
+        from synthetic import make_universe, anchor_tickers
+        u = make_universe(150, 400, seed=1)
+        self.assertEqual(u.df_price.shape, (400, 151))            # + ^GSPC
+        self.assertTrue(set(anchor_tickers()) <= set(u.df_price.columns))
+        first = u.df_price.notna().idxmax()
+        self.assertGreater((first > u.df_price.index[0]).sum(), 0)   # ragged inception
+        self.assertEqual(set(u.scraped), set(u.df_price.columns) - {'^GSPC'})
+        self.assertEqual(sorted(r['rank'] for r in u.scraped.values()), list(range(1, 151)))
+
+    def test_regression_check(self):
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+        from bench_pipeline import check_regressions
+        base = {'params': {}, 'machine': {}, 'sizes': {'1000': {'a': 1.0, 'b': 1.0, 'c': 0.01, 'd': 'skipped'}}}
+        now = {'params': {}, 'machine': {}, 'sizes': {'1000': {'a': 1.2, 'b': 2.0, 'c': 0.03, 'd': 'skipped'}}}
+        import contextlib
+        import io
+        with contextlib.redirect_stdout(io.StringIO()):
+            bad = check_regressions(now, base, tolerance=0.3, min_delta=0.05)
+        self.assertEqual([name for _, name, _, _ in bad], ['b'])
+
+
+# ─────────────────────────────────────────────────────────
+# 10. --daily-fast — 가격 민감 지표 벡터화 · 전체 실행 전환 조건
+# ─────────────────────────────────────────────────────────
+
+class TestDailyFast(unittest.TestCase):
+    """compute_price_metrics 가 스칼라 함수와 일치, full_run_reason 전환 조건"""
+
+    def test_price_metrics_match_scalar(self):
+        from metrics import compute_price_metrics, price_metric_records, compute_200dma_divergence
+        rng = np.random.default_rng(5)
+        df = pd.DataFrame(100 * np.exp(rng.normal(0, 0.01, (400, 4)).cumsum(axis=0)),
+                          columns=['A', 'B', 'C', 'D'])
+        df.iloc[:390, 1] = np.nan                  # 10개 — rsi·range 없음
+        df.iloc[:300, 2] = np.nan                  # 100개 — z_score 등 0.0
+        df.iloc[[50, 120, 121], 3] = np.nan        # 중간 결측
+        rec = price_metric_records(compute_price_metrics(df))
+        for t in df.columns:
+            ts = df[t].dropna()
+            long = len(ts) >= 200
+            self.assertAlmostEqual(rec[t]['z_score'], round(compute_z_score(ts), 2) if long else 0.0, places=6)
+            self.assertAlmostEqual(rec[t]['ma200_pct'], round(compute_200dma_divergence(ts), 1) if long else 0.0, places=6)
+            self.assertAlmostEqual(rec[t]['mdd_52w'], round(compute_52w_mdd(ts), 1) if long else 0.0, places=6)
+            self.assertEqual(rec[t]['rsi'], compute_rsi(ts) if len(ts) >= 15 else None)
+            self.assertEqual(rec[t]['range_52w'], compute_52w_range_pct(ts) if len(ts) >= 15 else None)
+
+    def test_full_run_reason(self):
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+        from compute_all import full_run_reason
+        idx = pd.to_datetime(['2026-10-15', '2026-10-16'])
+        load = {'df_price': pd.DataFrame({'A': [1.0, 2.0], '^GSPC': [1.0, 1.0]}, index=idx),
+                'scraped': {'A': {'fullname': 'Alpha ETF', 'inception_date': '2010-01-04'}}}
+        prev = {'as_of': '2026-10-15',
+                'allData': {'S01': [{'ticker': 'A', 'name': 'Alpha ETF', 'inception': '2010-01-04'}]}}
+        saved = {'rules': {'config.py': 'h'}}
+        self.assertIsNone(full_run_reason(prev, {'config.py': 'h'}, saved, load))
+        self.assertIsNotNone(full_run_reason(None, {'config.py': 'h'}, saved, load))
+        self.assertIsNotNone(full_run_reason(prev, {'config.py': 'x'}, saved, load))
+        self.assertIsNotNone(full_run_reason({**prev, 'as_of': '2026-09-30'}, {'config.py': 'h'}, saved, load))
+        load['scraped']['A']['fullname'] = 'Alpha ETF (renamed)'
+        self.assertIsNotNone(full_run_reason(prev, {'config.py': 'h'}, saved, load))
+
+
+# ─────────────────────────────────────────────────────────
+# 11. build_etf_pages — 변경분만 기록 · 매니페스트
+# ─────────────────────────────────────────────────────────
+
+class TestEtfPagesManifest(unittest.TestCase):
+    """해시가 같은 파일은 다시 쓰지 않고, 변경·삭제 경로를 매니페스트에 기록"""
+
+    def setUp(self):
+        import tempfile
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _build(self, all_data, df_price=None, as_of='2026-10-16'):
+        import contextlib
+        import io
+        import json
+        from unittest import mock
+        import build_etf_pages as bep
+        with mock.patch.object(bep, 'ETF_DIR', self.tmp), \
+             mock.patch.object(bep, 'HOLDINGS_PATH', os.path.join(self.tmp, 'none.json')), \
+             contextlib.redirect_stdout(io.StringIO()):
+            bep.build_etf_pages(all_data, as_of, df_price)
+        with open(os.path.join(self.tmp, bep.MANIFEST_NAME)) as f:
+            return json.load(f)
+
+    def test_only_changed_files_written(self):
+        data = {'S01': [{'ticker': 'AAA', 'rsi': 50.0}, {'ticker': 'BBB', 'rsi': 40.0}]}
+        import json
+        m = self._build(data)
+        self.assertEqual(m['changed'], ['/etf-data/AAA.json', '/etf-data/BBB.json', '/etf-data/_index.json'])
+        mtime = os.stat(os.path.join(self.tmp, 'AAA.json')).st_mtime_ns
+
+        data['S01'][1]['rsi'] = 41.0
+        m = self._build(data)
+        self.assertEqual(m['changed'], ['/etf-data/BBB.json'])
+        self.assertEqual(os.stat(os.path.join(self.tmp, 'AAA.json')).st_mtime_ns, mtime)
+
+        # 기준일만 바뀐 날: 티커 파일은 그대로, _index.json 만 변경
+        m = self._build(data, as_of='2026-10-19')
+        self.assertEqual(m['changed'], ['/etf-data/_index.json'])
+        with open(os.path.join(self.tmp, 'AAA.json')) as f:
+            self.assertNotIn('as_of', json.load(f))
+
+        # 같은 세대 재빌드 (새 체크아웃처럼 파일 없음): 파일은 다시 쓰되 매니페스트 변경 목록은 유지
+        os.remove(os.path.join(self.tmp, 'AAA.json'))
+        m = self._build(data, as_of='2026-10-19')
+        self.assertEqual(m['changed'], ['/etf-data/_index.json'])
+        self.assertTrue(os.path.exists(os.path.join(self.tmp, 'AAA.json')))
+
+        m = self._build({'S01': data['S01'][:1]}, as_of='2026-10-19')
+        self.assertEqual((m['changed'], m['removed']), ([], ['/etf-data/BBB.json']))
+        self.assertEqual(sorted(os.listdir(self.tmp)), ['AAA.json', '_index.json', '_manifest.json'])
+
+    def test_price_history_embedded(self):
+        """주간(일별 구간 이전) + 최근 1년 일별, 점 예산 이하 · 첫/끝 점 유지 — 가격이 안 바뀐 티커는 다시 안 씀"""
+        import json
+        import downsample as ds
+        dates = pd.bdate_range('2015-01-01', '2026-10-16')
+        rng = np.random.default_rng(5)
+        prices = pd.DataFrame(np.exp(np.cumsum(rng.normal(0, 0.01, (len(dates), 2)), axis=0)) * [450, 8],
+                              index=dates, columns=['AAA', 'BBB'])
+        prices.iloc[:2000, 1] = np.nan
+        data = {'S01': [{'ticker': 'AAA'}, {'ticker': 'BBB'}, {'ticker': 'CCC'}]}
+        self._build(data, prices)
+        with open(os.path.join(self.tmp, 'AAA.json')) as f:
+            hist = json.load(f)['history']
+        with open(os.path.join(self.tmp, 'CCC.json')) as f:
+            self.assertNotIn('history', json.load(f))
+        day = lambda t: (ds.EPOCH + pd.Timedelta(days=t)).strftime('%Y-%m-%d')
+        self.assertEqual(len(hist['w']['t']), ds.HISTORY_WEEKLY_POINTS)
+        self.assertEqual(len(hist['d']['t']), ds.HISTORY_DAILY_POINTS)
+        self.assertEqual((day(hist['w']['t'][0]), day(hist['d']['t'][-1])), ('2015-01-02', '2026-10-16'))
+        self.assertLess(hist['w']['t'][-1], hist['d']['t'][0])
+        self.assertEqual(hist['d']['c'][-1], round(prices['AAA'].iloc[-1], 2))
+        self.assertEqual(pd.Timestamp(day(hist['d']['t'][0])), dates[dates > '2025-10-16'][0])
+
+        # 이력만 바뀐 티커: 파일은 다시 쓰되 changed(배포 문서 기준)에는 안 들어감
+        mtime = os.stat(os.path.join(self.tmp, 'AAA.json')).st_mtime_ns
+        prices.iloc[-1, 1] *= 1.01
+        m = self._build(data, prices, as_of='2026-10-19')
+        self.assertEqual(m['changed'], ['/etf-data/_index.json'])
+        self.assertEqual(os.stat(os.path.join(self.tmp, 'AAA.json')).st_mtime_ns, mtime)
+        with open(os.path.join(self.tmp, 'BBB.json')) as f:
+            self.assertEqual(json.load(f)['history']['d']['c'][-1], round(prices['BBB'].iloc[-1], 3))
+
+        # 배포 빌드(CLI, 가격 없음): 같은 세대라 매니페스트 그대로, CI 가 커밋한 파일의 history 유지 (다시 쓰지 않음)
+        with open(os.path.join(self.tmp, 'AAA.json'), 'rb') as f:
+            committed = f.read()
+        m2 = self._build(data, as_of='2026-10-19')
+        self.assertEqual(m2, m)
+        self.assertEqual(os.stat(os.path.join(self.tmp, 'AAA.json')).st_mtime_ns, mtime)
+
+        # 가격 없이 문서가 바뀐 티커 (월간 holdings 등): 디스크의 history 를 옮겨 붙여 다시 씀
+        data['S01'][0]['rsi'] = 55.0
+        m3 = self._build(data, as_of='2026-10-19')
+        self.assertEqual(m3['changed'], ['/etf-data/AAA.json'])
+        self.assertEqual(m3['history'], m['history'])
+        with open(os.path.join(self.tmp, 'AAA.json')) as f:
+            doc = json.load(f)
+        self.assertEqual((doc['etf']['rsi'], doc['history']), (55.0, json.loads(committed)['history']))
+
+        # 새 체크아웃에 파일이 없으면 history 없이 쓰고 매니페스트에서도 뺌
+        os.remove(os.path.join(self.tmp, 'BBB.json'))
+        m4 = self._build(data, as_of='2026-10-19')
+        self.assertEqual(sorted(m4['history']), ['AAA'])
+        with open(os.path.join(self.tmp, 'BBB.json')) as f:
+            self.assertNotIn('history', json.load(f))
+
+    def test_cli_stdlib_only(self):
+        """Vercel buildCommand — import 만으로 numpy · pandas 를 불러오지 않음"""
+        import subprocess
+        root = os.path.join(os.path.dirname(__file__), '..')
+        code = "import sys, build_etf_pages; print(sorted({'numpy', 'pandas'} & set(sys.modules)))"
+        out = subprocess.run([sys.executable, '-c', code], cwd=root, capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip(), '[]')
+
+
+# ─────────────────────────────────────────────────────────
+# 12. etf_data 샤드 — 섹터별 샤드 + 매니페스트
+# ─────────────────────────────────────────────────────────
+
+class TestEtfShards(unittest.TestCase):
+    """샤드 해시·크기가 매니페스트와 일치하고, 샤드만으로 allData 재구성 가능"""
+
+    def test_shards_roundtrip(self):
+        import contextlib
+        import io
+        import json
+        import tempfile
+        from unittest import mock
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+        import compute_all
+        from serialize import content_hash
+        all_data = {'S01': [{'ticker': 'AAA', 'rank': 1}], 'S02': [{'ticker': 'BBB', 'rank': 2}]}
+        with tempfile.TemporaryDirectory() as tmp, \
+             mock.patch.object(compute_all, 'ETF_DATA_PATH', os.path.join(tmp, 'etf_data.json')), \
+             mock.patch.object(compute_all, 'ETF_COLUMNAR_PATH', os.path.join(tmp, 'etf_data_columnar.json')), \
+             mock.patch.object(compute_all, 'ETF_SHARD_DIR', os.path.join(tmp, 'etf-shards')), \
+             mock.patch.object(compute_all, 'ETF_DATA_MONOLITH', False), \
+             contextlib.redirect_stdout(io.StringIO()):
+            compute_all.write_etf_data('2026-10-16', {'S01': {}}, all_data)
+            self.assertFalse(os.path.exists(os.path.join(tmp, 'etf_data.json')))
+            with open(os.path.join(tmp, 'etf-shards', '_manifest.json')) as f:
+                manifest = json.load(f)
+            with open(os.path.join(tmp, 'etf-shards', 'S02.json'), 'rb') as f:
+                self.assertEqual(content_hash(f.read()), manifest['shards']['S02']['hash'])
+            self.assertEqual(set(manifest), {'as_of', 'sectorMeta', 'superSectorDefs', 'shards'})
+            self.assertEqual(compute_all.load_previous_etf_data()['allData'], all_data)
+
+
+# ─────────────────────────────────────────────────────────
+# 13. columnar.py — allData 열 지향 인코딩
+# ─────────────────────────────────────────────────────────
+
+class TestColumnar(unittest.TestCase):
+    """왕복 동일, 반복 문자열은 사전 코드, 불리언은 0/1"""
+
+    DATA = {
+        'S01': [{'ticker': 'AAA', 'is_legacy': True, 'legacy_reasons': ['LOW_AUM'], 'rsi': None},
+                {'ticker': 'BBB', 'is_legacy': False, 'legacy_reasons': [], 'rsi': 51.2}],
+        'S02': [{'ticker': 'CCC', 'is_legacy': True, 'legacy_reasons': ['MANUAL', 'LOW_AUM'], 'rsi': 40.0}],
+    }
+
+    def test_roundtrip(self):
+        from columnar import encode_all_data, decode_all_data
+        doc = encode_all_data(self.DATA)
+        self.assertEqual(decode_all_data(doc), self.DATA)
+        self.assertEqual(doc['dict'], ['LOW_AUM', 'MANUAL'])
+        self.assertEqual(doc['sectors']['S02']['cols']['legacy_reasons'], [[1, 0]])
+        self.assertEqual(doc['sectors']['S01']['cols']['is_legacy'], [1, 0])
+
+    def test_ragged_rows_rejected(self):
+        from columnar import encode_all_data
+        with self.assertRaises(ValueError):
+            encode_all_data({'S01': [{'ticker': 'A', 'rsi': 1.0}, {'ticker': 'B'}]})
+
+
+# ─────────────────────────────────────────────────────────
+# 14. build_assets — 사전 압축 · 해시 파일명 · 참조 치환
+# ─────────────────────────────────────────────────────────
+
+class TestBuildAssets(unittest.TestCase):
+    """참조 치환은 반복 실행해도 같고, 비슷한 이름은 건드리지 않음"""
+
+    ASSETS = {'/etf_data.json': '/assets/etf_data.0123456789.json',
+              '/graph_data.json': '/assets/graph_data.abcdefabcd.json'}
+
+    def test_rewrite_refs_idempotent(self):
+        from build_assets import rewrite_refs
+        src = ("fetch('/etf_data.json'); fetch(\"/etf_data_columnar.json\"); "
+               "fetch('graph_data.json'); fetch('/assets/etf_data.ffffffffff.json')")
+        once = rewrite_refs(src, self.ASSETS)
+        self.assertEqual(once, "fetch('/assets/etf_data.0123456789.json'); fetch(\"/etf_data_columnar.json\"); "
+                               "fetch('/assets/graph_data.abcdefabcd.json'); fetch('/assets/etf_data.0123456789.json')")
+        self.assertEqual(rewrite_refs(once, self.ASSETS), once)
+
+    def test_compress_and_hash(self):
+        import gzip
+        import tempfile
+        from pathlib import Path
+        from build_assets import compress, hashed_name
+        self.assertNotEqual(hashed_name('a.json', b'1'), hashed_name('a.json', b'2'))
+        self.assertRegex(hashed_name('etf_data.json', b'x'), r'^etf_data\.[0-9a-f]{10}\.json$')
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'a.json'
+            path.write_bytes(b'{"k":[1,2,3]}' * 100)
+            sizes = compress(path)
+            self.assertEqual(gzip.decompress((Path(tmp) / 'a.json.gz').read_bytes()), path.read_bytes())
+            self.assertLess(sizes['.gz'], sizes['raw'])
+
+    def test_keeps_previous_generation(self):
+        """원본 페이지는 그대로, 직전 세대 해시 사본은 한 세대 더 유지"""
+        import tempfile
+        from pathlib import Path
+        from unittest import mock
+        import build_assets as ba
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp)
+            assets_dir = out / 'assets'
+            page = out / 'page.html'
+            page.write_text("fetch('/a.json')", encoding='utf-8')
+            with mock.patch.multiple(ba, OUTPUT_DIR=out, ASSETS_DIR=assets_dir, ARTIFACTS=('a.json',),
+                                     MANIFEST_PATH=assets_dir / 'manifest.json',
+                                     PREVIOUS_PATH=assets_dir / 'manifest.prev.json',
+                                     VERCEL_JSON=out / 'vercel.json'):
+                gens = []
+                for body in (b'{"v":1}', b'{"v":2}', b'{"v":2}', b'{"v":3}'):
+                    (out / 'a.json').write_bytes(body)
+                    gens.append(ba.build_assets()['/a.json'].rsplit('/', 1)[1])
+                self.assertEqual(page.read_text(encoding='utf-8'), "fetch('/a.json')")
+                self.assertFalse((assets_dir / gens[0]).exists())
+                self.assertTrue((assets_dir / gens[1]).exists())
+                self.assertTrue((assets_dir / (gens[1] + '.gz')).exists())
+                self.assertTrue((assets_dir / gens[3]).exists())
+
+                ba.build_assets(rewrite=True)
+                self.assertEqual(page.read_text(encoding='utf-8'), f"fetch('/assets/{gens[3]}')")
+
+
+# ─────────────────────────────────────────────────────────
+# 15. serialize — 공용 JSON 직렬화 (orjson 선택 · 표준 json 대체)
+# ─────────────────────────────────────────────────────────
+
+class TestSerialize(unittest.TestCase):
+    """두 백엔드 모두 표준 json 과 같은 값으로 읽히는 JSON 을 만든다"""
+
+    DOC = {'a': np.float64(1.5), 'b': np.array([1.0, np.nan, 3.0]), 'c': np.int64(7), 'd': '한글'}
+    EXPECTED = {'a': 1.5, 'b': [1.0, None, 3.0], 'c': 7, 'd': '한글'}
+
+    def backends(self):
+        import serialize
+        yield serialize.orjson
+        if serialize.orjson is not None:
+            yield None
+
+    def test_dumps_numpy_nan(self):
+        import json
+        from unittest import mock
+        import serialize
+        for backend in self.backends():
+            with self.subTest(backend=backend and 'orjson'), mock.patch.object(serialize, 'orjson', backend):
+                self.assertEqual(json.loads(serialize.dumps(self.DOC)), self.EXPECTED)
+                self.assertTrue(serialize.dumps(self.DOC, indent=True).startswith(b'{\n  '))
+
+    def test_backends_byte_identical(self):
+        """표준 json 대체 경로도 orjson 과 같은 바이트 (NaN/Inf → null, 지수 표기)"""
+        import math
+        import random
+        from unittest import mock
+        import serialize
+        if serialize.orjson is None:
+            self.skipTest('orjson 없음')
+        rng = random.Random(0)
+        floats = [rng.uniform(-1, 1) * 10 ** rng.randint(-12, 22) for _ in range(2000)]
+        floats += [0.0, -0.0, 1e-5, 2.5e-5, 1e-6, 1.5e-7, 1e15, 1e16, 5e-324, math.nan, math.inf, -math.inf]
+        doc = {**self.DOC, 'f': floats, 'nested': {'x': [math.nan, {'y': math.inf}]},
+               's': '1e-05 "q\\" 2e+16', 'n': np.float64('nan')}
+        for indent in (False, True):
+            with self.subTest(indent=indent):
+                fast = serialize.dumps(doc, indent=indent, sort_keys=True)
+                with mock.patch.object(serialize, 'orjson', None):
+                    self.assertEqual(serialize.dumps(doc, indent=indent, sort_keys=True), fast)
+
+    def test_round_list(self):
+        from serialize import round_list
+        self.assertEqual(round_list(np.array([0.123456, np.nan, -2.0000049]), 5), [0.12346, None, -2.0])
+
+    def test_stream_matches_dumps(self):
+        import json
+        import tempfile
+        from unittest import mock
+        import serialize
+        items = [('A', [0, [0.1, None]]), ('B', [3, [1.0]])]
+        for backend in self.backends():
+            with self.subTest(backend=backend and 'orjson'), mock.patch.object(serialize, 'orjson', backend), \
+                    tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, 'out.json')
+                stat = serialize.write_json_stream(path, {'as_of': 'x', 'dates': ['d']}, 'returns',
+                                                   iter(items), quiet=True)
+                with open(path, encoding='utf-8') as f:
+                    self.assertEqual(json.load(f), {'as_of': 'x', 'dates': ['d'], 'returns': dict(items)})
+                self.assertEqual(stat.bytes, os.path.getsize(path))
+
+    def test_write_json_atomic(self):
+        import tempfile
+        import serialize
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'sub', 'out.json')
+            serialize.write_json(path, {'k': 1}, quiet=True)
+            with self.assertRaises(TypeError):
+                serialize.write_json(path, {'k': object()}, quiet=True)
+            self.assertEqual(serialize.load(path), {'k': 1})
+            self.assertEqual(os.listdir(os.path.dirname(path)), ['out.json'])
+
+
+# ─────────────────────────────────────────────────────────
+# 16. corr_returns 바이너리 — float32 .bin + 티커 인덱스
+# ─────────────────────────────────────────────────────────
+
+class TestCorrBinary(unittest.TestCase):
+    """바이너리에서 읽은 값이 호환 JSON 과 같고, 티커 구간이 빈틈없이 이어짐"""
+
+    def test_binary_matches_json(self):
+        import json
+        import tempfile
+        from pathlib import Path
+        from unittest import mock
+        import build_corr_data
+        idx = pd.date_range('2020-01-01', periods=600, freq='B')
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0, 0.01, (600, 3)), axis=0)),
+                          index=idx, columns=['AAA', 'BBB', 'CCC'])
+        df.loc[:idx[200], 'BBB'] = np.nan                 # 늦게 상장
+        df.loc[idx[300]:idx[330], 'CCC'] = np.nan         # 중간 결측
+        df.loc[idx[500]:, 'AAA'] = np.nan                 # 상장 폐지
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp)
+            with mock.patch.object(build_corr_data, 'OUT_PATH', out / 'corr_returns.json'), \
+                 mock.patch.object(build_corr_data, 'BIN_PATH', out / 'corr_returns.bin'), \
+                 mock.patch.object(build_corr_data, 'INDEX_PATH', out / 'corr_returns_index.json'):
+                build_corr_data.build_corr_data(df)
+                ref = json.loads((out / 'corr_returns.json').read_text())
+                index = json.loads((out / 'corr_returns_index.json').read_text())
+                got = build_corr_data.read_binary(list(ref['returns']))
+            self.assertEqual(got, ref['returns'])
+            self.assertEqual(index['dates'], ref['dates'])
+            self.assertIn(None, got['CCC'][1])
+            entries = sorted(index['tickers'].values())
+            for (o1, _, n1), (o2, _, _) in zip(entries, entries[1:]):
+                self.assertEqual(o1 + 4 * n1, o2)
+            self.assertEqual(entries[-1][0] + 4 * entries[-1][2], (out / 'corr_returns.bin').stat().st_size)
+
+
+# ─────────────────────────────────────────────────────────
+# 17. backtest_data — [첫 연도, [r...]] 압축 포맷 (backtest-v2)
+# ─────────────────────────────────────────────────────────
+
+class TestBacktestData(unittest.TestCase):
+    """연도 키 반복 없는 포맷이 이전 {연도: 수익률} 과 같은 값을 담음"""
+
+    def test_compact_matches_yearly_pct_change(self):
+        import json
+        import tempfile
+        from pathlib import Path
+        from unittest import mock
+        import build_backtest_data
+        idx = pd.date_range('2010-12-31', periods=8, freq='YE')
+        yearly = pd.DataFrame({
+            'AAA': [100, 110, 99, 120, 130, 125, 140, 150],
+            'BBB': [np.nan, np.nan, 50, 55, np.nan, 60, 66, np.nan],   # 늦은 상장 · 중간 결측 · 폐지
+            'CCC': [np.nan] * 8,
+        }, index=idx, dtype=float)
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp)
+            with mock.patch.object(build_backtest_data, 'OUT_PATH', out / 'backtest_data.json'), \
+                 mock.patch.object(build_backtest_data, 'BIN_PATH', out / 'backtest_data.bin'), \
+                 mock.patch.object(build_backtest_data, 'INDEX_PATH', out / 'backtest_data_index.json'):
+                build_backtest_data.build_backtest_data(yearly=yearly, binary=True)
+            doc = json.loads((out / 'backtest_data.json').read_text())
+            index = json.loads((out / 'backtest_data_index.json').read_text())
+            flat = np.frombuffer((out / 'backtest_data.bin').read_bytes(), dtype='<f4')
+
+        self.assertEqual(doc['format'], 'backtest-v2')
+        self.assertEqual(doc['last_year'], 2017)
+        self.assertNotIn('CCC', doc['returns'])
+        expected = yearly.ffill().pct_change()                  # 이전 pct_change() 기본 'pad' — 결측 연도는 직전 종가
+        self.assertEqual(expected['BBB'].isna().sum(), 3)       # 상장 전 2개 + 첫 해
+        for ticker, (first_year, vals) in doc['returns'].items():
+            s = expected[ticker].dropna()
+            self.assertEqual(first_year, s.index[0].year)
+            got = {first_year + i: v for i, v in enumerate(vals) if v is not None}
+            self.assertEqual(got, {d.year: round(v, 6) for d, v in s.items()})
+        # 중간 결측 연도 0, 다음 해는 마지막 종가(55) 대비, 상장폐지 이후 0
+        self.assertEqual(doc['returns']['BBB'], [2013, [0.1, 0.0, 0.090909, 0.1, 0.0]])
+
+        offset, first_year, length = index['tickers']['BBB']
+        vals = flat[offset // 4:offset // 4 + length]
+        self.assertEqual(first_year, 2013)
+        np.testing.assert_allclose(vals, [0.1, 0.0, 0.090909, 0.1, 0.0], rtol=1e-6)
+
+
+# ─────────────────────────────────────────────────────────
+# 18. bt-monthly — 티커별 int16 월간 수익률 청크
+# ─────────────────────────────────────────────────────────
+
+class TestBacktestMonthly(unittest.TestCase):
+    """양자화 오차는 티커 스케일의 절반 이내, 진행 중인 달 제외, 바뀐 파일만 다시 씀"""
+
+    def make_prices(self):
+        idx = pd.bdate_range('2020-01-01', '2021-06-15')
+        rng = np.random.default_rng(1)
+        df = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0, 0.01, (len(idx), 3)), axis=0)),
+                          index=idx, columns=['AAA', 'BBB', 'CCC'])
+        df.loc[:'2020-05-10', 'BBB'] = np.nan
+        df.loc['2020-08-01':'2020-09-30', 'CCC'] = np.nan
+        return df
+
+    def test_roundtrip_and_incremental_write(self):
+        import contextlib
+        import io
+        import tempfile
+        from pathlib import Path
+        from unittest import mock
+        import build_backtest_monthly as btm
+        from packed import CHUNK_HEADER, QMAX, decode_chunk
+        df = self.make_prices()
+        monthly = df.resample('ME').last()
+        expected = monthly.pct_change(fill_method=None).iloc[:-1]   # 2021-06 은 진행 중
+        files, last_month = btm.encode(df, monthly)
+        self.assertEqual(last_month, '2021-05')
+        for ticker, data in files.items():
+            start, values = decode_chunk(data)
+            s = expected[ticker]
+            s = s.loc[s.first_valid_index():s.last_valid_index()]
+            self.assertEqual(start, btm.month_index(s.index[0]))
+            self.assertEqual(len(data), CHUNK_HEADER.size + 2 * len(s))
+            scale = np.nanmax(np.abs(s.to_numpy())) / QMAX
+            np.testing.assert_allclose(values, s.to_numpy(), atol=scale * 0.51 + 1e-9)
+            np.testing.assert_array_equal(np.isnan(values), s.isna().to_numpy())
+
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.object(btm, 'OUT_DIR', Path(tmp)), \
+                contextlib.redirect_stdout(io.StringIO()):
+            btm.build_backtest_monthly(df, monthly)
+            manifest = btm.load_manifest(tmp)
+            self.assertEqual(len(manifest['changed']), 3)
+            btm.build_backtest_monthly(df, monthly)
+            self.assertEqual(btm.load_manifest(tmp)['changed'], [])
+            self.assertEqual(sorted(os.listdir(tmp)), ['AAA.bin', 'BBB.bin', 'CCC.bin', '_manifest.json'])
+
+
+# ─────────────────────────────────────────────────────────
+# 19. backtest.py — 벡터화 백테스트 엔진 (backtest-engine.js 와 같은 규칙)
+# ─────────────────────────────────────────────────────────
+
+NODE_SIMULATE = r"""
+const engine = require(process.argv[1]);
+const input = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const data = {
+  dataEndYear: input.dataEndYear,
+  annual: (t, y) => { const r = input.annual[t]; const v = r && r[1][y - r[0]]; return v == null ? 0 : v; },
+  firstYear: t => input.annual[t] ? input.annual[t][0] : null,
+  monthly: (t, m) => { const r = input.monthly[t]; const v = r && r[1][m - r[0]]; return v == null ? null : v; },
+};
+console.log(JSON.stringify(input.cases.map(c => engine.simulate(c, data))));
+"""
+
+
+class TestBacktestEngine(unittest.TestCase):
+    """배치 결과 = 1개씩 결과 = backtest-engine.js simulate (월간 결측 폴백·시작 연도 제약·DCA 포함)"""
+
+    def make_panel(self):
+        from backtest import ReturnPanel
+        rng = np.random.default_rng(3)
+
+        def series(n, scale):
+            return rng.normal(0.005 * scale, 0.04 * scale, n)
+        aaa_m = series(84, 1)
+        aaa_m[20:26] = np.nan                                    # 2019-09 ~ 2020-02 월간 결측 → 연간 근사
+        annual = {
+            'AAA': (2014, np.append(series(10, 12), np.nan)),    # 마지막 연도 결측 → 0
+            'BBB': (2018, series(6, 12)),                         # 늦게 상장 → 시작 연도 제약
+            'SPY': (2012, series(12, 12)),
+        }
+        monthly = {
+            'AAA': (2018 * 12, aaa_m),
+            'BBB': (2018 * 12 + 3, series(81, 1.5)),
+            'SPY': (2016 * 12, series(108, 1)),
+        }
+        return ReturnPanel(annual, monthly, data_end_year=2023)
+
+    def assert_close(self, got, want, path=''):
+        if isinstance(want, dict):
+            self.assertEqual(sorted(got), sorted(want), path)
+            for k in want:
+                self.assert_close(got[k], want[k], f'{path}.{k}')
+        elif isinstance(want, list):
+            self.assertEqual(len(got), len(want), path)
+            for i, (g, w) in enumerate(zip(got, want)):
+                self.assert_close(g, w, f'{path}[{i}]')
+        elif isinstance(want, float) or isinstance(got, float):
+            self.assertAlmostEqual(got, want, delta=1e-9 * max(1, abs(want)), msg=path)
+        else:
+            self.assertEqual(got, want, path)
+
+    @unittest.skipUnless(__import__('shutil').which('node'), 'node 없음')
+    def test_matches_js_engine(self):
+        import json
+        import subprocess
+        from backtest import run
+        panel = self.make_panel()
+        cases = [
+            ([('AAA', 0.6), ('SPY', 0.4)], 5, 'SPY', 'none', 0),
+            ([('AAA', 0.5), ('BBB', 0.5)], 10, 'SPY', 'monthly', 300),
+            ([('BBB', 0.3), ('AAA', 0.7)], 3, 'none', 'quarterly', 1000),
+            ([('SPY', 1.0)], 7, 'BBB', 'annually', 500),
+        ]
+        payload = {
+            'dataEndYear': panel.data_end_year,
+            'annual': {t: [s, [None if np.isnan(v) else v for v in vals]] for t, (s, vals) in panel.annual.items()},
+            'monthly': {t: [s, [None if np.isnan(v) else v for v in vals]] for t, (s, vals) in panel.monthly.items()},
+            'cases': [{'holdings': [{'ticker': t, 'weight': w} for t, w in h], 'period': p, 'initVal': 10000,
+                       'benchTicker': b, 'dcaFreq': f, 'dcaAmount': a} for h, p, b, f, a in cases],
+        }
+        engine = os.path.join(os.path.dirname(__file__), '..', 'output', 'backtest-engine.js')
+        proc = subprocess.run(['node', '-e', NODE_SIMULATE, engine], input=json.dumps(payload),
+                              capture_output=True, text=True, check=True)
+        for (holdings, period, bench, freq, amount), want in zip(cases, json.loads(proc.stdout)):
+            got = run(panel, holdings, period, 10000, None if bench == 'none' else bench, freq, amount)
+            self.assert_close(json.loads(json.dumps(got)), want)
+        self.assertEqual(want['constrainingTicker'], 'BBB')                # 벤치마크가 시작 연도 제약
+
+    def test_batch_matches_single(self):
+        from backtest import run, run_batch
+        panel = self.make_panel()
+        tickers = ['AAA', 'BBB', 'SPY']
+        W = np.random.default_rng(0).dirichlet(np.ones(3), size=12)
+        W[::3, 1] = 0                                            # BBB 미보유 → 시작 연도가 다른 그룹
+        W /= W.sum(axis=1, keepdims=True)
+        for rebalance in ('monthly', 'annually', 'none'):
+            batch = run_batch(panel, tickers, W, 10, dca_freq='monthly', dca_amount=100, rebalance=rebalance)
+            self.assertEqual(set(batch.start_year), {2014, 2018})
+            for k in range(len(W)):
+                single = run(panel, [(t, w) for t, w in zip(tickers, W[k]) if w], 10,
+                             dca_freq='monthly', dca_amount=100, rebalance=rebalance)
+                self.assertEqual(single['effectiveStartYear'], batch.start_year[k])
+                self.assertEqual(single['constrainingTicker'], None if W[k, 1] == 0 else 'BBB')
+                self.assertAlmostEqual(single['stats']['portVal'], batch.stats['portVal'][k], places=6)
+                self.assertAlmostEqual(single['stats']['sharpe'], batch.stats['sharpe'][k], places=9)
+
+    def test_constraining_ticker_tie_uses_input_order(self):
+        """첫 연도가 같은 티커끼리는 먼저 담은 티커가 constrainingTicker (열 순서와 무관, backtest-engine.js 와 같음)"""
+        from backtest import run, run_batch
+        from build_backtest_presets import preset_weights
+        panel = self.make_panel()
+        panel.annual['CCC'] = panel.annual['BBB']
+        panel.monthly['CCC'] = panel.monthly['BBB']
+        presets = {'cb': [('CCC', 50), ('BBB', 50)], 'bc': [('BBB', 50), ('CCC', 50)]}
+        tickers, W, order = preset_weights(presets)
+        self.assertEqual(tickers, ['BBB', 'CCC'])
+        batch = run_batch(panel, tickers, W, 10, bench='SPY', order=order)
+        for k, holdings in enumerate(presets.values()):
+            single = run(panel, [(t, w / 100) for t, w in holdings], 10, bench='SPY')
+            self.assertEqual(single['constrainingTicker'], holdings[0][0])
+            self.assertEqual(batch.to_js(k, 'SPY')['constrainingTicker'], holdings[0][0])
+        self.assertEqual(run_batch(panel, tickers, W, 10, bench='SPY').constraining, ['BBB', 'BBB'])
+
+    def test_single_holding_ignores_rebalance(self):
+        from backtest import run
+        panel = self.make_panel()
+        base = run(panel, [('SPY', 1.0)], 8, bench=None)
+        for rebalance in ('quarterly', 'annually', 'none'):
+            other = run(panel, [('SPY', 1.0)], 8, bench=None, rebalance=rebalance)
+            self.assertAlmostEqual(other['stats']['portVal'], base['stats']['portVal'], places=6)
+        with self.assertRaises(ValueError):
+            run(panel, [('SPY', 1.0)], 8, rebalance='weekly')
+
+    @unittest.skipUnless(__import__('shutil').which('node'), 'node 없음')
+    def test_presets_match_backtest_js(self):
+        import json
+        import re
+        import subprocess
+        from build_backtest_presets import PRESETS
+        path = os.path.join(os.path.dirname(__file__), '..', 'output', 'backtest.js')
+        with open(path, encoding='utf-8') as f:
+            js = re.search(r'const PRESETS_DEF = (\{.*?\n\});', f.read(), re.S).group(1)
+        proc = subprocess.run(['node', '-e', f'console.log(JSON.stringify({js}))'],
+                              capture_output=True, text=True, check=True)
+        expected = {k: [(t, w) for t, w in v] for k, v in json.loads(proc.stdout).items()}
+        self.assertEqual(PRESETS, expected)
+
+
+# ─────────────────────────────────────────────────────────
+# 20. return_index — 누적 로그수익률 인덱스 (구간 수익률 = 조회 두 번 + exp)
+# ─────────────────────────────────────────────────────────
+
+class TestReturnIndex(unittest.TestCase):
+    """구간 수익률 = 기간 말 종가 비율 (결측 기간은 직전 종가), 구간 밖·없는 티커 NaN, float32 기록 왕복"""
+
+    def make_prices(self):
+        idx = pd.bdate_range('2019-01-01', '2021-03-10')
+        rng = np.random.default_rng(5)
+        df = pd.DataFrame(50 * np.exp(np.cumsum(rng.normal(0, 0.01, (len(idx), 2)), axis=0)),
+                          index=idx, columns=['AAA', 'BBB'])
+        df.loc[:'2019-06-20', 'BBB'] = np.nan
+        df.loc['2020-03-01':'2020-04-30', 'AAA'] = np.nan       # 두 달 공백
+        return df
+
+    def test_period_and_trailing_returns(self):
+        from data_loader import compute_return_index
+        from return_index import period_key
+        df = self.make_prices()
+        ri = compute_return_index(df)
+        closes = df.resample('ME').last()
+        self.assertEqual(ri.start_key, 2019 * 12)
+        self.assertEqual(ri.end_key, 2021 * 12 + 2)             # 진행 중인 3월 = 최신 종가
+
+        key = lambda s: period_key(pd.DatetimeIndex([pd.Timestamp(s)]), 'M')[0]
+        r = ri.period_return(['AAA', 'BBB', 'ZZZ'], key('2019-12-31'), key('2020-12-31'))
+        self.assertAlmostEqual(r[0], closes.loc['2020-12-31', 'AAA'] / closes.loc['2019-12-31', 'AAA'] - 1)
+        self.assertAlmostEqual(r[1], closes.loc['2020-12-31', 'BBB'] / closes.loc['2019-12-31', 'BBB'] - 1)
+        self.assertTrue(np.isnan(r[2]))
+        gap = ri.period_return(['AAA'], key('2020-02-29'), key('2020-05-31'))[0]
+        self.assertAlmostEqual(gap, closes.loc['2020-05-31', 'AAA'] / closes.loc['2020-02-29', 'AAA'] - 1)
+        self.assertTrue(np.isnan(ri.period_return(['BBB'], key('2019-03-31'), key('2020-03-31'))[0]))
+
+        trailing = ri.trailing([1, 24], annualize=True)
+        total = df['AAA'].iloc[-1] / closes['AAA'].iloc[-25] - 1
+        self.assertAlmostEqual(trailing.loc['AAA', 24], (1 + total) ** 0.5 - 1)
+        self.assertAlmostEqual(trailing.loc['BBB', 1], df['BBB'].iloc[-1] / closes['BBB'].iloc[-2] - 1)
+
+        weekly = compute_return_index(df, 'W')
+        wk = weekly.period_return(['AAA'], weekly.end_key - 4, weekly.end_key)[0]
+        fridays = df['AAA'].resample('W-FRI').last()
+        self.assertAlmostEqual(wk, fridays.iloc[-1] / fridays.iloc[-5] - 1)
+
+    def test_binary_roundtrip(self):
+        import contextlib
+        import io
+        import tempfile
+        from pathlib import Path
+        from unittest import mock
+        import build_return_index as bri
+        from return_index import ReturnIndex
+        df = self.make_prices()
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.object(bri, 'OUT_DIR', Path(tmp)), \
+                contextlib.redirect_stdout(io.StringIO()):
+            bri.build_return_index(df, weekly=True)
+            self.assertEqual(sorted(os.listdir(tmp)), ['return_index_monthly.bin', 'return_index_monthly.json',
+                                                       'return_index_weekly.bin', 'return_index_weekly.json'])
+            for freq in ('M', 'W'):
+                ref = ReturnIndex.from_prices(df, freq)
+                got = bri.read_index(freq)
+                self.assertEqual((got.start_key, got.end_key), (ref.start_key, ref.end_key))
+                np.testing.assert_allclose(got.log_index, ref.log_index, atol=1e-6)
+
+
+# ─────────────────────────────────────────────────────────
+# 21. build_graph — 블록 상삼각 엣지 추출 · r 구간별 엣지 파일 · 메모리 산출물로 생성 · 임계값별 사전 배치
+# ─────────────────────────────────────────────────────────
+
+class TestBuildGraph(unittest.TestCase):
+    """블록 크기와 무관하게 전체 상삼각 추출과 같은 엣지(행 우선 순서), 노드 플래그 유지"""
+
+    def test_extract_edges_matches_full_triu(self):
+        from build_graph import extract_edges
+        rng = np.random.default_rng(2)
+        x = rng.normal(0, 1, (40, 30))
+        x[:, 5:10] += x[:, :1] * 3
+        corr = np.corrcoef(x, rowvar=False)
+        corr[7, :] = corr[:, 7] = np.nan
+        ri, ci = np.triu_indices(30, k=1)
+        keep = corr[ri, ci] >= 0.5
+        for block in (1, 4, 29, 256):
+            r, c, v = extract_edges(corr, 0.5, block)
+            np.testing.assert_array_equal(r, ri[keep])
+            np.testing.assert_array_equal(c, ci[keep])
+            np.testing.assert_array_equal(v, corr[ri, ci][keep].astype(np.float32))
+        for n in (0, 1):
+            self.assertEqual(len(extract_edges(np.ones((n, n)), 0.5)[0]), 0)
+
+    def test_build_from_memory(self):
+        import contextlib
+        import io
+        import json
+        import tempfile
+        from unittest import mock
+        import build_graph
+        corr = pd.DataFrame([[1.0, 0.9, 0.2], [0.9, 1.0, 0.75], [0.2, 0.75, 1.0]],
+                            index=['SPY', 'VOO', 'XYZ'], columns=['SPY', 'VOO', 'XYZ'])
+        all_data = {'S01': [{'ticker': 'SPY', 'name': 'SPDR S&P 500', 'aum': 5e11},
+                            {'ticker': 'VOO', 'name': 'Vanguard S&P 500', 'aum': 4e11}]}
+        legacy = {'XYZ': {'is_legacy': True, 'reasons': ['SHORT_HISTORY']}}
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.object(build_graph, 'OUT_JSON', os.path.join(tmp, 'graph_data.json')), \
+                contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(build_graph.build_graph(corr, all_data, legacy), 2)
+            with open(build_graph.OUT_JSON, encoding='utf-8') as f:
+                out = json.load(f)
+            s, t, r = build_graph.read_edges(out)
+            default_view = build_graph.read_edges(out, 0.9)
+        self.assertNotIn('links', out)
+        self.assertEqual((s.tolist(), t.tolist(), r.tolist()), ([0, 1], [1, 2], [0.9, 0.75]))
+        self.assertEqual([a.tolist() for a in default_view], [[0], [1], [0.9]])
+        nodes = {n['id']: n for n in out['nodes']}
+        self.assertEqual(nodes['SPY']['a'], 500.0)
+        self.assertEqual((nodes['XYZ']['s'], nodes['XYZ']['l'], nodes['XYZ']['sh']), ('S24', 1, 1))
+        self.assertEqual(sorted(out['layouts']), ['0.70', '0.80', '0.90', '0.95'])
+        self.assertTrue(all(len(xy) == 6 for xy in out['layouts'].values()))
+
+    def test_edge_bands_roundtrip(self):
+        """구간 경계는 소수 셋째 자리 반올림 값 기준 (graph.js 필터와 같음), 높은 구간부터 · 해시로 버전"""
+        import tempfile
+        from build_graph import read_edges, write_edge_bands
+        ri = np.array([0, 0, 1, 2, 3, 4])
+        ci = np.array([1, 2, 3, 4, 5, 5])
+        rv = np.array([0.97, 0.8996, 0.95, 0.7, 0.9, 1.0], dtype=np.float32)
+        with tempfile.TemporaryDirectory() as tmp:
+            bands = write_edge_bands(ri, ci, rv, 6, (0.7, 0.9, 0.95), tmp)
+            self.assertEqual([(b['min'], b['max'], b['count'], b['bytes']) for b in bands],
+                             [(0.95, None, 3, 18), (0.9, 0.95, 2, 12), (0.7, 0.9, 1, 6)])
+            self.assertEqual([b['file'] for b in bands], ['graph_edges_095.bin', 'graph_edges_090.bin', 'graph_edges_070.bin'])
+            doc = {'meta': {'edge_index_bytes': 2, 'edge_bands': bands}}
+            s, t, r = read_edges(doc, out_dir=tmp)
+            self.assertEqual(sorted(zip(s.tolist(), t.tolist(), r.tolist())),
+                             [(0, 1, 0.97), (0, 2, 0.9), (1, 3, 0.95), (2, 4, 0.7), (3, 5, 0.9), (4, 5, 1.0)])
+            self.assertEqual(len(read_edges(doc, 0.95, tmp)[0]), 3)
+            again = write_edge_bands(ri, ci, rv, 70_000, (0.7, 0.9, 0.95), tmp)
+        self.assertEqual([b['bytes'] for b in again], [30, 20, 10])
+        self.assertNotEqual(again[0]['v'], bands[0]['v'])
+
+    def test_stale_bands_removed_and_declared(self):
+        """meta.edge_bands 에 없는 구간 파일은 지우고, 저장하는 구간 파일은 모두 스테이지 출력으로 선언"""
+        import tempfile
+        import build_graph
+        from build_graph import remove_stale_bands, write_edge_bands
+        ri, ci, rv = np.array([0, 1]), np.array([1, 2]), np.array([0.96, 0.72], dtype=np.float32)
+        with tempfile.TemporaryDirectory() as tmp:
+            write_edge_bands(ri, ci, rv, 3, (0.7, 0.8, 0.95), tmp)
+            open(os.path.join(tmp, 'graph_data.json'), 'w').close()
+            bands = write_edge_bands(ri, ci, rv, 3, (0.7, 0.95), tmp)
+            self.assertEqual(remove_stale_bands(bands, tmp), ['graph_edges_080.bin'])
+            self.assertEqual(sorted(os.listdir(tmp)), ['graph_data.json', 'graph_edges_070.bin', 'graph_edges_095.bin'])
+        declared = {os.path.basename(p) for p in build_graph.OUT_EDGES}
+        self.assertEqual(declared, {os.path.basename(build_graph.band_path(lo)) for lo in build_graph.STORED_BANDS})
+        self.assertEqual(len(declared), len([lo for lo in build_graph.EDGE_BANDS if lo >= build_graph.STORE_MIN_R]))
+
+    def test_layouts_deterministic_and_clustered(self):
+        """같은 입력 → 같은 좌표, 임계값마다 2N 개 정수, 강한 상관 쌍은 임의 쌍보다 가깝게"""
+        from build_graph import LAYOUT_LEVELS, compute_layouts, extract_edges
+        rng = np.random.default_rng(4)
+        sector = np.repeat(np.arange(4), 15)
+        x = rng.normal(0, 1, (120, 4))[:, sector] + rng.normal(0, 0.4, (120, 60))
+        ri, ci, rv = extract_edges(np.corrcoef(x, rowvar=False), 0.70)
+        sectors = [f'S{s:02d}' for s in sector]
+        layouts = compute_layouts(sectors, ri, ci, rv)
+        self.assertEqual(layouts, compute_layouts(sectors, ri, ci, rv))
+        self.assertEqual(list(layouts), [f'{v:.2f}' for v in sorted(LAYOUT_LEVELS, reverse=True)])
+        for xy in layouts.values():
+            self.assertEqual(len(xy), 120)
+            self.assertTrue(all(isinstance(v, int) for v in xy))
+        pos = np.array(layouts['0.70'], dtype=float).reshape(-1, 2)
+        edge = np.linalg.norm(pos[ri] - pos[ci], axis=1).mean()
+        i, j = np.triu_indices(60, k=1)
+        self.assertLess(edge, 0.5 * np.linalg.norm(pos[i] - pos[j], axis=1).mean())
+        self.assertEqual(compute_layouts([], ri[:0], ci[:0], rv[:0]), {f'{v:.2f}': [] for v in LAYOUT_LEVELS})
+
+
+# ─────────────────────────────────────────────────────────
+# 22. downsample — LTTB 티커 전체 벡터화
+# ─────────────────────────────────────────────────────────
+
+class TestLttb(unittest.TestCase):
+    """티커마다 유효 구간 길이가 달라도 한 티커씩 도는 정의대로의 LTTB 와 같은 점을 고름"""
+
+    @staticmethod
+    def _reference(y, budget):
+        n = len(y)
+        if n <= budget:
+            return list(range(n))
+        every = (n - 2) / (budget - 2)
+        a, out = 0, [0]
+        for i in range(budget - 2):
+            lo, hi = int(np.floor(i * every)) + 1, int(np.floor((i + 1) * every)) + 1
+            nxt = min(int(np.floor((i + 2) * every)) + 1, n)
+            avg_x, avg_y = (hi + nxt - 1) / 2, y[hi:nxt].mean()
+            area = [abs((a - avg_x) * (y[j] - y[a]) - (a - j) * (avg_y - y[a])) for j in range(lo, hi)]
+            a = lo + int(np.argmax(area))
+            out.append(a)
+        return out + [n - 1]
+
+    def test_matches_reference(self):
+        from downsample import lttb_indices
+        rng = np.random.default_rng(6)
+        values = np.cumsum(rng.normal(0, 1, (700, 12)), axis=0)
+        starts = [0, 0, 5, 100, 400, 650, 690, 697, 699, 300, 0, 0]
+        for j, st in enumerate(starts):
+            values[:st, j] = np.nan
+        values[:, 11] = np.nan
+        for budget in (3, 7, 64, 200):
+            out = lttb_indices(values, budget)
+            self.assertEqual(out.shape, (12, budget))
+            for j, st in enumerate(starts[:11]):
+                got = out[j][out[j] >= 0].tolist()
+                self.assertEqual(got, [st + i for i in self._reference(values[st:, j], budget)])
+            self.assertTrue((out[11] == -1).all())
+        with self.assertRaises(ValueError):
+            lttb_indices(values, 2)
+
+
+# ─────────────────────────────────────────────────────────
+# 23. search_index — 자동완성 검색 인덱스 (티커 접두어 · 이름 단어 접두어)
+# ─────────────────────────────────────────────────────────
+
+NODE_SEARCH = """
+const S = require(process.argv[1]);
+let buf = '';
+process.stdin.on('data', d => buf += d).on('end', () => {
+  const {doc, queries} = JSON.parse(buf);
+  const idx = S.fromDoc(doc);
+  console.log(JSON.stringify(queries.map(q => idx.query(q, 5))));
+});
+"""
+
+NODE_AUTOCOMPLETE = """
+const S = require(process.argv[1]);
+let buf = '';
+process.stdin.on('data', d => buf += d).on('end', async () => {
+  const {doc, allData, queries} = JSON.parse(buf);
+  const el = () => ({style: {}, addEventListener() {}});
+  globalThis.window = globalThis;
+  globalThis.document = {createElement: el, head: {appendChild() {}}, addEventListener() {}};
+  let loads = 0;
+  window.CorryuSearch = {load: () => { loads++; return Promise.resolve(S.fromDoc(doc)); }};
+  require(process.argv[2]);
+  const before = queries.map(q => acFilter(q, allData, 4));   // 인덱스 받기 전: 선형 탐색만
+  await null;
+  const after = queries.map(q => acFilter(q, allData, 4));
+  console.log(JSON.stringify({before, after, loads}));
+});
+"""
+
+
+class TestSearchIndex(unittest.TestCase):
+    """ID = AUM 순위 순 · 같은 티커 먼저 · 이름은 단어 접두어 AND · JSON 왕복 · JS 조회 결과 동일"""
+
+    RECORDS = [
+        {'ticker': 'QQQ', 'name': 'Invesco QQQ Trust', 'rank': 3},
+        {'ticker': 'VOO', 'name': 'Vanguard S&P 500 ETF', 'rank': 1},
+        {'ticker': 'VO', 'name': 'Vanguard Mid-Cap ETF', 'rank': 9},
+        {'ticker': 'VOOG', 'name': 'Vanguard S&P 500 Growth ETF', 'rank': 7},
+        {'ticker': 'QQQM', 'name': 'Invesco NASDAQ 100 ETF', 'rank': 5},
+        {'ticker': 'ONEQ', 'name': 'Fidelity Nasdaq Composite Index ETF', 'rank': 12},
+        {'ticker': 'SMH', 'name': 'VanEck Semiconductor ETF', 'rank': 4},
+        {'ticker': 'SOXX', 'name': 'iShares Semiconductor ETF', 'rank': 6},
+        {'ticker': 'EWZ', 'name': 'iShares MSCI Brazil ETF', 'rank': 10},
+        {'ticker': 'ECH', 'name': 'iShares MSCI Chile Index Fund', 'rank': 11},
+    ]
+    QUERIES = ['voo', 'VO', 'q', 'nasdaq', 'semi', 'semiconductor', 'semiconductors', 'ishares msci',
+               'msci ch', 'S&P 500 growth', 'etf', 'x', '  smh ']
+
+    def build(self):
+        from search_index import SearchIndex
+        return SearchIndex.build(self.RECORDS)
+
+    def tickers(self, hits):
+        return [h['ticker'] for h in hits]
+
+    def test_query_order(self):
+        idx = self.build()
+        self.assertEqual(idx.etfs[0][0], 'VOO')                                  # rank 1 → ID 0
+        self.assertEqual(self.tickers(idx.query('VO')), ['VO', 'VOO', 'VOOG'])   # 같은 티커 먼저, 나머지 AUM 순
+        self.assertEqual(self.tickers(idx.query('q')), ['QQQ', 'QQQM'])
+        self.assertEqual(self.tickers(idx.query('nasdaq')), ['QQQM', 'ONEQ'])    # 대소문자 무시
+        self.assertEqual(self.tickers(idx.query('semiconductor')), ['SMH', 'SOXX'])  # 6글자 초과 → 이름 확인
+        self.assertEqual(idx.query('semiconductors'), [])
+        self.assertEqual(self.tickers(idx.query('msci ch')), ['ECH'])            # 모든 단어 AND
+        self.assertEqual(self.tickers(idx.query('S&P 500 growth')), ['VOOG'])
+        self.assertEqual(idx.query('etf'), [])                                    # 불용어만
+        self.assertEqual(len(idx.query('v', limit=2)), 2)
+
+    def test_doc_roundtrip(self):
+        import json
+        from search_index import SearchIndex
+        idx = self.build()
+        doc = json.loads(json.dumps(idx.to_doc('2026-10-16')))
+        self.assertEqual(doc['as_of'], '2026-10-16')
+        self.assertTrue(all(g >= 0 for gaps in doc['grams'].values() for g in gaps))   # 차이값
+        back = SearchIndex.from_doc(doc)
+        for q in self.QUERIES:
+            self.assertEqual(back.query(q), idx.query(q), q)
+        with self.assertRaises(ValueError):
+            SearchIndex.from_doc({**doc, 'format': 'search-v0'})
+
+    @unittest.skipUnless(__import__('shutil').which('node'), 'node 없음')
+    def test_matches_js(self):
+        import json
+        import subprocess
+        idx = self.build()
+        path = os.path.join(os.path.dirname(__file__), '..', 'output', 'search-index.js')
+        proc = subprocess.run(['node', '-e', NODE_SEARCH, os.path.abspath(path)],
+                              input=json.dumps({'doc': idx.to_doc(), 'queries': self.QUERIES}),
+                              capture_output=True, text=True, check=True)
+        for q, want in zip(self.QUERIES, json.loads(proc.stdout)):
+            self.assertEqual(idx.query(q, 5), want, q)
+
+    @unittest.skipUnless(__import__('shutil').which('node'), 'node 없음')
+    def test_autocomplete_fills_from_scan(self):
+        """인덱스 결과가 max 개 미만이면 선형 탐색(티커 중간 일치 등)으로 채우고, allData 에 없는 티커는 제외"""
+        import json
+        import subprocess
+        from search_index import SearchIndex
+        records = self.RECORDS + [{'ticker': 'TQQQ', 'name': 'ProShares UltraPro QQQ', 'rank': 8},
+                                  {'ticker': 'SQQQ', 'name': 'ProShares UltraPro Short QQQ', 'rank': 13}]
+        all_data = {r['ticker']: {'ticker': r['ticker'], 'name': r['name']} for r in records if r['ticker'] != 'QQQM'}
+        out = os.path.join(os.path.dirname(__file__), '..', 'output')
+        proc = subprocess.run(['node', '-e', NODE_AUTOCOMPLETE, os.path.abspath(os.path.join(out, 'search-index.js')),
+                               os.path.abspath(os.path.join(out, 'autocomplete.js'))],
+                              input=json.dumps({'doc': SearchIndex.build(records).to_doc(), 'allData': all_data,
+                                                'queries': ['QQQ', 'semi ishares', 'V']}),
+                              capture_output=True, text=True, check=True)
+        res = json.loads(proc.stdout)
+        self.assertEqual(res['loads'], 1)
+        before, after = ([self.tickers(h) for h in hits] for hits in (res['before'], res['after']))
+        self.assertEqual(before, [['QQQ', 'TQQQ', 'SQQQ'], [], ['VO', 'VOO', 'VOOG', 'QQQ']])
+        self.assertEqual(after, [['QQQ', 'TQQQ', 'SQQQ'], ['SOXX'], ['VOO', 'VOOG', 'VO', 'QQQ']])   # 인덱스: AUM 순 · 이름 단어 AND
+
+
+# ─────────────────────────────────────────────────────────
+# 24. metrics.compute_metric_ranks — 지표별 전체·섹터 백분위 · 정렬 순서 · 섹터 사분위
+# ─────────────────────────────────────────────────────────
+
+class TestMetricRanks(unittest.TestCase):
+    """pandas rank(pct=True) · np.percentile 과 같은 값, 정렬 순서는 내림차순 · 값 없음 맨 뒤"""
+
+    @staticmethod
+    def make_data():
+        rng = np.random.default_rng(11)
+        data = {}
+        for k, sid in enumerate(['S01', 'S02', 'S03']):
+            etfs = []
+            for i in range(8 + 5 * k):
+                etfs.append({
+                    'ticker': f'{sid}_{i}',
+                    'cagr': float(np.round(rng.normal(8, 4), 0)),        # 정수로 반올림 → 동점 다수
+                    'rsi': None if i % 4 == 0 else float(np.round(rng.uniform(20, 80), 1)),
+                    'aum': int(rng.integers(1, 100)) * 10**6,
+                    'is_legacy': False, 'short_history': False, 'vol': 10.0, 'sortino': 1.0,
+                })
+            data[sid] = etfs
+        data['S04'] = []
+        return data
+
+    def test_pct_and_order(self):
+        from metrics import compute_metric_ranks
+        data = self.make_data()
+        ranks = compute_metric_ranks(data, fields=('cagr', 'rsi', 'aum'))
+        df = pd.DataFrame([{**e, 'sid': sid} for sid, etfs in data.items() for e in etfs]).astype({'rsi': float})
+        self.assertEqual(ranks.tickers, df['ticker'].tolist())
+        for j, f in enumerate(ranks.fields):
+            want = df[f].rank(pct=True).to_numpy() * 100
+            np.testing.assert_allclose(ranks.pct[:, j], want, equal_nan=True)
+            want = df.groupby('sid')[f].rank(pct=True).to_numpy() * 100
+            np.testing.assert_allclose(ranks.sector_pct[:, j], want, equal_nan=True)
+            want = df[f].fillna(-np.inf).to_numpy()
+            got = want[ranks.order[j]]
+            self.assertTrue((got[:-1] >= got[1:]).all())                 # 내림차순, 값 없음(-inf) 맨 뒤
+            self.assertEqual(ranks.n_valid[j], df[f].notna().sum())
+        doc = ranks.to_doc()
+        self.assertEqual(doc['valid']['rsi'], int(df['rsi'].notna().sum()))
+        self.assertIsNone(doc['pct']['rsi'][0])
+        self.assertTrue(all(isinstance(p, int) and 0 < p <= 100 for p in doc['pct']['cagr']))
+
+    def test_sector_quartiles(self):
+        from metrics import compute_metric_ranks, compute_sector_stats
+        data = self.make_data()
+        ranks = compute_metric_ranks(data)
+        for sid, etfs in data.items():
+            stats = compute_sector_stats(etfs, ranks)
+            self.assertEqual({k: v for k, v in stats.items() if k != 'quartiles'}, compute_sector_stats(etfs))
+            for f in ('cagr', 'rsi'):
+                vals = [e[f] for e in etfs if e[f] is not None]
+                if not vals:
+                    self.assertIsNone(stats['quartiles'][f])
+                    continue
+                np.testing.assert_allclose(stats['quartiles'][f],
+                                           np.round(np.percentile(vals, [25, 50, 75]), 1))
+            self.assertIsNone(stats['quartiles']['div_yield'])         # 필드 없음
+        self.assertIsInstance(compute_sector_stats(data['S01'], ranks)['quartiles']['aum'][1], int)
+
+    @unittest.skipUnless(__import__('shutil').which('node'), 'node 없음')
+    def test_screener_ascending_keeps_tie_order(self):
+        """screener.html 오름차순 = 값 오름차순 · 동점은 ID 순 (기존 안정 정렬과 같음) · 값 없음 맨 뒤"""
+        import json
+        import re
+        import subprocess
+        from metrics import compute_metric_ranks
+        data = {'S01': [{'ticker': f'T{i}', 'cagr': v} for i, v in enumerate([3.0, 1.0, None, 3.0, 1.0, 2.0, 1.0])]}
+        ranks = compute_metric_ranks(data, fields=('cagr',))
+        path = os.path.join(os.path.dirname(__file__), '..', 'output', 'screener.html')
+        with open(path, encoding='utf-8') as f:
+            fn = re.search(r'^function ascendingOrder\(.*?^\}', f.read(), re.S | re.M).group(0)
+        js = (f'const allEtfs = {json.dumps(data["S01"])};\n{fn}\n'
+              f'console.log(JSON.stringify(ascendingOrder({ranks.order[0].tolist()}, {int(ranks.n_valid[0])}, "cagr")));')
+        proc = subprocess.run(['node', '-e', js], capture_output=True, text=True, check=True)
+        self.assertEqual(json.loads(proc.stdout), [1, 4, 6, 5, 0, 3, 2])
+
+    def test_ranks_written_separately(self):
+        """rankings 는 etf_data.json 이 아닌 screener_ranks.json (스크리너만 받음)"""
+        import contextlib
+        import io
+        import json
+        import tempfile
+        from unittest import mock
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+        import compute_all
+        from metrics import compute_metric_ranks
+        data = self.make_data()
+        with tempfile.TemporaryDirectory() as tmp, \
+             mock.patch.object(compute_all, 'ETF_DATA_PATH', os.path.join(tmp, 'etf_data.json')), \
+             mock.patch.object(compute_all, 'ETF_COLUMNAR_PATH', os.path.join(tmp, 'etf_data_columnar.json')), \
+             mock.patch.object(compute_all, 'ETF_SHARD_DIR', os.path.join(tmp, 'etf-shards')), \
+             mock.patch.object(compute_all, 'SCREENER_RANKS_PATH', os.path.join(tmp, 'screener_ranks.json')), \
+             mock.patch.object(compute_all, 'ETF_DATA_MONOLITH', True), \
+             contextlib.redirect_stdout(io.StringIO()):
+            compute_all.write_etf_data('2026-10-16', {}, data, compute_metric_ranks(data))
+            with open(os.path.join(tmp, 'etf_data.json')) as f:
+                self.assertNotIn('rankings', json.load(f))
+            with open(os.path.join(tmp, 'screener_ranks.json')) as f:
+                doc = json.load(f)
+        self.assertEqual((doc['as_of'], doc['format']), ('2026-10-16', 'ranks-v1'))
+        self.assertEqual(doc['tickers'], [e['ticker'] for etfs in data.values() for e in etfs])
+        self.assertIn('screener_ranks.json', __import__('build_assets').ARTIFACTS)
+
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)